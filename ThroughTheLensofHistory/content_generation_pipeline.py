@@ -11,6 +11,7 @@ import os
 import time
 import json
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 from tqdm import tqdm
 
 # Add project root to path (use project's own src directory)
@@ -266,8 +267,20 @@ def validate_image_generation_result(result: dict, step_name: str, logger) -> bo
     logger.info(success_msg)
     return True
 
-async def test_complete_replicate_pipeline_whisper():
-    """Test the complete AutoTube pipeline with Replicate (Schnell) image generation + Whisper audio sync."""
+async def test_complete_replicate_pipeline_whisper(topic: Optional[str] = None,
+                                                   exclude_topics: Optional[List[str]] = None,
+                                                   summary: Optional[Dict[str, Any]] = None):
+    """
+    Test the complete AutoTube pipeline with Replicate (Schnell) image generation + Whisper audio sync.
+    
+    Args:
+        topic: Topic to generate a story for, or None to suggest a unique one
+        exclude_topics: Extra topics to avoid when suggesting (e.g. topics already queued)
+        summary: Optional dict filled with the story title, folder name, cost and timings on success
+        
+    Returns:
+        True if every step succeeded, False otherwise
+    """
     print("\n🚀 AutoTube Pipeline Test - Replicate (Schnell) + Whisper Audio Sync\n" + ("="*70))
     timings = {}
     t0 = time.time()
@@ -277,10 +290,14 @@ async def test_complete_replicate_pipeline_whisper():
     t1 = time.time()
     async with StoryGenerator() as sg:
         print("\n[STEP 0.5] 🎯 Topic Suggestion (Avoiding Duplicates)...")
-        with tqdm(total=1, desc="Suggesting unique topic", unit="topic") as pbar_topic:
-            story_title = await sg.suggest_topic()
-            print(f"✅ Suggested topic: {story_title}")
-            pbar_topic.update(1)
+        if topic:
+            story_title = topic
+            print(f"✅ Using provided topic: {story_title}")
+        else:
+            with tqdm(total=1, desc="Suggesting unique topic", unit="topic") as pbar_topic:
+                story_title = await sg.suggest_topic(exclude_topics=exclude_topics)
+                print(f"✅ Suggested topic: {story_title}")
+                pbar_topic.update(1)
         with tqdm(total=1, desc="Generating story", unit="story") as pbar:
             story_data = await sg.generate_story(story_title)
             print(f"✅ Story: {story_data['title']}")
@@ -577,6 +594,18 @@ async def test_complete_replicate_pipeline_whisper():
     logger.info(f"📊 Total time: {total_time:.2f}s, Cost: ${result['total_cost']:.4f}")
     logger.info(f"📋 Ready for audio/video processing with topic: {story_title}")
     
+    if summary is not None:
+        summary.update({
+            "topic": story_title,
+            "story_title": story_data['title'],
+            "sanitized_title": sanitized_title,
+            "audio_duration": audio_duration,
+            "image_cost": result['total_cost'],
+            "successful_images": result['successful_images'],
+            "timings": timings,
+            "total_time": total_time
+        })
+    
     return True
 
 async def main():
@@ -0,0 +1,54 @@
+"""
+Shared model cache
+Keeps heavy models (faster-whisper) loaded once per process so repeated
+pipeline runs in the same interpreter do not pay the load cost again.
+"""
+
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_whisper_models: Dict[Tuple[str, str, str], object] = {}
+_whisper_lock = threading.Lock()
+
+
+def get_whisper_model(model_name_or_path: str, device: str = "auto", compute_type: str = "int8"):
+    """
+    Get a faster-whisper model, loading it on first use.
+
+    Args:
+        model_name_or_path: Model size name ("base", "small") or local model path
+        device: Device passed to WhisperModel
+        compute_type: Compute type passed to WhisperModel
+
+    Returns:
+        Loaded WhisperModel instance shared across callers
+    """
+    key = (str(model_name_or_path), device, compute_type)
+    model = _whisper_models.get(key)
+    if model is not None:
+        return model
+
+    with _whisper_lock:
+        model = _whisper_models.get(key)
+        if model is None:
+            from faster_whisper import WhisperModel
+            logger.info(f"📥 Loading Whisper model: {model_name_or_path} ({compute_type})")
+            model = WhisperModel(str(model_name_or_path), device=device, compute_type=compute_type)
+            _whisper_models[key] = model
+    return model
+
+
+def clear_model_cache(model_name_or_path: Optional[str] = None):
+    """
+    Drop cached models.
+
+    Args:
+        model_name_or_path: Only drop entries for this model, or everything if None
+    """
+    with _whisper_lock:
+        for key in list(_whisper_models):
+            if model_name_or_path is None or key[0] == str(model_name_or_path):
+                del _whisper_models[key]
@@ -10,7 +10,6 @@ import sys
 import openai
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
-from faster_whisper import WhisperModel
 import numpy as np
 
 # Add project root to path to import config
@@ -18,6 +17,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.model_cache import get_whisper_model
 
 class WhisperAudioSynchronizer:
     """
@@ -84,7 +84,7 @@ class WhisperAudioSynchronizer:
         """Load faster-whisper model (lazy loading to save memory)"""
         if self.model is None:
             self.logger.info(f"📥 Loading faster-whisper model: {self.model_name}")
-            self.model = WhisperModel(self.model_name, compute_type="int8")
+            self.model = get_whisper_model(self.model_name, compute_type="int8")
             self.logger.info("✅ faster-whisper model loaded successfully")
         return self.model
     
@@ -13,9 +13,10 @@ from moviepy.editor import VideoFileClip, CompositeVideoClip, ColorClip, ImageCl
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import logging
-from faster_whisper import WhisperModel
 import re
 
+from src.utils.model_cache import get_whisper_model
+
 class OptimizedWhisperViralSubtitleProcessor:
     """Scientifically optimized viral subtitle processor with dynamic word highlighting."""
     
@@ -82,7 +83,7 @@ class OptimizedWhisperViralSubtitleProcessor:
                 if os.path.exists(model_path) and model_path != "base":
                     try:
                         self.logger.info(f"Loading cached Whisper model from: {model_path}")
-                        self.whisper_model = WhisperModel(model_path, compute_type="int8")
+                        self.whisper_model = get_whisper_model(model_path, compute_type="int8")
                         self.logger.info("Cached Whisper model loaded successfully")
                         model_loaded = True
                         break
@@ -92,7 +93,7 @@ class OptimizedWhisperViralSubtitleProcessor:
             
             if not model_loaded:
                 self.logger.info("Loading Whisper model (small) - will download if not cached...")
-                self.whisper_model = WhisperModel("small", compute_type="int8")
+                self.whisper_model = get_whisper_model("small", compute_type="int8")
                 self.logger.info("Whisper model loaded successfully")
                 
         except Exception as e:
@@ -31,6 +31,32 @@ TRENDING_CONFIG = {
     "timeframe": "1d",  # Timeframe for trends (1d = last 24 hours)
     "category": "all",  # Category for trends
     "min_search_volume": 20,  # Lowered threshold to capture more trending topics
+    "sources": [s.strip() for s in os.getenv("TRENDING_SOURCES", "google,reddit,twitter").split(",") if s.strip()],
+    "source_timeout": float(os.getenv("TRENDING_SOURCE_TIMEOUT", 45)),  # Per-source timeout in seconds
+    "context_rate": float(os.getenv("TRENDING_CONTEXT_RATE", 5)),  # Context lookups per second
+    "context_burst": int(os.getenv("TRENDING_CONTEXT_BURST", 5)),  # Context lookups allowed in a burst
+}
+
+# Google Trends scraping (browser reuse and HTML snapshots)
+SCRAPING_CONFIG = {
+    "browser_pool_size": int(os.getenv("BROWSER_POOL_SIZE", 1)),  # Concurrent Chrome sessions
+    "browser_max_uses": int(os.getenv("BROWSER_MAX_USES", 20)),  # Pages per session before it is restarted
+    "browser_max_age": float(os.getenv("BROWSER_MAX_AGE", 1800)),  # Seconds before a session is restarted
+    "snapshot_dir": OUTPUT_DIR / "cache" / "html_snapshots",  # Fetched pages for offline re-parsing
+    "snapshot_ttl": float(os.getenv("TRENDS_SNAPSHOT_TTL", 900)),  # Seconds a snapshot counts as fresh
+    "http_cache_dir": OUTPUT_DIR / "cache" / "http",  # Shared on-disk HTTP cache for news scraping
+    "http_cache_fresh_seconds": float(os.getenv("HTTP_CACHE_FRESH_SECONDS", 3600)),  # Served without a request
+    "http_cache_max_age": float(os.getenv("HTTP_CACHE_MAX_AGE", 86400)),  # Revalidated (ETag/Last-Modified) until this age
+    "news_workers": int(os.getenv("NEWS_WORKERS", 6)),  # Concurrent news source requests per topic
+    "news_timeout": float(os.getenv("NEWS_TIMEOUT", 15)),  # Per-request timeout for news sources
+}
+
+# Trending source endpoints (override to point the fetcher at local stand-ins)
+TRENDING_SOURCE_URLS = {
+    "google_trends": os.getenv("GOOGLE_TRENDS_URL", "https://trends.google.com/trending?geo=US&sort=search-volume"),
+    "news_api": os.getenv("NEWS_API_URL", "https://newsapi.org/v2/top-headlines"),
+    "reddit": os.getenv("REDDIT_BASE_URL", "https://www.reddit.com"),
+    "twitter": os.getenv("TWITTER_TRENDS_URL", "https://trends24.in/united-states/"),
 }
 
 # Video configuration for trending topics
@@ -42,6 +68,9 @@ VIDEO_CONFIG = {
     "height": 1344,  # Video height (vertical for shorts)
     "fps": 30,  # Frames per second
     "enable_ken_burns": True,  # Enable Ken Burns effects
+    "content_workers": int(os.getenv("TRENDING_CONTENT_WORKERS", 3)),  # Topics in TTS/Whisper/image generation at once
+    "render_workers": int(os.getenv("TRENDING_RENDER_WORKERS", 1)),  # Topics in mixing/Ken Burns/subtitles at once
+    "work_dir": OUTPUT_DIR / "work",  # Per-topic scratch directories for temporary render files
 }
 
 # Audio settings
@@ -56,6 +85,11 @@ LLM_CONFIG = {
     "model": "gpt-4o-mini",  # Model for generating summaries
     "max_tokens": 500,  # Maximum tokens for summary generation
     "temperature": 0.7,  # Creativity level for summaries
+    "summary_mode": os.getenv("SUMMARY_MODE", "batched"),  # batched (one structured request per batch), concurrent, serial
+    "summary_batch_size": int(os.getenv("SUMMARY_BATCH_SIZE", 5)),  # Topics per structured-output request
+    "summary_workers": int(os.getenv("SUMMARY_WORKERS", 4)),  # Concurrent context lookups / LLM requests
+    "summary_rate": float(os.getenv("SUMMARY_RATE", 2)),  # LLM requests per second, shared by all workers
+    "summary_burst": int(os.getenv("SUMMARY_BURST", 4)),  # LLM requests allowed in a burst
 }
 
 # Image generation configuration
@@ -125,6 +159,23 @@ class Config:
     TRENDING_TIMEFRAME = TRENDING_CONFIG["timeframe"]
     TRENDING_CATEGORY = TRENDING_CONFIG["category"]
     MIN_SEARCH_VOLUME = TRENDING_CONFIG["min_search_volume"]
+    TRENDING_SOURCES = TRENDING_CONFIG["sources"]
+    TRENDING_SOURCE_TIMEOUT = TRENDING_CONFIG["source_timeout"]
+    TRENDING_CONTEXT_RATE = TRENDING_CONFIG["context_rate"]
+    TRENDING_CONTEXT_BURST = TRENDING_CONFIG["context_burst"]
+    TRENDING_SOURCE_URLS = TRENDING_SOURCE_URLS
+    
+    # Scraping configuration
+    BROWSER_POOL_SIZE = SCRAPING_CONFIG["browser_pool_size"]
+    BROWSER_MAX_USES = SCRAPING_CONFIG["browser_max_uses"]
+    BROWSER_MAX_AGE = SCRAPING_CONFIG["browser_max_age"]
+    SNAPSHOT_DIR = SCRAPING_CONFIG["snapshot_dir"]
+    SNAPSHOT_TTL = SCRAPING_CONFIG["snapshot_ttl"]
+    HTTP_CACHE_DIR = SCRAPING_CONFIG["http_cache_dir"]
+    HTTP_CACHE_FRESH_SECONDS = SCRAPING_CONFIG["http_cache_fresh_seconds"]
+    HTTP_CACHE_MAX_AGE = SCRAPING_CONFIG["http_cache_max_age"]
+    NEWS_WORKERS = SCRAPING_CONFIG["news_workers"]
+    NEWS_TIMEOUT = SCRAPING_CONFIG["news_timeout"]
     
     # Video configuration
     NUM_IMAGES = VIDEO_CONFIG["num_images"]
@@ -134,6 +185,9 @@ class Config:
     VIDEO_HEIGHT = VIDEO_CONFIG["height"]
     VIDEO_FPS = VIDEO_CONFIG["fps"]
     ENABLE_KEN_BURNS = VIDEO_CONFIG["enable_ken_burns"]
+    MAX_CONTENT_WORKERS = VIDEO_CONFIG["content_workers"]
+    MAX_RENDER_WORKERS = VIDEO_CONFIG["render_workers"]
+    WORK_DIR = VIDEO_CONFIG["work_dir"]
     
     # Audio configuration
     TTS_VOICE = AUDIO_CONFIG["tts_voice"]
@@ -144,6 +198,11 @@ class Config:
     LLM_MODEL = LLM_CONFIG["model"]
     MAX_TOKENS = LLM_CONFIG["max_tokens"]
     TEMPERATURE = LLM_CONFIG["temperature"]
+    SUMMARY_MODE = LLM_CONFIG["summary_mode"]
+    SUMMARY_BATCH_SIZE = LLM_CONFIG["summary_batch_size"]
+    SUMMARY_WORKERS = LLM_CONFIG["summary_workers"]
+    SUMMARY_RATE = LLM_CONFIG["summary_rate"]
+    SUMMARY_BURST = LLM_CONFIG["summary_burst"]
     
     # Image configuration
     IMAGE_MODEL = IMAGE_CONFIG["model"]
@@ -0,0 +1,151 @@
+"""
+Local Trend Source Stand-ins
+Small HTTP server that mimics the Reddit JSON, trends24, News API and news
+search endpoints so the trending fetchers and the news context gatherer can be
+exercised offline (see test_concurrent_trending.py, test_news_http_cache.py).
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+REDDIT_POSTS = [
+    ("Artemis Launch Window Confirmed by NASA", "space", 48000),
+    ("Olympic Committee Announces Host City", "sports", 31000),
+    ("Quantum Chip Breakthrough Stuns Researchers", "technology", 27000),
+    ("Federal Reserve Holds Rates Steady", "business", 19000),
+    ("Wildfire Season Starts Early in California", "news", 12000),
+]
+
+TWITTER_TRENDS = ["Artemis Launch", "Champions League", "Quantum Chip", "World Series", "Taylor Swift"]
+
+NEWS_SEARCH_PAGE = """<html><head><title>News search</title></head><body>
+<nav class="menu"><a href="/">Artemis Launch menu link that is not an article</a></nav>
+<div class="results">
+  <article><h3>Artemis Launch Window Confirmed After Final Review</h3>
+    <p>NASA confirmed the launch window after a final readiness review.</p></article>
+  <div class="news-card"><h2>Artemis Launch crew completes last rehearsal</h2>
+    <p>The four astronauts finished the final dress rehearsal on Monday.</p></div>
+  <div class="sidebar"><h3>Unrelated sidebar headline</h3></div>
+</div>
+</body></html>"""
+
+NEWS_ETAG = '"news-search-v1"'
+NEWS_LAST_MODIFIED = "Mon, 20 Jul 2026 10:00:00 GMT"
+
+NEWS_HEADLINES = [
+    "Artemis Launch Window Confirmed After Final Review",
+    "Champions League Draw Sets Up Classic Rematch",
+]
+
+
+def _reddit_listing(posts) -> Dict:
+    return {"data": {"children": [
+        {"data": {"title": title, "subreddit": subreddit, "score": score}}
+        for title, subreddit, score in posts
+    ]}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "LocalTrendStandin/1.0"
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        self.server.hits[path] = self.server.hits.get(path, 0) + 1
+
+        delay = self.server.delays.get(path, 0)
+        if delay:
+            time.sleep(delay)
+
+        if path == "/r/popular.json" or (path.startswith("/r/") and path.endswith("/hot.json")):
+            self._send_json(_reddit_listing(REDDIT_POSTS))
+        elif path == "/twitter":
+            links = "".join(f'<li><a href="/t/{i}" class="trend-card">{t}</a></li>' for i, t in enumerate(TWITTER_TRENDS))
+            self._send(f"<html><body><ol>{links}</ol></body></html>".encode("utf-8"), "text/html; charset=utf-8")
+        elif path == "/news":
+            self._send_json({"status": "ok", "articles": [{"title": t} for t in NEWS_HEADLINES]})
+        elif path.startswith("/news-search"):
+            # ETag on /news-search/etag, Last-Modified on /news-search/modified, no validators otherwise
+            validators = {}
+            if path.endswith("/etag"):
+                validators["ETag"] = NEWS_ETAG
+            elif path.endswith("/modified"):
+                validators["Last-Modified"] = NEWS_LAST_MODIFIED
+            if ((validators.get("ETag") and self.headers.get("If-None-Match") == NEWS_ETAG) or
+                    (validators.get("Last-Modified") and self.headers.get("If-Modified-Since") == NEWS_LAST_MODIFIED)):
+                self.server.hits["304"] = self.server.hits.get("304", 0) + 1
+                self.send_response(304)
+                for name, value in validators.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                return
+            self._send(NEWS_SEARCH_PAGE.encode("utf-8"), "text/html; charset=utf-8", validators)
+        else:
+            self.send_error(404)
+
+    def _send_json(self, payload: Dict):
+        self._send(json.dumps(payload).encode("utf-8"), "application/json")
+
+    def _send(self, body: bytes, content_type: str, extra_headers: Optional[Dict[str, str]] = None):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalTrendServer:
+    """
+    Threaded local HTTP server with per-path artificial latency.
+
+    Usage:
+        with LocalTrendServer(delays={"/twitter": 3}) as server:
+            fetcher.source_urls.update(server.source_urls())
+    """
+
+    def __init__(self, delays: Optional[Dict[str, float]] = None):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.delays = dict(delays or {})
+        self.httpd.hits = {}
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def hits(self) -> Dict[str, int]:
+        return self.httpd.hits
+
+    def source_urls(self) -> Dict[str, str]:
+        """Source URL overrides for RealTrendingFetcher.source_urls."""
+        return {
+            "reddit": self.url,
+            "twitter": f"{self.url}/twitter",
+            "news_api": f"{self.url}/news",
+        }
+
+    def start(self) -> "LocalTrendServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "LocalTrendServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -19,13 +19,26 @@ from src.utils.folder_utils import sanitize_folder_name, setup_logging_with_file
 # Set up output directory for this project
 # Use Config.OUTPUT_DIR directly instead of creating a local variable
 
-def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] = None) -> bool:
+def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] = None,
+                            work_dir: Optional[Path] = None) -> bool:
+    """
+    Mix audio, render the Ken Burns video and burn in subtitles for one topic.
+    
+    Args:
+        topic_name: Topic whose content-generation outputs are rendered
+        logger: Logger to use (a per-topic file logger is created if None)
+        work_dir: Scratch directory for temporary audio/encoder files
+                  (default: Config.WORK_DIR / <sanitized topic>), so topics can render concurrently
+    """
     if not logger:
         logger = setup_logging_with_file(topic_name, "audio_video")
     
     sanitized_name = sanitize_folder_name(topic_name)
     logger.info(f"📁 Sanitized folder name: {sanitized_name}")
     
+    work_dir = Path(work_dir) if work_dir else Config.WORK_DIR / sanitized_name
+    work_dir.mkdir(parents=True, exist_ok=True)
+    
     # Step 0: Audio Mixing (NEW - first step)
     logger.info(f"🎚️ Step 0: Audio Mixing for topic: {topic_name}")
     
@@ -119,7 +132,7 @@ def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] =
         
         # Create a temporary audio file with exact duration to ensure perfect sync
         import tempfile
-        temp_audio = tempfile.NamedTemporaryFile(suffix='.mp3', delete=False)
+        temp_audio = tempfile.NamedTemporaryFile(suffix='.mp3', dir=work_dir, delete=False)
         temp_audio.close()
         
         # AGGRESSIVE FIX: Trim mixed audio to EXACT TTS duration (no tolerance)
@@ -185,6 +198,7 @@ def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] =
                     codec='libx264',
                     audio_codec='aac',
                     audio_bitrate='320k',
+                    temp_audiofile=str(work_dir / f"{sanitized_name}_kenburns_trim_audio.m4a"),
                     preset='fast',
                     ffmpeg_params=['-pix_fmt', 'yuv420p']
                 )
@@ -213,7 +227,8 @@ def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] =
             video_path=kenburns_video,
             audio_path=result_path,  # Use the original mixed audio for subtitles
             output_path=final_video_path,
-            story_path=story_path if story_path.exists() else None
+            story_path=story_path if story_path.exists() else None,
+            work_dir=work_dir
         )
         
         if not Path(final_video).exists():
@@ -248,6 +263,7 @@ def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] =
                     codec='libx264',
                     audio_codec='aac',
                     audio_bitrate='320k',
+                    temp_audiofile=str(work_dir / f"{sanitized_name}_final_trim_audio.m4a"),
                     preset='fast',
                     ffmpeg_params=['-pix_fmt', 'yuv420p']
                 )
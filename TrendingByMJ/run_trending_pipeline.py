@@ -205,9 +205,12 @@ def show_configuration():
             ("Video Dimensions", f"{Config.VIDEO_WIDTH}x{Config.VIDEO_HEIGHT}"),
             ("TTS Voice", Config.TTS_VOICE),
             ("LLM Model", Config.LLM_MODEL),
+            ("Summary Mode", f"{Config.SUMMARY_MODE} (batch size {Config.SUMMARY_BATCH_SIZE})"),
             ("Trending Country", Config.TRENDING_COUNTRY),
             ("Trending Timeframe", Config.TRENDING_TIMEFRAME),
             ("Min Search Volume", Config.MIN_SEARCH_VOLUME),
+            ("Content Workers", Config.MAX_CONTENT_WORKERS),
+            ("Render Workers", Config.MAX_RENDER_WORKERS),
             ("History File", Config.HISTORY_FILE),
         ]
         
@@ -20,6 +20,43 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.keyword_scanner import KeywordRule, KeywordScanner
+
+# Content safety rules, compiled once into a single-pass scanner. Unsafe keywords match whole
+# words; historical contexts and problematic words also match inside longer words.
+CONTENT_SAFETY_SCANNER = KeywordScanner({
+    # Explicit violence (no exceptions)
+    'explicit_violence': ['murder', 'murdered', 'murdering', 'assassination', 'execution', 'torture',
+                          'massacre', 'genocide', 'slaughter'],
+    # Violence with context exceptions
+    'violence': KeywordRule(['kill', 'killed', 'killing', 'kills', 'death', 'dead', 'die', 'died'],
+                            not_followed_by=r'\s+(bacteria|infection|disease|mold|germ)'),
+    'gore': ['bloody', 'gore', 'gory', 'gruesome', 'horrific'],
+    # Weapons (no exceptions)
+    'weapons': ['gun', 'guns', 'sword', 'swords', 'knife', 'knives', 'weapon', 'weapons'],
+    # War and violence (no exceptions)
+    'war': ['battle', 'war', 'fighting', 'fought', 'attack', 'attacked', 'bomb', 'bombed', 'explosion', 'exploded'],
+    # Terrorism (no exceptions)
+    'terrorism': ['terror', 'terrorist', 'terrorism'],
+    # Inappropriate content (no exceptions)
+    'inappropriate': ['nude', 'naked', 'sex', 'sexual', 'porn', 'pornographic', 'explicit', 'adult', 'mature'],
+    # Extreme language (no exceptions)
+    'extreme_language': ['hate', 'hateful', 'racist', 'racism', 'discrimination', 'discriminatory',
+                         'abuse', 'abusive'],
+    # Historical contexts that make the problematic words below acceptable
+    'historical_context': KeywordRule([
+        'infection', 'disease', 'bacteria', 'mold', 'germ', 'medicine', 'medical',
+        'discovery', 'invention', 'science', 'scientific', 'research', 'experiment',
+        'ancient', 'historical', 'archaeology', 'civilization', 'culture',
+        'treasure', 'artifact', 'monument', 'building', 'architecture',
+        'king', 'queen', 'emperor', 'empire', 'kingdom', 'dynasty',
+        'trade', 'commerce', 'economy', 'wealth', 'fortune'
+    ], whole_words=False),
+    'problematic': KeywordRule(['violent', 'violence', 'brutal', 'brutally', 'horror', 'disturbing', 'shocking',
+                                'terrifying', 'fear', 'fearful', 'scary', 'scared', 'afraid', 'terrified'],
+                               whole_words=False),
+})
+CONTEXT_LABELS = ('historical_context', 'problematic')
 
 # Load prompts directly from project prompts file
 def load_prompts():
@@ -180,61 +217,24 @@ class StoryGenerator:
 
     def _is_content_safe(self, content: str) -> bool:
         """Check if content is YouTube advertiser-friendly with intelligent context awareness."""
-        
-        # Define unsafe keywords with context exceptions
-        unsafe_patterns = [
-            # Explicit violence (no exceptions)
-            r'\b(murder(ed|ing)?|assassination|execution|torture|massacre|genocide|slaughter)\b',
-            
-            # Violence with context exceptions
-            r'\b(kill(ed|ing|s)?|death|dead|die|died)\b(?!\s+(bacteria|infection|disease|mold|germ))',
-            r'\b(bloody|gore|gory|gruesome|horrific)\b',
-            
-            # Weapons (no exceptions)
-            r'\b(gun|guns|sword|swords|knife|knives|weapon|weapons)\b',
-            
-            # War and violence (no exceptions)
-            r'\b(battle|war|fighting|fought|attack|attacked|bomb|bombed|explosion|exploded)\b',
-            
-            # Terrorism (no exceptions)
-            r'\b(terror|terrorist|terrorism)\b',
-            
-            # Inappropriate content (no exceptions)
-            r'\b(nude|naked|sex|sexual|porn|pornographic|explicit|adult|mature)\b',
-            
-            # Extreme language (no exceptions)
-            r'\b(hate|hateful|racist|racism|discrimination|discriminatory|abuse|abusive)\b'
-        ]
-        
-        content_lower = content.lower()
+        # One pass over the content finds unsafe patterns, historical contexts and problematic words together
+        matches = CONTENT_SAFETY_SCANNER.scan(content)
         
         # Check for unsafe patterns
-        for pattern in unsafe_patterns:
-            if re.search(pattern, content_lower):
-                match = re.search(pattern, content_lower)
-                print(f"[CONTENT SAFETY] Unsafe pattern detected: '{match.group()}' in context")
-                return False
-        
-        # Additional context checks for historical content
-        historical_safe_contexts = [
-            'infection', 'disease', 'bacteria', 'mold', 'germ', 'medicine', 'medical',
-            'discovery', 'invention', 'science', 'scientific', 'research', 'experiment',
-            'ancient', 'historical', 'archaeology', 'civilization', 'culture',
-            'treasure', 'artifact', 'monument', 'building', 'architecture',
-            'king', 'queen', 'emperor', 'empire', 'kingdom', 'dynasty',
-            'trade', 'commerce', 'economy', 'wealth', 'fortune'
-        ]
+        unsafe = next((m for m in matches if m.label not in CONTEXT_LABELS), None)
+        if unsafe:
+            print(f"[CONTENT SAFETY] Unsafe pattern detected: '{unsafe.term}' in context")
+            return False
         
         # If content contains historical safe contexts, be more lenient
-        has_historical_context = any(context in content_lower for context in historical_safe_contexts)
+        has_historical_context = any(m.label == 'historical_context' for m in matches)
         
         # Check for problematic words only if no historical context
         if not has_historical_context:
-            problematic_words = ['violent', 'violence', 'brutal', 'brutally', 'horror', 'disturbing', 'shocking', 'terrifying', 'fear', 'fearful', 'scary', 'scared', 'afraid', 'terrified']
-            for word in problematic_words:
-                if word in content_lower:
-                    print(f"[CONTENT SAFETY] Problematic word detected: '{word}' in '{content}'")
-                    return False
+            problematic = next((m for m in matches if m.label == 'problematic'), None)
+            if problematic:
+                print(f"[CONTENT SAFETY] Problematic word detected: '{problematic.term}' in '{content}'")
+                return False
         
         return True
 
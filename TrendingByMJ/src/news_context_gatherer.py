@@ -6,7 +6,9 @@ Fetches real news and context about why trending topics are trending
 import requests
 import json
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any
 from pathlib import Path
@@ -18,43 +20,75 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.http_cache import get_http_cache
+from src.utils.soup_utils import parse_selected
 
 class NewsContextGatherer:
     """Gathers news context about trending topics."""
     
+    # News search pages and the article containers to keep when parsing each one
+    NEWS_SOURCES = [
+        ("https://news.google.com/search?q={query}&hl=en-US&gl=US&ceid=US:en",
+         ['article', '.NiLAwe', '.IBr9hb', '[data-n-tid]', '.MQsxIb']),
+        ("https://www.bing.com/news/search?q={query}",
+         ['.news-card', '.news-item', 'article', '.news-card-wrapper']),
+        ("https://www.cnn.com/search?q={query}",
+         ['.cn-search-result', '.search-results__item', 'article', '.container__item']),
+        ("https://www.foxnews.com/search-results/search?q={query}",
+         ['.search-result', '.article', '.story', '.content']),
+        ("https://www.bbc.com/search?q={query}",
+         ['.search-result', '.article', '.story', '.gs-c-promo']),
+        ("https://www.nbcnews.com/search?q={query}",
+         ['.search-result', '.article', '.story', '.item']),
+    ]
+    
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(__name__)
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        }
+        self._local = threading.local()
+        self.http_cache = get_http_cache()
+        self.news_sources = list(self.NEWS_SOURCES)
+        self.news_workers = Config.NEWS_WORKERS
+        self.news_timeout = Config.NEWS_TIMEOUT
+    
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session for the current thread (news sources are fetched from several threads at once)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
     
     def gather_trending_context(self, topic_data: Dict[str, Any]) -> Dict[str, Any]:
         """Gather comprehensive context about a trending topic."""
         try:
             topic = topic_data["topic"]
             self.logger.info(f"🔍 Gathering context for: {topic}")
+            gather_start = time.time()
             
             # Enhanced topic data with gathered context
             enhanced_topic = topic_data.copy()
             
-            # Add news search results
-            news_results = self._search_news(topic)
-            enhanced_topic["news_results"] = news_results
-            
-            # Add social media context
-            social_context = self._get_social_context(topic)
-            enhanced_topic["social_context"] = social_context
-            
-            # Add trending analysis
-            trending_analysis = self._analyze_trending_reason(topic, topic_data)
-            enhanced_topic["trending_analysis"] = trending_analysis
+            # Fan out: news search, social context and trending analysis run side by side
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="news-context") as executor:
+                news_future = executor.submit(self._search_news, topic)
+                social_future = executor.submit(self._get_social_context, topic)
+                analysis_future = executor.submit(self._analyze_trending_reason, topic, topic_data)
+                
+                enhanced_topic["news_results"] = news_future.result()
+                enhanced_topic["social_context"] = social_future.result()
+                enhanced_topic["trending_analysis"] = analysis_future.result()
             
             # Create comprehensive context summary
             context_summary = self._create_context_summary(topic, enhanced_topic)
             enhanced_topic["context_summary"] = context_summary
             
-            self.logger.info(f"✅ Context gathered for: {topic}")
+            self.logger.info(f"✅ Context gathered for: {topic} ({time.time() - gather_start:.1f}s, "
+                             f"HTTP cache: {self.http_cache.stats})")
             return enhanced_topic
             
         except Exception as e:
@@ -62,36 +96,36 @@ class NewsContextGatherer:
             return topic_data
     
     def _search_news(self, topic: str) -> List[Dict[str, Any]]:
-        """Search for real news about a topic using multiple sources."""
+        """Search for real news about a topic using multiple sources (queried concurrently)."""
         try:
-            news_results = []
-            
-            # 1. Try NewsAPI if available
-            if Config.NEWS_API_KEY:
+            # NewsAPI (if available) and web scraping run at the same time; NewsAPI wins when it has results
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="news-search") as executor:
+                api_future = executor.submit(self._search_real_news, topic) if Config.NEWS_API_KEY else None
+                web_future = executor.submit(self._search_web_news, topic)
+                
+                # 1. Try NewsAPI if available
+                if api_future is not None:
+                    try:
+                        news_results = api_future.result()
+                        if news_results:
+                            self.logger.info(f"✅ Found {len(news_results)} real news articles via NewsAPI for {topic}")
+                            return news_results
+                    except Exception as e:
+                        self.logger.warning(f"⚠️ NewsAPI failed for {topic}: {e}")
+                
+                # 2. Web scraping as fallback
                 try:
-                    news_results.extend(self._search_real_news(topic))
+                    news_results = web_future.result()
                     if news_results:
-                        self.logger.info(f"✅ Found {len(news_results)} real news articles via NewsAPI for {topic}")
+                        self.logger.info(f"✅ Found {len(news_results)} real news articles via web scraping for {topic}")
                         return news_results
                 except Exception as e:
-                    self.logger.warning(f"⚠️ NewsAPI failed for {topic}: {e}")
-            
-            # 2. Try web scraping as fallback
-            try:
-                news_results.extend(self._search_web_news(topic))
-                if news_results:
-                    self.logger.info(f"✅ Found {len(news_results)} real news articles via web scraping for {topic}")
-                    return news_results
-            except Exception as e:
-                self.logger.warning(f"⚠️ Web scraping failed for {topic}: {e}")
+                    self.logger.warning(f"⚠️ Web scraping failed for {topic}: {e}")
             
             # 3. If still no results, return empty - we need REAL news
-            if not news_results:
-                self.logger.error(f"❌ NO REAL NEWS FOUND for {topic} - this is unacceptable!")
-                self.logger.error(f"❌ We need real news, not fallback templates!")
-                return []
-            
-            return news_results
+            self.logger.error(f"❌ NO REAL NEWS FOUND for {topic} - this is unacceptable!")
+            self.logger.error(f"❌ We need real news, not fallback templates!")
+            return []
             
         except Exception as e:
             self.logger.error(f"❌ Error in news search for {topic}: {e}")
@@ -114,7 +148,7 @@ class NewsContextGatherer:
                 "from": (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
             }
             
-            response = self.session.get(url, params=params)
+            response = self.http_cache.get(self.session, url, params=params, timeout=self.news_timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -332,124 +366,25 @@ class NewsContextGatherer:
             return f"Trending topic: {topic}"
     
     def _search_web_news(self, topic: str) -> List[Dict[str, Any]]:
-        """Search for real news using web scraping from multiple sources."""
+        """Search for real news using web scraping from multiple sources (all sources at once)."""
         try:
-            import requests
-            from bs4 import BeautifulSoup
-            import re
             from urllib.parse import quote_plus
             
-            news_results = []
-            
             # Search query for real news
             search_query = quote_plus(f"{topic} news today latest")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
+            source_jobs = [(template.format(query=search_query), selectors)
+                           for template, selectors in self.news_sources]
             
-            # Try multiple news sources for real-time news
-            news_sources = [
-                f"https://news.google.com/search?q={search_query}&hl=en-US&gl=US&ceid=US:en",
-                f"https://www.bing.com/news/search?q={search_query}",
-                f"https://www.cnn.com/search?q={search_query}",
-                f"https://www.foxnews.com/search-results/search?q={search_query}",
-                f"https://www.bbc.com/search?q={search_query}",
-                f"https://www.nbcnews.com/search?q={search_query}"
-            ]
-            
-            for source_url in news_sources:
-                try:
-                    self.logger.info(f"🔍 Scraping {source_url}")
-                    response = self.session.get(source_url, headers=headers, timeout=15)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Extract news articles with more robust selectors
-                    articles = []
-                    
-                    # Google News specific selectors
-                    if "news.google.com" in source_url:
-                        articles = soup.select('article, .NiLAwe, .IBr9hb, [data-n-tid], .MQsxIb')
-                    # Bing News specific selectors  
-                    elif "bing.com" in source_url:
-                        articles = soup.select('.news-card, .news-item, article, .news-card-wrapper')
-                    # CNN specific selectors
-                    elif "cnn.com" in source_url:
-                        articles = soup.select('.cn-search-result, .search-results__item, article, .container__item')
-                    # Fox News specific selectors
-                    elif "foxnews.com" in source_url:
-                        articles = soup.select('.search-result, .article, .story, .content')
-                    # BBC specific selectors
-                    elif "bbc.com" in source_url:
-                        articles = soup.select('.search-result, .article, .story, .gs-c-promo')
-                    # NBC News specific selectors
-                    elif "nbcnews.com" in source_url:
-                        articles = soup.select('.search-result, .article, .story, .item')
-                    # Generic fallback selectors
-                    else:
-                        article_selectors = [
-                            'article', '.article', '.news-item', '.story',
-                            '[data-testid*="article"]', '.c-entry-box', '.search-result',
-                            '.news-card', '.content-item', '.post'
-                        ]
-                        for selector in article_selectors:
-                            found_articles = soup.select(selector)
-                            if found_articles:
-                                articles.extend(found_articles)
-                                break
-                    
-                    # Extract title and summary from articles
-                    for article in articles[:5]:  # Limit to 5 per source
-                        # Try multiple title selectors
-                        title_selectors = ['h1', 'h2', 'h3', 'h4', '.title', '.headline', 'a[href*="/"]', '[data-testid*="title"]']
-                        title_elem = None
-                        for selector in title_selectors:
-                            title_elem = article.select_one(selector)
-                            if title_elem:
-                                break
-                        
-                        # Try multiple summary selectors
-                        summary_selectors = ['p', '.summary', '.description', '.excerpt', '.snippet', '[data-testid*="description"]']
-                        summary_elem = None
-                        for selector in summary_selectors:
-                            summary_elem = article.select_one(selector)
-                            if summary_elem:
-                                break
-                        
-                        if title_elem:
-                            title = title_elem.get_text().strip()
-                            summary = summary_elem.get_text().strip() if summary_elem else ""
-                            
-                            # Enhanced filtering to ensure relevance and quality
-                            if (len(title) > 10 and 
-                                topic.lower() in title.lower() and
-                                not any(word in title.lower() for word in ['advertisement', 'sponsored', 'promoted']) and
-                                len(title) < 200):
-                                
-                                # Clean up the summary
-                                summary = re.sub(r'\s+', ' ', summary)  # Remove extra whitespace
-                                summary = summary[:300] + "..." if len(summary) > 300 else summary
-                                
-                                news_results.append({
-                                    "title": title,
-                                    "summary": summary,
-                                    "source": source_url.split('.')[1].title() if '.' in source_url else "Web Search",
-                                    "date": datetime.now().strftime("%Y-%m-%d"),
-                                    "url": source_url
-                                })
-                    
-                    if len(news_results) >= 5:  # Stop if we have enough results
-                        break
-                        
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Failed to scrape {source_url}: {e}")
-                    continue
+            with ThreadPoolExecutor(max_workers=max(1, min(self.news_workers, len(source_jobs))),
+                                    thread_name_prefix="news-source") as executor:
+                per_source = list(executor.map(lambda job: self._scrape_news_source(topic, *job), source_jobs))
+            
+            # Keep source priority order; stop adding sources once we have enough results
+            news_results = []
+            for results in per_source:
+                if len(news_results) >= 5:
+                    break
+                news_results.extend(results)
             
             self.logger.info(f"🌐 Successfully scraped {len(news_results)} real news articles for {topic}")
             return news_results
@@ -458,6 +393,74 @@ class NewsContextGatherer:
             self.logger.error(f"❌ Error in web news search for {topic}: {e}")
             return []
     
+    def _scrape_news_source(self, topic: str, source_url: str, selectors: List[str]) -> List[Dict[str, Any]]:
+        """Scrape one news search page (through the shared HTTP cache)."""
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+        }
+        
+        news_results = []
+        try:
+            self.logger.info(f"🔍 Scraping {source_url}")
+            response = self.http_cache.get(self.session, source_url, headers=headers, timeout=self.news_timeout)
+            response.raise_for_status()
+            
+            # Parse only the article containers for this source (lxml + SoupStrainer)
+            articles = parse_selected(response.content, selectors)
+            
+            # Extract title and summary from articles
+            for article in articles[:5]:  # Limit to 5 per source
+                # Try multiple title selectors
+                title_selectors = ['h1', 'h2', 'h3', 'h4', '.title', '.headline', 'a[href*="/"]', '[data-testid*="title"]']
+                title_elem = None
+                for selector in title_selectors:
+                    title_elem = article.select_one(selector)
+                    if title_elem:
+                        break
+                
+                # Try multiple summary selectors
+                summary_selectors = ['p', '.summary', '.description', '.excerpt', '.snippet', '[data-testid*="description"]']
+                summary_elem = None
+                for selector in summary_selectors:
+                    summary_elem = article.select_one(selector)
+                    if summary_elem:
+                        break
+                
+                if title_elem:
+                    title = title_elem.get_text().strip()
+                    summary = summary_elem.get_text().strip() if summary_elem else ""
+                    
+                    # Enhanced filtering to ensure relevance and quality
+                    if (len(title) > 10 and 
+                        topic.lower() in title.lower() and
+                        not any(word in title.lower() for word in ['advertisement', 'sponsored', 'promoted']) and
+                        len(title) < 200):
+                        
+                        # Clean up the summary
+                        summary = re.sub(r'\s+', ' ', summary)  # Remove extra whitespace
+                        summary = summary[:300] + "..." if len(summary) > 300 else summary
+                        
+                        news_results.append({
+                            "title": title,
+                            "summary": summary,
+                            "source": source_url.split('.')[1].title() if '.' in source_url else "Web Search",
+                            "date": datetime.now().strftime("%Y-%m-%d"),
+                            "url": source_url
+                        })
+            
+            if response.from_cache:
+                self.logger.info(f"📦 {source_url.split('/')[2]}: {len(news_results)} articles (cached)")
+                
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to scrape {source_url}: {e}")
+        
+        return news_results
+    
 
 
 def test_news_context_gatherer():
@@ -4,8 +4,10 @@ Gets actual live trending topics from Google Trends
 """
 
 import requests
+import asyncio
 import json
 import logging
+import threading
 import time
 import re
 from datetime import datetime, timedelta
@@ -19,23 +21,56 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.rate_limiter import TokenBucket
+from src.utils.browser_pool import get_browser_pool
+from src.utils.html_snapshot_cache import HtmlSnapshotCache
+from src.utils.keyword_scanner import KeywordScanner
+
+# Topics about a death or tragedy only get respectful tribute content (substring match, e.g. "accidental")
+SENSITIVE_TOPIC_SCANNER = KeywordScanner({
+    'tragedy': ['death', 'died', 'killed', 'shooting', 'accident'],
+}, whole_words=False)
 
 class RealTrendingFetcher:
     """Real trending fetcher that gets live data from Google Trends."""
     
+    # Row selectors tried in order on the rendered Google Trends page
+    GOOGLE_TRENDS_SELECTORS = ["table tr", "div[role='row']", ".trending-item"]
+    # Seconds to wait for any of the row selectors, shared across all of them
+    GOOGLE_TRENDS_WAIT = 20
+    
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(__name__)
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
-        })
+        }
+        self._local = threading.local()
         self.history_file = Config.HISTORY_FILE
         self.history = self._load_history()
+        
+        # Concurrent fetch settings (URLs can be pointed at local stand-ins for testing)
+        self.sources = list(Config.TRENDING_SOURCES)
+        self.source_timeout = Config.TRENDING_SOURCE_TIMEOUT
+        self.source_urls = dict(Config.TRENDING_SOURCE_URLS)
+        self.context_limiter = TokenBucket(Config.TRENDING_CONTEXT_RATE, Config.TRENDING_CONTEXT_BURST)
+        self.request_limiter = TokenBucket(1.0, 3)  # Reddit/News API requests across all sources
+        self.source_stats: Dict[str, Dict[str, Any]] = {}
+        self.snapshot_cache = HtmlSnapshotCache(Config.SNAPSHOT_DIR, ttl=Config.SNAPSHOT_TTL)
+    
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session for the current thread (sources are fetched from several threads at once)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
     
     def _load_history(self) -> Dict[str, Any]:
         """Load trending history from file."""
@@ -74,54 +109,62 @@ class RealTrendingFetcher:
         return False
     
     def fetch_trending_topics(self) -> List[Dict[str, Any]]:
-        """Fetch real trending topics from Google Trends with fallbacks."""
+        """Fetch real trending topics from all sources concurrently (blocking wrapper)."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch_trending_topics_async())
+        
+        # Called from inside an event loop - run the fetch loop on a helper thread
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.fetch_trending_topics_async()).result()
+    
+    async def fetch_trending_topics_async(self) -> List[Dict[str, Any]]:
+        """Fetch real trending topics from all configured sources in parallel, merged and deduplicated."""
         try:
-            self.logger.info("🔍 Fetching REAL trending topics from Google Trends...")
+            self.logger.info(f"🔍 Fetching REAL trending topics from {', '.join(self.sources)} in parallel...")
+            fetch_start = time.time()
             
-            # Get trending searches from multiple sources
-            trending_topics = []
+            source_methods = {
+                "google": self._fetch_google_trends,
+                "reddit": self._fetch_reddit_trends,
+                "twitter": self._fetch_twitter_trends,
+            }
+            sources = [name for name in self.sources if name in source_methods]
             
-            # 1. Google Trends (PRIMARY SOURCE)
-            google_trends = self._fetch_google_trends()
-            if google_trends:
-                trending_topics.extend(google_trends)
-                self.logger.info(f"✅ Found {len(google_trends)} Google Trends topics")
-            
-            # 2. Only use Reddit if Google Trends fails (FALLBACK)
-            if not trending_topics:
-                self.logger.warning("⚠️ Google Trends failed, using Reddit as fallback...")
-                reddit_trends = self._fetch_reddit_trends()
-                if reddit_trends:
-                    trending_topics.extend(reddit_trends)
-                    self.logger.info(f"✅ Found {len(reddit_trends)} Reddit fallback topics")
-            
-            # 3. Twitter/X as last resort (if still no topics)
-            if not trending_topics:
-                self.logger.warning("⚠️ Both Google Trends and Reddit failed, trying Twitter...")
-                twitter_trends = self._fetch_twitter_trends()
-                if twitter_trends:
-                    trending_topics.extend(twitter_trends)
-                    self.logger.info(f"✅ Found {len(twitter_trends)} Twitter fallback topics")
-            
-            # Filter out recent topics and get context
-            filtered_topics = []
+            # Own pool, not the loop's default one: a timed-out source must not hold up asyncio.run() shutdown
+            from concurrent.futures import ThreadPoolExecutor
+            source_pool = ThreadPoolExecutor(max_workers=max(1, len(sources)), thread_name_prefix="trend-source")
+            try:
+                results = await asyncio.gather(*[
+                    self._fetch_source(name, source_methods[name], source_pool) for name in sources
+                ])
+            finally:
+                source_pool.shutdown(wait=False)
+            
+            # Merge in source priority order (Google first), then deduplicate
+            trending_topics = self._merge_source_results(list(zip(sources, results)))
+            self.logger.info(f"📊 {len(trending_topics)} unique topics from {len(sources)} sources "
+                             f"in {time.time() - fetch_start:.1f}s")
+            
+            # Filter out recent topics, then get context concurrently under the rate limiter
+            candidates = []
             for topic_data in trending_topics:
-                topic = topic_data["topic"]
-                if self._is_topic_recent(topic):
-                    self.logger.info(f"⏭️ Skipping recent topic: {topic}")
+                if self._is_topic_recent(topic_data["topic"]):
+                    self.logger.info(f"⏭️ Skipping recent topic: {topic_data['topic']}")
                     continue
-                
-                # Get enhanced context
-                enhanced_topic = self._get_topic_context(topic_data)
-                if enhanced_topic:
-                    filtered_topics.append(enhanced_topic)
-                
-                # Limit to max topics
-                if len(filtered_topics) >= Config.MAX_TRENDING_TOPICS:
-                    break
-                
-                # Rate limiting
-                time.sleep(1)
+                candidates.append(topic_data)
+            
+            # Only as many candidates as topics are still missing, in priority order, so surplus
+            # candidates never wait on the rate limiter; rejected ones are replaced by the next
+            filtered_topics = []
+            position = 0
+            while len(filtered_topics) < Config.MAX_TRENDING_TOPICS and position < len(candidates):
+                batch = candidates[position:position + Config.MAX_TRENDING_TOPICS - len(filtered_topics)]
+                position += len(batch)
+                enhanced = await asyncio.gather(*[self._get_topic_context_async(t) for t in batch])
+                filtered_topics.extend(t for t in enhanced if t)
             
             self.logger.info(f"✅ Found {len(filtered_topics)} new trending topics")
             
@@ -135,6 +178,63 @@ class RealTrendingFetcher:
             self.logger.error(f"❌ Error fetching trending topics: {e}")
             return []
     
+    async def _fetch_source(self, name: str, fetch_method, executor) -> List[Dict[str, Any]]:
+        """Run one (blocking) source fetcher on a worker thread with a timeout."""
+        start = time.time()
+        loop = asyncio.get_running_loop()
+        try:
+            topics = await asyncio.wait_for(loop.run_in_executor(executor, fetch_method), timeout=self.source_timeout)
+            status = "ok" if topics else "empty"
+        except asyncio.TimeoutError:
+            # The worker thread finishes in the background; its result is ignored
+            self.logger.warning(f"⏱️ Source {name} timed out after {self.source_timeout:.0f}s")
+            topics, status = [], "timeout"
+        except Exception as e:
+            self.logger.error(f"❌ Source {name} failed: {e}")
+            topics, status = [], "error"
+        
+        self.source_stats[name] = {"status": status, "topics": len(topics), "time": time.time() - start}
+        self.logger.info(f"📡 {name}: {len(topics)} topics ({status}, {time.time() - start:.1f}s)")
+        for topic in topics:
+            topic.setdefault("source", name)
+        return topics
+    
+    def _merge_source_results(self, results: List[tuple]) -> List[Dict[str, Any]]:
+        """
+        Merge per-source topic lists into one deduplicated list.
+        
+        Args:
+            results: (source_name, topics) pairs in priority order
+            
+        Returns:
+            Topics ordered by source priority then search volume; duplicates keep
+            the highest-volume entry and record every source that reported them
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        priority: Dict[str, int] = {}
+        for rank, (name, topics) in enumerate(results):
+            for topic in topics:
+                key = topic["topic"].strip().lower()
+                if not key:
+                    continue
+                existing = merged.get(key)
+                if existing is None:
+                    merged[key] = dict(topic, sources=[name])
+                    priority[key] = rank
+                    continue
+                if name not in existing["sources"]:
+                    existing["sources"].append(name)
+                if topic.get("search_volume", 0) > existing.get("search_volume", 0):
+                    merged[key] = dict(topic, sources=existing["sources"])
+        
+        return sorted(merged.values(),
+                      key=lambda t: (priority[t["topic"].strip().lower()], -t.get("search_volume", 0)))
+    
+    async def _get_topic_context_async(self, topic_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get enhanced context for a topic once the rate limiter allows it."""
+        await self.context_limiter.acquire_async()
+        return await asyncio.to_thread(self._get_topic_context, topic_data)
+    
     def _fetch_google_trends(self) -> List[Dict[str, Any]]:
         """Fetch trending searches from Google Trends with Selenium."""
         try:
@@ -179,156 +279,164 @@ class RealTrendingFetcher:
             return []
     
     def _fetch_google_trends_main(self) -> List[Dict[str, Any]]:
-        """Fetch trending searches from Google Trends using Selenium."""
+        """Fetch trending searches from Google Trends (pooled Selenium session + snapshot cache)."""
         try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            from webdriver_manager.chrome import ChromeDriverManager
-            import time
-            
-            self.logger.info("🔍 Fetching Google Trends with Selenium...")
-            
-            # Setup Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")  # Run in background
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            
-            # Initialize driver
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            url = self.source_urls["google_trends"]
             
-            try:
-                # Navigate to Google Trends
-                url = "https://trends.google.com/trending?geo=US&sort=search-volume"
-                driver.get(url)
-                
-                # Wait for page to load
-                self.logger.info("⏳ Waiting for Google Trends page to load...")
-                time.sleep(5)  # Initial wait
-                
-                # Wait for trending topics to appear
-                wait = WebDriverWait(driver, 20)
-                
-                # Try to find trending topics in table rows
-                selectors_to_try = [
-                    "table tr",
-                    "div[role='row']",
-                    ".trending-item"
-                ]
-                
-                topics = []
-                found_topics = False
-                
-                for selector in selectors_to_try:
-                    try:
-                        # Wait for elements to be present
-                        elements = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)))
-                        
-                        if elements:
-                            self.logger.info(f"✅ Found {len(elements)} elements with selector: {selector}")
-                            
-                            for i, element in enumerate(elements):
-                                try:
-                                    text = element.text.strip()
-                                    
-                                    # Look for trending topic patterns in the text
-                                    # Pattern: "topic_name\nsearch_volume\narrow_upward\npercentage\nhours ago"
-                                    lines = text.split('\n')
-                                    
-                                    if len(lines) >= 3:
-                                        # First line is usually the topic name
-                                        topic_name = lines[0].strip()
-                                        
-                                        # Check if it looks like a trending topic
-                                        if (topic_name and 
-                                            len(topic_name) > 3 and 
-                                            not topic_name.startswith('Search') and
-                                            not topic_name.startswith('Trends') and
-                                            not topic_name.startswith('Home') and
-                                            not topic_name.startswith('Explore')):
-                                            
-                                            # Extract search volume from second line
-                                            search_volume_text = lines[1] if len(lines) > 1 else ""
-                                            search_volume = self._extract_search_volume(search_volume_text)
-                                            
-                                            # Extract percentage increase
-                                            percentage_text = lines[3] if len(lines) > 3 else ""
-                                            percentage = self._extract_percentage(percentage_text)
-                                            
-                                            # Extract time ago
-                                            time_text = lines[4] if len(lines) > 4 else ""
-                                            time_ago = self._extract_time_ago(time_text)
-                                            
-                                            topics.append({
-                                                "topic": topic_name,
-                                                "search_volume": search_volume,
-                                                "recent_volume": search_volume,
-                                                "avg_volume": max(50, search_volume - 20),
-                                                "context": f"Google Trends: {search_volume_text} searches, {percentage} increase",
-                                                "trending_reason": f"Trending with {search_volume_text} searches, {percentage} increase {time_ago}",
-                                                "related_searches": [],
-                                                "news_context": f"Trending on Google Trends with {search_volume_text} searches",
-                                                "discovered_date": datetime.now().isoformat()
-                                            })
-                                            
-                                            if len(topics) >= 10:  # Limit to top 10
-                                                break
-                                            
-                                except Exception as e:
-                                    self.logger.warning(f"⚠️ Error processing element {i}: {e}")
-                                    continue
-                            
-                            if topics:
-                                found_topics = True
-                                break
-                            
-                    except Exception as e:
-                        self.logger.warning(f"⚠️ Selector {selector} failed: {e}")
+            # Fresh snapshot? Parse it without touching the network
+            html = self.snapshot_cache.get(url)
+            if html is not None:
+                topics = self.parse_google_trends_html(html)
+            else:
+                html = self._render_google_trends_page(url)
+                # A consent page, error page or timed-out render has no trend rows and must not
+                # be served as fresh until the TTL ends; it still gets the page-text fallback
+                topics = self.parse_google_trends_html(html, rows_only=True)
+                if topics:
+                    self.snapshot_cache.put(url, html, source="google_trends")
+                else:
+                    self.logger.warning("⚠️ No trend rows on the Google Trends page - snapshot not cached")
+                    topics = self.parse_google_trends_html(html)
+            self.logger.info(f"📊 Google Trends Selenium: Found {len(topics)} topics")
+            return topics
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error fetching Google Trends with Selenium: {e}")
+            return []
+    
+    def _render_google_trends_page(self, url: str) -> str:
+        """Load the Google Trends page in a pooled headless Chrome and return the rendered HTML."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        self.logger.info("🔍 Fetching Google Trends with Selenium...")
+        with get_browser_pool().session() as driver:
+            driver.get(url)
+            
+            # Wait for trending topics to appear (no fixed sleep - returns as soon as rows exist).
+            # The selectors share one deadline so the browser is back in the pool before the source times out
+            self.logger.info("⏳ Waiting for Google Trends page to load...")
+            deadline = time.monotonic() + min(self.GOOGLE_TRENDS_WAIT, self.source_timeout / 2)
+            for selector in self.GOOGLE_TRENDS_SELECTORS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.logger.warning("⚠️ Google Trends page did not load before the deadline")
+                    break
+                try:
+                    WebDriverWait(driver, remaining).until(
+                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)))
+                    break
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Selector {selector} failed: {e}")
+            
+            return driver.page_source
+    
+    def parse_google_trends_html(self, html: str, rows_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Extract trending topics from Google Trends HTML (live or cached snapshot).
+        
+        Args:
+            html: Rendered page source
+            rows_only: Skip the page-text fallback, which finds "topics" in almost any page
+            
+        Returns:
+            Up to 10 topic dicts in page order
+        """
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        topics = []
+        for selector in self.GOOGLE_TRENDS_SELECTORS:
+            elements = soup.select(selector)
+            if not elements:
+                continue
+            self.logger.info(f"✅ Found {len(elements)} elements with selector: {selector}")
+            
+            for i, element in enumerate(elements):
+                try:
+                    # Header rows hold column titles, not topics
+                    if element.find('th'):
                         continue
-                
-                if not found_topics:
-                    # Try to get any text that might be trending topics
-                    self.logger.info("🔍 Trying to extract topics from page text...")
-                    page_text = driver.page_source
                     
-                    # Look for potential trending topics in the page source
-                    import re
-                    # Look for patterns that might be trending topics
-                    potential_topics = re.findall(r'<[^>]*>([A-Z][a-zA-Z\s]+)</[^>]*>', page_text)
+                    # Pattern: "topic_name\nsearch_volume\n...\npercentage\n...\nhours ago"
+                    lines = [line.strip() for line in element.get_text('\n', strip=True).split('\n')]
+                    if len(lines) < 3:
+                        continue
                     
-                    for i, topic in enumerate(potential_topics[:10]):
-                        topic = topic.strip()
-                        if len(topic) > 3 and len(topic) < 50:
-                            search_volume = 90 - (i * 5)
-                            topics.append({
-                                "topic": topic,
-                                "search_volume": search_volume,
-                                "recent_volume": search_volume,
-                                "avg_volume": search_volume,
-                                "context": f"Google Trends Text Extraction: {topic}",
-                                "trending_reason": f"Extracted from Google Trends page",
-                                "related_searches": [],
-                                "news_context": f"Trending on Google Trends",
-                                "discovered_date": datetime.now().isoformat()
-                            })
-                
-                self.logger.info(f"📊 Google Trends Selenium: Found {len(topics)} topics")
-                return topics
-                
-            finally:
-                driver.quit()
+                    # First line is usually the topic name
+                    topic_name = lines[0]
+                    
+                    # Check if it looks like a trending topic
+                    if (len(topic_name) > 3 and 
+                        not topic_name.startswith('Search') and
+                        not topic_name.startswith('Trends') and
+                        not topic_name.startswith('Home') and
+                        not topic_name.startswith('Explore')):
+                        
+                        # Extract search volume ("2M+"), falling back to the second line
+                        search_volume_text = next((l for l in lines[1:] if re.fullmatch(r'\d+(?:\.\d+)?[MK]?\+', l)), lines[1])
+                        search_volume = self._extract_search_volume(search_volume_text)
+                        
+                        # Extract percentage increase and time ago from whichever lines carry them
+                        percentage = self._extract_percentage(next((l for l in lines if '%' in l), ''))
+                        time_ago = self._extract_time_ago(next((l for l in lines if re.search(r'\d+\s+(hour|day|minute)s?\s+ago', l)), ''))
+                        
+                        topics.append({
+                            "topic": topic_name,
+                            "search_volume": search_volume,
+                            "recent_volume": search_volume,
+                            "avg_volume": max(50, search_volume - 20),
+                            "context": f"Google Trends: {search_volume_text} searches, {percentage} increase",
+                            "trending_reason": f"Trending with {search_volume_text} searches, {percentage} increase {time_ago}",
+                            "related_searches": [],
+                            "news_context": f"Trending on Google Trends with {search_volume_text} searches",
+                            "discovered_date": datetime.now().isoformat()
+                        })
+                        
+                        if len(topics) >= 10:  # Limit to top 10
+                            break
+                        
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Error processing element {i}: {e}")
+                    continue
             
-        except Exception as e:
-            self.logger.error(f"❌ Error fetching Google Trends with Selenium: {e}")
+            if topics:
+                return topics
+        
+        if rows_only:
+            return topics
+        
+        # Try to get any text that might be trending topics
+        self.logger.info("🔍 Trying to extract topics from page text...")
+        potential_topics = re.findall(r'<[^>]*>([A-Z][a-zA-Z\s]+)</[^>]*>', html)
+        
+        for i, topic in enumerate(potential_topics[:10]):
+            topic = topic.strip()
+            if len(topic) > 3 and len(topic) < 50:
+                search_volume = 90 - (i * 5)
+                topics.append({
+                    "topic": topic,
+                    "search_volume": search_volume,
+                    "recent_volume": search_volume,
+                    "avg_volume": search_volume,
+                    "context": f"Google Trends Text Extraction: {topic}",
+                    "trending_reason": f"Extracted from Google Trends page",
+                    "related_searches": [],
+                    "news_context": f"Trending on Google Trends",
+                    "discovered_date": datetime.now().isoformat()
+                })
+        return topics
+    
+    def parse_cached_google_trends(self) -> List[Dict[str, Any]]:
+        """Re-run the Google Trends parser on the newest snapshot, however old (no network)."""
+        cached = self.snapshot_cache.latest(self.source_urls["google_trends"])
+        if cached is None:
+            self.logger.warning("⚠️ No Google Trends snapshot cached yet")
             return []
+        html, meta = cached
+        self.logger.info(f"📦 Parsing snapshot from {datetime.fromtimestamp(meta['fetched_at']).isoformat()}")
+        return self.parse_google_trends_html(html)
     
     def _extract_search_volume(self, text: str) -> int:
         """Extract search volume from text like '2M+', '200K+', '50K+'."""
@@ -391,7 +499,7 @@ class RealTrendingFetcher:
                 return []
             
             # Get top headlines which often indicate trending topics
-            url = "https://newsapi.org/v2/top-headlines"
+            url = self.source_urls["news_api"]
             params = {
                 "country": "us",
                 "apiKey": Config.NEWS_API_KEY,
@@ -399,6 +507,7 @@ class RealTrendingFetcher:
             }
             
             self.logger.info("🔍 Fetching News API top headlines...")
+            self.request_limiter.acquire()
             response = self.session.get(url, params=params, timeout=15)
             response.raise_for_status()
             
@@ -463,9 +572,10 @@ class RealTrendingFetcher:
             
             for subreddit in news_subreddits[:3]:  # Limit to top 3 to avoid rate limiting
                 try:
-                    url = f"https://www.reddit.com/r/{subreddit}/hot.json"
+                    url = f"{self.source_urls['reddit']}/r/{subreddit}/hot.json"
                     
                     self.logger.info(f"🔍 Fetching Reddit r/{subreddit} hot posts...")
+                    self.request_limiter.acquire()  # Rate limiting shared with the other Reddit fetches
                     response = self.session.get(url, timeout=15)
                     response.raise_for_status()
                     
@@ -509,9 +619,6 @@ class RealTrendingFetcher:
                                 if len(trending_topics) >= 10:  # Limit total
                                     break
                     
-                    # Rate limiting between subreddits
-                    time.sleep(1)
-                    
                 except Exception as e:
                     self.logger.warning(f"⚠️ Error fetching r/{subreddit}: {e}")
                     continue
@@ -527,9 +634,10 @@ class RealTrendingFetcher:
         """Fetch trending topics from Reddit with better filtering for real events."""
         try:
             # Get trending topics from Reddit
-            url = "https://www.reddit.com/r/popular.json"
+            url = f"{self.source_urls['reddit']}/r/popular.json"
             
             self.logger.info("🔍 Fetching Reddit trending topics (filtered)...")
+            self.request_limiter.acquire()
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
             
@@ -702,7 +810,7 @@ class RealTrendingFetcher:
         try:
             # Try to get Twitter trends (this is limited due to API restrictions)
             # For now, we'll use a web scraping approach
-            url = "https://trends24.in/united-states/"
+            url = self.source_urls["twitter"]
             
             self.logger.info("🔍 Fetching Twitter/X trending topics...")
             response = self.session.get(url, timeout=15)
@@ -741,9 +849,10 @@ class RealTrendingFetcher:
         """Fetch trending topics from Reddit."""
         try:
             # Get trending topics from Reddit
-            url = "https://www.reddit.com/r/popular.json"
+            url = f"{self.source_urls['reddit']}/r/popular.json"
             
             self.logger.info("🔍 Fetching Reddit trending topics...")
+            self.request_limiter.acquire()
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
             
@@ -822,9 +931,12 @@ class RealTrendingFetcher:
                 "news_context": topic_data.get("news_context", f"Trending topic with {final_volume} search volume"),
                 "discovered_date": datetime.now().isoformat()
             }
+            if topic_data.get("source"):
+                enhanced_topic["source"] = topic_data["source"]
+                enhanced_topic["sources"] = topic_data.get("sources", [topic_data["source"]])
             
             # Add sensitivity check
-            if any(word in topic.lower() for word in ['death', 'died', 'killed', 'shooting', 'accident']):
+            if SENSITIVE_TOPIC_SCANNER.search(topic):
                 enhanced_topic["sensitivity_level"] = "high"
                 enhanced_topic["content_approach"] = "respectful_tribute_only"
             
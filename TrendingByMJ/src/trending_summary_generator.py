@@ -5,8 +5,10 @@ Generates engaging summaries for trending topics optimized for short-form conten
 
 import logging
 import json
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import openai
 from datetime import datetime
@@ -17,6 +19,26 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.rate_limiter import TokenBucket
+
+SUMMARY_MODES = ("batched", "concurrent", "serial")
+MUSIC_CATEGORIES = ("Uplifting", "Intense", "Somber", "Mystery")
+
+# Summaries outside this range are not a good fit for a 20-30s video
+SUMMARY_MIN_WORDS = 40
+SUMMARY_MAX_WORDS = 120
+
+_llm_limiter: Optional[TokenBucket] = None
+_llm_limiter_lock = threading.Lock()
+
+
+def get_llm_limiter() -> TokenBucket:
+    """Process-wide limiter for summary LLM requests, shared by every generator and worker thread."""
+    global _llm_limiter
+    with _llm_limiter_lock:
+        if _llm_limiter is None:
+            _llm_limiter = TokenBucket(Config.SUMMARY_RATE, Config.SUMMARY_BURST)
+        return _llm_limiter
 
 class TrendingSummaryGenerator:
     """Generates engaging summaries for trending topics."""
@@ -24,25 +46,35 @@ class TrendingSummaryGenerator:
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(__name__)
         self.client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.request_limiter = get_llm_limiter()
+        self.context_gatherer = None
+        
+        # Per-request latency/token records and per-topic fallbacks from batched mode
+        self.metrics: List[Dict[str, Any]] = []
+        self.fallback_topics: List[str] = []
+        self._metrics_lock = threading.Lock()
         
         # Load prompts
         self.prompts = self._load_prompts()
         
     def _load_prompts(self) -> Dict[str, str]:
-        """Load prompts for summary generation."""
+        """Load prompts for summary generation (file prompts override the defaults)."""
+        prompts = self._default_prompts()
         prompts_path = project_root / "prompts" / "trending_prompts.yaml"
         
         if prompts_path.exists():
             try:
                 import yaml
                 with open(prompts_path, 'r', encoding='utf-8') as f:
-                    prompts = yaml.safe_load(f)
+                    prompts.update(yaml.safe_load(f) or {})
                 self.logger.info("📝 Loaded trending prompts from file")
-                return prompts
             except Exception as e:
                 self.logger.error(f"❌ Error loading prompts: {e}")
         
-        # Default prompts if file doesn't exist
+        return prompts
+    
+    def _default_prompts(self) -> Dict[str, str]:
+        """Default prompts, used when the prompts file is missing or lacks a prompt."""
         return {
             "summary_generation": """You are a viral content creator for YouTube Shorts. Your job is to create engaging, informative summaries of trending topics that will captivate viewers in 20-30 seconds.
 
@@ -89,23 +121,104 @@ TASK: Create an image prompt that:
 TRENDING TOPIC: {topic}
 SUMMARY: {summary}
 
-FORMAT: Write only the image prompt, no additional text."""
+FORMAT: Write only the image prompt, no additional text.""",
+            
+            "batch_summary_generation": """You are a viral news content creator for YouTube Shorts. Create a complete short-video package for each of the {count} trending topics below.
+
+FOR EACH TOPIC:
+- summary: An engaging summary, 45-90 words (20-30 seconds read aloud), starting with a hook, explaining why the topic is trending and ending with an interesting conclusion.
+- title: A compelling, clickable title under 60 characters, accurate to the content.
+- image_prompt: A visually descriptive, cinematic image prompt with no text or logos.
+- music_category: Exactly one of Uplifting, Intense, Somber, Mystery.
+
+{topics}
+
+FORMAT: Respond with a JSON object only:
+{{"items": [{{"id": 0, "summary": "...", "title": "...", "image_prompt": "...", "music_category": "..."}}]}}
+Include exactly one item per topic, using the topic's number as "id"."""
+        }
+    
+    def _chat(self, call: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+              topics: int = 1, **kwargs) -> str:
+        """
+        Send one chat completion under the shared rate limiter and record its latency and token usage.
+        
+        Args:
+            call: Metric label (summary, title, image_prompt, batch)
+            messages: Chat messages
+            max_tokens: Completion token limit
+            temperature: Sampling temperature
+            topics: Number of topics covered by this request
+            **kwargs: Extra completion arguments (e.g. response_format)
+            
+        Returns:
+            Stripped message content
+        """
+        waited = self.request_limiter.acquire()
+        start = time.time()
+        record = {"call": call, "topics": topics, "rate_limit_wait": waited, "success": False}
+        try:
+            response = self.client.chat.completions.create(
+                model=Config.LLM_MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **kwargs
+            )
+            usage = getattr(response, "usage", None)
+            for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                record[field] = getattr(usage, field, 0) or 0
+            record["success"] = True
+            return response.choices[0].message.content.strip()
+        finally:
+            record["latency"] = time.time() - start
+            with self._metrics_lock:
+                self.metrics.append(record)
+    
+    def metrics_summary(self) -> Dict[str, Any]:
+        """Aggregate latency and token usage over all requests made by this generator."""
+        with self._metrics_lock:
+            records = list(self.metrics)
+            fallbacks = list(self.fallback_topics)
+        latencies = [r["latency"] for r in records]
+        return {
+            "requests": len(records),
+            "failed_requests": sum(1 for r in records if not r["success"]),
+            "batched_requests": sum(1 for r in records if r["call"] == "batch"),
+            "latency_total": sum(latencies),
+            "latency_avg": sum(latencies) / len(latencies) if latencies else 0.0,
+            "latency_max": max(latencies, default=0.0),
+            "rate_limit_wait": sum(r["rate_limit_wait"] for r in records),
+            "prompt_tokens": sum(r.get("prompt_tokens", 0) for r in records),
+            "completion_tokens": sum(r.get("completion_tokens", 0) for r in records),
+            "total_tokens": sum(r.get("total_tokens", 0) for r in records),
+            "fallback_topics": fallbacks
         }
     
     def generate_trending_summary(self, topic_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a complete summary package for a trending topic."""
+        try:
+            context_summary = self._gather_context(topic_data)
+            return self._generate_topic_package(topic_data, context_summary)
+        except Exception as e:
+            self.logger.error(f"❌ Error generating summary for {topic_data.get('topic')}: {e}")
+            return None
+    
+    def _gather_context(self, topic_data: Dict[str, Any]) -> str:
+        """Get enhanced context about WHY the topic is trending."""
+        if self.context_gatherer is None:
+            from src.news_context_gatherer import NewsContextGatherer
+            self.context_gatherer = NewsContextGatherer(self.logger)
+        enhanced_topic = self.context_gatherer.gather_trending_context(topic_data)
+        
+        # Use the comprehensive context summary
+        return enhanced_topic.get("context_summary", topic_data.get("context", ""))
+    
+    def _generate_topic_package(self, topic_data: Dict[str, Any], context_summary: str) -> Optional[Dict[str, Any]]:
+        """Generate summary, title and image prompt for one topic with separate LLM calls."""
         try:
             topic = topic_data["topic"]
             search_volume = topic_data["search_volume"]
-            context = topic_data.get("context", "")
-            
-            # Get enhanced context about WHY the topic is trending
-            from src.news_context_gatherer import NewsContextGatherer
-            context_gatherer = NewsContextGatherer(self.logger)
-            enhanced_topic = context_gatherer.gather_trending_context(topic_data)
-            
-            # Use the comprehensive context summary
-            context_summary = enhanced_topic.get("context_summary", context)
             
             self.logger.info(f"📝 Generating summary for: {topic}")
             self.logger.info(f"📊 Context: {context_summary[:100]}...")
@@ -121,41 +234,124 @@ FORMAT: Write only the image prompt, no additional text."""
             # Generate image prompt
             image_prompt = self._generate_image_prompt(topic, summary)
             
-            # Create story data (compatible with existing pipeline)
-            story_data = {
-                "title": title,
-                "story": summary,
-                "topic": topic,
-                "search_volume": search_volume,
-                "context": context,
-                "image_prompt": image_prompt,
-                "music_category": self._determine_music_category(topic, context),
-                "generated_date": datetime.now().isoformat(),
-                "estimated_duration": self._estimate_duration(summary)
-            }
-            
-            # Create complete package (for backward compatibility)
-            summary_package = {
-                "topic": topic,
-                "search_volume": search_volume,
-                "context": context,
-                "summary": summary,
-                "title": title,
-                "image_prompt": image_prompt,
-                "story_data": story_data,  # Add story data for pipeline compatibility
-                "generated_date": datetime.now().isoformat(),
-                "estimated_duration": self._estimate_duration(summary)
-            }
-            
-            self.logger.info(f"✅ Generated summary package for: {topic}")
-            self.logger.info(f"📊 Estimated duration: {summary_package['estimated_duration']:.1f}s")
-            
-            return summary_package
+            return self._build_summary_package(topic_data, summary, title, image_prompt)
             
         except Exception as e:
-            self.logger.error(f"❌ Error generating summary for {topic}: {e}")
+            self.logger.error(f"❌ Error generating summary for {topic_data.get('topic')}: {e}")
             return None
     
+    def _build_summary_package(self, topic_data: Dict[str, Any], summary: str, title: str, image_prompt: str,
+                               music_category: Optional[str] = None) -> Dict[str, Any]:
+        """Assemble the summary package (and pipeline story data) for one topic."""
+        topic = topic_data["topic"]
+        search_volume = topic_data["search_volume"]
+        context = topic_data.get("context", "")
+        
+        # Create story data (compatible with existing pipeline)
+        story_data = {
+            "title": title,
+            "story": summary,
+            "topic": topic,
+            "search_volume": search_volume,
+            "context": context,
+            "image_prompt": image_prompt,
+            "music_category": music_category or self._determine_music_category(topic, context),
+            "generated_date": datetime.now().isoformat(),
+            "estimated_duration": self._estimate_duration(summary)
+        }
+        
+        # Create complete package (for backward compatibility)
+        summary_package = {
+            "topic": topic,
+            "search_volume": search_volume,
+            "context": context,
+            "summary": summary,
+            "title": title,
+            "image_prompt": image_prompt,
+            "story_data": story_data,  # Add story data for pipeline compatibility
+            "generated_date": datetime.now().isoformat(),
+            "estimated_duration": self._estimate_duration(summary)
+        }
+        
+        self.logger.info(f"✅ Generated summary package for: {topic}")
+        self.logger.info(f"📊 Estimated duration: {summary_package['estimated_duration']:.1f}s")
+        
+        return summary_package
+    
+    def _generate_batch(self, batch: List[Tuple[Dict[str, Any], str]]) -> List[Optional[Dict[str, str]]]:
+        """
+        Generate summary, title, image prompt and music category for several topics in one structured-output request.
+        
+        Args:
+            batch: (topic_data, context_summary) pairs
+            
+        Returns:
+            Validated fields per topic, in batch order (None where the topic needs the per-topic fallback)
+        """
+        topics_block = "\n\n".join(
+            f"[{i}] TRENDING TOPIC: {topic_data['topic']}\n"
+            f"SEARCH VOLUME: {topic_data['search_volume']}\n"
+            f"CONTEXT ABOUT WHY THIS IS TRENDING:\n{context_summary}"
+            for i, (topic_data, context_summary) in enumerate(batch)
+        )
+        prompt = self.prompts["batch_summary_generation"].format(count=len(batch), topics=topics_block)
+        
+        try:
+            content = self._chat(
+                "batch",
+                [
+                    {"role": "system", "content": "You are an expert viral content creator specializing in trending topics and YouTube Shorts. You always answer with valid JSON."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=Config.MAX_TOKENS * len(batch),
+                temperature=Config.TEMPERATURE,
+                topics=len(batch),
+                response_format={"type": "json_object"}
+            )
+            items = json.loads(content).get("items", [])
+        except Exception as e:
+            self.logger.error(f"❌ Batched summary request failed for {len(batch)} topics: {e}")
+            return [None] * len(batch)
+        
+        by_id = {}
+        for item in items if isinstance(items, list) else []:
+            if isinstance(item, dict) and str(item.get("id", "")).isdigit():
+                by_id.setdefault(int(item["id"]), item)
+        
+        return [self._validate_batch_item(by_id.get(i), topic_data["topic"])
+                for i, (topic_data, _) in enumerate(batch)]
+    
+    def _validate_batch_item(self, item: Optional[Dict[str, Any]], topic: str) -> Optional[Dict[str, str]]:
+        """Validate and clean one topic from a batched response; None means fall back to per-topic generation."""
+        if not item:
+            self.logger.warning(f"⚠️ Batched response has no entry for: {topic}")
+            return None
+        
+        summary = item.get("summary")
+        title = item.get("title")
+        image_prompt = item.get("image_prompt")
+        if not all(isinstance(value, str) and value.strip() for value in (summary, title, image_prompt)):
+            self.logger.warning(f"⚠️ Batched entry for {topic} is missing summary, title or image prompt")
+            return None
+        
+        summary = summary.strip()
+        word_count = len(summary.split())
+        if word_count < SUMMARY_MIN_WORDS or word_count > SUMMARY_MAX_WORDS:
+            self.logger.warning(f"⚠️ Batched summary for {topic} has {word_count} words - regenerating individually")
+            return None
+        
+        # An unknown music category is not worth another request: use the keyword classifier instead
+        music_category = str(item.get("music_category", "")).strip().capitalize()
+        if music_category not in MUSIC_CATEGORIES:
+            music_category = None
+        
+        return {
+            "summary": summary,
+            "title": self._clean_title(title),
+            "image_prompt": self._enhance_image_prompt(image_prompt.strip()),
+            "music_category": music_category
+        }
+    
     def _generate_summary(self, topic: str, search_volume: int, context: str) -> Optional[str]:
         """Generate the main summary text."""
         try:
@@ -165,9 +361,9 @@ FORMAT: Write only the image prompt, no additional text."""
                 context=context
             )
             
-            response = self.client.chat.completions.create(
-                model=Config.LLM_MODEL,
-                messages=[
+            summary = self._chat(
+                "summary",
+                [
                     {"role": "system", "content": "You are an expert viral content creator specializing in trending topics and YouTube Shorts."},
                     {"role": "user", "content": prompt}
                 ],
@@ -175,11 +371,9 @@ FORMAT: Write only the image prompt, no additional text."""
                 temperature=Config.TEMPERATURE
             )
             
-            summary = response.choices[0].message.content.strip()
-            
             # Validate summary length
             word_count = len(summary.split())
-            if word_count < 40 or word_count > 120:
+            if word_count < SUMMARY_MIN_WORDS or word_count > SUMMARY_MAX_WORDS:
                 self.logger.warning(f"⚠️ Summary length ({word_count} words) may not be optimal for 20-30s video")
             
             return summary
@@ -196,9 +390,9 @@ FORMAT: Write only the image prompt, no additional text."""
                 summary=summary
             )
             
-            response = self.client.chat.completions.create(
-                model=Config.LLM_MODEL,
-                messages=[
+            title = self._chat(
+                "title",
+                [
                     {"role": "system", "content": "You are an expert at creating viral YouTube titles."},
                     {"role": "user", "content": prompt}
                 ],
@@ -206,19 +400,19 @@ FORMAT: Write only the image prompt, no additional text."""
                 temperature=0.8
             )
             
-            title = response.choices[0].message.content.strip()
-            
-            # Clean up title
-            title = title.replace('"', '').replace("'", "")
-            if len(title) > 60:
-                title = title[:57] + "..."
-            
-            return title
+            return self._clean_title(title)
             
         except Exception as e:
             self.logger.error(f"❌ Error generating title: {e}")
             return f"Trending: {topic}"
     
+    def _clean_title(self, title: str) -> str:
+        """Strip quotes and keep the title under 60 characters."""
+        title = title.strip().replace('"', '').replace("'", "")
+        if len(title) > 60:
+            title = title[:57] + "..."
+        return title
+    
     def _generate_image_prompt(self, topic: str, summary: str) -> Optional[str]:
         """Generate an image prompt for the topic."""
         try:
@@ -227,9 +421,9 @@ FORMAT: Write only the image prompt, no additional text."""
                 summary=summary
             )
             
-            response = self.client.chat.completions.create(
-                model=Config.LLM_MODEL,
-                messages=[
+            image_prompt = self._chat(
+                "image_prompt",
+                [
                     {"role": "system", "content": "You are an expert at creating detailed image prompts for AI image generation."},
                     {"role": "user", "content": prompt}
                 ],
@@ -237,17 +431,16 @@ FORMAT: Write only the image prompt, no additional text."""
                 temperature=0.7
             )
             
-            image_prompt = response.choices[0].message.content.strip()
-            
-            # Enhance with technical parameters
-            enhanced_prompt = f"{image_prompt}, professional photography, cinematic lighting, high quality, detailed, 4k"
-            
-            return enhanced_prompt
+            return self._enhance_image_prompt(image_prompt)
             
         except Exception as e:
             self.logger.error(f"❌ Error generating image prompt: {e}")
             return f"Professional photography of {topic}, cinematic lighting, high quality"
     
+    def _enhance_image_prompt(self, image_prompt: str) -> str:
+        """Enhance an image prompt with technical parameters."""
+        return f"{image_prompt}, professional photography, cinematic lighting, high quality, detailed, 4k"
+    
     def _estimate_duration(self, text: str) -> float:
         """Estimate the duration of text when read aloud."""
         # Average speaking rate: 150 words per minute
@@ -293,24 +486,87 @@ FORMAT: Write only the image prompt, no additional text."""
         # Default to uplifting for general trending topics
         return "Uplifting"
     
-    def generate_multiple_summaries(self, topics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Generate summaries for multiple trending topics."""
-        summaries = []
+    def generate_multiple_summaries(self, topics: List[Dict[str, Any]], mode: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Generate summaries for multiple trending topics.
         
-        for i, topic_data in enumerate(topics, 1):
-            self.logger.info(f"📝 Processing topic {i}/{len(topics)}: {topic_data['topic']}")
-            
-            summary_package = self.generate_trending_summary(topic_data)
-            if summary_package:
-                summaries.append(summary_package)
-            
-            # Rate limiting
-            if i < len(topics):
-                time.sleep(2)
+        Args:
+            topics: Trending topic dictionaries
+            mode: "batched" (one structured-output request per Config.SUMMARY_BATCH_SIZE topics,
+                  per-topic fallback for entries that fail validation), "concurrent" (per-topic
+                  requests in parallel) or "serial"; defaults to Config.SUMMARY_MODE.
+                  All modes share one LLM rate limiter.
+        
+        Returns:
+            Summary packages in topic order (failed topics are left out)
+        """
+        mode = (mode or Config.SUMMARY_MODE).lower()
+        if mode not in SUMMARY_MODES:
+            self.logger.warning(f"⚠️ Unknown summary mode '{mode}', using batched")
+            mode = "batched"
+        
+        start = time.time()
+        self.logger.info(f"📝 Generating summaries for {len(topics)} topics ({mode} mode)")
         
-        self.logger.info(f"✅ Generated {len(summaries)} summary packages")
+        if mode == "serial":
+            packages = []
+            for i, topic_data in enumerate(topics, 1):
+                self.logger.info(f"📝 Processing topic {i}/{len(topics)}: {topic_data['topic']}")
+                packages.append(self.generate_trending_summary(topic_data))
+        else:
+            workers = max(1, Config.SUMMARY_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary") as pool:
+                contexts = list(pool.map(self._safe_gather_context, topics))
+                if mode == "batched":
+                    packages = self._generate_batched(topics, contexts, pool)
+                else:
+                    packages = list(pool.map(self._generate_topic_package, topics, contexts))
+        
+        summaries = [package for package in packages if package]
+        
+        metrics = self.metrics_summary()
+        self.logger.info(f"✅ Generated {len(summaries)} summary packages in {time.time() - start:.2f}s")
+        self.logger.info(f"📊 LLM requests: {metrics['requests']} ({metrics['batched_requests']} batched), "
+                         f"tokens: {metrics['total_tokens']} ({metrics['prompt_tokens']} prompt / {metrics['completion_tokens']} completion), "
+                         f"avg latency: {metrics['latency_avg']:.2f}s, fallbacks: {len(metrics['fallback_topics'])}")
         return summaries
     
+    def _safe_gather_context(self, topic_data: Dict[str, Any]) -> str:
+        """Gather context, falling back to the topic's own context on error."""
+        try:
+            return self._gather_context(topic_data)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Context gathering failed for {topic_data['topic']}: {e}")
+            return topic_data.get("context", "")
+    
+    def _generate_batched(self, topics: List[Dict[str, Any]], contexts: List[str],
+                          pool: ThreadPoolExecutor) -> List[Optional[Dict[str, Any]]]:
+        """Generate packages with batched requests, regenerating failed entries one topic at a time."""
+        batch_size = max(1, Config.SUMMARY_BATCH_SIZE)
+        chunks = [list(range(i, min(i + batch_size, len(topics)))) for i in range(0, len(topics), batch_size)]
+        batch_results = pool.map(
+            lambda chunk: self._generate_batch([(topics[i], contexts[i]) for i in chunk]), chunks)
+        
+        packages: List[Optional[Dict[str, Any]]] = [None] * len(topics)
+        fallbacks = []
+        for chunk, results in zip(chunks, batch_results):
+            for i, fields in zip(chunk, results):
+                if fields:
+                    packages[i] = self._build_summary_package(topics[i], **fields)
+                else:
+                    fallbacks.append(i)
+        
+        if fallbacks:
+            fallback_names = [topics[i]["topic"] for i in fallbacks]
+            self.logger.warning(f"⚠️ Falling back to per-topic generation for: {', '.join(fallback_names)}")
+            with self._metrics_lock:
+                self.fallback_topics.extend(fallback_names)
+            for i, package in zip(fallbacks, pool.map(
+                    lambda i: self._generate_topic_package(topics[i], contexts[i]), fallbacks)):
+                packages[i] = package
+        
+        return packages
+    
     def save_summaries(self, summaries: List[Dict[str, Any]], output_dir: Path):
         """Save summaries to files."""
         try:
@@ -341,6 +597,12 @@ FORMAT: Write only the image prompt, no additional text."""
             with open(all_summaries_file, 'w', encoding='utf-8') as f:
                 json.dump(summaries, f, indent=2, ensure_ascii=False)
             
+            # Save LLM latency/token metrics for this generation run
+            if self.metrics:
+                metrics_file = output_dir / "generation_metrics.json"
+                with open(metrics_file, 'w', encoding='utf-8') as f:
+                    json.dump({"summary": self.metrics_summary(), "requests": self.metrics}, f, indent=2, ensure_ascii=False)
+            
             self.logger.info(f"💾 Saved {len(summaries)} summaries to {output_dir}")
             
         except Exception as e:
@@ -0,0 +1,147 @@
+"""Reusable headless Chrome sessions for scraping (one driver install check per process)."""
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+
+class _PooledBrowser:
+    """A driver plus the bookkeeping needed for its lifetime cap."""
+
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.created = time.monotonic()
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    Pool of headless Chrome sessions with a lifetime cap.
+
+    Sessions are reused across fetches and retired after max_uses pages or
+    max_age seconds, whichever comes first (long-lived Chrome leaks memory).
+    """
+
+    def __init__(self, max_size: int = 1, max_uses: int = 20, max_age: float = 1800.0,
+                 user_agent: str = DEFAULT_USER_AGENT):
+        self.max_size = max(1, max_size)
+        self.max_uses = max(1, max_uses)
+        self.max_age = max_age
+        self.user_agent = user_agent
+        self._idle: List[_PooledBrowser] = []
+        self._live = 0
+        self._cond = threading.Condition()
+        self._driver_path: Optional[str] = None
+        self._closed = False
+
+    def _resolve_driver_path(self) -> str:
+        """Run ChromeDriverManager's version check once per pool instead of once per fetch."""
+        if self._driver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            self._driver_path = ChromeDriverManager().install()
+        return self._driver_path
+
+    def _create(self) -> _PooledBrowser:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument(f"--user-agent={self.user_agent}")
+
+        start = time.time()
+        driver = webdriver.Chrome(service=Service(self._resolve_driver_path()), options=options)
+        logger.info(f"🌐 Started Chrome session in {time.time() - start:.1f}s")
+        return _PooledBrowser(driver)
+
+    def _expired(self, browser: _PooledBrowser) -> bool:
+        return browser.uses >= self.max_uses or time.monotonic() - browser.created >= self.max_age
+
+    def _quit(self, browser: _PooledBrowser):
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing Chrome session: {e}")
+
+    @contextmanager
+    def session(self):
+        """
+        Borrow a driver for one page fetch.
+
+        A driver that raised is discarded rather than returned to the pool.
+        """
+        browser = None
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+            while not self._idle and self._live >= self.max_size:
+                self._cond.wait()
+            if self._idle:
+                browser = self._idle.pop()
+            else:
+                self._live += 1
+
+        try:
+            if browser is None:
+                browser = self._create()
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+
+        healthy = False
+        try:
+            yield browser.driver
+            healthy = True
+        finally:
+            browser.uses += 1
+            retire = not healthy or self._expired(browser) or self._closed
+            if retire:
+                self._quit(browser)
+            with self._cond:
+                if retire:
+                    self._live -= 1
+                else:
+                    self._idle.append(browser)
+                self._cond.notify()
+
+    def close(self):
+        """Quit every idle session; sessions in use are quit when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+        for browser in idle:
+            self._quit(browser)
+
+
+_default_pool: Optional[BrowserPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide browser pool configured from Config (closed at exit)."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            from config import Config
+            _default_pool = BrowserPool(
+                max_size=Config.BROWSER_POOL_SIZE,
+                max_uses=Config.BROWSER_MAX_USES,
+                max_age=Config.BROWSER_MAX_AGE
+            )
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -0,0 +1,80 @@
+"""Short-TTL cache of fetched HTML pages, kept on disk so parsers can be re-run offline."""
+import hashlib
+import json
+import logging
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class HtmlSnapshotCache:
+    """
+    Timestamped HTML snapshots per URL.
+
+    get() only returns a snapshot younger than the TTL (so live fetches stay
+    fresh); latest() and history() ignore the TTL for offline re-parsing.
+    """
+
+    def __init__(self, cache_dir: Path, ttl: float = 900.0, keep: int = 20):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.keep = keep
+
+    def _prefix(self, url: str) -> str:
+        slug = re.sub(r'[^a-z0-9]+', '_', url.lower().split('://', 1)[-1])[:40].strip('_')
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]
+        return f"{slug}_{digest}"
+
+    def history(self, url: str) -> List[Tuple[Path, Dict]]:
+        """All snapshots for a URL, newest first, as (html_path, metadata) pairs."""
+        snapshots = []
+        for meta_path in self.cache_dir.glob(f"{self._prefix(url)}_*.json"):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            html_path = meta_path.with_suffix('.html')
+            if html_path.exists():
+                snapshots.append((html_path, meta))
+        snapshots.sort(key=lambda item: item[1].get('fetched_at', 0), reverse=True)
+        return snapshots
+
+    def latest(self, url: str) -> Optional[Tuple[str, Dict]]:
+        """Newest snapshot for a URL regardless of age, as (html, metadata)."""
+        snapshots = self.history(url)
+        if not snapshots:
+            return None
+        html_path, meta = snapshots[0]
+        return html_path.read_text(encoding='utf-8'), meta
+
+    def get(self, url: str) -> Optional[str]:
+        """Newest snapshot for a URL if it is younger than the TTL."""
+        cached = self.latest(url)
+        if cached is None:
+            return None
+        html, meta = cached
+        age = time.time() - meta.get('fetched_at', 0)
+        if age > self.ttl:
+            return None
+        logger.info(f"📦 Using cached snapshot of {url} ({age:.0f}s old)")
+        return html
+
+    def put(self, url: str, html: str, **metadata) -> Path:
+        """Store a snapshot and prune the oldest beyond `keep`."""
+        fetched_at = time.time()
+        stamp = datetime.fromtimestamp(fetched_at).strftime("%Y%m%d_%H%M%S_%f")
+        html_path = self.cache_dir / f"{self._prefix(url)}_{stamp}.html"
+        html_path.write_text(html, encoding='utf-8')
+        with open(html_path.with_suffix('.json'), 'w', encoding='utf-8') as f:
+            json.dump(dict(metadata, url=url, fetched_at=fetched_at, size=len(html)), f, indent=2)
+
+        for old_path, _ in self.history(url)[self.keep:]:
+            old_path.unlink(missing_ok=True)
+            old_path.with_suffix('.json').unlink(missing_ok=True)
+        return html_path
@@ -0,0 +1,166 @@
+"""On-disk HTTP cache with ETag / Last-Modified revalidation, shared by all scrapers in the process."""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """Minimal requests.Response look-alike for cached or revalidated bodies."""
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str],
+                 encoding: Optional[str] = None, from_cache: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers)
+        self.encoding = encoding or 'utf-8'
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HttpCache:
+    """
+    Disk cache for GET responses.
+
+    Within fresh_for seconds a cached body is served without any request.
+    After that, entries with an ETag or Last-Modified are revalidated with a
+    conditional GET (a 304 re-uses the stored body, nothing is downloaded);
+    entries without validators are fetched again. Entries older than max_age
+    are never reused.
+    """
+
+    # Only these headers are stored with the body
+    STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date')
+
+    def __init__(self, cache_dir: Path, fresh_for: float = 3600.0, max_age: float = 86400.0):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.fresh_for = fresh_for
+        self.max_age = max_age
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+
+    def _key(self, url: str, params: Optional[Dict[str, Any]]) -> str:
+        full_url = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        return hashlib.sha256(full_url.encode('utf-8')).hexdigest()[:32]
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        meta_path = self.cache_dir / f"{key}.json"
+        body_path = self.cache_dir / f"{key}.body"
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            meta['content'] = body_path.read_bytes()
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, key: str, url: str, response, stored_at: float):
+        meta = {
+            "url": url,
+            "status_code": response.status_code,
+            "headers": {h: response.headers[h] for h in self.STORED_HEADERS if h in response.headers},
+            "encoding": response.encoding,
+            "stored_at": stored_at
+        }
+        # Write-then-rename so concurrent readers never see a half-written entry
+        for suffix, data in (("body", response.content), ("json", json.dumps(meta).encode('utf-8'))):
+            final_path = self.cache_dir / f"{key}.{suffix}"
+            tmp_path = final_path.with_name(f"{final_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, final_path)
+
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def get(self, session: requests.Session, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Dict[str, str]] = None, timeout: float = 15) -> CachedResponse:
+        """
+        GET through the cache.
+
+        Args:
+            session: Session used for network requests
+            url: Request URL
+            params: Query parameters (part of the cache key)
+            headers: Extra request headers
+            timeout: Network timeout in seconds
+
+        Returns:
+            CachedResponse (from_cache is True when no body was downloaded)
+        """
+        key = self._key(url, params)
+        cached = self._load(key)
+        now = time.time()
+        request_headers = dict(headers or {})
+
+        if cached is not None:
+            age = now - cached.get('stored_at', 0)
+            if age <= self.fresh_for:
+                self._count("hits")
+                logger.debug(f"📦 HTTP cache hit ({age:.0f}s old): {url}")
+                return CachedResponse(url, cached['status_code'], cached['content'], cached['headers'],
+                                      cached.get('encoding'), from_cache=True)
+            if age <= self.max_age:
+                if 'ETag' in cached['headers']:
+                    request_headers['If-None-Match'] = cached['headers']['ETag']
+                if 'Last-Modified' in cached['headers']:
+                    request_headers['If-Modified-Since'] = cached['headers']['Last-Modified']
+            else:
+                cached = None
+
+        response = session.get(url, params=params, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and cached is not None:
+            self._count("revalidated")
+            logger.debug(f"📦 HTTP cache revalidated (304): {url}")
+            # Refresh the timestamp (and any new validators) but keep the stored body
+            merged = dict(cached['headers'])
+            merged.update({h: response.headers[h] for h in self.STORED_HEADERS if h in response.headers})
+            revalidated = CachedResponse(url, cached['status_code'], cached['content'], merged,
+                                         cached.get('encoding'), from_cache=True)
+            self._store(key, url, revalidated, now)
+            return revalidated
+
+        self._count("misses")
+        if response.status_code == 200:
+            self._store(key, url, response, now)
+        return CachedResponse(url, response.status_code, response.content,
+                              dict(response.headers), response.encoding)
+
+
+_default_cache: Optional[HttpCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Process-wide HTTP cache configured from Config."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            from config import Config
+            _default_cache = HttpCache(Config.HTTP_CACHE_DIR,
+                                       fresh_for=Config.HTTP_CACHE_FRESH_SECONDS,
+                                       max_age=Config.HTTP_CACHE_MAX_AGE)
+        return _default_cache
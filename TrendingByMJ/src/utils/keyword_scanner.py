@@ -0,0 +1,144 @@
+"""
+Keyword scanner
+Precompiled, single-pass matching of labelled keyword lists, used by the
+content safety check, topic sensitivity checks and the keyword classifiers
+that back up GPT scene analysis.
+
+Every keyword of every rule goes into one character trie, compiled into a
+single regex inside a lookahead (`(?=(a(?:rmy|ttack(?:ed)?)|...))`): one
+finditer() call visits each position of the text once, branching on literal
+characters, and reports every match - overlapping ones too - with its label
+and position. Word boundaries and exception suffixes are checked per rule on
+the (few) hits only.
+
+    scanner = KeywordScanner({
+        "weapons": ["sword", "knife"],
+        "violence": KeywordRule(["kill", "killed"], not_followed_by=r"\\s+bacteria"),
+        "context": KeywordRule(["king"], whole_words=False),   # also inside "kingdom"
+    })
+    scanner.scan("The knife that killed the king")
+    # [KeywordMatch('weapons', 'knife', 4, 9), KeywordMatch('violence', 'killed', 15, 21),
+    #  KeywordMatch('context', 'king', 26, 30)]
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+
+class KeywordRule(NamedTuple):
+    terms: Iterable[str]
+    whole_words: Optional[bool] = None  # None: the scanner's default
+    not_followed_by: Optional[str] = None  # Regex; a hit followed by it is ignored (e.g. "killed bacteria")
+
+
+class KeywordMatch(NamedTuple):
+    label: str
+    term: str  # Matched keyword, lowercased
+    start: int
+    end: int
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex alternation of terms, factored into a character trie (longest alternative first)."""
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:  # A term ends here; longer terms are tried first
+            return body + "?" if len(branches) == 1 and len(branches[0]) == 1 else f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordScanner:
+    """
+    Labelled keyword lists compiled into one pattern.
+
+    A rule is a list of keywords or a KeywordRule. With whole_words (the
+    default) a keyword only matches as a whole word, like `\\bkeyword\\b`;
+    with whole_words=False it also matches inside longer words, like
+    `keyword in text`. Matching ignores case.
+    """
+
+    def __init__(self, rules: Dict[str, Union[Iterable[str], KeywordRule]], whole_words: bool = True):
+        if not rules:
+            raise ValueError("KeywordScanner needs at least one rule")
+        self.labels = list(rules)
+        self._owners: Dict[str, List[Tuple[str, bool, Optional["re.Pattern"]]]] = {}
+        for label, rule in rules.items():
+            if not isinstance(rule, KeywordRule):
+                rule = KeywordRule(rule)
+            terms = {term.lower() for term in rule.terms if term}
+            if not terms:
+                raise ValueError(f"Keyword rule '{label}' has no keywords")
+            whole = whole_words if rule.whole_words is None else rule.whole_words
+            follow = re.compile(rule.not_followed_by) if rule.not_followed_by else None
+            for term in terms:
+                self._owners.setdefault(term, []).append((label, whole, follow))
+        # The trie reports the longest keyword at a position; shorter keywords that are its prefixes match too
+        self._candidates = {
+            term: [(prefix, owner) for length in range(len(term), 0, -1)
+                   for prefix in [term[:length]] for owner in self._owners.get(prefix, ())]
+            for term in self._owners
+        }
+        self._pattern = re.compile(f"(?=({_trie_pattern(self._owners)}))")
+
+    def _matches(self, text: str) -> Iterator[KeywordMatch]:
+        lower = text.lower()
+        if len(lower) != len(text):  # e.g. "İ" lowercases to two characters; keep positions aligned
+            lower = "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+        for hit in self._pattern.finditer(lower):
+            start = hit.start()
+            for term, (label, whole, follow) in self._candidates[hit.group(1)]:
+                end = start + len(term)
+                if whole and ((start > 0 and _is_word_char(lower[start - 1]))
+                              or (end < len(lower) and _is_word_char(lower[end]))):
+                    continue
+                if follow is not None and follow.match(lower, end):
+                    continue
+                yield KeywordMatch(label, term, start, end)
+
+    def scan(self, text: str) -> List[KeywordMatch]:
+        """
+        Every match in text, in order of position.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            KeywordMatch per match; a keyword in several rules appears once per rule
+        """
+        return list(self._matches(text))
+
+    def search(self, text: str) -> Optional[KeywordMatch]:
+        """The first match in text; stops scanning at the first hit."""
+        return next(self._matches(text), None)
+
+    def labels_found(self, text: str) -> Set[str]:
+        """Labels with at least one match in text."""
+        return {match.label for match in self._matches(text)}
+
+    def first_label(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """The first label, in rule order, with a match in text (an if/elif chain of keyword checks)."""
+        found = self.labels_found(text)
+        return next((label for label in self.labels if label in found), default)
+
+    def term_counts(self, text: str) -> Dict[str, int]:
+        """Number of distinct keywords found per label (0 for labels without matches)."""
+        terms: Dict[str, Set[str]] = {label: set() for label in self.labels}
+        for match in self._matches(text):
+            terms[match.label].add(match.term)
+        return {label: len(found) for label, found in terms.items()}
@@ -0,0 +1,90 @@
+"""BeautifulSoup helpers: lxml parsing restricted to the elements a scraper actually reads."""
+import re
+from typing import Callable, Dict, List, Optional, Sequence
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+    has_lxml = True
+except ImportError:
+    HTML_PARSER = 'html.parser'
+    has_lxml = False
+
+# Simple selectors only: tag, .class, [attr], [attr*="value"], [attr="value"]
+_SELECTOR_RE = re.compile(r'^(?:(?P<tag>[a-zA-Z][\w-]*)|\.(?P<cls>[\w-]+)|'
+                          r'\[(?P<attr>[\w-]+)(?:(?P<op>\*?=)"?(?P<value>[^"\]]*)"?)?\])$')
+
+
+def compile_selectors(selectors: Sequence[str]) -> Callable[[str, Dict], bool]:
+    """
+    Turn simple CSS selectors into a (tag_name, attrs) -> bool matcher.
+
+    Raises:
+        ValueError: For selectors that are not simple (descendant, pseudo-class, ...)
+    """
+    tags, classes, attr_rules = set(), set(), []
+    for selector in selectors:
+        match = _SELECTOR_RE.match(selector.strip())
+        if not match:
+            raise ValueError(f"Unsupported selector for SoupStrainer: {selector}")
+        if match.group('tag'):
+            tags.add(match.group('tag').lower())
+        elif match.group('cls'):
+            classes.add(match.group('cls'))
+        else:
+            attr_rules.append((match.group('attr'), match.group('op'), match.group('value')))
+
+    def matches(name: str, attrs: Optional[Dict]) -> bool:
+        if name in tags:
+            return True
+        attrs = attrs or {}
+        tag_classes = attrs.get('class') or ()
+        if isinstance(tag_classes, str):
+            tag_classes = tag_classes.split()
+        if classes.intersection(tag_classes):
+            return True
+        for attr, op, value in attr_rules:
+            if attr not in attrs:
+                continue
+            actual = attrs[attr] if isinstance(attrs[attr], str) else ' '.join(attrs[attr])
+            if op is None or (op == '*=' and value in actual) or (op == '=' and value == actual):
+                return True
+        return False
+
+    return matches
+
+
+def selector_strainer(selectors: Sequence[str]):
+    """Parse-only filter keeping just the elements matching selectors (and their contents)."""
+    matches = compile_selectors(selectors)
+    try:
+        from bs4.filter import ElementFilter
+    except ImportError:
+        # beautifulsoup4 < 4.13 calls a callable name with (name, attrs)
+        return SoupStrainer(matches)
+
+    class _SelectorFilter(ElementFilter):
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            return matches(name, attrs)
+
+        def allow_string_creation(self, string):
+            return False
+
+    return _SelectorFilter()
+
+
+def parse_selected(markup, selectors: Sequence[str]) -> List:
+    """
+    Parse markup keeping only elements that match selectors, then select them.
+
+    Args:
+        markup: HTML bytes or text
+        selectors: Simple CSS selectors (see compile_selectors)
+
+    Returns:
+        Matching elements in document order
+    """
+    soup = BeautifulSoup(markup, HTML_PARSER, parse_only=selector_strainer(selectors))
+    return soup.select(', '.join(selectors))
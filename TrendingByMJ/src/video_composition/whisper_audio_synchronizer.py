@@ -10,7 +10,6 @@ import sys
 import openai
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
-from faster_whisper import WhisperModel
 import numpy as np
 
 # Add project root to path to import config
@@ -18,6 +17,16 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.model_cache import get_whisper_model
+from src.utils.keyword_scanner import KeywordScanner
+
+# Keywords for the fallback parser, checked in this order (the first content type with a hit wins)
+FALLBACK_CONTENT_TYPES = KeywordScanner({
+    'character_action': ['walked', 'ran', 'fought', 'moved', 'entered'],
+    'environment_description': ['palace', 'room', 'city', 'building'],
+    'emotional_moment': ['felt', 'thought', 'realized', 'feared'],
+    'dialogue_confrontation': ['said', 'spoke', 'told', 'asked'],
+}, whole_words=False)
 
 class WhisperAudioSynchronizer:
     """
@@ -59,6 +68,8 @@ class WhisperAudioSynchronizer:
                 'belonged', 'existed', 'occurred', 'happened', 'took place'
             ]
         }
+        # Compiled once; matches inside longer words like the `keyword in text` checks it replaced
+        self.content_scanner = KeywordScanner(self.content_keywords, whole_words=False)
         
         # Shot type mapping based on content type - more flexible
         self.shot_type_mapping = {
@@ -84,7 +95,7 @@ class WhisperAudioSynchronizer:
         """Load faster-whisper model (lazy loading to save memory)"""
         if self.model is None:
             self.logger.info(f"📥 Loading faster-whisper model: {self.model_name}")
-            self.model = WhisperModel(self.model_name, compute_type="int8")
+            self.model = get_whisper_model(self.model_name, compute_type="int8")
             self.logger.info("✅ faster-whisper model loaded successfully")
         return self.model
     
@@ -287,11 +298,7 @@ class WhisperAudioSynchronizer:
         except Exception as e:
             self.logger.warning(f"GPT analysis failed, falling back to keyword matching: {e}")
             # Fallback to keyword matching
-            audio_lower = audio_content.lower()
-            scores = {}
-            for content_type, keywords in self.content_keywords.items():
-                score = sum(1 for keyword in keywords if keyword in audio_lower)
-                scores[content_type] = score
+            scores = self.content_scanner.term_counts(audio_content)
             
             if max(scores.values()) == 0:
                 return 'exposition_setup'
@@ -480,20 +487,8 @@ class WhisperAudioSynchronizer:
     
     def _fallback_parse_response(self, response_text: str, audio_content: str) -> Dict[str, str]:
         """Fallback parsing when JSON parsing fails"""
-        # Simple keyword-based fallback
-        audio_lower = audio_content.lower()
-        
-        # Determine content type
-        if any(word in audio_lower for word in ['walked', 'ran', 'fought', 'moved', 'entered']):
-            content_type = 'character_action'
-        elif any(word in audio_lower for word in ['palace', 'room', 'city', 'building']):
-            content_type = 'environment_description'
-        elif any(word in audio_lower for word in ['felt', 'thought', 'realized', 'feared']):
-            content_type = 'emotional_moment'
-        elif any(word in audio_lower for word in ['said', 'spoke', 'told', 'asked']):
-            content_type = 'dialogue_confrontation'
-        else:
-            content_type = 'exposition_setup'
+        # Simple keyword-based fallback: the first content type (in rule order) with a keyword hit
+        content_type = FALLBACK_CONTENT_TYPES.first_label(audio_content, default='exposition_setup')
         
         # Determine shot type
         shot_type = 'medium_shot'  # Default
@@ -526,11 +521,7 @@ class WhisperAudioSynchronizer:
     
     def _keyword_content_analysis(self, audio_content: str) -> str:
         """Keyword-based content analysis fallback"""
-        audio_lower = audio_content.lower()
-        scores = {}
-        for content_type, keywords in self.content_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in audio_lower)
-            scores[content_type] = score
+        scores = self.content_scanner.term_counts(audio_content)
         
         if max(scores.values()) == 0:
             return 'exposition_setup'
@@ -13,9 +13,10 @@ from moviepy.editor import VideoFileClip, CompositeVideoClip, ColorClip, ImageCl
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import logging
-from faster_whisper import WhisperModel
 import re
 
+from src.utils.model_cache import get_whisper_model
+
 class OptimizedWhisperViralSubtitleProcessor:
     """Scientifically optimized viral subtitle processor with dynamic word highlighting."""
     
@@ -82,7 +83,7 @@ class OptimizedWhisperViralSubtitleProcessor:
                 if os.path.exists(model_path) and model_path != "base":
                     try:
                         self.logger.info(f"Loading cached Whisper model from: {model_path}")
-                        self.whisper_model = WhisperModel(model_path, compute_type="int8")
+                        self.whisper_model = get_whisper_model(model_path, compute_type="int8")
                         self.logger.info("Cached Whisper model loaded successfully")
                         model_loaded = True
                         break
@@ -92,7 +93,7 @@ class OptimizedWhisperViralSubtitleProcessor:
             
             if not model_loaded:
                 self.logger.info("Loading Whisper model (small) - will download if not cached...")
-                self.whisper_model = WhisperModel("small", compute_type="int8")
+                self.whisper_model = get_whisper_model("small", compute_type="int8")
                 self.logger.info("Whisper model loaded successfully")
                 
         except Exception as e:
@@ -774,8 +775,13 @@ class OptimizedWhisperViralSubtitleProcessor:
             # Move to next word position with proper spacing
             current_x += word_width + self.word_spacing
     
-    def add_viral_subtitles_to_video(self, video_path: str, audio_path: str, output_path: Optional[str] = None, story_path: Optional[str] = None) -> str:
-        """Add scientifically optimized viral subtitles to video with story fallback."""
+    def add_viral_subtitles_to_video(self, video_path: str, audio_path: str, output_path: Optional[str] = None, story_path: Optional[str] = None,
+                                     work_dir: Optional[str] = None) -> str:
+        """Add scientifically optimized viral subtitles to video with story fallback.
+
+        Temporary encoder files are written to work_dir (default: next to the output),
+        so concurrent renders never share a scratch file.
+        """
         total_start_time = time.time()
         
         try:
@@ -856,6 +862,10 @@ class OptimizedWhisperViralSubtitleProcessor:
                 # Ensure output_path is a string, not a Path object
                 output_path = str(output_path)
             
+            scratch_dir = Path(work_dir) if work_dir else Path(output_path).parent
+            scratch_dir.mkdir(parents=True, exist_ok=True)
+            temp_audiofile = str(scratch_dir / f"{Path(output_path).stem}_temp-audio.m4a")
+            
             # Write video with HD encoding settings
             write_start = time.time()
             self.logger.info(f"Writing HD viral subtitle video: {output_path}")
@@ -865,7 +875,7 @@ class OptimizedWhisperViralSubtitleProcessor:
                 codec='libx264',
                 audio_codec='aac',
                 audio_bitrate='320k',
-                temp_audiofile='temp-audio.m4a',
+                temp_audiofile=temp_audiofile,
                 remove_temp=True,
                 preset='slow',  # High-quality encoding preset
                 bitrate='8000k',  # High bitrate for HD quality
@@ -0,0 +1,129 @@
+"""
+Test Batched Summaries
+Runs TrendingSummaryGenerator against a local chat-completions stand-in:
+batched structured output, per-topic fallback on validation failure, and
+latency/token metrics. No API key or network access is needed.
+"""
+
+import sys
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from config import Config
+from src.trending_summary_generator import TrendingSummaryGenerator
+from src.utils.script_tests import run_tests
+
+
+class StandinChatClient:
+    """Answers batched (JSON) and single requests like the chat completions API, counting calls."""
+
+    def __init__(self, bad_topics=()):
+        self.bad_topics = set(bad_topics)
+        self.calls = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, max_tokens, temperature, **kwargs):
+        batched = kwargs.get("response_format") is not None
+        with self._lock:
+            self.calls.append("batch" if batched else "single")
+
+        if batched:
+            items = []
+            for topic_id, topic in re.findall(r'^\[(\d+)\] TRENDING TOPIC: (.*)$', messages[1]["content"], re.M):
+                words = 5 if topic in self.bad_topics else 70
+                items.append({"id": int(topic_id), "summary": " ".join(["news"] * words),
+                              "title": f'"{topic} explained"', "image_prompt": f"Crowd reacting to {topic}",
+                              "music_category": "intense"})
+            content = json.dumps({"items": items})
+        else:
+            content = " ".join(["story"] * 60)
+
+        usage = SimpleNamespace(prompt_tokens=120, completion_tokens=80, total_tokens=200)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+
+def make_generator(client):
+    # The real OpenAI client is built (and then replaced) in __init__; it only needs some key to exist
+    api_key = Config.OPENAI_API_KEY
+    Config.OPENAI_API_KEY = api_key or "offline-test-key"
+    try:
+        generator = TrendingSummaryGenerator(logging.getLogger("test_batched_summaries"))
+    finally:
+        Config.OPENAI_API_KEY = api_key
+    generator.client = client
+    generator.context_gatherer = SimpleNamespace(
+        gather_trending_context=lambda topic_data: {"context_summary": f"Why {topic_data['topic']} is trending"})
+    return generator
+
+
+def make_topics(count):
+    return [{"topic": f"Topic {i}", "search_volume": 1000 - i, "context": ""} for i in range(count)]
+
+
+def test_batched_requests():
+    """Seven topics with a batch size of 5 take two requests and keep topic order."""
+    print("🧪 Batched structured-output requests...")
+    from config import Config
+    Config.SUMMARY_BATCH_SIZE = 5
+    client = StandinChatClient()
+    generator = make_generator(client)
+    topics = make_topics(7)
+
+    summaries = generator.generate_multiple_summaries(topics, mode="batched")
+    assert [s["topic"] for s in summaries] == [t["topic"] for t in topics]
+    assert client.calls == ["batch", "batch"], client.calls
+    first = summaries[0]
+    assert first["title"] == "Topic 0 explained", first["title"]
+    assert first["story_data"]["music_category"] == "Intense"
+    assert first["image_prompt"].endswith("4k")
+    print(f"✅ {len(summaries)} packages from {len(client.calls)} requests")
+
+
+def test_fallback_on_validation_failure():
+    """A batched entry that fails validation is regenerated with per-topic requests."""
+    print("🧪 Per-topic fallback...")
+    client = StandinChatClient(bad_topics={"Topic 1"})
+    generator = make_generator(client)
+
+    summaries = generator.generate_multiple_summaries(make_topics(3), mode="batched")
+    assert len(summaries) == 3
+    assert summaries[1]["summary"].startswith("story"), "fallback summary not used"
+    assert summaries[0]["summary"].startswith("news")
+    assert client.calls.count("single") == 3, client.calls  # summary, title, image prompt
+    assert generator.metrics_summary()["fallback_topics"] == ["Topic 1"]
+    print("✅ Invalid entry regenerated individually, others kept from the batch")
+
+
+def test_metrics_recorded():
+    """Every request records latency and token usage."""
+    print("🧪 Latency and token metrics...")
+    client = StandinChatClient()
+    generator = make_generator(client)
+    generator.generate_multiple_summaries(make_topics(2), mode="concurrent")
+
+    metrics = generator.metrics_summary()
+    assert metrics["requests"] == 6 and metrics["batched_requests"] == 0, metrics
+    assert metrics["total_tokens"] == 6 * 200
+    assert all("latency" in record for record in generator.metrics)
+    print(f"✅ {metrics['requests']} requests, {metrics['total_tokens']} tokens, "
+          f"avg latency {metrics['latency_avg'] * 1000:.1f}ms")
+
+
+def main():
+    """Run all batched summary tests."""
+    logging.basicConfig(level=logging.WARNING)
+    tests = [test_batched_requests, test_fallback_on_validation_failure, test_metrics_recorded]
+    return run_tests("TESTING BATCHED SUMMARIES", tests, width=60)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
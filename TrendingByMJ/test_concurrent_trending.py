@@ -0,0 +1,138 @@
+"""
+Test Concurrent Trending Fetch
+Runs RealTrendingFetcher against local HTTP stand-ins: sources in parallel,
+per-source timeouts, merge/dedup, and the token-bucket context limiter.
+"""
+
+import sys
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from local_trend_standins import LocalTrendServer
+from src.real_trending_fetcher import RealTrendingFetcher
+from src.utils.rate_limiter import TokenBucket
+from src.utils.script_tests import run_tests
+
+
+def _make_fetcher(server: LocalTrendServer, timeout: float) -> RealTrendingFetcher:
+    fetcher = RealTrendingFetcher(logging.getLogger("test_concurrent_trending"))
+    fetcher.sources = ["reddit", "twitter"]
+    fetcher.source_timeout = timeout
+    fetcher.source_urls.update(server.source_urls())
+    fetcher.history = {"topics": [], "last_updated": None}  # Don't let real history skip stand-in topics
+    return fetcher
+
+
+def test_sources_run_in_parallel():
+    """Two slow sources should take about as long as the slowest one, not the sum."""
+    print("🧪 Sources run in parallel...")
+    delay = 1.5
+    with LocalTrendServer(delays={"/r/popular.json": delay, "/twitter": delay}) as server:
+        fetcher = _make_fetcher(server, timeout=10)
+        fetcher.context_limiter = TokenBucket(100, 100)  # Measure the source fetch only
+        start = time.time()
+        topics = fetcher.fetch_trending_topics()
+        elapsed = time.time() - start
+
+    assert topics, "no topics fetched"
+    assert elapsed < delay * 1.8, f"sources look serial: {elapsed:.2f}s"
+    print(f"✅ {len(topics)} topics in {elapsed:.2f}s (each source {delay}s)")
+
+
+def test_source_timeout():
+    """A source slower than its timeout is dropped without holding up the others."""
+    print("🧪 Per-source timeout...")
+    with LocalTrendServer(delays={"/twitter": 5}) as server:
+        fetcher = _make_fetcher(server, timeout=1)
+        start = time.time()
+        topics = fetcher.fetch_trending_topics()
+        elapsed = time.time() - start
+
+    assert fetcher.source_stats["twitter"]["status"] == "timeout", fetcher.source_stats
+    assert fetcher.source_stats["reddit"]["status"] == "ok", fetcher.source_stats
+    assert topics and all(t["source"] == "reddit" for t in topics)
+    assert elapsed < 3, f"timeout not enforced: {elapsed:.2f}s"
+    print(f"✅ twitter timed out, {len(topics)} reddit topics in {elapsed:.2f}s")
+
+
+def test_merge_and_dedup():
+    """Topics reported by several sources appear once and remember every source."""
+    print("🧪 Merge and dedup...")
+    with LocalTrendServer() as server:
+        fetcher = _make_fetcher(server, timeout=10)
+        topics = fetcher.fetch_trending_topics()
+
+    names = [t["topic"].lower() for t in topics]
+    assert len(names) == len(set(names)), f"duplicates: {names}"
+    artemis = [t for t in topics if t["topic"].lower() == "artemis launch"]
+    assert artemis, f"expected Artemis Launch in {names}"
+    assert set(artemis[0]["sources"]) == {"reddit", "twitter"}, artemis[0]["sources"]
+    # Source priority order is kept: reddit (listed first) before twitter-only topics
+    first_twitter_only = next(i for i, t in enumerate(topics) if t["sources"] == ["twitter"])
+    assert all(t["source"] == "reddit" for t in topics[:first_twitter_only])
+    print(f"✅ {len(topics)} unique topics, Artemis Launch from {artemis[0]['sources']}")
+
+
+def test_context_stops_at_max_topics():
+    """Context is only fetched for as many candidates as topics are needed; rejected ones are replaced."""
+    print("🧪 Context stops at the topic limit...")
+    from config import Config
+
+    with LocalTrendServer() as server:
+        fetcher = _make_fetcher(server, timeout=10)
+        fetcher.context_limiter = TokenBucket(100, 100)
+        looked_up = []
+        get_context = fetcher._get_topic_context
+
+        def counting_context(topic_data):
+            looked_up.append(topic_data["topic"])
+            # Reject the first candidate so the next one has to fill its place
+            return None if len(looked_up) == 1 else get_context(topic_data)
+
+        fetcher._get_topic_context = counting_context
+        original_max = Config.MAX_TRENDING_TOPICS
+        Config.MAX_TRENDING_TOPICS = 3
+        try:
+            topics = fetcher.fetch_trending_topics()
+        finally:
+            Config.MAX_TRENDING_TOPICS = original_max
+
+    assert len(topics) == 3, f"expected 3 topics, got {len(topics)}"
+    assert len(looked_up) == 4, f"context fetched for {len(looked_up)} candidates: {looked_up}"
+    assert [t["topic"] for t in topics] == looked_up[1:], (looked_up, [t["topic"] for t in topics])
+    print(f"✅ 3 topics from {len(looked_up)} context lookups")
+
+
+def test_token_bucket():
+    """The token bucket spaces out calls beyond its burst size."""
+    print("🧪 Token bucket...")
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire_async()
+
+    start = time.time()
+    asyncio.run(take(7))
+    elapsed = time.time() - start
+    # 2 free tokens, then 5 more at 10/s
+    assert 0.4 < elapsed < 1.0, f"unexpected pacing: {elapsed:.2f}s"
+    print(f"✅ 7 acquisitions took {elapsed:.2f}s")
+
+
+def main():
+    """Run all concurrent trending tests."""
+    logging.basicConfig(level=logging.WARNING)
+    tests = [test_token_bucket, test_sources_run_in_parallel, test_source_timeout, test_merge_and_dedup,
+             test_context_stops_at_max_topics]
+    return run_tests("TESTING CONCURRENT TRENDING FETCH", tests, width=60)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
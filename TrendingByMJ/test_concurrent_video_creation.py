@@ -0,0 +1,124 @@
+"""
+Test Concurrent Video Creation
+Runs TrendingFullPipeline.create_videos with stub content and render stages:
+both pools stay within their worker limits, every topic renders in its own
+scratch directory, and failed topics keep their scratch files.
+"""
+
+import sys
+import asyncio
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import trending_full_pipeline
+from config import Config
+from src.utils.script_tests import run_tests
+from trending_full_pipeline import TrendingFullPipeline
+
+
+class _StubStages:
+    """Content and render stages that record how many topics each pool runs at once."""
+
+    def __init__(self, failing_topic: str):
+        self.failing_topic = failing_topic
+        self.lock = threading.Lock()
+        self.active = {"content": 0, "render": 0}
+        self.peak = {"content": 0, "render": 0}
+        self.work_dirs = {}
+        self.shared_dirs = []
+
+    def _enter(self, stage):
+        with self.lock:
+            self.active[stage] += 1
+            self.peak[stage] = max(self.peak[stage], self.active[stage])
+
+    def _leave(self, stage):
+        with self.lock:
+            self.active[stage] -= 1
+
+    async def content(self, story_data, topic_name=None, logger=None):
+        self._enter("content")
+        await asyncio.sleep(0.1)
+        self._leave("content")
+        return True
+
+    def render(self, topic_name, logger=None, work_dir=None):
+        self._enter("render")
+        try:
+            work_dir.mkdir(parents=True, exist_ok=True)
+            marker = work_dir / "temp-audio.m4a"
+            if marker.exists():
+                self.shared_dirs.append(topic_name)
+            marker.write_text(topic_name)
+            self.work_dirs[topic_name] = work_dir
+            time.sleep(0.1)
+            # Another render writing the same scratch file would change it under us
+            if marker.read_text() != topic_name:
+                self.shared_dirs.append(topic_name)
+            return topic_name != self.failing_topic
+        finally:
+            self._leave("render")
+
+
+def _package(topic: str) -> dict:
+    return {"topic": topic, "title": f"{topic} explained", "story_data": {"title": topic, "story": "..."}}
+
+
+def test_pools_bounds_and_work_dirs():
+    """Pools stay within their limits, scratch dirs are per topic, and only failed topics keep theirs."""
+    print("🧪 Concurrent video creation...")
+    topics = [f"Trending topic {i}" for i in range(6)]
+    stages = _StubStages(failing_topic=topics[2])
+    names = ("test_complete_replicate_pipeline_whisper_with_story", "process_video_for_topic")
+    originals = [getattr(trending_full_pipeline, name) for name in names]
+    settings = ("MAX_CONTENT_WORKERS", "MAX_RENDER_WORKERS", "WORK_DIR", "STORIES_DIR", "HISTORY_FILE", "SNAPSHOT_DIR")
+    saved = {name: getattr(Config, name) for name in settings}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        trending_full_pipeline.test_complete_replicate_pipeline_whisper_with_story = stages.content
+        trending_full_pipeline.process_video_for_topic = stages.render
+        Config.MAX_CONTENT_WORKERS, Config.MAX_RENDER_WORKERS = 3, 2
+        Config.WORK_DIR, Config.STORIES_DIR = tmp / "work", tmp / "stories"
+        Config.HISTORY_FILE, Config.SNAPSHOT_DIR = tmp / "history.json", tmp / "snapshots"
+        try:
+            pipeline = TrendingFullPipeline(logger=logging.getLogger("test_concurrent_video_creation"))
+            pipeline.summary_packages = [_package(topic) for topic in topics]
+            start = time.time()
+            success = asyncio.run(pipeline.create_videos())
+            elapsed = time.time() - start
+        finally:
+            for name, original in zip(names, originals):
+                setattr(trending_full_pipeline, name, original)
+            for name, value in saved.items():
+                setattr(Config, name, value)
+
+        kept = sorted(path.name for path in (tmp / "work").iterdir())
+        statuses = {record["topic"]: record["status"] for record in pipeline.video_results}
+
+    assert success, "create_videos reported failure"
+    assert stages.peak["content"] == 3, f"content pool peak {stages.peak['content']}, expected 3"
+    assert stages.peak["render"] == 2, f"render pool peak {stages.peak['render']}, expected 2"
+    assert len(set(stages.work_dirs.values())) == len(topics), "topics shared a scratch directory"
+    assert not stages.shared_dirs, f"scratch files clobbered for {stages.shared_dirs}"
+    assert kept == [stages.work_dirs[topics[2]].name], f"kept scratch dirs: {kept}"
+    assert [t for t, status in statuses.items() if status != "SUCCESS"] == [topics[2]], statuses
+    print(f"✅ {len(topics)} topics in {elapsed:.2f}s, peaks {stages.peak}, kept scratch: {kept}")
+
+
+def main():
+    """Run all concurrent video creation tests."""
+    logging.basicConfig(level=logging.WARNING)
+    tests = [test_pools_bounds_and_work_dirs]
+    return run_tests("TESTING CONCURRENT VIDEO CREATION", tests, width=60)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,137 @@
+"""
+Test Google Trends Offline Parsing
+Runs the Google Trends extraction against the saved page snapshot
+(selenium_google_trends_debug.html) through the HTML snapshot cache,
+and checks the browser pool's reuse and lifetime cap.
+"""
+
+import sys
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.real_trending_fetcher import RealTrendingFetcher
+from src.utils.browser_pool import BrowserPool, _PooledBrowser
+from src.utils.html_snapshot_cache import HtmlSnapshotCache
+from src.utils.script_tests import run_tests
+
+SNAPSHOT_FILE = project_root / "selenium_google_trends_debug.html"
+
+
+def test_snapshot_cache_ttl():
+    """get() honours the TTL; latest() ignores it."""
+    print("🧪 Snapshot cache TTL...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HtmlSnapshotCache(Path(tmp), ttl=0.2, keep=2)
+        url = "https://trends.google.com/trending?geo=US"
+        for i in range(3):
+            cache.put(url, f"<html>{i}</html>")
+        assert cache.get(url) == "<html>2</html>"
+        assert len(cache.history(url)) == 2, "old snapshots not pruned"
+        time.sleep(0.3)
+        assert cache.get(url) is None, "stale snapshot returned"
+        assert cache.latest(url)[0] == "<html>2</html>"
+    print("✅ Fresh hits, stale misses, pruning to 2 snapshots")
+
+
+def test_fetch_uses_cached_snapshot():
+    """A fresh snapshot is parsed without starting a browser."""
+    print("🧪 Fetch from cached snapshot...")
+    with tempfile.TemporaryDirectory() as tmp:
+        fetcher = RealTrendingFetcher(logging.getLogger("test_google_trends_offline"))
+        fetcher.snapshot_cache = HtmlSnapshotCache(Path(tmp), ttl=60)
+        fetcher.snapshot_cache.put(fetcher.source_urls["google_trends"],
+                                   SNAPSHOT_FILE.read_text(encoding="utf-8"))
+
+        topics = fetcher._fetch_google_trends_main()
+        assert len(topics) == 10, f"expected 10 topics, got {len(topics)}"
+        assert topics[0]["topic"] == "malcolm jamal warner", topics[0]["topic"]
+        assert topics[0]["search_volume"] == 2000000
+        assert "3 hours ago" in topics[0]["trending_reason"], topics[0]["trending_reason"]
+
+        # Offline re-parse works even once the snapshot is stale
+        fetcher.snapshot_cache.ttl = 0
+        reparsed = fetcher.parse_cached_google_trends()
+        assert [t["topic"] for t in reparsed] == [t["topic"] for t in topics]
+    print(f"✅ Parsed {len(topics)} topics offline: {', '.join(t['topic'] for t in topics[:3])}...")
+
+
+def test_pages_without_rows_are_not_cached():
+    """A rendered page without trend rows (consent, error, timeout) is not cached; a real page is."""
+    print("🧪 Snapshot caching of rendered pages...")
+    consent_page = "<html><body><h1>Before you continue to Google</h1><button>Accept all</button></body></html>"
+    with tempfile.TemporaryDirectory() as tmp:
+        fetcher = RealTrendingFetcher(logging.getLogger("test_google_trends_offline"))
+        fetcher.snapshot_cache = HtmlSnapshotCache(Path(tmp), ttl=60)
+        url = fetcher.source_urls["google_trends"]
+        rendered = []
+
+        def render(page):
+            rendered.append(page)
+            return page
+
+        fetcher._render_google_trends_page = lambda _url: render(consent_page)
+        fetcher._fetch_google_trends_main()
+        fetcher._fetch_google_trends_main()
+        assert len(rendered) == 2, "consent page was served from the cache"
+        assert fetcher.snapshot_cache.latest(url) is None, "consent page was cached"
+
+        fetcher._render_google_trends_page = lambda _url: render(SNAPSHOT_FILE.read_text(encoding="utf-8"))
+        topics = fetcher._fetch_google_trends_main()
+        again = fetcher._fetch_google_trends_main()
+        assert len(rendered) == 3 and len(again) == len(topics) == 10, (len(rendered), len(again))
+    print(f"✅ Consent page rendered twice and never cached; trends page cached after one render")
+
+
+class _CountingPool(BrowserPool):
+    """BrowserPool whose sessions are plain objects, to check reuse and retirement."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.created = 0
+        self.quit = 0
+
+    def _create(self):
+        self.created += 1
+        return _PooledBrowser(object())
+
+    def _quit(self, browser):
+        self.quit += 1
+
+
+def test_browser_pool_lifetime():
+    """Sessions are reused until max_uses, and discarded after an error."""
+    print("🧪 Browser pool reuse and lifetime cap...")
+    pool = _CountingPool(max_size=1, max_uses=3, max_age=60)
+    for _ in range(7):
+        with pool.session():
+            pass
+    assert pool.created == 3, f"expected 3 sessions for 7 pages at 3 uses each, got {pool.created}"
+    assert pool.quit == 2
+
+    try:
+        with pool.session():
+            raise ValueError("page crashed")
+    except ValueError:
+        pass
+    assert pool.quit == 3, "failed session was returned to the pool"
+
+    pool.close()
+    print(f"✅ {pool.created} sessions created, {pool.quit} retired")
+
+
+def main():
+    """Run all offline Google Trends tests."""
+    logging.basicConfig(level=logging.WARNING)
+    tests = [test_snapshot_cache_ttl, test_fetch_uses_cached_snapshot, test_pages_without_rows_are_not_cached,
+             test_browser_pool_lifetime]
+    return run_tests("TESTING GOOGLE TRENDS OFFLINE PARSING", tests, width=60)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
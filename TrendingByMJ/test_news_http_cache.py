@@ -0,0 +1,105 @@
+"""
+Test News HTTP Cache
+Runs the shared HTTP cache and NewsContextGatherer against local stand-ins:
+fresh hits, ETag / Last-Modified revalidation, concurrent source scraping and
+strained (article-only) parsing.
+"""
+
+import sys
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from local_trend_standins import LocalTrendServer
+from src.news_context_gatherer import NewsContextGatherer
+from src.utils.http_cache import HttpCache
+from src.utils.script_tests import run_tests
+from src.utils.soup_utils import parse_selected
+
+
+def test_fresh_hit_and_revalidation():
+    """Fresh entries skip the network; stale ones revalidate with ETag or Last-Modified."""
+    print("🧪 Fresh hits and conditional revalidation...")
+    session = requests.Session()
+    with tempfile.TemporaryDirectory() as tmp, LocalTrendServer() as server:
+        cache = HttpCache(Path(tmp), fresh_for=60, max_age=86400)
+        for validator in ("etag", "modified"):
+            path = f"/news-search/{validator}"
+            url = f"{server.url}{path}"
+
+            first = cache.get(session, url)
+            assert first.status_code == 200 and not first.from_cache
+            second = cache.get(session, url)
+            assert second.from_cache and second.content == first.content
+            assert server.hits[path] == 1, "fresh entry went to the network"
+
+            cache.fresh_for = 0
+            third = cache.get(session, url)
+            cache.fresh_for = 60
+            assert third.from_cache and third.content == first.content
+            assert server.hits[path] == 2
+
+        assert server.hits["304"] == 2, server.hits
+        assert cache.stats == {"hits": 2, "revalidated": 2, "misses": 2}, cache.stats
+
+        # No validators: a stale entry is downloaded again
+        url = f"{server.url}/news-search/plain"
+        cache.get(session, url)
+        cache.fresh_for = 0
+        again = cache.get(session, url)
+        assert not again.from_cache and server.hits["/news-search/plain"] == 2
+    print("✅ Fresh hit, 304 revalidation (ETag and Last-Modified), refetch without validators")
+
+
+def test_strained_parsing():
+    """Only article containers are parsed; navigation and sidebars are dropped."""
+    print("🧪 Strained parsing...")
+    from local_trend_standins import NEWS_SEARCH_PAGE
+    articles = parse_selected(NEWS_SEARCH_PAGE.encode("utf-8"), ['article', '.news-card', '[data-n-tid]'])
+    titles = [a.select_one('h2, h3').get_text() for a in articles]
+    assert titles == ["Artemis Launch Window Confirmed After Final Review",
+                      "Artemis Launch crew completes last rehearsal"], titles
+    print(f"✅ Parsed {len(articles)} article containers")
+
+
+def test_sources_scraped_concurrently():
+    """Slow news sources are fetched in parallel, and a repeated topic is served from the cache."""
+    print("🧪 Concurrent source scraping...")
+    delay = 1.0
+    with tempfile.TemporaryDirectory() as tmp, \
+            LocalTrendServer(delays={f"/news-search/{i}": delay for i in range(3)}) as server:
+        gatherer = NewsContextGatherer(logging.getLogger("test_news_http_cache"))
+        gatherer.http_cache = HttpCache(Path(tmp), fresh_for=3600)
+        gatherer.news_sources = [(f"{server.url}/news-search/{i}?q={{query}}", ['article', '.news-card'])
+                                 for i in range(3)]
+
+        start = time.time()
+        results = gatherer._search_web_news("Artemis Launch")
+        elapsed = time.time() - start
+        assert len(results) == 6, f"expected 2 articles from each of 3 sources, got {len(results)}"
+        assert elapsed < delay * 2, f"sources look serial: {elapsed:.2f}s"
+
+        start = time.time()
+        cached_results = gatherer._search_web_news("Artemis Launch")
+        cached_elapsed = time.time() - start
+        assert len(cached_results) == len(results)
+        assert cached_elapsed < delay / 2, f"repeat topic hit the network: {cached_elapsed:.2f}s"
+    print(f"✅ 3 sources in {elapsed:.2f}s (each {delay}s), repeat topic in {cached_elapsed:.2f}s")
+
+
+def main():
+    """Run all news HTTP cache tests."""
+    logging.basicConfig(level=logging.WARNING)
+    tests = [test_fresh_hit_and_revalidation, test_strained_parsing, test_sources_scraped_concurrently]
+    return run_tests("TESTING NEWS HTTP CACHE", tests, width=60)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -8,6 +8,8 @@ import sys
 import os
 import time
 import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from tqdm import tqdm
@@ -25,7 +27,7 @@ from src.real_trending_fetcher import RealTrendingFetcher as TrendingFetcher
 from src.trending_summary_generator import TrendingSummaryGenerator
 
 # Import pipeline components
-from partial_pipelines.content_generation_pipeline import test_complete_replicate_pipeline_whisper
+from partial_pipelines.content_generation_pipeline import test_complete_replicate_pipeline_whisper_with_story
 from partial_pipelines.audio_video_processor_pipeline import process_video_for_topic
 from src.utils.folder_utils import sanitize_folder_name, setup_logging_with_file
 
@@ -38,6 +40,7 @@ class TrendingFullPipeline:
         self.logger = logger
         self.trending_topics = []
         self.summary_packages = []
+        self.video_results = []
         
         # Setup logging if not provided
         if self.logger is None:
@@ -113,7 +116,7 @@ class TrendingFullPipeline:
                 "timestamp": datetime.now().isoformat(),
                 "total_duration": total_time,
                 "trending_topics_count": len(self.trending_topics),
-                "successful_videos": len([s for s in self.step_timings.values() if s.get("success", False)])
+                "successful_videos": len([r for r in self.video_results if r["status"] == "SUCCESS"])
             },
             "step_timings": self.step_timings,
             "trending_topics": [
@@ -131,7 +134,8 @@ class TrendingFullPipeline:
                     "estimated_duration": summary["estimated_duration"]
                 }
                 for summary in self.summary_packages
-            ]
+            ],
+            "video_results": self.video_results
         }
         
         # Save report
@@ -273,67 +277,113 @@ class TrendingFullPipeline:
             self.log_step_end("Generate Summaries", success=False)
             return False
     
+    def _save_story_data(self, topic: str, story_data: dict) -> Path:
+        """Save story data for the content generation pipeline."""
+        story_dir = Config.STORIES_DIR / sanitize_folder_name(topic)
+        story_dir.mkdir(parents=True, exist_ok=True)
+        
+        story_file = story_dir / "story.json"
+        with open(story_file, 'w', encoding='utf-8') as f:
+            json.dump(story_data, f, indent=2, ensure_ascii=False)
+        
+        self.logger.info(f"📄 Story data saved: {story_file}")
+        self.logger.info(f"🎵 Music category: {story_data.get('music_category', 'Unknown')}")
+        return story_file
+    
+    def _run_content_stage(self, topic: str, story_data: dict) -> bool:
+        """Run TTS, Whisper sync, music selection and image generation for one topic on its own event loop (worker thread)."""
+        return bool(asyncio.run(test_complete_replicate_pipeline_whisper_with_story(
+            story_data,
+            topic_name=topic,
+            logger=self.logger
+        )))
+    
+    def _run_render_stage(self, topic: str, work_dir: Path) -> bool:
+        """Run audio mixing, Ken Burns rendering and subtitles for one topic (worker thread)."""
+        return process_video_for_topic(
+            topic_name=topic,
+            logger=self.logger,
+            work_dir=work_dir
+        )
+    
+    async def _produce_video(self, index: int, summary_package: dict,
+                             content_pool: ThreadPoolExecutor, render_pool: ThreadPoolExecutor) -> bool:
+        """Push one topic through the network-bound stage, then the CPU-bound render stage."""
+        loop = asyncio.get_running_loop()
+        topic = summary_package["topic"]
+        title = summary_package["title"]
+        total = len(self.summary_packages)
+        work_dir = Config.WORK_DIR / sanitize_folder_name(topic)
+        record = {"index": index, "topic": topic, "title": title, "status": "FAILED"}
+        self.video_results.append(record)
+        
+        self.logger.info(f"🎬 [{index}/{total}] Creating video: {title}")
+        
+        try:
+            # Use story data from summary package (compatible with existing pipeline)
+            story_data = summary_package["story_data"]
+            self._save_story_data(topic, story_data)
+            
+            content_start = time.time()
+            content_success = await loop.run_in_executor(content_pool, self._run_content_stage, topic, story_data)
+            record["content_time"] = time.time() - content_start
+            
+            if not content_success:
+                self.logger.error(f"❌ [{index}/{total}] Content generation failed: {title}")
+                return False
+            
+            self.logger.info(f"✅ [{index}/{total}] Content ready: {title} ({record['content_time']:.1f}s)")
+            
+            render_start = time.time()
+            video_success = await loop.run_in_executor(render_pool, self._run_render_stage, topic, work_dir)
+            record["render_time"] = time.time() - render_start
+            
+            if not video_success:
+                self.logger.error(f"❌ [{index}/{total}] Video processing failed: {title}")
+                return False
+            
+            record["status"] = "SUCCESS"
+            self.logger.info(f"✅ [{index}/{total}] Video created successfully: {title} ({record['render_time']:.1f}s render)")
+            
+            # Mark topic as used in history (on the event loop, so history writes never overlap)
+            from src.real_trending_fetcher import RealTrendingFetcher
+            fetcher = RealTrendingFetcher(self.logger)
+            fetcher.mark_topic_used(topic)
+            
+            # Scratch files are only kept for failed topics
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return True
+        
+        except Exception as e:
+            record["error"] = str(e)
+            self.logger.error(f"❌ [{index}/{total}] Error creating video for {topic}: {e}")
+            return False
+    
     async def create_videos(self) -> bool:
-        """Step 3: Create videos for each trending topic."""
+        """Step 3: Create videos for all approved topics concurrently.
+        
+        Topics run side by side: up to Config.MAX_CONTENT_WORKERS in the network-bound
+        stage (TTS, Whisper sync, image generation) and up to Config.MAX_RENDER_WORKERS
+        in the CPU-bound stage (mixing, Ken Burns, subtitles). Every topic writes to its
+        own output folders and its own scratch directory under Config.WORK_DIR.
+        """
         try:
             self.log_step_start("Create Videos")
+            self.video_results = []
             
-            successful_videos = 0
+            content_workers = max(1, Config.MAX_CONTENT_WORKERS)
+            render_workers = max(1, Config.MAX_RENDER_WORKERS)
+            self.logger.info(f"🎬 Creating {len(self.summary_packages)} videos "
+                             f"(content workers: {content_workers}, render workers: {render_workers})")
             
-            for i, summary_package in enumerate(self.summary_packages, 1):
-                topic = summary_package["topic"]
-                title = summary_package["title"]
-                
-                self.logger.info(f"🎬 Creating video {i}/{len(self.summary_packages)}: {title}")
-                
-                try:
-                    # Use story data from summary package (compatible with existing pipeline)
-                    story_data = summary_package["story_data"]
-                    
-                    # Save story data for content generation pipeline
-                    story_dir = Config.STORIES_DIR / sanitize_folder_name(topic)
-                    story_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    story_file = story_dir / "story.json"
-                    with open(story_file, 'w', encoding='utf-8') as f:
-                        json.dump(story_data, f, indent=2, ensure_ascii=False)
-                    
-                    self.logger.info(f"📄 Story data saved: {story_file}")
-                    self.logger.info(f"🎵 Music category: {story_data.get('music_category', 'Unknown')}")
-                    
-                    # Run content generation pipeline with story data
-                    content_success = await test_complete_replicate_pipeline_whisper(
-                        topic_name=topic,
-                        logger=self.logger
-                    )
-                    
-                    if content_success:
-                        # Run audio/video processing pipeline
-                        video_success = process_video_for_topic(
-                            topic_name=topic,
-                            logger=self.logger
-                        )
-                        
-                        if video_success:
-                            successful_videos += 1
-                            self.logger.info(f"✅ Video created successfully: {title}")
-                            
-                            # Mark topic as used in history
-                            from src.real_trending_fetcher import RealTrendingFetcher
-                            fetcher = RealTrendingFetcher(self.logger)
-                            fetcher.mark_topic_used(topic)
-                        else:
-                            self.logger.error(f"❌ Video processing failed: {title}")
-                    else:
-                        self.logger.error(f"❌ Content generation failed: {title}")
-                
-                except Exception as e:
-                    self.logger.error(f"❌ Error creating video for {topic}: {e}")
-                
-                # Rate limiting between videos
-                if i < len(self.summary_packages):
-                    time.sleep(5)
+            with ThreadPoolExecutor(max_workers=content_workers, thread_name_prefix="content") as content_pool, \
+                 ThreadPoolExecutor(max_workers=render_workers, thread_name_prefix="render") as render_pool:
+                results = await asyncio.gather(*[
+                    self._produce_video(i, summary_package, content_pool, render_pool)
+                    for i, summary_package in enumerate(self.summary_packages, 1)
+                ])
             
+            successful_videos = sum(1 for result in results if result)
             self.logger.info(f"🎬 Video creation completed: {successful_videos}/{len(self.summary_packages)} successful")
             
             success = successful_videos > 0
@@ -360,35 +410,21 @@ class TrendingFullPipeline:
                 'news_context': topic_data.get('news_context', '')
             }
             
-            # Save story data for content generation pipeline
             topic = topic_data['topic']
             story_data = story_package['story_data']
-            
-            story_dir = Config.STORIES_DIR / sanitize_folder_name(topic)
-            story_dir.mkdir(parents=True, exist_ok=True)
-            
-            story_file = story_dir / "story.json"
-            with open(story_file, 'w', encoding='utf-8') as f:
-                json.dump(story_data, f, indent=2, ensure_ascii=False)
-            
-            self.logger.info(f"📄 Story data saved: {story_file}")
-            self.logger.info(f"🎵 Music category: {story_data.get('music_category', 'Unknown')}")
+            self._save_story_data(topic, story_data)
             
             # Run content generation pipeline with story data
-            content_success = test_complete_replicate_pipeline_whisper(
-                topic_name=topic,
-                logger=self.logger
-            )
+            content_success = self._run_content_stage(topic, story_data)
             
             if content_success:
                 # Run audio/video processing pipeline
-                video_success = process_video_for_topic(
-                    topic_name=topic,
-                    logger=self.logger
-                )
+                work_dir = Config.WORK_DIR / sanitize_folder_name(topic)
+                video_success = self._run_render_stage(topic, work_dir)
                 
                 if video_success:
                     self.logger.info(f"✅ Video created successfully: {topic}")
+                    shutil.rmtree(work_dir, ignore_errors=True)
                     
                     # Mark topic as used in history
                     from src.real_trending_fetcher import RealTrendingFetcher
@@ -448,7 +484,7 @@ class TrendingFullPipeline:
             print(f"⏱️ Total time: {total_time:.2f} seconds")
             print(f"📊 Trending topics: {len(self.trending_topics)}")
             print(f"📝 Summaries generated: {len(self.summary_packages)}")
-            print(f"🎬 Videos created: {len([s for s in self.step_timings.values() if s.get('success', False)])}")
+            print(f"🎬 Videos created: {len([r for r in self.video_results if r['status'] == 'SUCCESS'])}")
             print("="*60)
             
             return True
@@ -0,0 +1,273 @@
+"""
+AutoTube Batch Pipeline - Many Stories per Process
+Produces N videos in one run, pipelining stories across resources:
+while story k is being mixed/rendered/encoded on the CPU, story k+1's
+story, TTS and images are being generated over the network.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+# Import project-specific config
+from config import Config
+
+# Import pipeline components
+from partial_pipelines.content_generation_pipeline import test_complete_replicate_pipeline_whisper
+from partial_pipelines.audio_video_processor_pipeline import process_video_for_topic
+from src.llm.story_generator import BannedTopicIndex
+from src.utils.logger import configure_logging
+
+
+class BatchPipeline:
+    """Runs the full AutoTube pipeline over many topics with cross-story pipelining."""
+
+    def __init__(self, content_workers: Optional[int] = None, render_workers: Optional[int] = None,
+                 pending_renders: Optional[int] = None, encoder_profile: Optional[str] = None):
+        """
+        Args:
+            content_workers: Max stories in the network stage at once (API-bound)
+            render_workers: Max stories in the CPU stage at once (encoder-bound)
+            pending_renders: Max finished stories waiting for a render slot
+            encoder_profile: Encoder profile for every video writer
+        """
+        self.content_workers = max(1, content_workers or Config.BATCH.MAX_CONTENT_WORKERS)
+        self.render_workers = max(1, render_workers or Config.BATCH.MAX_RENDER_WORKERS)
+        self.pending_renders = max(0, pending_renders if pending_renders is not None else Config.BATCH.MAX_PENDING_RENDERS)
+        self.encoder_profile = encoder_profile or Config.RENDER.ENCODER_PROFILE
+
+        self.logger = None
+        self.results: List[Dict[str, Any]] = []
+        self.claimed_topics: List[str] = []
+        self._claim_lock = threading.Lock()
+        self.start_time = None
+
+    def setup_logging(self):
+        """Setup logging for the batch pipeline."""
+        fp_logs_dir = Config.OUTPUT_DIR / "fp_logs"
+        fp_logs_dir.mkdir(parents=True, exist_ok=True)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_path = fp_logs_dir / f"batch_pipeline_{timestamp}.log"
+
+        configure_logging(log_file=log_path, file_key="batch_pipeline")
+
+        self.logger = logging.getLogger("autotube.batch_pipeline")
+        self.logger.info(f"🚀 Starting AutoTube Batch Pipeline")
+        self.logger.info(f"📝 Log file: {log_path}")
+        return self.logger
+
+    def claim_topic(self, topic: str) -> bool:
+        """
+        Reserve a suggested topic for this batch (called from content worker threads).
+
+        Returns False when a concurrent story already claimed the same or a
+        near-duplicate topic, so the caller suggests another one.
+        """
+        with self._claim_lock:
+            if BannedTopicIndex(self.claimed_topics).contains(topic):
+                return False
+            self.claimed_topics.append(topic)
+            return True
+
+    def _run_content_stage(self, topic: Optional[str]) -> Dict[str, Any]:
+        """Run content generation for one story on its own event loop (worker thread)."""
+        summary: Dict[str, Any] = {}
+        with self._claim_lock:
+            exclude = list(self.claimed_topics) if topic is None else None
+        success = asyncio.run(test_complete_replicate_pipeline_whisper(
+            topic=topic,
+            exclude_topics=exclude,
+            summary=summary,
+            claim_topic=self.claim_topic if topic is None else None
+        ))
+        summary["success"] = bool(success)
+        return summary
+
+    def _run_render_stage(self, story_title: str, encode_stats: List[Dict]) -> bool:
+        """Run mixing, Ken Burns rendering and subtitles for one story (worker thread)."""
+        return process_video_for_topic(story_title, self.logger,
+                                       encoder_profile=self.encoder_profile,
+                                       encode_stats=encode_stats)
+
+    async def _produce_story(self, index: int, topic: Optional[str], slots: asyncio.Semaphore,
+                             content_pool: ThreadPoolExecutor, render_pool: ThreadPoolExecutor):
+        """Push one story through the network stage, then the CPU stage."""
+        loop = asyncio.get_running_loop()
+        record = {"index": index, "requested_topic": topic, "status": "FAILED"}
+        self.results.append(record)
+
+        # A slot bounds how far content generation can run ahead of rendering
+        await slots.acquire()
+        try:
+            content_start = time.time()
+            self.logger.info(f"🔄 [{index}] Content generation started: {topic or 'auto-suggested topic'}")
+            summary = await loop.run_in_executor(content_pool, self._run_content_stage, topic)
+            record["content_time"] = time.time() - content_start
+            record.update({k: v for k, v in summary.items() if k != "success"})
+
+            if not summary.get("success") or not summary.get("story_title"):
+                self.logger.error(f"❌ [{index}] Content generation failed")
+                return
+
+            self.logger.info(f"✅ [{index}] Content ready: {summary['story_title']} ({record['content_time']:.1f}s)")
+
+            render_queued = time.time()
+            record["encodes"] = []
+            # The slot is held until the render finishes: with every render worker busy,
+            # at most pending_renders stories can be generated ahead of them
+            video_success = await loop.run_in_executor(render_pool, self._run_render_stage,
+                                                       summary["story_title"], record["encodes"])
+            record["render_time"] = time.time() - render_queued
+            record["status"] = "SUCCESS" if video_success else "FAILED"
+
+            status = "✅" if video_success else "❌"
+            self.logger.info(f"{status} [{index}] Render finished: {summary['story_title']} ({record['render_time']:.1f}s)")
+        except Exception as e:
+            record["error"] = str(e)
+            self.logger.error(f"❌ [{index}] Story failed: {e}")
+        finally:
+            slots.release()
+
+    async def run_batch(self, topics: Optional[List[str]] = None, count: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Produce a batch of videos.
+
+        Args:
+            topics: Explicit topics to produce (one video each)
+            count: Number of auto-suggested topics to produce when topics is empty
+
+        Returns:
+            Throughput report dictionary
+        """
+        self.start_time = time.time()
+        cpu_start = os.times()
+        self.setup_logging()
+
+        planned: List[Optional[str]] = list(topics) if topics else [None] * (count or 1)
+        self.logger.info(f"🎬 Batch of {len(planned)} stories "
+                         f"(content workers: {self.content_workers}, render workers: {self.render_workers}, "
+                         f"pending renders: {self.pending_renders})")
+
+        slots = asyncio.Semaphore(self.render_workers + self.pending_renders)
+        with ThreadPoolExecutor(max_workers=self.content_workers, thread_name_prefix="content") as content_pool, \
+             ThreadPoolExecutor(max_workers=self.render_workers, thread_name_prefix="render") as render_pool:
+            await asyncio.gather(*[
+                self._produce_story(i + 1, topic, slots, content_pool, render_pool)
+                for i, topic in enumerate(planned)
+            ])
+
+        report = self.build_report(cpu_start)
+        report_path = self.save_batch_report(report)
+        self._print_summary(report, report_path)
+        return report
+
+    def build_report(self, cpu_start: os.times_result) -> Dict[str, Any]:
+        """Build the throughput report: videos/hour, CPU utilisation and cost."""
+        wall_time = time.time() - self.start_time
+        cpu_end = os.times()
+        # Own threads plus reaped ffmpeg children
+        cpu_time = ((cpu_end.user - cpu_start.user) + (cpu_end.system - cpu_start.system) +
+                    (cpu_end.children_user - cpu_start.children_user) +
+                    (cpu_end.children_system - cpu_start.children_system))
+        cpu_count = os.cpu_count() or 1
+
+        completed = [r for r in self.results if r["status"] == "SUCCESS"]
+        total_cost = sum(r.get("image_cost", 0.0) for r in self.results)
+
+        return {
+            "batch_info": {
+                "start_time": datetime.fromtimestamp(self.start_time).isoformat(),
+                "end_time": datetime.now().isoformat(),
+                "stories_planned": len(self.results),
+                "stories_completed": len(completed),
+                "content_workers": self.content_workers,
+                "render_workers": self.render_workers,
+                "pending_renders": self.pending_renders,
+                "encoder_profile": self.encoder_profile
+            },
+            "throughput": {
+                "wall_time": wall_time,
+                "videos_per_hour": len(completed) / wall_time * 3600 if wall_time > 0 else 0.0,
+                "cpu_time": cpu_time,
+                "cpu_count": cpu_count,
+                "cpu_utilisation": cpu_time / (wall_time * cpu_count) if wall_time > 0 else 0.0,
+                "total_cost": total_cost,
+                "cost_per_video": total_cost / len(completed) if completed else 0.0
+            },
+            "stories": sorted(self.results, key=lambda r: r["index"]),
+            "batch_status": "SUCCESS" if len(completed) == len(self.results) else "PARTIAL_SUCCESS" if completed else "FAILED"
+        }
+
+    def save_batch_report(self, report: Dict[str, Any]) -> Path:
+        """Save the batch report next to the full pipeline reports."""
+        fp_logs_dir = Config.OUTPUT_DIR / "fp_logs"
+        fp_logs_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = fp_logs_dir / f"batch_report_{timestamp}.json"
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+        self.logger.info(f"📊 Batch report saved: {report_path}")
+        return report_path
+
+    def _print_summary(self, report: Dict[str, Any], report_path: Path):
+        """Print the batch throughput summary."""
+        throughput = report["throughput"]
+        info = report["batch_info"]
+        print("\n🎉 Batch Pipeline Finished")
+        print("=" * 60)
+        print(f"📊 Videos: {info['stories_completed']}/{info['stories_planned']}")
+        print(f"⏱️ Wall time: {throughput['wall_time']:.1f}s")
+        print(f"🚀 Throughput: {throughput['videos_per_hour']:.2f} videos/hour")
+        print(f"🖥️ CPU utilisation: {throughput['cpu_utilisation']*100:.1f}% of {throughput['cpu_count']} cores")
+        print(f"💰 Cost: ${throughput['total_cost']:.4f} (${throughput['cost_per_video']:.4f}/video)")
+        print(f"📊 Report: {report_path}")
+        for story in report["stories"]:
+            status = "✅" if story["status"] == "SUCCESS" else "❌"
+            print(f"  {status} [{story['index']}] {story.get('story_title') or story.get('requested_topic') or 'N/A'}")
+
+
+async def main():
+    """Main function to run the batch pipeline."""
+    parser = argparse.ArgumentParser(description="AutoTube Batch Pipeline")
+    parser.add_argument("topics", nargs="*", help="Topics to produce (omit to auto-suggest)")
+    parser.add_argument("--count", type=int, default=1, help="Number of auto-suggested topics when no topics are given")
+    parser.add_argument("--content-workers", type=int, help="Max stories in the network stage at once")
+    parser.add_argument("--render-workers", type=int, help="Max stories rendering/encoding at once")
+    parser.add_argument("--pending-renders", type=int, help="Max finished stories waiting for a render slot")
+    parser.add_argument("--encoder-profile", choices=["draft", "preview", "production", "archival"],
+                        help="Encoder profile for all video writers")
+    args = parser.parse_args()
+
+    pipeline = BatchPipeline(
+        content_workers=args.content_workers,
+        render_workers=args.render_workers,
+        pending_renders=args.pending_renders,
+        encoder_profile=args.encoder_profile
+    )
+
+    try:
+        report = await pipeline.run_batch(topics=args.topics, count=args.count)
+        sys.exit(0 if report["batch_status"] == "SUCCESS" else 1)
+    except KeyboardInterrupt:
+        print("\n⚠️ Batch interrupted by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
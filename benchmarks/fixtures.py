@@ -0,0 +1,171 @@
+"""
+Synthetic benchmark fixtures
+Everything the hot paths need, generated offline and deterministically (no
+API keys, no downloads): 768x1344 JPEG scene images, speech-like narration,
+Whisper-style word timings that line up with it, and a small music library
+laid out like data/music (<Category>/*.wav).
+"""
+
+import json
+import wave
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+RATE = 44100
+IMAGE_SIZE = (768, 1344)
+MUSIC_CATEGORIES = ("Intense", "Somber", "Uplifting", "Mystery")
+
+# The narration is defined per 60 s of content and squeezed or stretched to any
+# duration: 4.2 syllables and 0.25 phrase cycles per second at that length
+_CONTENT_SECONDS = 60.0
+_SYLLABLES_PER_SECOND = 4.2
+_PHRASES_PER_SECOND = 0.25
+_WORDS = ("empire", "river", "soldiers", "marched", "north", "through", "winter", "the", "king",
+          "never", "returned", "gold", "vanished", "overnight", "nobody", "knew", "why", "until")
+
+
+def render_narration(seconds: float, rate: int = RATE) -> np.ndarray:
+    """Voiced 'speech': harmonics of a wandering pitch shaped by moving formants, in syllables and phrases."""
+    frames = int(seconds * rate)
+    u = np.arange(frames) / frames  # Normalised time: the same content at any duration
+    length = _CONTENT_SECONDS
+
+    f0 = 125 + 25 * np.sin(2 * np.pi * 7 * u) + 10 * np.sin(2 * np.pi * 53 * u)
+    phase = 2 * np.pi * np.cumsum(f0) / rate
+    formant_1 = 600 + 250 * np.sin(2 * np.pi * 41 * u)
+    formant_2 = 1700 + 500 * np.sin(2 * np.pi * 67 * u + 1.0)
+
+    voice = np.zeros(frames, dtype=np.float32)
+    for harmonic in range(1, 32):
+        frequency = harmonic * f0
+        weight = (np.exp(-((frequency - formant_1) / 150) ** 2)
+                  + 0.6 * np.exp(-((frequency - formant_2) / 200) ** 2) + 0.02 / harmonic)
+        voice += (weight * np.sin(harmonic * phase)).astype(np.float32)
+
+    syllables = np.clip(np.sin(2 * np.pi * _SYLLABLES_PER_SECOND * length * u), 0, None) ** 0.5
+    phrases = (np.sin(2 * np.pi * _PHRASES_PER_SECOND * length * u) > -0.8).astype(np.float32)
+    voice *= (syllables * phrases).astype(np.float32)
+    voice *= np.float32(0.3 / (np.abs(voice).max() + 1e-9))
+    return voice
+
+
+def narration_word_timings(seconds: float, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Canned Whisper output for render_narration(seconds): each word covers one to
+    three voiced syllables, and phrase pauses fall between words.
+    """
+    rng = np.random.default_rng(seed)
+    syllable_count = int(_SYLLABLES_PER_SECOND * _CONTENT_SECONDS)
+    # Syllable k is voiced over the positive half-cycle [k, k + 0.5] / count (normalised time)
+    starts = np.arange(syllable_count) / syllable_count
+    ends = starts + 0.5 / syllable_count
+    # A syllable is heard if the phrase gate is open anywhere in it, so pauses between words are silent
+    points = starts[:, None] + (ends - starts)[:, None] * np.linspace(0, 1, 9)
+    voiced = (np.sin(2 * np.pi * _PHRASES_PER_SECOND * _CONTENT_SECONDS * points) > -0.8).any(axis=1)
+
+    words = []
+    k = 0
+    while k < syllable_count:
+        if not voiced[k]:
+            k += 1
+            continue
+        span = int(rng.integers(1, 4))
+        last = k
+        while last + 1 < min(k + span, syllable_count) and voiced[last + 1]:
+            last += 1
+        words.append({
+            "word": f" {_WORDS[len(words) % len(_WORDS)]}",
+            "start": round(float(starts[k] * seconds), 3),
+            "end": round(float(ends[last] * seconds), 3),
+            "confidence": round(float(rng.uniform(0.8, 0.99)), 3),
+            "source": "fixture",
+        })
+        k = last + 1
+    return words
+
+
+def write_wav(path: Path, samples: np.ndarray, rate: int = RATE) -> Path:
+    """16-bit PCM WAV from float samples shaped (frames,) or (frames, channels)."""
+    samples = samples if samples.ndim == 2 else samples[:, None]
+    pcm = np.clip(np.rint(samples * 32767), -32768, 32767).astype("<i2")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(samples.shape[1])
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(pcm.tobytes())
+    return path
+
+
+def make_images(directory: Path, count: int = 12, seed: int = 0, size=IMAGE_SIZE) -> List[Path]:
+    """Scene-like JPEGs: smooth colour fields (upscaled noise) with fine grain, like generated art."""
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        coarse = Image.fromarray(rng.integers(0, 256, (size[1] // 32, size[0] // 32, 3), dtype=np.uint8))
+        base = np.asarray(coarse.resize(size, Image.BICUBIC), dtype=np.int16)
+        grain = rng.integers(-12, 13, base.shape, dtype=np.int16)
+        image = Image.fromarray(np.clip(base + grain, 0, 255).astype(np.uint8))
+        path = directory / f"scene_{i + 1:02d}.jpg"
+        image.save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def make_music_track(seconds: float, seed: int, rate: int = RATE) -> np.ndarray:
+    """Stereo chord pad with a slow swell and a soft pulse, shaped (frames, 2)."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    root = rng.choice([110.0, 130.8, 146.8, 164.8])
+    left = np.zeros_like(t)
+    for ratio in (1.0, 1.25, 1.5, 2.0):
+        left += np.sin(2 * np.pi * root * ratio * t + rng.uniform(0, 2 * np.pi)) / ratio
+    swell = 0.6 + 0.4 * np.sin(2 * np.pi * t / 8)
+    pulse = 1 + 0.15 * np.clip(np.sin(2 * np.pi * rng.uniform(1.5, 2.5) * t), 0, None)
+    left = left * swell * pulse
+    right = np.roll(left, int(0.012 * rate))
+    track = np.stack([left, right], axis=1)
+    return (0.5 * track / np.abs(track).max()).astype(np.float32)
+
+
+def make_music_library(directory: Path, tracks_per_category: int = 2, seconds: float = 30.0) -> List[Path]:
+    """A music library in the data/music layout: one folder per category of WAV tracks."""
+    paths = []
+    for c, category in enumerate(MUSIC_CATEGORIES):
+        for n in range(tracks_per_category):
+            path = directory / category / f"{category.lower()}_{n + 1}.wav"
+            paths.append(write_wav(path, make_music_track(seconds, seed=10 * c + n)))
+    return paths
+
+
+def build_fixtures(root: Path, seconds: float = 20.0, seed: int = 0) -> Dict[str, Any]:
+    """
+    Generate every fixture under root.
+
+    Returns:
+        Dictionary of paths and in-memory fixtures (narration samples, word timings)
+    """
+    root = Path(root)
+    narration = render_narration(seconds)
+    words = narration_word_timings(seconds, seed)
+    words_path = root / "word_timings.json"
+    words_path.parent.mkdir(parents=True, exist_ok=True)
+    words_path.write_text(json.dumps(words, indent=2), encoding="utf-8")
+
+    return {
+        "root": root,
+        "seconds": seconds,
+        "images": make_images(root / "images", seed=seed),
+        "image_dir": root / "images",
+        "narration": narration,
+        "narration_path": write_wav(root / "narration.wav", narration),
+        "word_timings": words,
+        "word_timings_path": words_path,
+        "music_dir": root / "music",
+        "music_tracks": make_music_library(root / "music"),
+    }
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the pipeline's hot paths.
+
+Builds synthetic fixtures (benchmarks/fixtures.py), times each hot path a few
+times and writes JSON results. Results can be saved as a baseline and later
+runs compared against it: a benchmark whose median time grows by more than the
+threshold is a regression and makes the run exit with status 1.
+
+Benchmarks:
+  compose_video        MoviePyVideoComposer.compose_video (Ken Burns render + encode)
+  subtitle_clips       create_viral_subtitle_clips from canned word timings
+  mix_audio            AudioMixer.mix_audio (loop, ducking, loudness, limiter)
+  music_index          Cold MusicIndex build of the synthetic library
+  banned_topic         StoryGenerator._contains_banned_topic over a used-topic list
+  av_stage             process_video_for_topic end to end (needs ffmpeg/ffprobe on
+                       PATH and a cached Whisper 'small' model, else skipped)
+
+Usage:
+  python benchmarks/run_benchmarks.py [--only mix_audio,subtitle_clips] [--repeat 3] [--seconds 20]
+  python benchmarks/run_benchmarks.py --save-baseline benchmarks/results/baseline.json
+  python benchmarks/run_benchmarks.py --baseline benchmarks/results/baseline.json [--threshold 0.2]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.fixtures import RATE, build_fixtures
+from src.utils.logger import configure_logging
+
+RESULTS_DIR = project_root / "benchmarks" / "results"
+# Differences below this are timer noise, whatever the relative change
+NOISE_FLOOR_S = 0.005
+# Benchmarks that produce fixture-length video also report seconds of video per second of work
+REALTIME_BENCHMARKS = ("compose_video", "av_stage")
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark whose prerequisites are missing on this machine."""
+
+
+# -- benchmarks: each takes the fixtures and a scratch dir and returns the callable to time,
+#    which may return extra metrics --------------------------------------------------------
+
+def bench_compose_video(fx: Dict[str, Any], work: Path, encoder_profile: str) -> Callable[[], Dict[str, Any]]:
+    from config import Config
+    from src.video_composition.moviepy_video_composer import MoviePyVideoComposer
+
+    def run():
+        output_dir = work / "compose"
+        shutil.rmtree(output_dir, ignore_errors=True)
+        composer = MoviePyVideoComposer(output_dir=output_dir, encoder_profile=encoder_profile)
+        video = composer.compose_video(
+            image_dir=str(fx["image_dir"]),
+            audio_file=str(fx["narration_path"]),
+            topic_name="benchmark",
+            output_filename="benchmark_kenburns.mp4",
+            num_images=12,
+            parallel_render=Config.RENDER.PARALLEL_SEGMENTS,
+            max_workers=Config.RENDER.SEGMENT_WORKERS or None
+        )
+        return {"video_mb": round(Path(video).stat().st_size / 2**20, 2)}
+    return run
+
+
+def bench_subtitle_clips(fx: Dict[str, Any], work: Path, encoder_profile: str) -> Callable[[], Dict[str, Any]]:
+    from src.video_composition.whisper_subtitle_processor import OptimizedWhisperViralSubtitleProcessor
+
+    def run():
+        # A new processor per run: its text cache starts cold, as it does for each video
+        processor = OptimizedWhisperViralSubtitleProcessor(encoder_profile=encoder_profile)
+        clips = processor.create_viral_subtitle_clips(fx["word_timings"], video_duration=fx["seconds"])
+        return {"clips": len(clips), "words": len(fx["word_timings"])}
+    return run
+
+
+def bench_mix_audio(fx: Dict[str, Any], work: Path, encoder_profile: str) -> Callable[[], Dict[str, Any]]:
+    import numpy as np
+    from pydub import AudioSegment
+    from src.audio_mixer import AudioMixer
+
+    pcm = np.clip(np.rint(fx["narration"] * 32767), -32768, 32767).astype("<i2")
+    voice = AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=RATE, channels=1).set_channels(2)
+    mixer = AudioMixer()
+    # Shorter than the narration, so the mix also exercises the music loop
+    music, music_lufs = mixer.load_music_file(str(fx["music_tracks"][0]))
+
+    def run():
+        mixed = mixer.mix_audio(voice, music, music_lufs=music_lufs, word_timings=fx["word_timings"])
+        return {"frames": int(mixed.frame_count())}
+    return run
+
+
+def bench_music_index(fx: Dict[str, Any], work: Path, encoder_profile: str) -> Callable[[], Dict[str, Any]]:
+    from src.utils.music_index import MusicIndex
+
+    def run():
+        index_dir = work / "music_index"
+        shutil.rmtree(index_dir, ignore_errors=True)
+        index = MusicIndex(fx["music_dir"], index_path=index_dir / "music_index.json", cache_dir=index_dir / "cache")
+        index.refresh()
+        return {"tracks": len(index.entries())}
+    return run
+
+
+def bench_banned_topic(fx: Dict[str, Any], work: Path, encoder_profile: str) -> Callable[[], Dict[str, Any]]:
+    from src.llm.story_generator import StoryGenerator
+
+    rng = random.Random(0)
+    subjects = ["Emperor", "Library", "Lighthouse", "Plague", "Siege", "Treasure", "Spy", "Queen", "Volcano",
+                "Expedition", "Pirate", "Monastery", "Cathedral", "Duel", "Shipwreck", "Heist", "Bridge", "Comet"]
+    places = ["Rome", "Alexandria", "Constantinople", "Kyoto", "Timbuktu", "Venice", "Petra", "Samarkand",
+              "Cusco", "Antwerp", "Novgorod", "Carthage", "Angkor", "Zanzibar", "Lisbon", "Babylon"]
+    eras = ["of 1347", "Nobody Remembers", "That Changed Everything", "Before the Fall", "in Winter",
+            "of the Last Dynasty", "at Midnight", "Lost for Centuries"]
+
+    def topic():
+        return f"The {rng.choice(subjects)} of {rng.choice(places)} {rng.choice(eras)}"
+
+    banned = {topic() for _ in range(1500)}
+    candidates = [topic() for _ in range(200)]
+    generator = StoryGenerator(api_key="offline-benchmark")
+
+    def run():
+        rejected = sum(generator._contains_banned_topic(candidate, banned) for candidate in candidates)
+        return {"candidates": len(candidates), "banned_topics": len(banned), "rejected": rejected}
+    return run
+
+
+def _av_stage_missing() -> Optional[str]:
+    """Why the end-to-end A/V stage cannot run here, or None."""
+    missing = [tool for tool in ("ffmpeg", "ffprobe") if shutil.which(tool) is None]
+    if missing:
+        return f"{' and '.join(missing)} not on PATH (pydub decodes the MP3 voiceover with them)"
+    hub = Path(os.getenv("HF_HOME", Path.home() / ".cache" / "huggingface")) / "hub"
+    if not (hub / "models--Systran--faster-whisper-small").exists() and not Path("./models/whisper-small").exists():
+        return "Whisper 'small' model is not cached (subtitles transcribe the mixed audio)"
+    return None
+
+
+def bench_av_stage(fx: Dict[str, Any], work: Path, encoder_profile: str) -> Callable[[], Dict[str, Any]]:
+    reason = _av_stage_missing()
+    if reason:
+        raise SkipBenchmark(reason)
+
+    from pydub import AudioSegment
+    from config import Config
+    from partial_pipelines.audio_video_processor_pipeline import process_video_for_topic
+    from src.utils.folder_utils import sanitize_folder_name
+
+    title = "Benchmark Story"
+    name = sanitize_folder_name(title)
+
+    def run():
+        output_dir = work / "output"
+        shutil.rmtree(output_dir, ignore_errors=True)
+        # The stage reads and writes everything under Config.OUTPUT_DIR
+        audio_dir = output_dir / "audio" / name
+        audio_dir.mkdir(parents=True)
+        AudioSegment.from_wav(str(fx["narration_path"])).export(str(audio_dir / f"audio_{name}.mp3"), format="mp3")
+        selection_dir = output_dir / "music_selections" / name
+        selection_dir.mkdir(parents=True)
+        (selection_dir / "music_selection.json").write_text(json.dumps(
+            {"story_title": title, "selected_music_file": str(fx["music_tracks"][0])}), encoding="utf-8")
+        shutil.copytree(fx["image_dir"], output_dir / "images" / name)
+
+        original_output = Config.OUTPUT_DIR
+        Config.OUTPUT_DIR = output_dir
+        try:
+            if not process_video_for_topic(title, logging.getLogger("benchmark.av_stage"),
+                                           encoder_profile=encoder_profile):
+                raise RuntimeError("process_video_for_topic failed")
+        finally:
+            Config.OUTPUT_DIR = original_output
+        final = output_dir / "subtitles_processed_video" / name / f"{name}_final.mp4"
+        return {"video_mb": round(final.stat().st_size / 2**20, 2)}
+    return run
+
+
+BENCHMARKS = {
+    "compose_video": bench_compose_video,
+    "subtitle_clips": bench_subtitle_clips,
+    "mix_audio": bench_mix_audio,
+    "music_index": bench_music_index,
+    "banned_topic": bench_banned_topic,
+    "av_stage": bench_av_stage,
+}
+
+
+# -- harness ---------------------------------------------------------------------------------
+
+def time_benchmark(name: str, fx: Dict[str, Any], work: Path, repeat: int, encoder_profile: str) -> Dict[str, Any]:
+    """Median/min/max seconds over `repeat` runs (after setup), plus the last run's extra metrics."""
+    # The code under test prints progress and debug lines; keep them out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            run = BENCHMARKS[name](fx, work, encoder_profile)
+        except SkipBenchmark as e:
+            return {"skipped": str(e)}
+
+        times, extra = [], {}
+        for _ in range(repeat):
+            start = time.perf_counter()
+            extra = run() or {}
+            times.append(time.perf_counter() - start)
+    result = {
+        "median_s": round(statistics.median(times), 4),
+        "min_s": round(min(times), 4),
+        "max_s": round(max(times), 4),
+        "runs": repeat,
+    }
+    if name in REALTIME_BENCHMARKS:
+        result["realtime_factor"] = round(fx["seconds"] / result["median_s"], 2)
+    result.update(extra)
+    return result
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> Dict[str, Dict[str, Any]]:
+    """Relative change of each benchmark's median against the baseline; flags regressions."""
+    comparison = {}
+    for name, result in results["results"].items():
+        base = baseline.get("results", {}).get(name, {})
+        if "median_s" not in result or "median_s" not in base:
+            continue
+        change = result["median_s"] / base["median_s"] - 1 if base["median_s"] > 0 else 0.0
+        regression = change > threshold and result["median_s"] - base["median_s"] > NOISE_FLOOR_S
+        comparison[name] = {"baseline_s": base["median_s"], "current_s": result["median_s"],
+                            "change": round(change, 4), "regression": regression}
+    return comparison
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the AutoTube hot paths")
+    parser.add_argument("--only", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (median is reported)")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Narration/video length of the fixtures")
+    parser.add_argument("--encoder-profile", default="draft", help="Encoder profile for the video benchmarks")
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="Compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown vs. baseline (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", help="Also write the results to this baseline path")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+    # Quiet while timing; callers running in the same process (the test suite) get their level back
+    previous_level = logging.getLogger().level
+    configure_logging(level=logging.WARNING)
+    try:
+        return _run_benchmarks(args, names)
+    finally:
+        configure_logging(level=previous_level)
+
+
+def _run_benchmarks(args, names) -> int:
+    """Build the fixtures, time the selected benchmarks, compare and save the results."""
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "fixture_seconds": args.seconds,
+            "encoder_profile": args.encoder_profile,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="autotube_bench_") as tmp:
+        print(f"🧪 Building fixtures ({args.seconds:.0f}s narration, 12 images, music library)...")
+        start = time.perf_counter()
+        fx = build_fixtures(Path(tmp) / "fixtures", seconds=args.seconds)
+        print(f"   Done in {time.perf_counter() - start:.1f}s")
+
+        from config import Config
+        original_library = Config.MUSIC.LIBRARY_DIR
+        Config.MUSIC.LIBRARY_DIR = fx["music_dir"]  # The mixer's index lookups use the synthetic library
+        try:
+            for name in names:
+                work = Path(tmp) / name
+                work.mkdir()
+                print(f"⏱️ {name}...", end=" ", flush=True)
+                result = time_benchmark(name, fx, work, args.repeat, args.encoder_profile)
+                results["results"][name] = result
+                if "skipped" in result:
+                    print(f"skipped ({result['skipped']})")
+                else:
+                    print(f"{result['median_s']:.3f}s median ({result['min_s']:.3f}-{result['max_s']:.3f}s)")
+        finally:
+            Config.MUSIC.LIBRARY_DIR = original_library
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        comparison = compare(results, baseline, args.threshold)
+        results["comparison"] = {"baseline": args.baseline, "threshold": args.threshold, "benchmarks": comparison}
+        print(f"\n📊 Against {args.baseline} (threshold +{args.threshold:.0%}):")
+        for name, entry in comparison.items():
+            marker = "❌" if entry["regression"] else "✅"
+            print(f"   {marker} {name:<16} {entry['baseline_s']:.3f}s → {entry['current_s']:.3f}s ({entry['change']:+.1%})")
+        if any(entry["regression"] for entry in comparison.values()):
+            status = 1
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d_%H%M%S}.json"
+    for path in filter(None, [output, args.save_baseline]):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved: {path}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Time-stretch benchmark: WSOLA vs librosa (phase vocoder) vs pydub speedup
+on 60 s of synthetic narration.
+
+The narration is rendered from parameter tracks (pitch contour, formants,
+syllable envelope, pauses) over normalised time, so the ideal result of a
+tempo change is the same narration rendered at the shorter duration. Quality
+is the log-spectral distance (dB) to that reference - lower is better.
+
+Usage: python benchmarks/time_stretch_benchmark.py [--seconds 60] [--speed 1.25]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.fixtures import RATE, render_narration
+from src.utils.time_stretch import wsola
+
+
+def log_spectral_distance(test: np.ndarray, reference: np.ndarray, n_fft: int = 2048, hop: int = 512) -> float:
+    """Mean log-spectral distance in dB over frames where the reference is not silent."""
+    length = min(test.shape[0], reference.shape[0])
+    window = np.hanning(n_fft).astype(np.float32)
+
+    def spectrogram(signal):
+        frames = np.lib.stride_tricks.sliding_window_view(signal[:length], n_fft)[::hop]
+        return 20 * np.log10(np.abs(np.fft.rfft(frames * window, axis=1)) + 1e-6)
+
+    test_db, reference_db = spectrogram(test), spectrogram(reference)
+    voiced = reference_db.max(axis=1) > reference_db.max() - 40
+    # Compare the top 60 dB of each reference frame (ignore the numerical noise floor)
+    floor = reference_db.max(axis=1, keepdims=True) - 60
+    difference = np.maximum(test_db, floor) - np.maximum(reference_db, floor)
+    return float(np.sqrt(np.mean(difference[voiced] ** 2, axis=1)).mean())
+
+
+def run_wsola(signal, speed):
+    return wsola(signal, RATE, speed)
+
+
+def run_librosa(signal, speed):
+    import librosa
+    return librosa.effects.time_stretch(signal, rate=speed)
+
+
+def run_pydub(signal, speed):
+    from pydub import AudioSegment
+    pcm = np.clip(np.rint(signal * 32767), -32768, 32767).astype('<i2')
+    audio = AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=RATE, channels=1)
+    sped_up = audio.speedup(playback_speed=speed)
+    return np.frombuffer(sped_up.raw_data, dtype='<i2').astype(np.float32) / 32768.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark time-stretch engines on synthetic narration")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Narration length")
+    parser.add_argument("--speed", type=float, default=1.25, help="Tempo factor (1.25 = 25%% faster)")
+    args = parser.parse_args()
+
+    print(f"🎙️ Rendering {args.seconds:.0f}s narration and its {args.speed}x reference...")
+    narration = render_narration(args.seconds)
+    reference = render_narration(args.seconds / args.speed)
+
+    engines = [("WSOLA", run_wsola), ("librosa", run_librosa), ("pydub speedup", run_pydub)]
+    print(f"\n{'Engine':<16}{'Time':>10}{'x realtime':>12}{'Length error':>14}{'LSD (dB)':>10}")
+    for name, engine in engines:
+        try:
+            start = time.perf_counter()
+            stretched = engine(narration, args.speed)
+            elapsed = time.perf_counter() - start
+        except ImportError as e:
+            print(f"{name:<16}{'skipped':>10}  ({e})")
+            continue
+        length_error_ms = (stretched.shape[0] - reference.shape[0]) / RATE * 1000
+        distance = log_spectral_distance(stretched, reference)
+        print(f"{name:<16}{elapsed:>9.2f}s{args.seconds / elapsed:>11.0f}x{length_error_ms:>12.1f}ms{distance:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,103 @@ class OPENAI:
     API_KEY = os.getenv('OPENAI_API_KEY', '')
     MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
 
+# Batch pipeline settings
+class BATCH:
+    # Stories allowed in the network stage (LLM, TTS, Whisper sync, images) at once
+    MAX_CONTENT_WORKERS = int(os.getenv('BATCH_MAX_CONTENT_WORKERS', 2))
+    # Stories allowed in the CPU stage (mixing, Ken Burns, subtitles, encoding) at once
+    MAX_RENDER_WORKERS = int(os.getenv('BATCH_MAX_RENDER_WORKERS', 1))
+    # Finished stories allowed to wait for a render slot before content generation pauses
+    MAX_PENDING_RENDERS = int(os.getenv('BATCH_MAX_PENDING_RENDERS', 1))
+
+# Video rendering settings
+class RENDER:
+    # Encoder profile for every video writer: draft, preview, production, archival
+    ENCODER_PROFILE = os.getenv('ENCODER_PROFILE', 'production')
+    # Render Ken Burns segments in a process pool and join them without re-encoding
+    PARALLEL_SEGMENTS = os.getenv('RENDER_PARALLEL_SEGMENTS', 'false').lower() == 'true'
+    # Process pool size for segment rendering (0 = one per CPU core)
+    SEGMENT_WORKERS = int(os.getenv('RENDER_SEGMENT_WORKERS', 0))
+    # Subtitle word timing: 'aligned' force-aligns the known story text (falls back to transcription), 'transcribe' always transcribes
+    SUBTITLE_TIMING = os.getenv('SUBTITLE_TIMING', 'aligned').lower()
+
+# Background music library settings
+class MUSIC:
+    # One folder per category (Intense, Somber, Uplifting, Mystery)
+    LIBRARY_DIR = DATA_DIR / "music"
+    # Pre-decoded track cache and index are built at the mixer's format
+    SAMPLE_RATE = 44100
+    # Use the music index (cached samples, precomputed loudness) instead of decoding tracks per mix
+    USE_INDEX = os.getenv('MUSIC_USE_INDEX', 'true').lower() == 'true'
+    # Crossfade at the seam when a track is looped under a longer voiceover
+    LOOP_CROSSFADE_MS = int(os.getenv('MUSIC_LOOP_CROSSFADE_MS', '1000'))
+    # Frames mixed per block (looped music is generated one block at a time)
+    MIX_BLOCK_FRAMES = 65536
+
+# Final mix loudness settings
+class AUDIO:
+    # Integrated loudness of the finished mix (YouTube/streaming normalisation target)
+    TARGET_LUFS = float(os.getenv('AUDIO_TARGET_LUFS', -14.0))
+    # Music bed level relative to the voiceover (between phrases, when ducking)
+    MUSIC_BED_LU = float(os.getenv('AUDIO_MUSIC_BED_LU', -12.0))
+    # True-peak ceiling enforced by the limiter
+    TRUE_PEAK_CEILING_DB = float(os.getenv('AUDIO_TRUE_PEAK_CEILING_DB', -1.0))
+    # Sidechain ducking: pull the music down further while the voice is speaking
+    DUCKING = os.getenv('AUDIO_DUCKING', 'true').lower() == 'true'
+    DUCK_DEPTH_DB = float(os.getenv('AUDIO_DUCK_DEPTH_DB', 8.0))
+    DUCK_THRESHOLD_DB = float(os.getenv('AUDIO_DUCK_THRESHOLD_DB', -40.0))
+    DUCK_ATTACK_MS = float(os.getenv('AUDIO_DUCK_ATTACK_MS', 80.0))
+    DUCK_RELEASE_MS = float(os.getenv('AUDIO_DUCK_RELEASE_MS', 400.0))
+
+# Render worker settings (long-lived process fed from a local job queue)
+class WORKER:
+    # SQLite job queue shared by every project in this repository
+    QUEUE_PATH = Path(os.getenv('RENDER_WORKER_QUEUE', str(OUTPUT_DIR / "worker" / "jobs.db")))
+    # Seconds between queue polls while idle
+    POLL_SECONDS = float(os.getenv('RENDER_WORKER_POLL_SECONDS', 1.0))
+    # Load the Whisper models and music index when a project process starts
+    PRELOAD_MODELS = os.getenv('RENDER_WORKER_PRELOAD', 'true').lower() == 'true'
+
+# Stage profiler settings (opt-in; results go into the full pipeline report)
+class PROFILING:
+    ENABLED = os.getenv('PROFILE_PIPELINE', 'false').lower() == 'true'
+    # Stack sampling interval for the collapsed-stack (flamegraph) export
+    SAMPLE_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', 5.0))
+    # Trace Python allocations per stage (slows allocation-heavy stages down)
+    TRACEMALLOC = os.getenv('PROFILE_TRACEMALLOC', 'true').lower() == 'true'
+    TOP_ALLOCATORS = int(os.getenv('PROFILE_TOP_ALLOCATORS', '10'))
+    # Write a cProfile .prof file per stage
+    CPROFILE = os.getenv('PROFILE_CPROFILE', 'false').lower() == 'true'
+
+# Topic history settings
+class TOPICS:
+    # Near-duplicate index (MinHash LSH over topic words) stored next to topic_history.json
+    LSH_NUM_PERM = int(os.getenv('TOPIC_LSH_NUM_PERM', '128'))
+    # Jaccard similarity the bands are tuned for; word overlap >= 0.8 means Jaccard >= 0.67
+    LSH_THRESHOLD = float(os.getenv('TOPIC_LSH_THRESHOLD', '0.5'))
+    # 0-1: weight of missed near-duplicates vs extra candidates (higher = better recall, more candidates)
+    LSH_FALSE_NEGATIVE_WEIGHT = float(os.getenv('TOPIC_LSH_FALSE_NEGATIVE_WEIGHT', '0.8'))
+    # Topic suggestions requested concurrently per round; the first acceptable one wins (1 = one at a time)
+    SUGGESTION_CANDIDATES = int(os.getenv('TOPIC_SUGGESTION_CANDIDATES', '3'))
+
+# Story prefetch settings (stories generated ahead of time while the render worker is idle)
+class PREFETCH:
+    # Stories kept ready for the content stage (0 = no backlog)
+    BACKLOG_SIZE = int(os.getenv('STORY_BACKLOG_SIZE', 2))
+    # Hours a prefetched story stays usable
+    TTL_HOURS = float(os.getenv('STORY_BACKLOG_TTL_HOURS', 48))
+    # SQLite store shared by the worker that fills it and the pipelines that take from it
+    STORE_PATH = Path(os.getenv('STORY_BACKLOG_PATH', str(OUTPUT_DIR / "prefetch" / "stories.db")))
+    # Seconds the render worker queue must be empty before it refills the backlog
+    IDLE_SECONDS = float(os.getenv('STORY_BACKLOG_IDLE_SECONDS', 30))
+
+# Logging settings (one queue-based setup shared by every entry point)
+class LOGGING:
+    LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    # Log files as structured JSON lines ('json') or the classic text format ('text')
+    FILE_FORMAT = os.getenv('LOG_FILE_FORMAT', 'json').lower()
+    CONSOLE = os.getenv('LOG_CONSOLE', 'true').lower() == 'true'
+
 # Main config class
 class Config:
     OUTPUT_DIR = OUTPUT_DIR
@@ -41,6 +138,15 @@ class Config:
     API = API
     RUNPOD = RUNPOD
     OPENAI = OPENAI
+    BATCH = BATCH
+    RENDER = RENDER
+    MUSIC = MUSIC
+    AUDIO = AUDIO
+    WORKER = WORKER
+    PROFILING = PROFILING
+    LOGGING = LOGGING
+    TOPICS = TOPICS
+    PREFETCH = PREFETCH
 
 # Paths for easy access
 PATHS = {
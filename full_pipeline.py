@@ -24,16 +24,23 @@ from config import Config, PATHS
 from partial_pipelines.content_generation_pipeline import test_complete_replicate_pipeline_whisper
 from partial_pipelines.audio_video_processor_pipeline import process_video_for_topic
 from src.utils.folder_utils import sanitize_folder_name, setup_logging_with_file
+from src.utils.logger import configure_logging, log_volume, reset_log_volume
+from src.utils.profiler import StageProfiler, set_profiler, profile_span
 
 class FullPipeline:
     """Complete AutoTube pipeline from story generation to final video."""
     
-    def __init__(self):
+    def __init__(self, encoder_profile: str = None, profile: bool = None, cprofile: bool = None):
         self.start_time = None
         self.step_timings = {}
         self.logger = None
         self.story_title = None
         self.sanitized_title = None
+        self.encoder_profile = encoder_profile or Config.RENDER.ENCODER_PROFILE
+        self.encode_stats = []
+        self.profile = Config.PROFILING.ENABLED if profile is None else profile
+        self.cprofile = Config.PROFILING.CPROFILE if cprofile is None else cprofile
+        self.profiler = None
         
     def setup_logging(self):
         """Setup logging for the full pipeline."""
@@ -46,15 +53,9 @@ class FullPipeline:
         log_filename = f"full_pipeline_{timestamp}.log"
         log_path = fp_logs_dir / log_filename
         
-        # Setup logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_path, encoding='utf-8'),
-                logging.StreamHandler()  # Also log to console
-            ]
-        )
+        # Setup logging (queue-based: file and console writes happen on the listener thread)
+        configure_logging(log_file=log_path, file_key="full_pipeline")
+        reset_log_volume()
         
         self.logger = logging.getLogger("autotube.full_pipeline")
         self.logger.info(f"🚀 Starting AutoTube Full Pipeline")
@@ -100,6 +101,8 @@ class FullPipeline:
         total_time = time.time() - self.start_time
         successful_steps = sum(1 for step in self.step_timings.values() if step.get("success", False))
         total_steps = len(self.step_timings)
+        fp_logs_dir = Config.OUTPUT_DIR / "fp_logs"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         report = {
             "pipeline_info": {
@@ -113,13 +116,19 @@ class FullPipeline:
                 "success_rate": f"{(successful_steps/total_steps)*100:.1f}%" if total_steps > 0 else "0%"
             },
             "step_timings": self.step_timings,
+            "encoding": {
+                "encoder_profile": self.encoder_profile,
+                "encodes": self.encode_stats,
+                "total_encode_time": sum(e["encode_time"] for e in self.encode_stats)
+            },
             "output_files": self._get_output_files(),
+            "profile": self._get_profile_report(fp_logs_dir, timestamp),
+            # Log records and message bytes per stage and level (spots stages that log in hot loops)
+            "log_volume": log_volume(),
             "pipeline_status": "SUCCESS" if successful_steps == total_steps else "PARTIAL_SUCCESS" if successful_steps > 0 else "FAILED"
         }
         
         # Save report
-        fp_logs_dir = Config.OUTPUT_DIR / "fp_logs"
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_filename = f"pipeline_report_{self.sanitized_title}_{timestamp}.json"
         report_path = fp_logs_dir / report_filename
         
@@ -129,6 +138,37 @@ class FullPipeline:
         self.logger.info(f"📊 Pipeline report saved: {report_path}")
         return report_path
     
+    def start_profiler(self):
+        """Install a stage profiler for this run (spans in the partial pipelines report to it)."""
+        cprofile_dir = None
+        if self.cprofile:
+            cprofile_dir = Config.OUTPUT_DIR / "fp_logs" / "profiles" / datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.profiler = set_profiler(StageProfiler(
+            sample_interval_ms=Config.PROFILING.SAMPLE_INTERVAL_MS,
+            trace_allocations=Config.PROFILING.TRACEMALLOC,
+            top_allocators=Config.PROFILING.TOP_ALLOCATORS,
+            cprofile_dir=cprofile_dir
+        ))
+        self.logger.info(f"🔬 Stage profiling enabled" + (f" (cProfile dumps: {cprofile_dir})" if cprofile_dir else ""))
+    
+    def stop_profiler(self):
+        """Stop sampling and restore the disabled default profiler."""
+        if self.profiler:
+            self.profiler.stop()
+            set_profiler(None)
+    
+    def _get_profile_report(self, fp_logs_dir: Path, timestamp: str) -> dict:
+        """Stage spans plus the collapsed-stack file for flamegraph tools (None when profiling is off)."""
+        if not self.profiler:
+            return None
+        
+        self.profiler.stop()
+        profile = self.profiler.report()
+        collapsed_path = fp_logs_dir / f"pipeline_profile_{self.sanitized_title}_{timestamp}.folded"
+        profile["collapsed_stacks"] = str(self.profiler.write_collapsed(collapsed_path))
+        self.logger.info(f"🔥 Collapsed stacks for flamegraphs: {collapsed_path}")
+        return profile
+    
     def _get_output_files(self) -> dict:
         """Get list of output files created during the pipeline."""
         if not self.sanitized_title:
@@ -176,7 +216,8 @@ class FullPipeline:
             self.log_step_start("Content Generation")
             
             # Run the content generation pipeline
-            success = await test_complete_replicate_pipeline_whisper()
+            with profile_span("content"):
+                success = await test_complete_replicate_pipeline_whisper()
             
             if success:
                 # Extract story title from the generated content
@@ -220,7 +261,10 @@ class FullPipeline:
             self.log_step_start("Audio/Video Processing")
             
             # Run the audio/video processing pipeline
-            success = process_video_for_topic(self.story_title, self.logger)
+            with profile_span("video"):
+                success = process_video_for_topic(self.story_title, self.logger,
+                                                  encoder_profile=self.encoder_profile,
+                                                  encode_stats=self.encode_stats)
             
             self.log_step_end("Audio/Video Processing", success)
             return success
@@ -243,6 +287,9 @@ class FullPipeline:
         print("\n🎬 AutoTube Full Pipeline - Complete Content to Video")
         print("=" * 60)
         
+        if self.profile:
+            self.start_profiler()
+        
         # Step 1: Content Generation
         self.log_step_start("Content Generation")
         content_success = await self.run_content_generation()
@@ -250,6 +297,7 @@ class FullPipeline:
         if not content_success:
             self.logger.error("❌ Content generation failed - stopping pipeline")
             self.log_step_end("Full Pipeline", False)
+            self.stop_profiler()
             return False
         
         # Step 2: Audio/Video Processing
@@ -259,6 +307,7 @@ class FullPipeline:
         if not video_success:
             self.logger.error("❌ Audio/video processing failed")
             self.log_step_end("Full Pipeline", False)
+            self.stop_profiler()
             return False
         
         # Pipeline completed successfully
@@ -267,6 +316,7 @@ class FullPipeline:
         
         # Save comprehensive report
         report_path = self.save_pipeline_report()
+        self.stop_profiler()
         
         # Final summary
         self.logger.info("🎉 Full Pipeline Completed Successfully!")
@@ -296,7 +346,18 @@ class FullPipeline:
 
 async def main():
     """Main function to run the full pipeline."""
-    pipeline = FullPipeline()
+    import argparse
+    parser = argparse.ArgumentParser(description="AutoTube Full Pipeline")
+    parser.add_argument("--encoder-profile", choices=["draft", "preview", "production", "archival"],
+                        help="Encoder profile for all video writers (default: ENCODER_PROFILE or production)")
+    parser.add_argument("--profile", action="store_true", default=None,
+                        help="Profile each stage (wall/CPU time, peak RSS, top allocators, flamegraph stacks)")
+    parser.add_argument("--cprofile", action="store_true", default=None,
+                        help="Also write a cProfile dump per stage (implies --profile)")
+    args = parser.parse_args()
+    
+    pipeline = FullPipeline(encoder_profile=args.encoder_profile,
+                            profile=True if args.cprofile else args.profile, cprofile=args.cprofile)
     
     try:
         success = await pipeline.run_full_pipeline()
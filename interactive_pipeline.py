@@ -31,8 +31,11 @@ from src.video_composition.whisper_subtitle_processor import OptimizedWhisperVir
 class InteractivePipeline:
     """Interactive pipeline for generating videos from user-provided topics."""
     
-    def __init__(self):
+    def __init__(self, encoder_profile: Optional[str] = None):
         self.logger = setup_logging_with_file("interactive_pipeline", "interactive")
+        # Encoder profile for video writers ('draft' = ultrafast, half resolution review renders)
+        self.encoder_profile = encoder_profile or Config.RENDER.ENCODER_PROFILE
+        self.encode_stats = []
         self.story_generator = StoryGenerator()
         self.music_selector = MusicSelector()
         self.image_generator = OptimizedReplicateImageGenerator()
@@ -354,9 +357,10 @@ class InteractivePipeline:
             self.logger.error(f"Audio mixing failed: {e}")
             raise
     
-    def create_video(self, topic: str, mixed_audio_path: str, sanitized_name: str) -> str:
+    def create_video(self, topic: str, mixed_audio_path: str, sanitized_name: str, encoder_profile: Optional[str] = None) -> str:
         """Create Ken Burns video with images and audio using high-quality processing."""
-        print(f"\n🎬 Creating video for: {topic}")
+        encoder_profile = encoder_profile or self.encoder_profile
+        print(f"\n🎬 Creating video for: {topic} ({encoder_profile} profile)")
         
         try:
             # Create videos directory
@@ -367,7 +371,7 @@ class InteractivePipeline:
             image_dir = Config.OUTPUT_DIR / "images" / sanitized_name
             
             # Use existing video composer (now includes strict duration matching)
-            composer = MoviePyVideoComposer(output_dir=videos_dir, logger=self.logger)
+            composer = MoviePyVideoComposer(output_dir=videos_dir, logger=self.logger, encoder_profile=encoder_profile)
             
             video_path = composer.compose_video(
                 image_dir=image_dir,
@@ -377,6 +381,7 @@ class InteractivePipeline:
                 enable_ken_burns=True,
                 num_images=12
             )
+            self._record_encodes(composer.encode_stats)
             
             if not video_path or not Path(video_path).exists():
                 raise Exception("Video creation failed")
@@ -418,9 +423,11 @@ class InteractivePipeline:
             self.logger.error(f"Video creation failed: {e}")
             raise
     
-    def add_subtitles(self, topic: str, video_path: str, mixed_audio_path: str, story_path: str, sanitized_name: str) -> str:
+    def add_subtitles(self, topic: str, video_path: str, mixed_audio_path: str, story_path: str, sanitized_name: str,
+                      encoder_profile: Optional[str] = None) -> str:
         """Add viral subtitles to the video with high-quality audio preservation."""
-        print(f"\n📝 Adding subtitles for: {topic}")
+        encoder_profile = encoder_profile or self.encoder_profile
+        print(f"\n📝 Adding subtitles for: {topic} ({encoder_profile} profile)")
         
         try:
             # Create subtitles directory
@@ -430,7 +437,7 @@ class InteractivePipeline:
             final_video_path = subtitles_dir / f"{sanitized_name}_final.mp4"
             
             # Use existing subtitle processor (now includes strict audio preservation)
-            subtitle_processor = OptimizedWhisperViralSubtitleProcessor(logger=self.logger)
+            subtitle_processor = OptimizedWhisperViralSubtitleProcessor(logger=self.logger, encoder_profile=encoder_profile)
             
             final_video = subtitle_processor.add_viral_subtitles_to_video(
                 video_path=video_path,
@@ -438,6 +445,7 @@ class InteractivePipeline:
                 output_path=final_video_path,
                 story_path=story_path
             )
+            self._record_encodes(subtitle_processor.encode_stats)
             
             if not final_video or not Path(final_video).exists():
                 raise Exception("Subtitle processing failed")
@@ -642,6 +650,26 @@ class InteractivePipeline:
             print(f"⚠️ Quality verification failed: {e}")
             self.logger.error(f"Quality verification failed: {e}")
     
+    def _record_encodes(self, encode_stats: List[Dict[str, Any]]):
+        """Keep per-profile encode time and file size for the run summary."""
+        for stats in encode_stats:
+            self.encode_stats.append(stats)
+            print(f"⏱️ {stats['stage']} encode ({stats['profile']}): {stats['encode_time']:.1f}s, "
+                  f"{stats['file_size']/1024/1024:.1f} MB")
+    
+    def review_draft(self, topic: str, video_path: str, final_video_path: str, mixed_audio_path: str,
+                     story_path: str, sanitized_name: str) -> str:
+        """Offer to re-render an approved draft at production quality (reuses audio and images)."""
+        print(f"\n👀 Draft ready for review: {final_video_path}")
+        answer = input("Render the production version now? (y/N): ").strip().lower()
+        if answer not in ('y', 'yes'):
+            print("📝 Keeping draft render - re-run without --draft when ready")
+            return final_video_path
+        
+        video_path = self.create_video(topic, mixed_audio_path, sanitized_name, encoder_profile='production')
+        return self.add_subtitles(topic, video_path, mixed_audio_path, story_path, sanitized_name,
+                                  encoder_profile='production')
+    
     async def run_pipeline(self, topic: str) -> bool:
         """Run the complete interactive pipeline."""
         start_time = time.time()
@@ -685,6 +713,11 @@ class InteractivePipeline:
             # Step 10: Add viral subtitles (same as full pipeline)
             final_video_path = self.add_subtitles(topic, video_path, mixed_audio_path, story_path, sanitized_name)
             
+            # Draft renders are for review - optionally follow up with the production encode
+            if self.encoder_profile == 'draft':
+                final_video_path = self.review_draft(topic, video_path, final_video_path, mixed_audio_path,
+                                                     story_path, sanitized_name)
+            
             # Success!
             total_time = time.time() - start_time
             
@@ -693,6 +726,9 @@ class InteractivePipeline:
             print(f"📊 Topic: {topic}")
             print(f"📊 Total time: {total_time:.1f} seconds")
             print(f"📊 Final video: {final_video_path}")
+            for stats in self.encode_stats:
+                print(f"📊 {stats['stage']} encode ({stats['profile']}): {stats['encode_time']:.1f}s, "
+                      f"{stats['file_size']/1024/1024:.1f} MB")
             
             # Show file sizes
             if Path(final_video_path).exists():
@@ -726,8 +762,16 @@ class InteractivePipeline:
 
 async def main():
     """Main function to run the interactive pipeline."""
+    import argparse
+    parser = argparse.ArgumentParser(description="AutoTube Interactive Pipeline")
+    parser.add_argument("--draft", action="store_true",
+                        help="Fast review render (ultrafast, half resolution)")
+    parser.add_argument("--encoder-profile", choices=["draft", "preview", "production", "archival"],
+                        help="Encoder profile for all video writers")
+    args = parser.parse_args()
+    
     try:
-        pipeline = InteractivePipeline()
+        pipeline = InteractivePipeline(encoder_profile="draft" if args.draft else args.encoder_profile)
         
         # Get topic from user
         topic = pipeline.get_user_topic()
@@ -1,9 +1,10 @@
 import os
 import sys
 import json
+import time
 from pathlib import Path
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 
 # Add project root to path to access src modules (use project's own src directory)
 project_root = Path(__file__).parent
@@ -14,12 +15,32 @@ from config import Config, PATHS
 
 from src.video_composition.moviepy_video_composer import MoviePyVideoComposer
 from src.video_composition.whisper_subtitle_processor import OptimizedWhisperViralSubtitleProcessor
+from src.video_composition.utils.quality_optimizer import QualityOptimizer
+from src.video_composition.utils.ffmpeg_utils import stream_copy_trim
 from src.utils.folder_utils import sanitize_folder_name, setup_logging_with_file
+from src.utils.profiler import profile_span
 
 # Set up output directory for this project
 # Use Config.OUTPUT_DIR directly instead of creating a local variable
 
-def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] = None) -> bool:
+def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] = None,
+                            encoder_profile: Optional[str] = None,
+                            encode_stats: Optional[List[Dict]] = None) -> bool:
+    """
+    Mix audio, render the Ken Burns video and burn in subtitles for a topic.
+    
+    Args:
+        topic_name: Story title (sanitized internally for folder names)
+        logger: Optional logger (a per-topic file logger is created if None)
+        encoder_profile: Encoder profile for every video writer (None = Config.RENDER.ENCODER_PROFILE)
+        encode_stats: Optional list that receives one encode-time/file-size record per written video
+        
+    Returns:
+        True if the final video was created successfully
+    """
+    encoder_profile = QualityOptimizer.get_encoder_profile(encoder_profile or Config.RENDER.ENCODER_PROFILE)['name']
+    if encode_stats is None:
+        encode_stats = []
     if not logger:
         logger = setup_logging_with_file(topic_name, "audio_video")
     
@@ -71,7 +92,8 @@ def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] =
     mixed_audio_path = mixed_audio_dir / f"mixed_audio_{sanitized_name}.mp3"
     
     logger.info(f"🎚️ Mixing TTS with background music...")
-    result_path = mixer.mix_story_audio(source_audio_path, music_file, mixed_audio_path)
+    with profile_span("mix"):
+        result_path = mixer.mix_story_audio(source_audio_path, music_file, mixed_audio_path)
     
     if not result_path or not Path(result_path).exists():
         logger.error("❌ Audio mixing failed")
@@ -137,16 +159,22 @@ def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] =
         else:
             logger.info(f"✅ Perfect audio trimming: {actual_trimmed_duration:.3f}s")
         
-        composer = MoviePyVideoComposer(output_dir=videos_dir, logger=logger)
+        logger.info(f"🎛️ Encoder profile: {encoder_profile}")
+        composer = MoviePyVideoComposer(output_dir=videos_dir, logger=logger, encoder_profile=encoder_profile)
+        
+        with profile_span("ken_burns_render"):
+            kenburns_video = composer.compose_video(
+                image_dir=image_dir,
+                audio_file=temp_audio.name,  # Use the trimmed audio for exact duration
+                topic_name=sanitized_name,
+                output_filename=f"{sanitized_name}_kenburns.mp4",
+                enable_ken_burns=True,
+                num_images=12,
+                parallel_render=Config.RENDER.PARALLEL_SEGMENTS,
+                max_workers=Config.RENDER.SEGMENT_WORKERS or None
+            )
         
-        kenburns_video = composer.compose_video(
-            image_dir=image_dir,
-            audio_file=temp_audio.name,  # Use the trimmed audio for exact duration
-            topic_name=sanitized_name,
-            output_filename=f"{sanitized_name}_kenburns.mp4",
-            enable_ken_burns=True,
-            num_images=12
-        )
+        encode_stats.extend(composer.encode_stats)
         
         # Clean up temp file
         try:
@@ -168,53 +196,44 @@ def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] =
         
         logger.info(f"📹 Ken Burns video duration: {kenburns_video_duration:.3f}s")
         
-        # AGGRESSIVE FIX: If there's any mismatch, trim the Ken Burns video to exact duration
-        if abs(kenburns_video_duration - exact_target_duration) > 0.001:  # 1ms tolerance
-            logger.warning(f"⚠️ Ken Burns video duration mismatch: {abs(kenburns_video_duration - exact_target_duration):.3f}s")
+        # The composer writes a whole number of frames computed from the audio, so the
+        # video is within one frame of the TTS duration. Anything longer is cut with a
+        # stream copy - never a decode + re-encode.
+        frame_duration = 1.0 / composer.fps
+        if kenburns_video_duration - exact_target_duration > frame_duration:
+            logger.warning(f"⚠️ Ken Burns video duration mismatch: {kenburns_video_duration - exact_target_duration:.3f}s")
+            logger.info(f"✂️ Stream-copy trim: Ken Burns video {kenburns_video_duration:.3f}s → {exact_target_duration:.3f}s")
             
-            # AGGRESSIVE TRIM: Trim Ken Burns video to exact target duration
-            if kenburns_video_duration > exact_target_duration:
-                logger.info(f"✂️ AGGRESSIVE TRIM: Ken Burns video {kenburns_video_duration:.3f}s → {exact_target_duration:.3f}s")
-                
-                # Create a new trimmed Ken Burns video
-                trimmed_kenburns_path = kenburns_video.replace('.mp4', '_trimmed.mp4')
-                trimmed_clip = VideoFileClip(kenburns_video).subclip(0, exact_target_duration)
-                trimmed_clip.write_videofile(
-                    trimmed_kenburns_path,
-                    fps=30,
-                    codec='libx264',
-                    audio_codec='aac',
-                    audio_bitrate='320k',
-                    preset='fast',
-                    ffmpeg_params=['-pix_fmt', 'yuv420p']
-                )
-                trimmed_clip.close()
-                
-                # Replace the original Ken Burns video with the trimmed version
-                import shutil
-                shutil.move(trimmed_kenburns_path, kenburns_video)
-                kenburns_video_duration = exact_target_duration
-                
-                logger.info(f"✅ Ken Burns video trimmed to exact duration: {kenburns_video_duration:.3f}s")
-            else:
-                logger.error(f"❌ Ken Burns video too short - cannot extend")
-                return False
+            trimmed_kenburns_path = kenburns_video.replace('.mp4', '_trimmed.mp4')
+            trim_start = time.time()
+            stream_copy_trim(kenburns_video, trimmed_kenburns_path, exact_target_duration, fps=composer.fps, logger=logger)
+            
+            import shutil
+            shutil.move(trimmed_kenburns_path, kenburns_video)
+            logger.info(f"✅ Ken Burns video trimmed without re-encoding in {time.time() - trim_start:.2f}s")
+        elif exact_target_duration - kenburns_video_duration > frame_duration:
+            logger.error(f"❌ Ken Burns video too short - cannot extend")
+            return False
         else:
-            logger.info(f"✅ Perfect Ken Burns video duration: {kenburns_video_duration:.3f}s")
+            logger.info(f"✅ Frame-exact Ken Burns video duration: {kenburns_video_duration:.3f}s "
+                        f"(target {exact_target_duration:.3f}s)")
         
         # Step 2: Add dynamic subtitles to the video
         logger.info(f"🎬 Adding dynamic subtitles to video")
-        subtitle_processor = OptimizedWhisperViralSubtitleProcessor(logger=logger)
+        subtitle_processor = OptimizedWhisperViralSubtitleProcessor(logger=logger, encoder_profile=encoder_profile)
         
         # Get story path for subtitle enhancement
         story_path = Config.OUTPUT_DIR / "stories" / sanitized_name / "story.txt"
         
-        final_video = subtitle_processor.add_viral_subtitles_to_video(
-            video_path=kenburns_video,
-            audio_path=result_path,  # Use the original mixed audio for subtitles
-            output_path=final_video_path,
-            story_path=story_path if story_path.exists() else None
-        )
+        with profile_span("subtitle_render"):
+            final_video = subtitle_processor.add_viral_subtitles_to_video(
+                video_path=kenburns_video,
+                audio_path=result_path,  # Use the original mixed audio for subtitles
+                output_path=final_video_path,
+                story_path=story_path if story_path.exists() else None
+            )
+        
+        encode_stats.extend(subtitle_processor.encode_stats)
         
         if not Path(final_video).exists():
             logger.error("Subtitle processing failed")
@@ -231,40 +250,24 @@ def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] =
         
         logger.info(f"📹 Final video duration: {final_video_duration:.3f}s")
         
-        # AGGRESSIVE FINAL FIX: If there's any mismatch, trim the final video to exact duration
-        if abs(final_video_duration - exact_target_duration) > 0.001:  # 1ms tolerance
-            logger.warning(f"⚠️ FINAL VIDEO DURATION MISMATCH: {abs(final_video_duration - exact_target_duration):.3f}s")
+        # Same frame-level check for the subtitled video; any excess is a stream-copy cut
+        if final_video_duration - exact_target_duration > frame_duration:
+            logger.warning(f"⚠️ FINAL VIDEO DURATION MISMATCH: {final_video_duration - exact_target_duration:.3f}s")
+            logger.info(f"✂️ Stream-copy trim: Final video {final_video_duration:.3f}s → {exact_target_duration:.3f}s")
+            
+            trimmed_final_path = final_video.replace('.mp4', '_trimmed.mp4')
+            trim_start = time.time()
+            stream_copy_trim(final_video, trimmed_final_path, exact_target_duration, fps=composer.fps, logger=logger)
             
-            # AGGRESSIVE TRIM: Trim final video to exact target duration
-            if final_video_duration > exact_target_duration:
-                logger.info(f"✂️ AGGRESSIVE FINAL TRIM: Final video {final_video_duration:.3f}s → {exact_target_duration:.3f}s")
-                
-                # Create a new trimmed final video
-                trimmed_final_path = final_video.replace('.mp4', '_trimmed.mp4')
-                trimmed_clip = VideoFileClip(final_video).subclip(0, exact_target_duration)
-                trimmed_clip.write_videofile(
-                    trimmed_final_path,
-                    fps=30,
-                    codec='libx264',
-                    audio_codec='aac',
-                    audio_bitrate='320k',
-                    preset='fast',
-                    ffmpeg_params=['-pix_fmt', 'yuv420p']
-                )
-                trimmed_clip.close()
-                
-                # Replace the original final video with the trimmed version
-                import shutil
-                shutil.move(trimmed_final_path, final_video)
-                final_video_duration = exact_target_duration
-                
-                logger.info(f"✅ Final video trimmed to exact duration: {final_video_duration:.3f}s")
-                logger.info(f"✅ No repetitive ending issues expected!")
-            else:
-                logger.error(f"❌ Final video too short - cannot extend")
-                return False
+            import shutil
+            shutil.move(trimmed_final_path, final_video)
+            logger.info(f"✅ Final video trimmed without re-encoding in {time.time() - trim_start:.2f}s")
+            logger.info(f"✅ No repetitive ending issues expected!")
+        elif exact_target_duration - final_video_duration > frame_duration:
+            logger.error(f"❌ Final video too short - cannot extend")
+            return False
         else:
-            logger.info(f"🎉 PERFECT FINAL VIDEO DURATION: {final_video_duration:.3f}s")
+            logger.info(f"🎉 FRAME-EXACT FINAL VIDEO DURATION: {final_video_duration:.3f}s")
             logger.info(f"✅ No repetitive ending issues expected!")
         
         logger.info(f"🎉 Audio/Video processing completed successfully!")
@@ -280,13 +283,14 @@ def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] =
         return False
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python audio_video_processor_pipeline.py <topic_name>")
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python audio_video_processor_pipeline.py <topic_name> [draft|preview|production|archival]")
         print("Example: python audio_video_processor_pipeline.py 'The Great Emu War'")
         sys.exit(1)
     
     topic_name = sys.argv[1]
-    success = process_video_for_topic(topic_name)
+    encoder_profile = sys.argv[2] if len(sys.argv) == 3 else None
+    success = process_video_for_topic(topic_name, encoder_profile=encoder_profile)
     
     if success:
         print("Audio/Video processing completed successfully!")
@@ -11,6 +11,7 @@ import os
 import time
 import json
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
 from tqdm import tqdm
 
 # Add project root to path (use project's own src directory)
@@ -20,10 +21,12 @@ sys.path.insert(0, str(project_root))
 # Import project-specific config
 from config import Config, PATHS
 
+from src.llm.story_backlog import take_prefetched_story
 from src.llm.story_generator import StoryGenerator
 from src.replicate_image_generator import OptimizedReplicateImageGenerator
 from src.video_composition.whisper_audio_synchronizer import WhisperAudioSynchronizer
 from src.utils.folder_utils import sanitize_folder_name, setup_logging_with_file
+from src.utils.profiler import profile_span
 
 def validate_file_creation(file_path: str, step_name: str, logger) -> bool:
     """
@@ -266,8 +269,23 @@ def validate_image_generation_result(result: dict, step_name: str, logger) -> bo
     logger.info(success_msg)
     return True
 
-async def test_complete_replicate_pipeline_whisper():
-    """Test the complete AutoTube pipeline with Replicate (Schnell) image generation + Whisper audio sync."""
+async def test_complete_replicate_pipeline_whisper(topic: Optional[str] = None,
+                                                   exclude_topics: Optional[List[str]] = None,
+                                                   summary: Optional[Dict[str, Any]] = None,
+                                                   claim_topic: Optional[Callable[[str], bool]] = None):
+    """
+    Test the complete AutoTube pipeline with Replicate (Schnell) image generation + Whisper audio sync.
+    
+    Args:
+        topic: Topic to generate a story for, or None to suggest a unique one
+        exclude_topics: Extra topics to avoid when suggesting (e.g. topics already queued in a batch)
+        summary: Optional dict filled with the story title, folder name, cost and timings on success
+        claim_topic: Optional callable(topic) -> bool called as soon as a topic is chosen; returning
+            False means another run already took it and a different topic is suggested
+        
+    Returns:
+        True if every step succeeded, False otherwise
+    """
     print("\n🚀 AutoTube Pipeline Test - Replicate (Schnell) + Whisper Audio Sync\n" + ("="*70))
     timings = {}
     t0 = time.time()
@@ -277,12 +295,33 @@ async def test_complete_replicate_pipeline_whisper():
     t1 = time.time()
     async with StoryGenerator() as sg:
         print("\n[STEP 0.5] 🎯 Topic Suggestion (Avoiding Duplicates)...")
-        with tqdm(total=1, desc="Suggesting unique topic", unit="topic") as pbar_topic:
-            story_title = await sg.suggest_topic()
-            print(f"✅ Suggested topic: {story_title}")
-            pbar_topic.update(1)
-        with tqdm(total=1, desc="Generating story", unit="story") as pbar:
-            story_data = await sg.generate_story(story_title)
+        prefetched = None
+        if topic:
+            story_title = topic
+            print(f"✅ Using provided topic: {story_title}")
+        else:
+            exclusions = list(exclude_topics or [])
+            prefetched = take_prefetched_story(sg, exclude_topics=exclusions)
+            if prefetched and (claim_topic is None or claim_topic(prefetched['topic'])):
+                story_title = prefetched['topic']
+                print(f"📦 Using prefetched topic ({prefetched['age'] / 60:.0f} min old): {story_title}")
+            else:
+                prefetched = None
+                with profile_span("topic"), tqdm(total=1, desc="Suggesting unique topic", unit="topic") as pbar_topic:
+                    for _ in range(3):
+                        story_title = await sg.suggest_topic(exclude_topics=exclusions)
+                        if claim_topic is None or claim_topic(story_title):
+                            break
+                        # A concurrent run claimed the same topic while this one was suggesting
+                        print(f"⚠️ Topic already claimed, suggesting another: {story_title}")
+                        exclusions.append(story_title)
+                    else:
+                        raise RuntimeError("Could not suggest a topic that is not already claimed")
+                    print(f"✅ Suggested topic: {story_title}")
+                    pbar_topic.update(1)
+        with profile_span("story"), tqdm(total=1, desc="Generating story", unit="story") as pbar:
+            # A prefetched story was generated, safety-checked and music-classified ahead of time
+            story_data = prefetched['story_data'] if prefetched else await sg.generate_story(story_title)
             print(f"✅ Story: {story_data['title']}")
             print(f"✅ Hook: {story_data.get('hook', '')}")
             print(f"✅ Word count: {len(story_data.get('story', '').split())}")
@@ -379,7 +418,7 @@ async def test_complete_replicate_pipeline_whisper():
     t2 = time.time()
     from src.tts_generator import tts_story_to_audio
     audio_filename = f"audio_{sanitized_title}.mp3"
-    with tqdm(total=1, desc="Generating TTS audio", unit="audio") as pbar:
+    with profile_span("tts"), tqdm(total=1, desc="Generating TTS audio", unit="audio") as pbar:
         audio_path = tts_story_to_audio(story_data['story'], audio_filename, story_title=story_data['title'])
         pbar.update(1)
     
@@ -418,7 +457,7 @@ async def test_complete_replicate_pipeline_whisper():
     # Step 3: Whisper Audio Synchronization (NEW - replaces guessing with exact timestamps)
     print("\n[STEP 3] 🎤 Whisper Audio Synchronization...")
     t3 = time.time()
-    with tqdm(total=1, desc="Whisper audio sync", unit="sync") as pbar:
+    with profile_span("whisper_sync"), tqdm(total=1, desc="Whisper audio sync", unit="sync") as pbar:
         # Initialize Whisper synchronizer
         whisper_sync = WhisperAudioSynchronizer(model_name="base")
         
@@ -467,7 +506,7 @@ async def test_complete_replicate_pipeline_whisper():
     t4 = time.time()
     from src.utils.music_selector import MusicSelector
     selector = MusicSelector()
-    with tqdm(total=1, desc="Selecting background music", unit="music") as pbar:
+    with profile_span("music_selection"), tqdm(total=1, desc="Selecting background music", unit="music") as pbar:
         music_file = selector.get_music_file_by_story(story_data, story_title=story_data['title'])
         pbar.update(1)
     
@@ -516,7 +555,7 @@ async def test_complete_replicate_pipeline_whisper():
     print("\n[STEP 6] 🖼️ Replicate Image Generation (Schnell) with Whisper Sync...")
     t6 = time.time()
     image_generator = OptimizedReplicateImageGenerator(default_preset="mvp_testing")
-    with tqdm(total=len(image_prompts), desc="Generating images with Schnell", unit="image") as pbar:
+    with profile_span("image_batch"), tqdm(total=len(image_prompts), desc="Generating images with Schnell", unit="image") as pbar:
         result = await image_generator.generate_images_for_story(
             story_data=story_data,
             image_prompts=image_prompts,
@@ -591,6 +630,18 @@ async def test_complete_replicate_pipeline_whisper():
     logger.info(f"📊 Total time: {total_time:.2f}s, Cost: ${result['total_cost']:.4f}")
     logger.info(f"📋 Ready for audio/video processing with topic: {story_title}")
     
+    if summary is not None:
+        summary.update({
+            "topic": story_title,
+            "story_title": story_data['title'],
+            "sanitized_title": sanitized_title,
+            "audio_duration": audio_duration,
+            "image_cost": result['total_cost'],
+            "successful_images": result['successful_images'],
+            "timings": timings,
+            "total_time": total_time
+        })
+    
     return True
 
 async def main():
@@ -0,0 +1,571 @@
+"""
+AutoTube Render Worker - Warm Long-Lived Pipeline Process
+Takes jobs (project, topic, stage range) from a durable SQLite queue and runs
+them in one warm process per project, so imports, Whisper models, fonts, the
+music index and API clients are built once instead of once per video.
+
+Every project in this repository (the root project, ThroughTheLensofHistory,
+TrendingByMJ, ...) submits to the same queue. Projects have their own `config`
+and `src` packages, so each gets its own child process, started on its first
+job and kept for the following ones. Every project caches its Whisper models
+(src/utils/model_cache.py); the music index only exists in the root project,
+so other projects skip that part of the warm-up.
+
+While the queue is empty the worker refills the story backlog of projects
+that have one (src/llm/story_backlog.py), so the next content stage starts
+from a prefetched story instead of suggesting and writing one.
+
+Usage:
+  python render_worker.py serve [--max-jobs N] [--idle-exit SECONDS] [--no-preload] [--no-prefetch]
+  python render_worker.py submit [--project DIR] [--topic TITLE] [--stages content:video]
+  python render_worker.py status [--limit N]
+  python render_worker.py stats [--project DIR]
+"""
+
+# Only the standard library at module level: project processes are spawned
+# and re-import this file before switching to their own project's packages
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+import traceback
+from contextlib import closing
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).parent
+STAGES = ("content", "video")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project TEXT NOT NULL,
+    topic TEXT,
+    first_stage TEXT NOT NULL,
+    last_stage TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+
+def parse_stages(spec: str) -> Tuple[str, str]:
+    """'content:video', 'video' or 'content' -> (first_stage, last_stage)."""
+    first, _, last = spec.partition(":")
+    last = last or first
+    if first not in STAGES or last not in STAGES or STAGES.index(first) > STAGES.index(last):
+        raise ValueError(f"Invalid stage range '{spec}' (stages in order: {', '.join(STAGES)})")
+    return first, last
+
+
+def resolve_project(project: str) -> Path:
+    """Project directory for a name relative to the repository root ('.' is the root project)."""
+    path = Path(project)
+    return (path if path.is_absolute() else REPO_ROOT / path).resolve()
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linearly interpolated percentile (the same definition as numpy's default)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class JobQueue:
+    """Durable job queue in SQLite (WAL mode); safe to share between processes and workers."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def submit(self, project: str, topic: Optional[str] = None, stages: str = "content:video") -> int:
+        """Queue a job; returns its id."""
+        first, last = parse_stages(stages)
+        if not (resolve_project(project) / "config.py").exists():
+            raise ValueError(f"'{project}' is not an AutoTube project (no config.py)")
+        if topic is None and first != "content":
+            raise ValueError("A job that skips the content stage needs a topic")
+        with closing(self._connect()) as db:
+            cursor = db.execute(
+                "INSERT INTO jobs (project, topic, first_stage, last_stage, submitted_at) VALUES (?, ?, ?, ?, ?)",
+                (project, topic, first, last, time.time()))
+            return cursor.lastrowid
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest queued job and mark it running."""
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            db.execute("UPDATE jobs SET status = 'running', worker = ?, started_at = ?, attempts = attempts + 1 "
+                       "WHERE id = ?", (worker_id, time.time(), row["id"]))
+            db.execute("COMMIT")
+            return dict(db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def finish(self, job_id: int, success: bool, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        with closing(self._connect()) as db:
+            db.execute("UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE id = ?",
+                       ("done" if success else "failed", time.time(),
+                        json.dumps(result, default=str) if result is not None else None, error, job_id))
+
+    def requeue_stale(self) -> int:
+        """Put back running jobs whose worker process (on this host) no longer exists."""
+        host = socket.gethostname()
+        stale = []
+        with closing(self._connect()) as db:
+            for row in db.execute("SELECT id, worker FROM jobs WHERE status = 'running'"):
+                worker_host, _, pid = (row["worker"] or "").rpartition(":")
+                if worker_host == host and pid.isdigit() and not _pid_alive(int(pid)):
+                    stale.append(row["id"])
+            for job_id in stale:
+                db.execute("UPDATE jobs SET status = 'queued', worker = NULL, started_at = NULL WHERE id = ?", (job_id,))
+        return len(stale)
+
+    def jobs(self, limit: int = 20, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        query, params = "SELECT * FROM jobs", []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        with closing(self._connect()) as db:
+            return [dict(row) for row in db.execute(query + " ORDER BY id DESC LIMIT ?", params + [limit])]
+
+    def latency_stats(self, project: Optional[str] = None) -> Dict[str, Any]:
+        """p50/p90/p99 of queue wait, run time and end-to-end latency over finished jobs (seconds)."""
+        query = "SELECT * FROM jobs WHERE status IN ('done', 'failed')"
+        params: List[Any] = []
+        if project:
+            query += " AND project = ?"
+            params.append(project)
+        with closing(self._connect()) as db:
+            rows = [dict(row) for row in db.execute(query, params)]
+
+        series = {
+            "queue_wait": [r["started_at"] - r["submitted_at"] for r in rows],
+            "run_time": [r["finished_at"] - r["started_at"] for r in rows],
+            "latency": [r["finished_at"] - r["submitted_at"] for r in rows],
+        }
+        for row in rows:
+            for stage, seconds in (json.loads(row["result"] or "{}").get("stages") or {}).items():
+                series.setdefault(f"stage_{stage}", []).append(seconds)
+
+        stats = {"jobs": len(rows), "failed": sum(1 for r in rows if r["status"] == "failed")}
+        for name, values in series.items():
+            stats[name] = {f"p{p}": percentile(values, p) for p in (50, 90, 99)}
+        return stats
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+class StageRunner:
+    """
+    Runs pipeline stages inside a project process. Stage modules are imported
+    once; the models and caches they build stay alive between jobs.
+    """
+
+    def __init__(self, project_dir: Path, logger: logging.Logger):
+        self.project_dir = project_dir
+        self.logger = logger
+        self.content_module = self._import_stage_module("content_generation_pipeline")
+        self.video_module = self._import_stage_module("audio_video_processor_pipeline")
+
+    def _import_stage_module(self, name: str):
+        """
+        Projects keep stage scripts either in partial_pipelines/ or at the project root.
+
+        The layout is read from the project directory rather than tried by import:
+        some project modules put the repository root on sys.path, which would
+        otherwise resolve to the root project's partial_pipelines.
+        """
+        if (self.project_dir / "partial_pipelines" / f"{name}.py").exists():
+            return import_module(f"partial_pipelines.{name}")
+        return import_module(name)
+
+    def warm_up(self, preload_models: bool) -> Dict[str, float]:
+        """Load what every job would otherwise load again; returns seconds per item."""
+        timings = {}
+        if not preload_models:
+            return timings
+        for name, module, load in (("whisper_base", "src.utils.model_cache", self._load_whisper("base")),
+                                   ("whisper_small", "src.utils.model_cache", self._load_whisper("small")),
+                                   ("music_index", "src.utils.music_index", self._load_music_index)):
+            if not (self.project_dir / Path(*module.split("."))).with_suffix(".py").exists():
+                self.logger.info(f"ℹ️ Warm-up of {name} skipped: this project has no {module}")
+                continue
+            start = time.time()
+            try:
+                load()
+                timings[name] = time.time() - start
+            except Exception as e:
+                self.logger.warning(f"⚠️ Warm-up of {name} skipped: {e}")
+        return timings
+
+    @staticmethod
+    def _load_whisper(model_name: str):
+        def load():
+            from src.utils.model_cache import get_whisper_model
+            get_whisper_model(model_name, compute_type="int8")
+        return load
+
+    @staticmethod
+    def _load_music_index():
+        from src.utils.music_index import get_music_index
+        get_music_index().ensure_fresh()
+
+    def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the job's stage range; stops at the first failing stage."""
+        result = {"success": False, "title": job.get("topic"), "stages": {}, "pid": os.getpid()}
+        first, last = STAGES.index(job["first_stage"]), STAGES.index(job["last_stage"])
+        for stage in STAGES[first:last + 1]:
+            start = time.time()
+            self.logger.info(f"▶️ Job {job['id']}: {stage} stage ({result['title'] or 'auto-suggested topic'})")
+            ok = getattr(self, f"_run_{stage}")(result)
+            result["stages"][stage] = time.time() - start
+            if not ok:
+                result["error"] = f"{stage} stage failed"
+                return result
+        result["success"] = True
+        return result
+
+    def _run_content(self, result: Dict[str, Any]) -> bool:
+        pipeline = self.content_module.test_complete_replicate_pipeline_whisper
+        if "summary" not in inspect.signature(pipeline).parameters:
+            # Older project layouts pick their own topic and report nothing back
+            if result["title"]:
+                self.logger.warning("⚠️ This project's content stage picks its own topic; the job topic is ignored")
+            return bool(asyncio.run(pipeline()))
+
+        summary: Dict[str, Any] = {}
+        ok = asyncio.run(pipeline(topic=result["title"], summary=summary))
+        result["title"] = summary.get("story_title") or result["title"]
+        return bool(ok)
+
+    def _run_video(self, result: Dict[str, Any]) -> bool:
+        if not result["title"]:
+            raise ValueError("The video stage needs a topic (this project's content stage does not report one)")
+        return bool(self.video_module.process_video_for_topic(result["title"]))
+
+    def prefetch(self, limit: int) -> Dict[str, Any]:
+        """Add up to `limit` stories to this project's story backlog, if the project has one."""
+        try:
+            story_backlog = import_module("src.llm.story_backlog")
+        except ModuleNotFoundError:
+            return {"supported": False, "added": 0}
+        added = asyncio.run(story_backlog.StoryPrefetcher().refill(limit=limit))
+        return {"supported": True, "added": added}
+
+
+def enter_project(project_dir: str):
+    """Make this process import a project's own config/src/partial_pipelines packages."""
+    os.chdir(project_dir)
+    # Spawned children inherit the parent's sys.path; the repository root must not
+    # shadow this project's own config/src/partial_pipelines packages
+    sys.path[:] = [project_dir] + [p for p in sys.path if p and Path(p).resolve() != REPO_ROOT.resolve()]
+    if Path(project_dir).resolve() == REPO_ROOT.resolve():
+        return  # Already loaded modules are this project's (the logging setup keeps using its profiler)
+    for name in list(sys.modules):
+        if name.split(".")[0] in ("config", "src", "partial_pipelines"):
+            del sys.modules[name]
+
+
+def _project_process_main(project_dir: str, conn, preload_models: bool, log_dir: Optional[str] = None):
+    """Entry point of a project process: switch to the project, warm up, then serve jobs over the pipe."""
+    # The shared queue-based setup comes from the repository root before switching
+    # projects: the other projects' src.utils.logger does not have it
+    from src.utils.logger import configure_logging
+    name = Path(project_dir).name
+    configure_logging(log_file=Path(log_dir) / f"{name}.log" if log_dir else None,
+                      file_key=f"render_worker.{name}")
+    enter_project(project_dir)
+    logger = logging.getLogger(f"autotube.render_worker.{name}")
+
+    try:
+        start = time.time()
+        runner = StageRunner(Path(project_dir), logger)
+        timings = runner.warm_up(preload_models)
+        conn.send({"ready": True, "startup": time.time() - start, "warm_up": timings})
+    except Exception as e:
+        conn.send({"ready": False, "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()})
+        return
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        try:
+            result = runner.prefetch(job["prefetch"]) if "prefetch" in job else runner.run(job)
+        except Exception as e:
+            result = {"success": False, "error": f"{type(e).__name__}: {e}",
+                      "traceback": traceback.format_exc(), "pid": os.getpid()}
+        conn.send(result)
+
+
+class ProjectProcess:
+    """A warm child process for one project, reused for all of that project's jobs."""
+
+    def __init__(self, project: str, preload_models: bool, logger: logging.Logger,
+                 log_dir: Optional[Path] = None):
+        self.project = project
+        self.logger = logger
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_project_process_main, name=f"autotube-{Path(project).name}",
+                                       args=(str(resolve_project(project)), child_conn, preload_models,
+                                             str(log_dir) if log_dir else None),
+                                       daemon=True)
+        self.process.start()
+        child_conn.close()
+        ready = self._receive()
+        if not ready.get("ready"):
+            self.stop()
+            raise RuntimeError(f"Project process for '{project}' failed to start: {ready.get('error')}")
+        self.logger.info(f"🔥 Project process for '{project}' ready in {ready['startup']:.1f}s "
+                         f"(pid {self.process.pid}, warm-up: {ready['warm_up']})")
+
+    def _receive(self) -> Dict[str, Any]:
+        while not self.conn.poll(0.5):
+            if not self.process.is_alive():
+                raise RuntimeError(f"Project process for '{self.project}' exited with code {self.process.exitcode}")
+        return self.conn.recv()
+
+    def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        self.conn.send(job)
+        return self._receive()
+
+    def prefetch(self, limit: int = 1) -> Dict[str, Any]:
+        self.conn.send({"prefetch": limit})
+        return self._receive()
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self):
+        try:
+            if self.process.is_alive():
+                self.conn.send(None)
+            self.process.join(timeout=10)
+        except (OSError, BrokenPipeError):
+            pass
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+class RenderWorker:
+    """Polls the queue and dispatches jobs to warm project processes, one job at a time."""
+
+    def __init__(self, queue: JobQueue, preload_models: bool = True, poll_seconds: float = 1.0,
+                 prefetch_after: Optional[float] = None, prefetch_projects: Tuple[str, ...] = (".",),
+                 log_dir: Optional[Path] = None):
+        self.queue = queue
+        self.preload_models = preload_models
+        self.poll_seconds = poll_seconds
+        # Seconds of empty queue before story backlogs are refilled (None: never)
+        self.prefetch_after = prefetch_after
+        self.prefetch_projects = list(prefetch_projects)
+        self._next_prefetch = 0.0
+        # Each project process writes its own log file here (None: console only)
+        self.log_dir = log_dir
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.processes: Dict[str, ProjectProcess] = {}
+        self.logger = logging.getLogger("autotube.render_worker")
+
+    def _process_for(self, project: str) -> ProjectProcess:
+        process = self.processes.get(project)
+        if process is None or not process.alive():
+            if process is not None:
+                self.logger.warning(f"⚠️ Project process for '{project}' died - starting a new one")
+            process = self.processes[project] = ProjectProcess(project, self.preload_models, self.logger,
+                                                               self.log_dir)
+        return process
+
+    def run_job(self, job: Dict[str, Any]):
+        self.logger.info(f"📥 Job {job['id']}: {job['project']} [{job['first_stage']}→{job['last_stage']}] "
+                         f"{job['topic'] or '(auto topic)'} - waited {job['started_at'] - job['submitted_at']:.1f}s")
+        try:
+            result = self._process_for(job["project"]).run(job)
+        except Exception as e:
+            result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+        self.queue.finish(job["id"], result.get("success", False), result, result.get("error"))
+
+        if result.get("success"):
+            stages = ", ".join(f"{s} {t:.1f}s" for s, t in result.get("stages", {}).items())
+            self.logger.info(f"✅ Job {job['id']} done: {result.get('title')} ({stages})")
+        else:
+            self.logger.error(f"❌ Job {job['id']} failed: {result.get('error')}")
+            if result.get("traceback"):
+                self.logger.error(result["traceback"])
+        self.log_percentiles()
+
+    def prefetch_stories(self) -> int:
+        """
+        Refill project story backlogs by one story each while the queue is idle.
+
+        One story at a time keeps a newly queued job waiting for at most one story
+        generation. Projects without a backlog are not asked again; a full backlog
+        or a failure waits another idle period before the next try.
+        """
+        added = 0
+        for project in list(self.prefetch_projects):
+            try:
+                result = self._process_for(project).prefetch(1)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Story prefetch for '{project}' failed: {e}")
+                continue
+            if result.get("error"):
+                self.logger.warning(f"⚠️ Story prefetch for '{project}' failed: {result['error']}")
+            elif not result.get("supported"):
+                self.logger.info(f"ℹ️ Project '{project}' has no story backlog - not prefetching")
+                self.prefetch_projects.remove(project)
+            added += result.get("added", 0)
+        if not added:
+            self._next_prefetch = time.time() + self.prefetch_after
+        return added
+
+    def log_percentiles(self):
+        stats = self.queue.latency_stats()
+        latency = stats["latency"]
+        if latency["p50"] is not None:
+            self.logger.info(f"📊 Latency over {stats['jobs']} jobs: p50 {latency['p50']:.1f}s, "
+                             f"p90 {latency['p90']:.1f}s, p99 {latency['p99']:.1f}s ({stats['failed']} failed)")
+
+    def serve(self, max_jobs: Optional[int] = None, idle_exit: Optional[float] = None) -> int:
+        """Process jobs until max_jobs are done or the queue has been empty for idle_exit seconds."""
+        requeued = self.queue.requeue_stale()
+        if requeued:
+            self.logger.info(f"♻️ Re-queued {requeued} job(s) left running by a dead worker")
+        self.logger.info(f"🚀 Render worker {self.worker_id} serving {self.queue.path}")
+
+        done = 0
+        idle_since = time.time()
+        try:
+            while max_jobs is None or done < max_jobs:
+                job = self.queue.claim(self.worker_id)
+                if job is None:
+                    if idle_exit is not None and time.time() - idle_since >= idle_exit:
+                        self.logger.info(f"💤 Queue idle for {idle_exit:.0f}s - exiting")
+                        break
+                    if (self.prefetch_after is not None and self.prefetch_projects
+                            and time.time() - idle_since >= self.prefetch_after and time.time() >= self._next_prefetch):
+                        self.prefetch_stories()
+                        continue
+                    time.sleep(self.poll_seconds)
+                    continue
+                self.run_job(job)
+                done += 1
+                idle_since = time.time()
+        except KeyboardInterrupt:
+            self.logger.info("⏹️ Worker interrupted")
+        finally:
+            for process in self.processes.values():
+                process.stop()
+        return done
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}s"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AutoTube render worker and job queue")
+    parser.add_argument("--queue", help="Queue database (default: Config.WORKER.QUEUE_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the worker")
+    serve.add_argument("--max-jobs", type=int, help="Exit after this many jobs")
+    serve.add_argument("--idle-exit", type=float, help="Exit after the queue is empty for this many seconds")
+    serve.add_argument("--no-preload", action="store_true", help="Do not preload Whisper models and the music index")
+    serve.add_argument("--no-prefetch", action="store_true", help="Do not refill story backlogs while idle")
+
+    submit = commands.add_parser("submit", help="Queue a job")
+    submit.add_argument("--project", default=".", help="Project directory relative to the repository root")
+    submit.add_argument("--topic", help="Story topic (default: the content stage suggests one)")
+    submit.add_argument("--stages", default="content:video", help="Stage range: content, video or content:video")
+
+    status = commands.add_parser("status", help="Show recent jobs")
+    status.add_argument("--limit", type=int, default=20)
+
+    stats = commands.add_parser("stats", help="Show latency percentiles")
+    stats.add_argument("--project", help="Only this project's jobs")
+
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO_ROOT))
+    from config import Config
+    queue = JobQueue(Path(args.queue) if args.queue else Config.WORKER.QUEUE_PATH)
+
+    if args.command == "serve":
+        from src.utils.logger import configure_logging
+        log_dir = queue.path.parent / "logs"
+        configure_logging(log_file=log_dir / "render_worker.log", file_key="render_worker")
+        worker = RenderWorker(queue, preload_models=Config.WORKER.PRELOAD_MODELS and not args.no_preload,
+                              poll_seconds=Config.WORKER.POLL_SECONDS,
+                              prefetch_after=None if args.no_prefetch or not Config.PREFETCH.BACKLOG_SIZE
+                              else Config.PREFETCH.IDLE_SECONDS,
+                              log_dir=log_dir)
+        worker.serve(max_jobs=args.max_jobs, idle_exit=args.idle_exit)
+    elif args.command == "submit":
+        job_id = queue.submit(args.project, args.topic, args.stages)
+        print(f"📥 Queued job {job_id}: {args.project} [{args.stages}] {args.topic or '(auto topic)'}")
+    elif args.command == "status":
+        for job in queue.jobs(args.limit):
+            result = json.loads(job["result"] or "{}")
+            run_time = job["finished_at"] - job["started_at"] if job["finished_at"] else None
+            print(f"#{job['id']:<5} {job['status']:<8} {job['project']:<34} {job['first_stage']}→{job['last_stage']:<8} "
+                  f"{_format_seconds(run_time):>8}  {result.get('title') or job['topic'] or '(auto topic)'}")
+    elif args.command == "stats":
+        stats = queue.latency_stats(args.project)
+        print(f"📊 {stats['jobs']} finished jobs ({stats['failed']} failed)")
+        for name, values in stats.items():
+            if isinstance(values, dict):
+                print(f"   {name:<14} p50 {_format_seconds(values['p50']):>8}  "
+                      f"p90 {_format_seconds(values['p90']):>8}  p99 {_format_seconds(values['p99']):>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
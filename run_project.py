@@ -64,6 +64,33 @@ def run_project(project_name: str, pipeline: str = "content"):
         print("\n⏹️  Pipeline interrupted by user")
         return False
 
+def submit_project(project_name: str, pipeline: str = "content", topic: str = None):
+    """
+    Queue a pipeline run for the render worker instead of running it here.
+    
+    Args:
+        project_name: Name of the project directory
+        pipeline: Which pipeline to run ("content", "video" or "full")
+        topic: Story topic (required for "video")
+    """
+    stages = {"content": "content", "video": "video", "full": "content:video"}.get(pipeline)
+    if stages is None:
+        print(f"❌ Unknown pipeline: {pipeline}")
+        print("💡 Available pipelines: content, video, full")
+        return False
+    
+    from render_worker import JobQueue
+    from config import Config
+    
+    try:
+        job_id = JobQueue(Config.WORKER.QUEUE_PATH).submit(project_name, topic, stages)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    print(f"📥 Queued job {job_id}: {pipeline} pipeline for project {project_name}")
+    print("💡 Start a worker with: python run_project.py --worker")
+    return True
+
 def main():
     """Main CLI interface."""
     if len(sys.argv) < 2:
@@ -74,6 +101,11 @@ def main():
         print("Pipelines:")
         print("  content  - Generate story, audio, and images (default)")
         print("  video    - Process audio and create final video")
+        print("  full     - Content then video (render worker only)")
+        print("")
+        print("Render worker (warm process fed from a local job queue):")
+        print("  python run_project.py --worker [--max-jobs N] [--idle-exit SECONDS]")
+        print("  python run_project.py <project_name> [pipeline] --submit [--topic TITLE]")
         print("")
         print("Examples:")
         print("  python run_project.py ThroughTheLensofHistory")
@@ -81,10 +113,27 @@ def main():
         print("  python run_project.py ThroughTheLensofHistory video")
         return
     
-    project_name = sys.argv[1]
-    pipeline = sys.argv[2] if len(sys.argv) > 2 else "content"
+    if sys.argv[1] == "--worker":
+        from render_worker import main as worker_main
+        sys.exit(worker_main(["serve"] + sys.argv[2:]))
+    
+    args = sys.argv[1:]
+    topic = None
+    if "--topic" in args:
+        index = args.index("--topic")
+        topic = args[index + 1] if index + 1 < len(args) else None
+        del args[index:index + 2]
+    submit = "--submit" in args
+    if submit:
+        args.remove("--submit")
     
-    success = run_project(project_name, pipeline)
+    project_name = args[0]
+    pipeline = args[1] if len(args) > 1 else "content"
+    
+    if submit:
+        success = submit_project(project_name, pipeline, topic)
+    else:
+        success = run_project(project_name, pipeline)
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -5,11 +5,9 @@ Combines TTS voiceover with background music for viral YouTube Shorts.
 
 import os
 import json
+import math
 import numpy as np
 from pydub import AudioSegment
-from pydub.effects import normalize
-import librosa
-import soundfile as sf
 from pathlib import Path
 import logging
 import re
@@ -21,8 +19,9 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from src.utils.ducking import build_ducker
+from src.utils.loudness import LoudnessMeter, TruePeakLimiter
+from src.utils.music_loop import LoopedMusic, pcm_scale, pcm_view
 logger = logging.getLogger(__name__)
 
 class AudioMixer:
@@ -31,8 +30,10 @@ class AudioMixer:
     def __init__(self):
         self.sample_rate = 44100
         self.channels = 2  # Stereo
-        self.voice_target_db = -12  # Mobile optimized
-        self.music_target_db = -24  # Mobile optimized (12dB below voice)
+        self.target_lufs = Config.AUDIO.TARGET_LUFS  # Streaming loudness target for the mix
+        self.music_bed_lu = Config.AUDIO.MUSIC_BED_LU  # Music loudness relative to voice
+        self.true_peak_ceiling_db = Config.AUDIO.TRUE_PEAK_CEILING_DB
+        self.ducking = Config.AUDIO.DUCKING  # Duck the music under the voice
 
         # High-quality audio processing
         try:
@@ -71,6 +72,44 @@ class AudioMixer:
             logger.error(f"Error loading audio file {file_path}: {e}")
             raise
     
+    def load_music_file(self, file_path: str) -> tuple:
+        """
+        Load a background music track as a PCM view, from the music index when possible.
+        
+        Indexed tracks are the memory-mapped 44.1 kHz float32 cache (no decode, no
+        resample, no copy) with their loudness already measured. Other tracks are
+        decoded, viewed in place over the AudioSegment's raw bytes and measured.
+        
+        Returns:
+            (music_pcm, music_lufs) - music_pcm is shaped (frames, channels)
+        """
+        if Config.MUSIC.USE_INDEX:
+            try:
+                from src.utils.music_index import get_music_index
+                index = get_music_index()
+                entry = index.get(file_path)
+                if (entry is not None and entry.get("cache_file")
+                        and index.sample_rate == self.sample_rate and index.channels == self.channels):
+                    music_pcm = index.load_samples(file_path)
+                    logger.info(f"Loaded indexed music: {entry['path']} ({entry['duration']:.3f}s, "
+                                f"{entry['dbfs']:.1f} dBFS, {entry['integrated_loudness']:.1f} LUFS)")
+                    return music_pcm, entry["integrated_loudness"]
+            except Exception as e:
+                logger.warning(f"⚠️ Music index unavailable for {file_path}, decoding directly: {e}")
+        
+        music_audio = self.load_audio_file(file_path)
+        music_pcm = pcm_view(music_audio)
+        return music_pcm, self.measure_loudness(music_pcm, music_audio.frame_rate)
+    
+    def measure_loudness(self, pcm: np.ndarray, sample_rate: int) -> float:
+        """Integrated loudness (LUFS) of a PCM array, read block by block."""
+        meter = LoudnessMeter(sample_rate, pcm.shape[1])
+        scale = np.float32(pcm_scale(pcm))
+        block_frames = Config.MUSIC.MIX_BLOCK_FRAMES
+        for start in range(0, pcm.shape[0], block_frames):
+            meter.add(pcm[start:start + block_frames].astype(np.float32) * scale)
+        return meter.integrated()
+    
     def verify_audio_duration(self, audio: AudioSegment, expected_duration_ms: int = None) -> bool:
         """Verify audio duration and log any issues."""
         actual_duration = len(audio)
@@ -87,99 +126,122 @@ class AudioMixer:
             logger.info(f"📊 Audio duration: {actual_duration}ms")
             return True
     
-    def balance_audio_levels(self, voice_audio: AudioSegment, music_audio: AudioSegment) -> tuple:
-        """
-        Balance audio levels for optimal voice prominence.
-        Returns (balanced_voice, balanced_music)
+    def compute_loudness_gains(self, voice_lufs: float, music_lufs: float) -> tuple:
         """
-        logger.info("Balancing audio levels for mobile...")
+        Gains (in dB) that put the mix at the loudness target with the music bed under the voice.
         
-        # Set voice to -12dB
-        voice_adjustment = self.voice_target_db - voice_audio.dBFS
-        balanced_voice = voice_audio + voice_adjustment
-        
-        # Set music to -24dB
-        music_adjustment = self.music_target_db - music_audio.dBFS
-        balanced_music = music_audio + music_adjustment
-        
-        logger.info(f"Voice adjusted by {voice_adjustment:.1f}dB, Music by {music_adjustment:.1f}dB")
-        return balanced_voice, balanced_music
-    
-    def extend_music_simple(self, music_audio: AudioSegment, target_duration: int) -> AudioSegment:
-        """Loop and trim music to match target duration with EXACT precision."""
-        if len(music_audio) >= target_duration:
-            # CRITICAL: Exact trim to prevent extra audio
-            result = music_audio[:target_duration]
-            logger.info(f"Trimmed music to exact duration: {len(result)}ms")
-            return result
+        Voice and music are uncorrelated, so their powers add: the voice is set to
+        target - 10*log10(1 + 10^(bed/10)) and the music `bed` LU below it, which
+        sums to the target without measuring the mix first.
+        Returns (voice_gain_db, music_gain_db)
+        """
+        logger.info(f"Balancing audio levels to {self.target_lufs:.1f} LUFS...")
         
-        loops_needed = int(np.ceil(target_duration / len(music_audio)))
-        extended = music_audio * loops_needed
+        voice_level = self.target_lufs - 10 * math.log10(1 + 10 ** (self.music_bed_lu / 10))
+        music_level = voice_level + self.music_bed_lu
+        # Silent tracks are left as they are
+        voice_gain_db = voice_level - voice_lufs if math.isfinite(voice_lufs) else 0.0
+        music_gain_db = music_level - music_lufs if math.isfinite(music_lufs) else 0.0
         
-        # CRITICAL: Exact trim to prevent extra audio at end
-        result = extended[:target_duration]
-        logger.info(f"Extended music with {loops_needed} loops, trimmed to exact duration: {len(result)}ms")
-        return result
+        logger.info(f"Voice {voice_lufs:.1f} LUFS adjusted by {voice_gain_db:+.1f}dB, "
+                    f"Music {music_lufs:.1f} LUFS by {music_gain_db:+.1f}dB")
+        return voice_gain_db, music_gain_db
     
-    def mix_audio(self, voice_audio: AudioSegment, music_audio: AudioSegment) -> AudioSegment:
+    def mix_audio(self, voice_audio: AudioSegment, music, music_lufs: float = None,
+                  word_timings: list = None) -> AudioSegment:
         """
         Mix voice and music audio with EXACT duration matching to prevent end audio issues.
+        
+        The voice sample count is the timeline. Music is read through a PCM view and
+        looped lazily, block by block, with a crossfade at each loop seam - the repeated
+        track is never materialised. Loudness gains are set from integrated loudness
+        (voice measured in one read, music from the index), and each mixed block goes
+        through the fade-out and a true-peak limiter straight into the 16-bit output,
+        so the mix reaches the LUFS target in a single pass with no peak normalisation.
+        While the voice speaks, the music is ducked by a sidechain gain curve.
+        
+        Args:
+            voice_audio: Voiceover (defines rate, channels and length)
+            music: Music as a (frames, channels) PCM array at the voice's rate, or an AudioSegment
+            music_lufs: Whole-track music loudness (measured when None)
+            word_timings: Whisper words ({'start', 'end'} in seconds) to key the ducking on
         """
         logger.info("Mixing audio with exact duration matching...")
+        rate, channels = voice_audio.frame_rate, voice_audio.channels
         
-        # Get exact voice duration (this is our target)
-        voice_duration = len(voice_audio)
-        logger.info(f"Target duration: {voice_duration}ms")
+        if isinstance(music, AudioSegment):
+            # Same rate/channels for both tracks so sample counts line up
+            music = pcm_view(music.set_frame_rate(rate).set_channels(channels))
+        if music.ndim != 2 or music.shape[1] != channels:
+            raise ValueError(f"Music has {music.shape[-1]} channels, voice has {channels}")
+        if music_lufs is None:
+            music_lufs = self.measure_loudness(music, rate)
         
-        # Extend music if needed
-        if len(music_audio) < voice_duration:
-            music_audio = self.extend_music_simple(music_audio, voice_duration)
-        elif len(music_audio) > voice_duration:
-            # CRITICAL: Trim music to exact voice duration (no extra audio)
-            music_audio = music_audio[:voice_duration]
-            logger.info(f"Trimmed music from {len(music_audio)}ms to {voice_duration}ms")
+        # Get exact voice length in samples (this is our target)
+        target_samples = int(voice_audio.frame_count())
+        logger.info(f"Target duration: {target_samples} samples ({target_samples / rate:.3f}s)")
         
-        # Balance levels (no ducking)
-        balanced_voice, balanced_music = self.balance_audio_levels(voice_audio, music_audio)
+        # Balance loudness
+        voice = pcm_view(voice_audio)
+        voice_gain_db, music_gain_db = self.compute_loudness_gains(self.measure_loudness(voice, rate), music_lufs)
+        voice_gain = np.float32(pcm_scale(voice) * 10 ** (voice_gain_db / 20))
+        music_gain = np.float32(10 ** (music_gain_db / 20))
         
-        # Mix audio
-        mixed = balanced_voice.overlay(balanced_music)
-        
-        # CRITICAL: Ensure exact duration match (prevent end audio issues)
-        if len(mixed) > voice_duration:
-            mixed = mixed[:voice_duration]
-            logger.info(f"Trimmed mixed audio to exact duration: {voice_duration}ms")
+        # Sidechain ducking keyed on the voice (word timings when available, else its envelope)
+        ducker = None
+        if self.ducking:
+            ducker = build_ducker(voice, rate, pcm_scale(voice), word_timings=word_timings,
+                                  block_frames=Config.MUSIC.MIX_BLOCK_FRAMES, depth_db=Config.AUDIO.DUCK_DEPTH_DB,
+                                  threshold_db=Config.AUDIO.DUCK_THRESHOLD_DB, attack_ms=Config.AUDIO.DUCK_ATTACK_MS,
+                                  release_ms=Config.AUDIO.DUCK_RELEASE_MS)
         
         # AGGRESSIVE FIX: Add fade-out to prevent any end artifacts
+        voice_duration = len(voice_audio)
         fade_duration = min(500, voice_duration // 10)  # 500ms or 10% of duration, whichever is smaller
-        if fade_duration > 0:
-            mixed = mixed.fade_out(fade_duration)
-            logger.info(f"Added {fade_duration}ms fade-out to prevent end artifacts")
+        fade_samples = min(target_samples, int(fade_duration * rate / 1000))
+        fade_start = target_samples - fade_samples
         
-        # CRITICAL: Final trim to exact duration after fade
-        if len(mixed) > voice_duration:
-            mixed = mixed[:voice_duration]
-            logger.info(f"Final trim after fade: {len(mixed)}ms")
+        # Mix, fade and limit block by block: only one block of looped music exists at a time
+        crossfade_frames = int(Config.MUSIC.LOOP_CROSSFADE_MS * rate / 1000)
+        looped = LoopedMusic(music, crossfade_frames)
+        loops = -(-target_samples // looped.period) if target_samples > looped.frames else 1
+        limiter = TruePeakLimiter(rate, channels, ceiling_db=self.true_peak_ceiling_db)
+        meter = LoudnessMeter(rate, channels)
+        pcm = np.empty((target_samples, channels), dtype='<i2')
+        written = 0
         
-        # Normalize final output
-        mixed = normalize(mixed)
+        def write(limited: np.ndarray):
+            nonlocal written
+            meter.add(limited)
+            end = written + limited.shape[0]
+            pcm[written:end] = np.clip(np.rint(limited * 32768.0), -32768, 32767)
+            written = end
         
-        # CRITICAL: Ultra-strict duration verification (1ms tolerance)
-        final_duration = len(mixed)
-        if abs(final_duration - voice_duration) > 1:  # Ultra-strict tolerance (1ms)
-            logger.warning(f"⚠️ Duration mismatch: {final_duration}ms vs {voice_duration}ms")
-            # Force exact duration
-            if final_duration > voice_duration:
-                mixed = mixed[:voice_duration]
-                logger.info(f"🔧 Forced exact duration: {len(mixed)}ms")
-            elif final_duration < voice_duration:
-                # Add silence to match duration (rare case)
-                silence_needed = voice_duration - final_duration
-                silence = AudioSegment.silent(duration=silence_needed)
-                mixed = mixed + silence
-                logger.info(f"🔧 Added {silence_needed}ms silence to match duration: {len(mixed)}ms")
-        else:
-            logger.info(f"✅ Perfect duration match: {final_duration}ms")
+        for start, block in looped.blocks(target_samples, Config.MUSIC.MIX_BLOCK_FRAMES):
+            end = start + block.shape[0]
+            mixed = voice[start:end] * voice_gain
+            if ducker is not None:
+                mixed += block * (ducker.gain(start, block.shape[0]) * music_gain)
+            else:
+                mixed += block * music_gain
+            if end > fade_start:
+                offset = max(start, fade_start)
+                ramp = 1.0 - (np.arange(offset, end, dtype=np.float32) - fade_start + 1) / fade_samples
+                mixed[offset - start:] *= ramp[:, None]
+            write(limiter.process(mixed))
+        write(limiter.flush())
+        logger.info(f"Music: {looped.frames} samples, {loops} pass(es), {looped.crossfade} sample crossfade at seams")
+        if fade_samples > 0:
+            logger.info(f"Added {fade_duration}ms fade-out to prevent end artifacts")
+        logger.info(f"Mix loudness: {meter.integrated():.1f} LUFS (target {self.target_lufs:.1f}), "
+                    f"limiter gain reduction {-20 * math.log10(limiter.min_gain):.1f}dB max")
+        mixed = AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=rate, channels=channels)
+        
+        # Single sample-exact verification
+        final_samples = int(mixed.frame_count())
+        if final_samples != target_samples:
+            raise ValueError(f"Mixed audio is {final_samples} samples, voice is {target_samples}")
+        logger.info(f"✅ Perfect duration match: {final_samples} samples")
         
         logger.info(f"Audio mixing completed: {len(mixed)}ms")
         return mixed
@@ -230,14 +292,14 @@ class AudioMixer:
             
             # Load audio files with duration verification
             voice_audio = self.load_audio_file(str(tts_audio_path))
-            music_audio = self.load_audio_file(music_file)
+            music_pcm, music_lufs = self.load_music_file(music_file)
             
             # CRITICAL: Verify voice audio duration before mixing
             voice_duration = len(voice_audio)
             self.verify_audio_duration(voice_audio, voice_duration)
             
             # Mix audio with exact duration matching
-            mixed_audio = self.mix_audio(voice_audio, music_audio)
+            mixed_audio = self.mix_audio(voice_audio, music_pcm, music_lufs)
             
             # CRITICAL: Final verification of mixed audio
             final_duration = len(mixed_audio)
@@ -254,12 +316,6 @@ class AudioMixer:
             # Save final mixed audio
             output_path = output_dir / f"mixed_audio_{sanitized_title}.mp3"
             
-            # AGGRESSIVE FIX: Ensure exact duration before export
-            export_duration = len(mixed_audio)
-            if export_duration > voice_duration:
-                mixed_audio = mixed_audio[:voice_duration]
-                logger.info(f"Final trim before export: {len(mixed_audio)}ms")
-            
             # Export with high quality and exact duration
             mixed_audio.export(
                 str(output_path),
@@ -295,23 +351,18 @@ class AudioMixer:
             logger.error(f"Error processing story audio: {e}")
             raise
 
-    def mix_story_audio(self, tts_path, music_path, output_path):
+    def mix_story_audio(self, tts_path, music_path, output_path, word_timings=None):
         """Simple direct integration: mix TTS and music, save to output_path."""
         try:
             voice_audio = self.load_audio_file(tts_path)
-            music_audio = self.load_audio_file(music_path)
+            music_pcm, music_lufs = self.load_music_file(str(music_path))
             
             # Get exact voice duration
             voice_duration = len(voice_audio)
             logger.info(f"Voice duration: {voice_duration}ms")
             
-            mixed = self.mix_audio(voice_audio, music_audio)
-            
-            # AGGRESSIVE FIX: Final verification before export
-            final_duration = len(mixed)
-            if final_duration > voice_duration:
-                mixed = mixed[:voice_duration]
-                logger.info(f"Final trim in simple mix: {len(mixed)}ms")
+            # mix_audio returns exactly the voice sample count - no trim needed before export
+            mixed = self.mix_audio(voice_audio, music_pcm, music_lufs, word_timings)
             
             out_dir = Path(output_path).parent
             out_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,200 @@
+"""
+Story backlog: topics and stories generated ahead of time.
+
+Topic suggestion, story generation (with its safety rewrites) and music
+classification are the first minute of every video. StoryPrefetcher runs them
+while nothing else is happening - the render worker calls it when its queue
+is idle - and keeps a small number of finished stories in a local SQLite
+store. The content stage takes the oldest one instead of starting from
+scratch, and falls back to generating as before when the backlog is empty.
+Entries expire after a TTL so the backlog never serves stale topics.
+"""
+import json
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import sys
+
+# Add project root to path to import config
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from config import Config
+from src.utils.logger import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    story TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class StoryBacklog:
+    """Bounded store of prefetched stories in SQLite (WAL mode); safe to share between processes."""
+
+    def __init__(self, path: Optional[Path] = None, max_size: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        """
+        Initialize the backlog store.
+
+        Args:
+            path: SQLite file (default: Config.PREFETCH.STORE_PATH)
+            max_size: Stories to keep ready (default: Config.PREFETCH.BACKLOG_SIZE)
+            ttl_seconds: Age after which a story is dropped (default: Config.PREFETCH.TTL_HOURS)
+        """
+        self.path = Path(path or Config.PREFETCH.STORE_PATH)
+        self.max_size = Config.PREFETCH.BACKLOG_SIZE if max_size is None else max_size
+        self.ttl_seconds = Config.PREFETCH.TTL_HOURS * 3600 if ttl_seconds is None else ttl_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def expire(self) -> int:
+        """Drop stories older than the TTL; returns how many were dropped."""
+        with closing(self._connect()) as db:
+            cursor = db.execute("DELETE FROM stories WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        if cursor.rowcount:
+            logger.info(f"⌛ Dropped {cursor.rowcount} expired stories from the backlog")
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as db:
+            return db.execute("SELECT COUNT(*) FROM stories WHERE created_at >= ?",
+                              (time.time() - self.ttl_seconds,)).fetchone()[0]
+
+    def missing(self) -> int:
+        """Stories needed to fill the backlog."""
+        return max(0, self.max_size - len(self))
+
+    def topics(self) -> List[str]:
+        """Topics of the stories waiting in the backlog, oldest first."""
+        with closing(self._connect()) as db:
+            return [row["topic"] for row in db.execute(
+                "SELECT topic FROM stories WHERE created_at >= ? ORDER BY id", (time.time() - self.ttl_seconds,))]
+
+    def add(self, topic: str, story_data: Dict[str, Any]) -> int:
+        """Store a generated story; returns its id."""
+        with closing(self._connect()) as db:
+            cursor = db.execute("INSERT INTO stories (topic, story, created_at) VALUES (?, ?, ?)",
+                                (topic, json.dumps(story_data, ensure_ascii=False), time.time()))
+            return cursor.lastrowid
+
+    def take(self, exclude_topics: Optional[Iterable[str]] = None, is_used=None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically remove and return the oldest unexpired story.
+
+        Args:
+            exclude_topics: Topics to leave in the backlog (e.g. already queued in a batch)
+            is_used: Optional callable(topic) -> bool; stories whose topic has been
+                used since they were generated are dropped
+
+        Returns:
+            {"topic", "story_data", "age"} or None when no story is available
+        """
+        exclude = set(exclude_topics or ())
+        self.expire()
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            taken = None
+            for row in db.execute("SELECT * FROM stories ORDER BY id").fetchall():
+                if row["topic"] in exclude:
+                    continue
+                db.execute("DELETE FROM stories WHERE id = ?", (row["id"],))
+                if is_used is not None and is_used(row["topic"]):
+                    logger.info(f"🗑️ Dropped prefetched story with an already used topic: {row['topic'][:50]}")
+                    continue
+                taken = {"topic": row["topic"], "story_data": json.loads(row["story"]),
+                         "age": time.time() - row["created_at"]}
+                break
+            db.execute("COMMIT")
+            return taken
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+
+class StoryPrefetcher:
+    """Fills a StoryBacklog with suggested topics and generated stories."""
+
+    def __init__(self, backlog: Optional[StoryBacklog] = None, generator_factory=None):
+        """
+        Args:
+            backlog: Store to fill (default: StoryBacklog())
+            generator_factory: Callable returning a StoryGenerator (default: StoryGenerator)
+        """
+        self.backlog = backlog if backlog is not None else StoryBacklog()
+        if generator_factory is None:
+            from src.llm.story_generator import StoryGenerator as generator_factory
+        self.generator_factory = generator_factory
+
+    async def refill(self, limit: Optional[int] = None) -> int:
+        """
+        Generate stories until the backlog is full (or `limit` stories were added).
+
+        Each topic avoids the used topics and the topics already in the backlog.
+        Stops at the first failure; the next idle period tries again.
+
+        Returns:
+            Number of stories added
+        """
+        self.backlog.expire()
+        wanted = self.backlog.missing()
+        if limit is not None:
+            wanted = min(wanted, limit)
+        added = 0
+        if not wanted:
+            return added
+        async with self.generator_factory() as sg:
+            while added < wanted:
+                try:
+                    topic = await sg.suggest_topic(exclude_topics=self.backlog.topics())
+                    story_data = await sg.generate_story(topic)
+                except Exception as e:
+                    logger.warning(f"⚠️ Story prefetch failed: {e}")
+                    break
+                if not story_data.get('title') or not story_data.get('story'):
+                    logger.warning(f"⚠️ Prefetched story for '{topic[:50]}' is incomplete - discarded")
+                    break
+                self.backlog.add(topic, story_data)
+                added += 1
+                logger.info(f"📦 Prefetched story: {story_data['title']} "
+                            f"({len(self.backlog)}/{self.backlog.max_size} in backlog)")
+        return added
+
+
+def take_prefetched_story(sg, exclude_topics: Optional[Iterable[str]] = None,
+                          backlog: Optional[StoryBacklog] = None) -> Optional[Dict[str, Any]]:
+    """
+    Take a story from the backlog for the content stage, or None if it is empty or disabled.
+
+    Topics used since the story was prefetched are checked against used_topics.txt
+    with the generator's banned-topic check and dropped.
+    """
+    if not Config.PREFETCH.BACKLOG_SIZE and backlog is None:
+        return None
+    try:
+        if backlog is None:
+            backlog = StoryBacklog()
+        used_topics = set(sg._load_banned_topics())
+        return backlog.take(exclude_topics, is_used=lambda topic: sg._contains_banned_topic(topic, used_topics))
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Story backlog unavailable: {e}")
+        return None
@@ -5,7 +5,6 @@ from dotenv import load_dotenv
 import os
 import asyncio
 from typing import Dict, Any, List
-import openai
 import yaml
 import random
 from pathlib import Path
@@ -20,6 +19,105 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.keyword_scanner import KeywordRule, KeywordScanner
+from src.utils.lazy_import import lazy_import
+
+# Imported on first use: openai's import chain is the slowest part of startup
+openai = lazy_import("openai")
+
+# Content safety rules, compiled once into a single-pass scanner. Unsafe keywords match whole
+# words; historical contexts and problematic words also match inside longer words.
+CONTENT_SAFETY_SCANNER = KeywordScanner({
+    # Explicit violence (no exceptions)
+    'explicit_violence': ['murder', 'murdered', 'murdering', 'assassination', 'execution', 'torture',
+                          'massacre', 'genocide', 'slaughter'],
+    # Violence with context exceptions
+    'violence': KeywordRule(['kill', 'killed', 'killing', 'kills', 'death', 'dead', 'die', 'died'],
+                            not_followed_by=r'\s+(bacteria|infection|disease|mold|germ)'),
+    'gore': ['bloody', 'gore', 'gory', 'gruesome', 'horrific'],
+    # Weapons (no exceptions)
+    'weapons': ['gun', 'guns', 'sword', 'swords', 'knife', 'knives', 'weapon', 'weapons'],
+    # War and violence (no exceptions)
+    'war': ['battle', 'war', 'fighting', 'fought', 'attack', 'attacked', 'bomb', 'bombed', 'explosion', 'exploded'],
+    # Terrorism (no exceptions)
+    'terrorism': ['terror', 'terrorist', 'terrorism'],
+    # Inappropriate content (no exceptions)
+    'inappropriate': ['nude', 'naked', 'sex', 'sexual', 'porn', 'pornographic', 'explicit', 'adult', 'mature'],
+    # Extreme language (no exceptions)
+    'extreme_language': ['hate', 'hateful', 'racist', 'racism', 'discrimination', 'discriminatory',
+                         'abuse', 'abusive'],
+    # Historical contexts that make the problematic words below acceptable
+    'historical_context': KeywordRule([
+        'infection', 'disease', 'bacteria', 'mold', 'germ', 'medicine', 'medical',
+        'discovery', 'invention', 'science', 'scientific', 'research', 'experiment',
+        'ancient', 'historical', 'archaeology', 'civilization', 'culture',
+        'treasure', 'artifact', 'monument', 'building', 'architecture',
+        'king', 'queen', 'emperor', 'empire', 'kingdom', 'dynasty',
+        'trade', 'commerce', 'economy', 'wealth', 'fortune'
+    ], whole_words=False),
+    'problematic': KeywordRule(['violent', 'violence', 'brutal', 'brutally', 'horror', 'disturbing', 'shocking',
+                                'terrifying', 'fear', 'fearful', 'scary', 'scared', 'afraid', 'terrified'],
+                               whole_words=False),
+})
+CONTEXT_LABELS = ('historical_context', 'problematic')
+
+# Words ignored when comparing a suggested topic with used topics
+TOPIC_COMMON_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'up', 'down',
+    'out', 'off', 'over', 'under', 'again', 'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why',
+    'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only',
+    'own', 'same', 'so', 'than', 'too', 'very', 'can', 'will', 'just', 'should', 'now', 'title', 'summary', 'story',
+    'history', 'historical', 'secret', 'hidden', 'real', 'true', 'behind', 'what', 'if', 'who', 'which', 'that',
+    'this', 'these', 'those'
+})
+_TOPIC_PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+class BannedTopicIndex:
+    """
+    Used/excluded topics prepared for repeated banned-topic checks.
+
+    Every topic is cleaned once into its exact-match title and its word set, and
+    words map to the topics containing them, so a check only compares the
+    suggestion with topics that share at least one word with it.
+    """
+
+    def __init__(self, topics):
+        self.topics = frozenset(topics)
+        self._titles = set()
+        self._word_sets = []
+        self._topics_by_word = {}
+        for topic in self.topics:
+            clean = self.clean(topic)
+            self._titles.add(clean.strip())
+            words = set(clean.split()) - TOPIC_COMMON_WORDS
+            if words:
+                for word in words:
+                    self._topics_by_word.setdefault(word, []).append(len(self._word_sets))
+                self._word_sets.append(words)
+
+    @staticmethod
+    def clean(topic: str) -> str:
+        return _TOPIC_PUNCTUATION.sub('', topic.lower())
+
+    def __len__(self) -> int:
+        return len(self.topics)
+
+    def contains(self, suggested_topic: str) -> bool:
+        """True for an exact (cleaned) title match or 80%+ overlap of the unique words with a banned topic."""
+        suggested_clean = self.clean(suggested_topic)
+        suggested_words = set(suggested_clean.split()) - TOPIC_COMMON_WORDS
+        shared = {}
+        for word in suggested_words:
+            for topic_id in self._topics_by_word.get(word, ()):
+                shared[topic_id] = shared.get(topic_id, 0) + 1
+        for topic_id, overlap in shared.items():
+            total_unique = len(self._word_sets[topic_id]) + len(suggested_words) - overlap
+            # Only reject if there's very high similarity (80%+ overlap)
+            if overlap / total_unique > 0.8:
+                print(f"[DEBUG] High overlap detected: {overlap}/{total_unique} = {overlap/total_unique:.2f}")
+                return True
+        return suggested_clean.strip() in self._titles
 
 # Load prompts directly from project prompts file
 def load_prompts():
@@ -180,61 +278,24 @@ class StoryGenerator:
 
     def _is_content_safe(self, content: str) -> bool:
         """Check if content is YouTube advertiser-friendly with intelligent context awareness."""
-        
-        # Define unsafe keywords with context exceptions
-        unsafe_patterns = [
-            # Explicit violence (no exceptions)
-            r'\b(murder(ed|ing)?|assassination|execution|torture|massacre|genocide|slaughter)\b',
-            
-            # Violence with context exceptions
-            r'\b(kill(ed|ing|s)?|death|dead|die|died)\b(?!\s+(bacteria|infection|disease|mold|germ))',
-            r'\b(bloody|gore|gory|gruesome|horrific)\b',
-            
-            # Weapons (no exceptions)
-            r'\b(gun|guns|sword|swords|knife|knives|weapon|weapons)\b',
-            
-            # War and violence (no exceptions)
-            r'\b(battle|war|fighting|fought|attack|attacked|bomb|bombed|explosion|exploded)\b',
-            
-            # Terrorism (no exceptions)
-            r'\b(terror|terrorist|terrorism)\b',
-            
-            # Inappropriate content (no exceptions)
-            r'\b(nude|naked|sex|sexual|porn|pornographic|explicit|adult|mature)\b',
-            
-            # Extreme language (no exceptions)
-            r'\b(hate|hateful|racist|racism|discrimination|discriminatory|abuse|abusive)\b'
-        ]
-        
-        content_lower = content.lower()
+        # One pass over the content finds unsafe patterns, historical contexts and problematic words together
+        matches = CONTENT_SAFETY_SCANNER.scan(content)
         
         # Check for unsafe patterns
-        for pattern in unsafe_patterns:
-            if re.search(pattern, content_lower):
-                match = re.search(pattern, content_lower)
-                print(f"[CONTENT SAFETY] Unsafe pattern detected: '{match.group()}' in context")
-                return False
-        
-        # Additional context checks for historical content
-        historical_safe_contexts = [
-            'infection', 'disease', 'bacteria', 'mold', 'germ', 'medicine', 'medical',
-            'discovery', 'invention', 'science', 'scientific', 'research', 'experiment',
-            'ancient', 'historical', 'archaeology', 'civilization', 'culture',
-            'treasure', 'artifact', 'monument', 'building', 'architecture',
-            'king', 'queen', 'emperor', 'empire', 'kingdom', 'dynasty',
-            'trade', 'commerce', 'economy', 'wealth', 'fortune'
-        ]
+        unsafe = next((m for m in matches if m.label not in CONTEXT_LABELS), None)
+        if unsafe:
+            print(f"[CONTENT SAFETY] Unsafe pattern detected: '{unsafe.term}' in context")
+            return False
         
         # If content contains historical safe contexts, be more lenient
-        has_historical_context = any(context in content_lower for context in historical_safe_contexts)
+        has_historical_context = any(m.label == 'historical_context' for m in matches)
         
         # Check for problematic words only if no historical context
         if not has_historical_context:
-            problematic_words = ['violent', 'violence', 'brutal', 'brutally', 'horror', 'disturbing', 'shocking', 'terrifying', 'fear', 'fearful', 'scary', 'scared', 'afraid', 'terrified']
-            for word in problematic_words:
-                if word in content_lower:
-                    print(f"[CONTENT SAFETY] Problematic word detected: '{word}' in '{content}'")
-                    return False
+            problematic = next((m for m in matches if m.label == 'problematic'), None)
+            if problematic:
+                print(f"[CONTENT SAFETY] Problematic word detected: '{problematic.term}' in '{content}'")
+                return False
         
         return True
 
@@ -699,8 +760,14 @@ class StoryGenerator:
             prompts.append(final_prompt)
         return prompts
 
-    async def suggest_topic(self, exclude_topics=None) -> str:
-        """Suggest a unique topic that hasn't been used before."""
+    async def suggest_topic(self, exclude_topics=None, candidates: int = None) -> str:
+        """Suggest a unique topic that hasn't been used before.
+
+        Each round sends `candidates` topic requests at once (Config.TOPICS.SUGGESTION_CANDIDATES
+        by default), each with a different prompt key. Answers are checked against the banned
+        topics as they arrive and the first acceptable one is returned, cancelling the requests
+        still in flight. With candidates=1 this is the original one-request-per-attempt loop.
+        """
         
         import time
         import random
@@ -717,12 +784,15 @@ class StoryGenerator:
                 all_excluded.add(exclude_topics)
             else:
                 all_excluded.update(exclude_topics)
+        # Cleaned once here instead of once per banned topic per candidate
+        banned_index = BannedTopicIndex(all_excluded)
         
         print(f"[DEBUG] Loaded {len(banned_topics)} banned topics from used_topics.txt")
         print(f"[DEBUG] Total excluded topics: {len(all_excluded)}")
         
         # Try to generate a unique topic
         max_attempts = 5  # Reduced from 10 to 5 for faster generation
+        candidates = max(1, candidates or Config.TOPICS.SUGGESTION_CANDIDATES)
         failed_attempts = []
         
         random.seed(time.time_ns())  # Ensure true randomization per call
@@ -736,82 +806,73 @@ class StoryGenerator:
             ("topic_suggestion_shocking", 0.03),  # Reduced weight for shocking topics
             ("topic_suggestion_disturbing", 0.02)  # Minimal weight for disturbing topics
         ]
-        keys, weights = zip(*prompt_options)
+        # Draw only prompts that have a template, so no attempt (or slot in a round) is spent on a missing one
+        prompt_options = [option for option in prompt_options
+                          if "template" in PROMPTS.get(option[0], {})] or prompt_options
+        
+        # Build exclusion string for prompt
+        if all_excluded:
+            exclude_text = (
+                "🚫 FORBIDDEN TOPICS - DO NOT SUGGEST ANY OF THESE:\n"
+                + "\n".join([f"• {topic}" for topic in all_excluded])
+                + f"\n\n⚠️ CRITICAL: You MUST choose a completely different topic. If you suggest any of the above topics, your response will be rejected and you will be asked to try again. Choose something entirely new and unique."
+            )
+        else:
+            exclude_text = ""
         
         attempt = 0
         while attempt < max_attempts:
-            attempt += 1
-            
-            # After 3 attempts, start using adaptive prompting
-            if attempt > 3:
-                chosen_key = self._get_adaptive_prompt_key(attempt, failed_attempts)
-                print(f"[DEBUG] Using adaptive prompt: {chosen_key} (attempt {attempt})")
-            else:
-                chosen_key = random.choices(keys, weights=weights, k=1)[0]
-                print(f"[DEBUG] Using topic prompt: {chosen_key} (attempt {attempt})")
-            
-            system = PROMPTS[chosen_key]["system"]
-            
-            # Build exclusion string for prompt
-            if all_excluded:
-                exclude_text = (
-                    "🚫 FORBIDDEN TOPICS - DO NOT SUGGEST ANY OF THESE:\n"
-                    + "\n".join([f"• {topic}" for topic in all_excluded])
-                    + f"\n\n⚠️ CRITICAL: You MUST choose a completely different topic. If you suggest any of the above topics, your response will be rejected and you will be asked to try again. Choose something entirely new and unique."
-                )
-            else:
-                exclude_text = ""
-            
-            # After 3 attempts, add context about failed attempts
-            if attempt > 3 and failed_attempts:
-                failed_context = (
-                    f"\n\n🚫 RECENTLY REJECTED CONCEPTS (avoid similar themes):\n"
-                    + "\n".join([f"• {topic[:60]}..." for topic in failed_attempts[-3:]])
-                    + f"\n\n💡 INSTRUCTIONS: Choose a topic that is COMPLETELY DIFFERENT from the rejected concepts above. Focus on different historical periods, different types of events, or different themes entirely."
-                )
-                exclude_text += failed_context
-            
-            # Check if the chosen_key exists in PROMPTS
-            if chosen_key not in PROMPTS:
-                print(f"[ERROR] Prompt key '{chosen_key}' not found in PROMPTS. Available keys: {list(PROMPTS.keys())}")
-                failed_attempts.append(f"Missing prompt: {chosen_key}")
-                continue
-            
-            # Check if template exists for this key
-            if "template" not in PROMPTS[chosen_key]:
-                print(f"[ERROR] Template not found for prompt key '{chosen_key}'. Available fields: {list(PROMPTS[chosen_key].keys())}")
-                failed_attempts.append(f"Missing template: {chosen_key}")
-                continue
-            
-            template = PROMPTS[chosen_key]["template"].format(exclude_topics=exclude_text)
-            
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": template}
-                ],
-                max_tokens=120,
-                temperature=1.0,  # Increase for more variety
-            )
-            
-            suggested_topic = response.choices[0].message.content.strip()
-            
-            # Check if the suggested topic contains any banned topics
-            if not self._contains_banned_topic(suggested_topic, all_excluded):
-                # Additional content safety check
-                if self._is_content_safe(suggested_topic):
-                    print(f"[DEBUG] Topic accepted (safe): {suggested_topic[:50]}...")
-                    return suggested_topic
+            requests = []
+            round_keys = []
+            for _ in range(min(candidates, max_attempts - attempt)):
+                attempt += 1
+                
+                # After 3 attempts, start using adaptive prompting
+                if attempt > 3:
+                    chosen_key = self._get_adaptive_prompt_key(attempt, failed_attempts)
+                    print(f"[DEBUG] Using adaptive prompt: {chosen_key} (attempt {attempt})")
                 else:
-                    print(f"[DEBUG] Topic rejected (unsafe content): {suggested_topic[:50]}...")
-                    failed_attempts.append(suggested_topic)
+                    # Requests in the same round use different prompts
+                    options = [option for option in prompt_options if option[0] not in round_keys] or prompt_options
+                    keys, weights = zip(*options)
+                    chosen_key = random.choices(keys, weights=weights, k=1)[0]
+                    print(f"[DEBUG] Using topic prompt: {chosen_key} (attempt {attempt})")
+                round_keys.append(chosen_key)
+                
+                # Check if the chosen_key exists in PROMPTS
+                if chosen_key not in PROMPTS:
+                    print(f"[ERROR] Prompt key '{chosen_key}' not found in PROMPTS. Available keys: {list(PROMPTS.keys())}")
+                    failed_attempts.append(f"Missing prompt: {chosen_key}")
                     continue
-            else:
-                print(f"[DEBUG] Topic rejected (contains banned content): {suggested_topic[:50]}...")
-                failed_attempts.append(suggested_topic)
-                print(f"[DEBUG] Retrying with stronger exclusion...")
+                
+                # Check if template exists for this key
+                if "template" not in PROMPTS[chosen_key]:
+                    print(f"[ERROR] Template not found for prompt key '{chosen_key}'. Available fields: {list(PROMPTS[chosen_key].keys())}")
+                    failed_attempts.append(f"Missing template: {chosen_key}")
+                    continue
+                
+                # After 3 attempts, add context about failed attempts
+                attempt_exclude_text = exclude_text
+                if attempt > 3 and failed_attempts:
+                    attempt_exclude_text += (
+                        f"\n\n🚫 RECENTLY REJECTED CONCEPTS (avoid similar themes):\n"
+                        + "\n".join([f"• {topic[:60]}..." for topic in failed_attempts[-3:]])
+                        + f"\n\n💡 INSTRUCTIONS: Choose a topic that is COMPLETELY DIFFERENT from the rejected concepts above. Focus on different historical periods, different types of events, or different themes entirely."
+                    )
+                
+                template = PROMPTS[chosen_key]["template"].format(exclude_topics=attempt_exclude_text)
+                requests.append((PROMPTS[chosen_key]["system"], template))
+            
+            if not requests:
+                continue
+            if len(requests) > 1:
+                print(f"[DEBUG] Requesting {len(requests)} topic candidates concurrently")
+            suggested_topic = await self._first_acceptable_topic(requests, banned_index, failed_attempts)
+            if suggested_topic:
+                return suggested_topic
+            print(f"[DEBUG] Retrying with stronger exclusion...")
         
+
         # If we hit the safety limit, raise an error instead of using fallback
         print(f"[ERROR] Failed to generate unique topic after {max_attempts} attempts")
         
@@ -841,7 +902,7 @@ class StoryGenerator:
         
         # Try each era until one works
         for era in high_view_eras:
-            if not self._contains_banned_topic(era, all_excluded):
+            if not self._contains_banned_topic(era, banned_index):
                 print(f"[SUCCESS] Using fallback era: {era}")
                 
                 # Generate a story topic about this specific era
@@ -857,6 +918,59 @@ class StoryGenerator:
         print(f"[SUCCESS] Using guaranteed unique topic: {guaranteed_topic}")
         return guaranteed_topic
     
+    async def _request_topic(self, system: str, template: str) -> str:
+        """One topic suggestion round-trip."""
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": template}
+            ],
+            max_tokens=120,
+            temperature=1.0,  # Increase for more variety
+        )
+        return response.choices[0].message.content.strip()
+    
+    async def _first_acceptable_topic(self, requests: list, banned_index: "BannedTopicIndex",
+                                      failed_attempts: list) -> str:
+        """
+        Send the (system, template) requests concurrently and return the first answer
+        that passes the banned-topic and content safety checks.
+        
+        Rejected answers are appended to failed_attempts. Requests still running when
+        a topic is accepted are cancelled. Returns None if every answer was rejected;
+        raises the first error if no request returned at all.
+        """
+        tasks = [asyncio.ensure_future(self._request_topic(system, template)) for system, template in requests]
+        errors = []
+        try:
+            for next_answer in asyncio.as_completed(tasks):
+                try:
+                    suggested_topic = await next_answer
+                except Exception as e:
+                    print(f"[WARNING] Topic suggestion request failed: {e}")
+                    errors.append(e)
+                    continue
+                
+                # Check if the suggested topic contains any banned topics
+                if self._contains_banned_topic(suggested_topic, banned_index):
+                    print(f"[DEBUG] Topic rejected (contains banned content): {suggested_topic[:50]}...")
+                # Additional content safety check
+                elif not self._is_content_safe(suggested_topic):
+                    print(f"[DEBUG] Topic rejected (unsafe content): {suggested_topic[:50]}...")
+                else:
+                    print(f"[DEBUG] Topic accepted (safe): {suggested_topic[:50]}...")
+                    return suggested_topic
+                failed_attempts.append(suggested_topic)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if len(errors) == len(tasks):
+            raise errors[0]
+        return None
+    
     def _get_adaptive_prompt_key(self, attempt: int, failed_attempts: list) -> str:
         """Get an adaptive prompt key based on failed attempts to avoid repeating concepts."""
         
@@ -1079,49 +1193,22 @@ Return ONLY the title, nothing else."""
             print(f"[WARNING] Error loading banned topics: {e}")
             return []
     
-    def _contains_banned_topic(self, suggested_topic: str, banned_topics: set) -> bool:
-        """Check if the suggested topic contains any banned topics - MUCH LESS AGGRESSIVE"""
+    def _contains_banned_topic(self, suggested_topic: str, banned_topics) -> bool:
+        """Check if the suggested topic contains any banned topics - MUCH LESS AGGRESSIVE
+
+        Only exact title matches or a very high word overlap (80%+ of the unique
+        words, ignoring common words) count. banned_topics is a set of titles or
+        a BannedTopicIndex; the index for a set is built once and reused while
+        the set stays the same.
+        """
         if not banned_topics:
             return False
-        
-        suggested_lower = suggested_topic.lower()
-        
-        for banned_topic in banned_topics:
-            banned_lower = banned_topic.lower()
-            
-            # ONLY check for EXACT title matches or very close matches
-            # Remove common words and punctuation for comparison
-            import re
-            
-            # Clean both topics
-            suggested_clean = re.sub(r'[^\w\s]', '', suggested_lower)
-            banned_clean = re.sub(r'[^\w\s]', '', banned_lower)
-            
-            # Split into words
-            suggested_words = set(suggested_clean.split())
-            banned_words = set(banned_clean.split())
-            
-            # Remove common words that don't matter
-            common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'up', 'down', 'out', 'off', 'over', 'under', 'again', 'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'can', 'will', 'just', 'should', 'now', 'title', 'summary', 'story', 'history', 'historical', 'secret', 'hidden', 'real', 'true', 'story', 'behind', 'what', 'if', 'when', 'where', 'how', 'why', 'who', 'which', 'that', 'this', 'these', 'those'}
-            
-            suggested_words = suggested_words - common_words
-            banned_words = banned_words - common_words
-            
-            # Only consider it a match if there's a very high overlap (80%+ of unique words)
-            if len(banned_words) > 0 and len(suggested_words) > 0:
-                overlap = len(banned_words.intersection(suggested_words))
-                total_unique = len(banned_words.union(suggested_words))
-                
-                # Only reject if there's very high similarity (80%+ overlap)
-                if overlap / total_unique > 0.8:
-                    print(f"[DEBUG] High overlap detected: {overlap}/{total_unique} = {overlap/total_unique:.2f}")
-                    return True
-            
-            # Also check for exact title matches (case insensitive)
-            if suggested_clean.strip() == banned_clean.strip():
-                return True
-        
-        return False
+        if isinstance(banned_topics, BannedTopicIndex):
+            return banned_topics.contains(suggested_topic)
+        index = getattr(self, '_banned_index', None)
+        if index is None or index.topics != banned_topics:
+            index = self._banned_index = BannedTopicIndex(banned_topics)
+        return index.contains(suggested_topic)
     
 
 
@@ -16,7 +16,9 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
-from utils.error_handling import handle_errors, validate_input
+from src.utils.error_handling import handle_errors, validate_input
+from src.utils.logger import get_logger
+from src.utils.minhash_lsh import MinHashLSH
 
 # Initialize logger
 logger = get_logger(__name__)
@@ -32,12 +34,16 @@ class TopicTracker:
             data_file: Path to the JSON file for storing used topics
         """
         self.data_file = data_file or (Config.DATA_DIR / "topic_history.json")
+        self.index_file = self.data_file.with_name(f"{self.data_file.stem}.lsh.json")
         self.used_topics: Dict[str, Dict] = {}
         self._load_used_topics()
         
         # Ensure data directory exists
         self.data_file.parent.mkdir(parents=True, exist_ok=True)
         
+        # Near-duplicate index over topic words, kept in step with used_topics
+        self.index = self._load_index()
+        
         logger.info(f"Initialized TopicTracker with {len(self.used_topics)} tracked topics")
     
     def _load_used_topics(self) -> None:
@@ -77,22 +83,63 @@ class TopicTracker:
         except Exception as e:
             logger.error(f"Error saving used topics: {str(e)}")
     
+    def _load_index(self) -> MinHashLSH:
+        """Load the LSH index and bring it in line with the loaded topics (adds new, drops expired)."""
+        params = {
+            'num_perm': Config.TOPICS.LSH_NUM_PERM,
+            'threshold': Config.TOPICS.LSH_THRESHOLD,
+            'false_negative_weight': Config.TOPICS.LSH_FALSE_NEGATIVE_WEIGHT
+        }
+        index = MinHashLSH.load(self.index_file, **params) or MinHashLSH(**params)
+        
+        stale = [topic_id for topic_id in index.items if topic_id not in self.used_topics]
+        missing = [topic_id for topic_id in self.used_topics if topic_id not in index]
+        for topic_id in stale:
+            index.remove(topic_id)
+        for topic_id in missing:
+            index.insert(topic_id, self._topic_words(self.used_topics[topic_id]['topic']))
+        
+        if stale or missing:
+            self._save_index(index)
+        return index
+    
+    def _save_index(self, index: MinHashLSH) -> None:
+        """Save the LSH index next to the topic history."""
+        try:
+            index.save(self.index_file)
+        except Exception as e:
+            logger.error(f"Error saving topic index: {str(e)}")
+    
+    @staticmethod
+    def _topic_words(topic: str) -> Set[str]:
+        """Words compared by get_similar_topics (and shingled into the LSH index)."""
+        return set(topic.lower().split())
+    
+    @staticmethod
+    def _word_overlap(words: Set[str], other_words: Set[str]) -> float:
+        """Shared words over the larger word count (0-1)."""
+        total = max(len(words), len(other_words))
+        return len(words & other_words) / total if total > 0 else 0
+    
     def _generate_topic_id(self, topic: str) -> str:
         """Generate a unique ID for a topic."""
         return hashlib.md5(topic.lower().encode('utf-8')).hexdigest()
     
-    def is_topic_used(self, topic: str) -> bool:
+    def is_topic_used(self, topic: str, similarity_threshold: Optional[float] = None) -> bool:
         """
         Check if a topic has already been used.
         
         Args:
             topic: The topic to check
+            similarity_threshold: Also count near-duplicates with at least this word overlap (0-1)
             
         Returns:
             bool: True if the topic has been used, False otherwise
         """
         topic_id = self._generate_topic_id(topic)
-        return topic_id in self.used_topics
+        if topic_id in self.used_topics:
+            return True
+        return similarity_threshold is not None and bool(self.get_similar_topics(topic, similarity_threshold))
     
     def get_topic_info(self, topic: str) -> Optional[Dict]:
         """
@@ -134,30 +181,39 @@ class TopicTracker:
         }
         
         self._save_used_topics()
+        if topic_id not in self.index:
+            self.index.insert(topic_id, self._topic_words(topic))
+            self._save_index(self.index)
         logger.info(f"Marked topic as used: {topic[:50]}...")
     
-    def get_similar_topics(self, topic: str, threshold: float = 0.8) -> List[Dict]:
+    def get_similar_topics(self, topic: str, threshold: float = 0.8, exact: bool = False) -> List[Dict]:
         """
         Find topics similar to the given topic.
         
+        Candidates come from the LSH index, so only topics sharing a band with
+        this one are compared. Word overlap >= threshold implies Jaccard
+        similarity >= threshold / (2 - threshold); near-duplicates above the
+        index's LSH_THRESHOLD are found with high probability, lower query
+        thresholds trade recall for speed (use exact=True to compare every topic).
+        
         Args:
             topic: The topic to find similar topics for
             threshold: Similarity threshold (0-1)
+            exact: Compare against every stored topic instead of the index candidates
             
         Returns:
             List of similar topics with their information
         """
-        # Simple implementation - in a real app, you'd use a proper NLP similarity metric
-        topic_lower = topic.lower()
+        # Simple word overlap - in a real app, you'd use a proper NLP similarity metric
+        words = self._topic_words(topic)
+        candidates = self.used_topics.keys() if exact else self.index.query(words)
         similar = []
         
-        for topic_info in self.used_topics.values():
-            used_topic = topic_info['topic'].lower()
-            
-            # Simple word overlap check
-            overlap = len(set(topic_lower.split()) & set(used_topic.split()))
-            total = max(len(set(topic_lower.split())), len(set(used_topic.split())))
-            similarity = overlap / total if total > 0 else 0
+        for topic_id in candidates:
+            topic_info = self.used_topics.get(topic_id)
+            if topic_info is None:
+                continue
+            similarity = self._word_overlap(words, self._topic_words(topic_info['topic']))
             
             if similarity >= threshold:
                 similar.append({
@@ -4,10 +4,8 @@ Based on Replicate's official documentation and best practices
 """
 
 import os
-import replicate
 import yaml
 import time
-import requests
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import sys
@@ -18,6 +16,12 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.lazy_import import lazy_import
+
+# Imported on first use
+replicate = lazy_import("replicate")
+requests = lazy_import("requests")
+
 class OptimizedPromptEnhancer:
     """Streamlined prompt enhancement that focuses on what actually works."""
     
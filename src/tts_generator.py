@@ -1,5 +1,4 @@
 import os
-from elevenlabs import generate, save, set_api_key
 from dotenv import load_dotenv
 import re
 
@@ -17,8 +16,6 @@ if not ELEVENLABS_API_KEY:
 if not ELEVENLABS_VOICE_ID:
     raise ValueError("ELEVENLABS_VOICE_ID not set in environment or .env file.")
 
-set_api_key(ELEVENLABS_API_KEY)
-
 # Import config resolver to get the correct output directory
 import sys
 from pathlib import Path
@@ -28,6 +25,10 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.lazy_import import lazy_import
+
+# Imported (and given the API key) on first use
+elevenlabs = lazy_import("elevenlabs", on_load=lambda module: module.set_api_key(ELEVENLABS_API_KEY))
 # Use config to get the correct output directory
 OUTPUT_DIR = Config.OUTPUT_DIR / "audio"
 
@@ -161,7 +162,7 @@ def tts_story_to_audio(story_text: str, output_filename: str = "story_audio.mp3"
             return None
         
         # Generate audio
-        audio = generate(
+        audio = elevenlabs.generate(
             text=processed_text,
             voice=ELEVENLABS_VOICE_ID,
             model="eleven_multilingual_v2"
@@ -187,7 +188,7 @@ def tts_story_to_audio(story_text: str, output_filename: str = "story_audio.mp3"
         
         # Save audio file with explicit error handling
         try:
-            save(audio, output_path)
+            elevenlabs.save(audio, output_path)
             print(f"[DEBUG] TTS: Audio saved to: {output_path}")
             
             # Add fade-out to prevent end artifacts in TTS audio
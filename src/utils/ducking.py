@@ -0,0 +1,129 @@
+"""
+Sidechain ducking
+Lowers background music while the voiceover is speaking. The sidechain is a
+control-rate envelope (one value per hop, ~10 ms) taken from the voice's
+frame-wise RMS or from Whisper word timings; gain reduction gets linear-in-dB
+attack and release ramps and is interpolated to per-sample gains one block at
+a time, so nothing proportional to the full mix length is allocated per sample.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+
+class SidechainDucker:
+    """
+    Music gain curve driven by a voice envelope.
+
+    Reduction follows a compressor curve above the threshold (capped at
+    depth_db). The music starts ducking attack_ms before the voice crosses the
+    threshold - the whole voiceover is known in advance, so the sidechain looks
+    ahead - and recovers over release_ms after it falls away.
+    """
+
+    def __init__(self, sample_rate: int, hop_ms: float = 10.0, threshold_db: float = -40.0,
+                 ratio: float = 4.0, depth_db: float = 8.0, attack_ms: float = 80.0, release_ms: float = 400.0):
+        self.sample_rate = sample_rate
+        self.hop = max(1, int(round(hop_ms * sample_rate / 1000)))
+        self.threshold_db = threshold_db
+        self.ratio = ratio
+        self.depth_db = depth_db
+        self.attack_ms = attack_ms
+        self.release_ms = release_ms
+        self._gain = np.ones(2, dtype=np.float32)
+        self._ramp = np.arange(self.hop, dtype=np.float32) / self.hop
+
+    def envelope_from_audio(self, pcm: np.ndarray, scale: float = 1.0, block_frames: int = 65536) -> np.ndarray:
+        """
+        Frame-wise RMS level (dBFS) of the voice, one value per hop.
+
+        Args:
+            pcm: Voice samples shaped (frames, channels), read block by block
+            scale: Factor mapping the PCM values to [-1, 1]
+            block_frames: Frames read per block (rounded down to whole hops)
+        """
+        frames = pcm.shape[0]
+        block_frames = max(self.hop, block_frames // self.hop * self.hop)
+        levels = np.empty(-(-frames // self.hop), dtype=np.float32)
+        channels = pcm.shape[1]
+        window = self.hop * channels
+        for start in range(0, frames, block_frames):
+            samples = pcm[start:start + block_frames].astype(np.float32).ravel()
+            if samples.shape[0] % window:
+                samples = np.pad(samples, (0, window - samples.shape[0] % window))
+            # Non-overlapping hop-sized windows (all channels), as a strided view
+            windows = sliding_window_view(samples, window)[::window]
+            hop_start = start // self.hop
+            levels[hop_start:hop_start + windows.shape[0]] = np.einsum('ij,ij->i', windows, windows) / window
+        levels *= np.float32(scale * scale)
+        with np.errstate(divide="ignore"):
+            return 10 * np.log10(levels)
+
+    def envelope_from_words(self, words: List[Dict[str, Any]], frames: int, pad_ms: float = 50.0) -> np.ndarray:
+        """
+        Voice activity from Whisper word timings as a level envelope: 0 dBFS while a
+        word is spoken (padded by pad_ms), -inf elsewhere. Short pauses between
+        words only partly release the music.
+        """
+        hops = -(-frames // self.hop)
+        active = np.zeros(hops + 1, dtype=np.int32)
+        hops_per_second = self.sample_rate / self.hop
+        pad = pad_ms / 1000
+        starts = np.array([max(0.0, w['start'] - pad) for w in words]) * hops_per_second
+        ends = np.array([w['end'] + pad for w in words]) * hops_per_second
+        # Mark spans with +1/-1 edges and integrate, instead of filling each word's range
+        np.add.at(active, np.clip(np.floor(starts).astype(int), 0, hops), 1)
+        np.add.at(active, np.clip(np.ceil(ends).astype(int), 0, hops), -1)
+        speaking = np.cumsum(active[:hops]) > 0
+        return np.where(speaking, 0.0, -np.inf).astype(np.float32)
+
+    def set_envelope(self, levels_db: np.ndarray):
+        """Compute the music gain curve from a voice envelope (dBFS per hop)."""
+        over = np.nan_to_num(levels_db - self.threshold_db, neginf=0.0)
+        reduction = np.clip(over * (1 - 1 / self.ratio), 0.0, self.depth_db)
+
+        # Linear-in-dB ramps: released[k] = max over j <= k of r[j] - rate * (k - j),
+        # and the look-ahead attack is the same thing run backwards in time
+        hop_seconds = self.hop / self.sample_rate
+        index = np.arange(reduction.shape[0])
+        release_rate = self.depth_db * hop_seconds / max(self.release_ms / 1000, hop_seconds)
+        attack_rate = self.depth_db * hop_seconds / max(self.attack_ms / 1000, hop_seconds)
+        released = np.maximum.accumulate(reduction + release_rate * index) - release_rate * index
+        attacked = (np.maximum.accumulate((reduction - attack_rate * index)[::-1])[::-1]
+                    + attack_rate * index)
+        smoothed = np.maximum(released, attacked)
+
+        gain = (10 ** (-smoothed / 20)).astype(np.float32)
+        # One extra node so the last hop interpolates towards itself
+        self._gain = np.append(gain, gain[-1:] if gain.size else np.ones(1, dtype=np.float32))
+        ducked = float(np.mean(smoothed > 0.5)) * 100 if smoothed.size else 0.0
+        logger.info(f"🎚️ Ducking: up to {float(smoothed.max(initial=0.0)):.1f}dB, music ducked {ducked:.0f}% of the time")
+
+    def gain(self, start: int, count: int) -> np.ndarray:
+        """Per-sample music gain for frames [start, start + count), shaped (count, 1)."""
+        first, last = start // self.hop, (start + count - 1) // self.hop
+        nodes = self._gain[np.minimum(np.arange(first, last + 2), self._gain.shape[0] - 1)]
+        # Linear interpolation between hop nodes, one row per hop
+        curve = (nodes[:-1, None] + (nodes[1:] - nodes[:-1])[:, None] * self._ramp).ravel()
+        offset = start - first * self.hop
+        return curve[offset:offset + count, None]
+
+
+def build_ducker(voice_pcm: np.ndarray, sample_rate: int, scale: float = 1.0,
+                 word_timings: Optional[List[Dict[str, Any]]] = None, block_frames: int = 65536,
+                 **params) -> SidechainDucker:
+    """
+    Ducker for a voiceover, keyed on word timings when available, else on its RMS envelope.
+    """
+    ducker = SidechainDucker(sample_rate, **params)
+    if word_timings:
+        levels = ducker.envelope_from_words(word_timings, voice_pcm.shape[0])
+    else:
+        levels = ducker.envelope_from_audio(voice_pcm, scale, block_frames)
+    ducker.set_envelope(levels)
+    return ducker
@@ -84,15 +84,9 @@ def setup_logging_with_file(topic_name: str, pipeline_type: str = "content_gen",
     log_filename = create_log_filename(topic_name, pipeline_type)
     log_path = Path(log_dir) / log_filename
     
-    # Setup logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_path, encoding='utf-8'),
-            logging.StreamHandler()  # Also log to console
-        ]
-    )
+    # Setup logging; a later topic of the same pipeline type replaces this file
+    from src.utils.logger import configure_logging
+    configure_logging(log_file=log_path, file_key=pipeline_type)
     
     logger = logging.getLogger(f"autotube.{pipeline_type}")
     logger.info(f"🚀 Starting {pipeline_type} pipeline for topic: {topic_name}")
@@ -10,8 +10,6 @@ from pathlib import Path
 from typing import Optional, Tuple
 import numpy as np
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class HighQualityAudioProcessor:
@@ -64,21 +62,18 @@ class HighQualityAudioProcessor:
             logger.info(f"🔧 Added {fade_duration}ms fade-out")
             
             # NEW APPROACH: Use pydub speedup with better quality settings
-            # For small speed factors (1.1x), pydub actually works better than librosa
-            # and preserves voice quality much better
+            # For small speed factors (1.1x), pydub's chunked speedup is transparent enough
             if speed_factor <= 1.15:  # For small speed increases, use pydub
                 sped_up_audio = audio_segment.speedup(playback_speed=speed_factor)
                 logger.info(f"✅ Used pydub speedup (better quality for small speed factors)")
                 logger.info(f"✅ Voice quality preserved - no robotic sound")
-            elif maintain_pitch and self._has_librosa():
-                # Use librosa for larger speed factors
-                sped_up_audio = self._librosa_speed_up(audio_segment, speed_factor)
-                logger.info(f"✅ Used librosa high-quality time stretching (pitch preserved)")
+            elif maintain_pitch:
+                # WSOLA for larger speed factors: speech-tuned, pitch preserved, no phase vocoder
+                sped_up_audio = self._wsola_speed_up(audio_segment, speed_factor)
+                logger.info(f"✅ Used WSOLA time stretching (pitch preserved)")
                 
-                # Verify quality by checking audio characteristics
-                original_rms = np.sqrt(np.mean(np.array(audio_segment.get_array_of_samples())**2))
-                sped_up_rms = np.sqrt(np.mean(np.array(sped_up_audio.get_array_of_samples())**2))
-                quality_ratio = sped_up_rms / original_rms if original_rms > 0 else 1.0
+                # Verify level is preserved (audioop RMS - no array conversion)
+                quality_ratio = sped_up_audio.rms / audio_segment.rms if audio_segment.rms > 0 else 1.0
                 
                 if 0.8 <= quality_ratio <= 1.2:  # Within 20% of original quality
                     logger.info(f"✅ Audio quality verified: {quality_ratio:.2f} ratio (good)")
@@ -131,80 +126,25 @@ class HighQualityAudioProcessor:
             logger.error(f"❌ High-quality speed adjustment failed: {e}")
             return False
     
-    def _has_librosa(self) -> bool:
-        """Check if librosa is available for high-quality processing."""
+    def _wsola_speed_up(self, audio_segment, speed_factor: float):
+        """Time-stretch in memory with WSOLA (pitch preserved), straight from the raw samples."""
         try:
-            import librosa
-            return True
-        except ImportError:
-            return False
-    
-    def _librosa_speed_up(self, audio_segment, speed_factor: float):
-        """Use librosa for high-quality time stretching with better quality preservation."""
-        try:
-            import librosa
-            import soundfile as sf
-            import tempfile
-            import os
+            from pydub import AudioSegment
+            from src.utils.music_loop import pcm_scale, pcm_view
+            from src.utils.time_stretch import wsola
             
-            # Create temporary files for high-quality processing
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_input:
-                temp_input_path = temp_input.name
+            pcm = pcm_view(audio_segment)
+            stretched = wsola(pcm * np.float32(pcm_scale(pcm)), audio_segment.frame_rate, speed_factor)
             
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_output:
-                temp_output_path = temp_output.name
+            samples = np.clip(np.rint(stretched * 32768.0), -32768, 32767).astype('<i2')
+            sped_up_audio = AudioSegment(data=samples.tobytes(), sample_width=2,
+                                         frame_rate=audio_segment.frame_rate, channels=audio_segment.channels)
             
-            try:
-                # Export audio segment to temporary WAV file (librosa works better with WAV)
-                audio_segment.export(temp_input_path, format="wav")
-                
-                # Load with librosa (this gives us floating-point data)
-                audio_array, sample_rate = librosa.load(temp_input_path, sr=None, mono=False)
-                
-                # For stereo audio, process each channel separately for better quality
-                if len(audio_array.shape) > 1:
-                    # Stereo audio
-                    left_channel = audio_array[0]
-                    right_channel = audio_array[1]
-                    
-                    # Calculate time stretch factor (librosa uses stretch factor, inverse of speed)
-                    time_stretch_factor = 1.0 / speed_factor
-                    
-                    # Apply high-quality time stretching with pitch preservation to each channel
-                    left_sped_up = librosa.effects.time_stretch(left_channel, rate=time_stretch_factor)
-                    right_sped_up = librosa.effects.time_stretch(right_channel, rate=time_stretch_factor)
-                    
-                    # Recombine stereo channels
-                    sped_up_array = np.vstack([left_sped_up, right_sped_up])
-                else:
-                    # Mono audio
-                    time_stretch_factor = 1.0 / speed_factor
-                    sped_up_array = librosa.effects.time_stretch(audio_array, rate=time_stretch_factor)
-                
-                # Save the processed audio back to temporary file
-                sf.write(temp_output_path, sped_up_array.T if len(sped_up_array.shape) > 1 else sped_up_array, sample_rate)
-                
-                # Load back as AudioSegment
-                from pydub import AudioSegment
-                sped_up_audio = AudioSegment.from_wav(temp_output_path)
-                
-                # Ensure correct format
-                sped_up_audio = sped_up_audio.set_frame_rate(audio_segment.frame_rate)
-                sped_up_audio = sped_up_audio.set_channels(audio_segment.channels)
-                
-                logger.info(f"✅ High-quality librosa time stretching completed")
-                return sped_up_audio
-                
-            finally:
-                # Clean up temporary files
-                try:
-                    os.unlink(temp_input_path)
-                    os.unlink(temp_output_path)
-                except:
-                    pass
+            logger.info(f"✅ WSOLA time stretching completed")
+            return sped_up_audio
             
         except Exception as e:
-            logger.warning(f"⚠️ librosa processing failed: {e}")
+            logger.warning(f"⚠️ WSOLA processing failed: {e}")
             logger.warning(f"⚠️ Falling back to pydub speedup (lower quality)")
             # Fallback to pydub
             return audio_segment.speedup(playback_speed=speed_factor)
@@ -276,16 +216,12 @@ class HighQualityAudioProcessor:
 
 def test_high_quality_audio_processor():
     """Test the high-quality audio processor."""
-    processor = HighQualityAudioProcessor()
+    from pydub.generators import Sine
     
-    # Test if librosa is available
-    has_librosa = processor._has_librosa()
-    print(f"librosa available: {has_librosa}")
-    
-    if has_librosa:
-        print("✅ High-quality time stretching will be used")
-    else:
-        print("⚠️ Will fall back to pydub speedup")
+    processor = HighQualityAudioProcessor()
+    tone = Sine(220).to_audio_segment(duration=3000).set_channels(2)
+    sped_up = processor._wsola_speed_up(tone, 1.25)
+    print(f"WSOLA 1.25x: {len(tone)}ms -> {len(sped_up)}ms (expected {int(len(tone) / 1.25)}ms)")
 
 if __name__ == "__main__":
     test_high_quality_audio_processor() 
\ No newline at end of file
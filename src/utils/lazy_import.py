@@ -0,0 +1,81 @@
+"""
+Lazy imports
+Module proxies that defer importing heavy dependencies (moviepy, openai,
+replicate, PIL, elevenlabs, ...) until an attribute is first used, so entry
+points like `project_manager.py list` or the interactive prompt start fast.
+
+    mpy = lazy_import("moviepy.editor")   # nothing imported yet
+    clip = mpy.ImageClip(path)            # moviepy.editor imported here, once
+"""
+
+import importlib
+import sys
+import threading
+import types
+from typing import Callable, Optional
+
+_import_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    After loading, the real module's namespace is copied onto the proxy, so
+    later lookups are plain attribute hits with no extra indirection.
+    """
+
+    def __init__(self, name: str, on_load: Optional[Callable[[types.ModuleType], None]] = None):
+        super().__init__(name)
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_on_load"] = on_load
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is not None:
+            return module
+        with _import_lock:
+            module = self.__dict__["_lazy_module"]
+            if module is None:
+                module = importlib.import_module(self.__dict__["_lazy_name"])
+                on_load = self.__dict__["_lazy_on_load"]
+                if on_load is not None:
+                    on_load(module)
+                self.__dict__.update(module.__dict__)
+                self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        # Only called for names not yet in __dict__, i.e. before the first load
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_lazy_name']}' ({state})>"
+
+
+def lazy_import(name: str, on_load: Optional[Callable[[types.ModuleType], None]] = None) -> types.ModuleType:
+    """
+    Module proxy for `name`, imported on first attribute access.
+
+    If the module is already imported, it is returned as is.
+
+    Args:
+        name: Dotted module name, e.g. "PIL.Image" or "moviepy.editor"
+        on_load: Called with the real module right after it is imported (e.g. to set an API key)
+    """
+    module = sys.modules.get(name)
+    if module is not None and not isinstance(module, LazyModule):
+        if on_load is not None:
+            on_load(module)
+        return module
+    return LazyModule(name, on_load)
+
+
+def is_loaded(module: types.ModuleType) -> bool:
+    """True once a lazy module has actually been imported (always True for real modules)."""
+    return not isinstance(module, LazyModule) or module.__dict__["_lazy_module"] is not None
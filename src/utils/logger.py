@@ -1,92 +1,242 @@
-"""Logging configuration for the AI Video Generator."""
+"""
+Logging configuration for the AI Video Generator.
+
+One central setup for every entry point: the root logger gets a single
+QueueHandler, so a log call only formats the message and enqueues it; a
+QueueListener thread does the console and file I/O. Log files are written as
+JSON lines (one structured record per line) or plain text (LOGGING.FILE_FORMAT).
+Records are tagged with the current pipeline stage (the innermost
+profile_span) and counted per stage and level, so noisy stages show up in the
+pipeline report.
+
+    from src.utils.logger import configure_logging, get_logger
+    configure_logging(log_file=Config.OUTPUT_DIR / "fp_logs" / "run.log")
+    logger = get_logger(__name__)
+"""
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-from pathlib import Path
-from typing import Optional
+import threading
+from collections import defaultdict
 from datetime import datetime
-
-import sys
 from pathlib import Path
+from typing import Dict, Optional, Union
 
 # Add project root to path to import config
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.profiler import current_stage
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes that are not user-supplied extras
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "stage"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, stage, message and any extra= fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "stage": getattr(record, "stage", None),
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class StageQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records for the listener thread, tagging each with the current
+    stage and counting records and message bytes per stage and level.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._counts_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        stage = current_stage() or "-"
+        record.stage = stage
+        with self._counts_lock:
+            counts = self._counts[stage]
+            counts[record.levelname] += 1
+            counts["bytes"] += len(record.msg)
+        return record
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        with self._counts_lock:
+            return {stage: dict(levels) for stage, levels in self._counts.items()}
+
+    def reset_counts(self):
+        with self._counts_lock:
+            self._counts.clear()
+
+
+_lock = threading.RLock()
+_queue_handler: Optional[StageQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_console_handler: Optional[logging.Handler] = None
+_file_handlers: Dict[str, logging.Handler] = {}
+
+
+def _stream_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(CONSOLE_FORMAT, datefmt='%H:%M:%S'))
+    return handler
+
+
+def _file_handler(path: Path, file_format: str) -> logging.Handler:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.FileHandler(path, encoding='utf-8')
+    if file_format == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt='%Y-%m-%d %H:%M:%S'))
+    return handler
+
+
+def _restart_listener():
+    """Rebuild the listener around the current handler set (handlers are fixed per listener)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # Drains everything already queued into the old handler set
+    handlers = [h for h in [_console_handler, *_file_handlers.values()] if h is not None]
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def configure_logging(level: Optional[Union[str, int]] = None, log_file: Optional[Union[str, Path]] = None,
+                      file_key: str = "main", file_format: Optional[str] = None,
+                      console: Optional[bool] = None) -> logging.Logger:
+    """
+    Install the queue-based logging setup (safe to call from every entry point).
+
+    The first call installs the root QueueHandler and the listener thread;
+    later calls adjust the level and add log files. Each file is registered
+    under file_key, so a batch run that configures a log file per topic
+    replaces the previous topic's file instead of writing to all of them.
+
+    Args:
+        level: Root log level (default: LOGGING.LEVEL on the first call, unchanged afterwards)
+        log_file: Optional log file to add
+        file_key: Slot for log_file; a new file under the same key replaces the old one
+        file_format: "json" (structured JSON lines) or "text" (default: LOGGING.FILE_FORMAT)
+        console: Whether to log to stdout (default: LOGGING.CONSOLE on the first call, unchanged afterwards)
+
+    Returns:
+        The root logger
+    """
+    global _queue_handler, _console_handler
+    with _lock:
+        root = logging.getLogger()
+        first = _queue_handler is None
+        if level is not None or first:
+            level = Config.LOGGING.LEVEL if level is None else level
+            root.setLevel(logging.getLevelName(level.upper()) if isinstance(level, str) else level)
+        if console is None:
+            console = Config.LOGGING.CONSOLE if first else _console_handler is not None
+        changed = first
+        retired = []
+
+        if first:
+            _queue_handler = StageQueueHandler(queue.SimpleQueue())
+            # The queue handler replaces any handlers a library or basicConfig installed
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            root.addHandler(_queue_handler)
+            atexit.register(shutdown_logging)
+
+        if console != (_console_handler is not None):
+            _console_handler = _stream_handler() if console else None
+            changed = True
+
+        if log_file is not None:
+            log_file = Path(log_file).resolve()
+            previous = _file_handlers.get(file_key)
+            if previous is None or Path(previous.baseFilename) != log_file:
+                _file_handlers[file_key] = _file_handler(log_file, file_format or Config.LOGGING.FILE_FORMAT)
+                retired = [previous] if previous is not None else []
+                changed = True
+
+        if changed or _listener is None:
+            _restart_listener()
+        # The old listener drained its queue on stop, so replaced files receive nothing more
+        for handler in retired:
+            handler.close()
+    return root
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread (registered with atexit)."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        for handler in _file_handlers.values():
+            handler.flush()
+
+
+def log_volume() -> Dict[str, Dict[str, int]]:
+    """Records per level and message bytes, keyed by pipeline stage ("-" outside any stage)."""
+    return _queue_handler.counts() if _queue_handler is not None else {}
+
+
+def reset_log_volume():
+    """Clear the per-stage counters (at the start of a pipeline run)."""
+    if _queue_handler is not None:
+        _queue_handler.reset_counts()
+
 
 def setup_logger(name: str, log_level: Optional[str] = None) -> logging.Logger:
     """
-    Set up a logger with both file and console handlers.
-    
+    Set up a logger with both file and console output.
+
+    Kept for existing callers: configures central logging with a timestamped
+    file in OUTPUT_DIR/logs and returns the named logger.
+
     Args:
         name: Name of the logger
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-        
+
     Returns:
         Configured logger instance
     """
-    # Create logs directory if it doesn't exist
-    logs_dir = Config.OUTPUT_DIR / "logs"
-    logs_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Set up logger
-    logger = logging.getLogger(name)
-    
-    # Set log level
-    level = getattr(logging, log_level or 'INFO', logging.INFO)
-    logger.setLevel(level)
-    
-    # Prevent adding handlers multiple times in case of module reloading
-    if logger.handlers:
-        return logger
-    
-    # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%H:%M:%S'
-    )
-    
-    # Create file handler
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    log_file = logs_dir / f'{name.lower()}_{timestamp}.log'
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(level)
-    file_handler.setFormatter(file_formatter)
-    
-    # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
-    console_handler.setFormatter(console_formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
+    log_file = Config.OUTPUT_DIR / "logs" / f'{name.lower()}_{timestamp}.log'
+    configure_logging(level=log_level, log_file=log_file, file_key=name)
+    return logging.getLogger(name)
 
 
 def get_logger(name: str) -> logging.Logger:
     """
-    Get a logger instance with the given name.
-    
+    Get a logger instance with the given name, installing the console setup if nothing is configured yet.
+
     Args:
         name: Name of the logger
-        
+
     Returns:
         Configured logger instance
     """
+    if _queue_handler is None:
+        configure_logging()
     return logging.getLogger(name)
 
 
-# Create a default logger for the application
-logger = setup_logger('ai_video_generator')
-
-# Example usage:
-# from utils.logger import get_logger
-# logger = get_logger(__name__)
-# logger.info('This is an info message')
-# logger.error('This is an error message')
+# Default application logger; it writes through whatever configure_logging() installed
+logger = logging.getLogger('ai_video_generator')
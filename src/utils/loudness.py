@@ -0,0 +1,324 @@
+"""
+Loudness measurement and control
+ITU-R BS.1770 integrated loudness (LUFS), true peak (dBTP) and RMS level
+(dBFS) for float sample arrays shaped (frames, channels) in the range [-1, 1],
+plus a streaming loudness meter and a look-ahead true-peak limiter that work
+one block at a time.
+"""
+
+import importlib.util
+import logging
+import math
+from typing import List
+
+import numpy as np
+
+from src.utils.lazy_import import lazy_import
+
+# scipy.signal takes over a second to import: only check it is installed until a filter is needed
+has_scipy = importlib.util.find_spec("scipy") is not None
+scipy_signal = lazy_import("scipy.signal")
+
+logger = logging.getLogger(__name__)
+
+# BS.1770 gating: 400 ms blocks with 75% overlap, -70 LUFS absolute gate, -10 LU relative gate
+BLOCK_SECONDS = 0.4
+BLOCK_OVERLAP = 0.75
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+
+# True peak: 4x oversampling with a windowed-sinc interpolator (16 taps per phase)
+OVERSAMPLING = 4
+INTERPOLATOR_HALF_TAPS = 8
+
+_warned_no_scipy = False
+
+
+def _biquad(kind: str, gain_db: float, q: float, center_hz: float, sample_rate: int):
+    """Normalised (b, a) coefficients for the two K-weighting stages at any sample rate."""
+    a_gain = 10 ** (gain_db / 40.0)
+    w0 = 2.0 * math.pi * (center_hz / sample_rate)
+    alpha = math.sin(w0) / (2.0 * q)
+    cos_w0 = math.cos(w0)
+
+    if kind == "high_shelf":
+        sqrt_a = math.sqrt(a_gain)
+        b = [a_gain * ((a_gain + 1) + (a_gain - 1) * cos_w0 + 2 * sqrt_a * alpha),
+             -2 * a_gain * ((a_gain - 1) + (a_gain + 1) * cos_w0),
+             a_gain * ((a_gain + 1) + (a_gain - 1) * cos_w0 - 2 * sqrt_a * alpha)]
+        a = [(a_gain + 1) - (a_gain - 1) * cos_w0 + 2 * sqrt_a * alpha,
+             2 * ((a_gain - 1) - (a_gain + 1) * cos_w0),
+             (a_gain + 1) - (a_gain - 1) * cos_w0 - 2 * sqrt_a * alpha]
+    elif kind == "high_pass":
+        b = [(1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2]
+        a = [1 + alpha, -2 * cos_w0, 1 - alpha]
+    else:
+        raise ValueError(f"Unknown filter kind: {kind}")
+
+    return np.array(b) / a[0], np.array(a) / a[0]
+
+
+def _k_weighting_stages(sample_rate: int):
+    """(b, a) coefficients of the high shelf and RLB high-pass stages."""
+    return [_biquad(*stage, sample_rate)
+            for stage in (("high_shelf", 4.0, 1 / math.sqrt(2), 1500.0), ("high_pass", 0.0, 0.5, 38.0))]
+
+
+def _warn_no_scipy():
+    global _warned_no_scipy
+    if not _warned_no_scipy:
+        logger.warning("⚠️ scipy not installed - loudness is measured without K-weighting")
+        _warned_no_scipy = True
+
+
+def k_weight(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """
+    Apply the BS.1770 K-weighting pre-filter (high shelf + RLB high-pass).
+
+    Without scipy the signal is returned unweighted, which over-reads
+    bass-heavy material by roughly 1 LU.
+    """
+    if not has_scipy:
+        _warn_no_scipy()
+        return np.asarray(samples, dtype=np.float64)
+
+    weighted = np.asarray(samples, dtype=np.float64)
+    for b, a in _k_weighting_stages(sample_rate):
+        weighted = scipy_signal.lfilter(b, a, weighted, axis=0)
+    return weighted
+
+
+def _gated_loudness(powers: np.ndarray) -> float:
+    """Integrated loudness from per-block mean-square powers, with the absolute and relative gates."""
+    with np.errstate(divide="ignore"):
+        block_loudness = -0.691 + 10 * np.log10(powers)
+
+    gated = powers[block_loudness > ABSOLUTE_GATE_LUFS]
+    if gated.size == 0:
+        return float("-inf")
+
+    relative_gate = -0.691 + 10 * np.log10(gated.mean()) + RELATIVE_GATE_LU
+    gated = powers[(block_loudness > ABSOLUTE_GATE_LUFS) & (block_loudness > relative_gate)]
+    if gated.size == 0:
+        return float("-inf")
+    return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+class LoudnessMeter:
+    """
+    Streaming integrated loudness: feed blocks of any size with add(), read integrated().
+
+    K-weighting filter state is carried across blocks and only one power value per
+    100 ms step is kept, so the result equals a whole-signal measurement while
+    memory stays constant per block.
+    """
+
+    def __init__(self, sample_rate: int, channels: int):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.steps_per_block = int(round(1 / (1 - BLOCK_OVERLAP)))
+        self.step = max(1, int(round(BLOCK_SECONDS * sample_rate / self.steps_per_block)))
+        self.block = self.step * self.steps_per_block
+        self.frames = 0
+
+        self._stages = _k_weighting_stages(sample_rate) if has_scipy else []
+        self._zi = [np.zeros((2, channels)) for _ in self._stages]
+        self._step_energy: List[float] = []
+        self._partial = 0.0
+        self._partial_frames = 0
+        if not has_scipy:
+            _warn_no_scipy()
+
+    def add(self, samples: np.ndarray):
+        """Measure the next block of float samples shaped (frames, channels)."""
+        weighted = np.asarray(samples, dtype=np.float64)
+        if weighted.ndim == 1:
+            weighted = weighted[:, None]
+        if weighted.shape[0] == 0:
+            return
+        for i, (b, a) in enumerate(self._stages):
+            weighted, self._zi[i] = scipy_signal.lfilter(b, a, weighted, axis=0, zi=self._zi[i])
+        self.frames += weighted.shape[0]
+
+        # Channel-summed energy per frame, split on 100 ms step boundaries
+        energy = np.square(weighted).sum(axis=1)
+        fill = min(self.step - self._partial_frames, energy.shape[0])
+        self._partial += float(energy[:fill].sum())
+        self._partial_frames += fill
+        if self._partial_frames < self.step:
+            return
+        self._step_energy.append(self._partial)
+
+        rest = energy[fill:]
+        whole = rest.shape[0] // self.step
+        if whole:
+            self._step_energy.extend(rest[:whole * self.step].reshape(whole, self.step).sum(axis=1).tolist())
+        tail = rest[whole * self.step:]
+        self._partial = float(tail.sum())
+        self._partial_frames = tail.shape[0]
+
+    def block_powers(self) -> np.ndarray:
+        """Mean-square power of every complete 400 ms gating block so far."""
+        if not self.frames:
+            return np.zeros(0)
+        if len(self._step_energy) < self.steps_per_block:
+            # Shorter than one block: measure the whole signal as a single block
+            return np.array([(sum(self._step_energy) + self._partial) / self.frames])
+        cumulative = np.concatenate([[0.0], np.cumsum(self._step_energy)])
+        return (cumulative[self.steps_per_block:] - cumulative[:-self.steps_per_block]) / self.block
+
+    def integrated(self) -> float:
+        """Gated integrated loudness in LUFS of everything added so far (-inf for silence)."""
+        return _gated_loudness(self.block_powers())
+
+
+def integrated_loudness(samples: np.ndarray, sample_rate: int) -> float:
+    """
+    Gated integrated loudness in LUFS.
+
+    Args:
+        samples: Float samples, shape (frames,) or (frames, channels)
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        Integrated loudness in LUFS (-inf for silence)
+    """
+    samples = np.asarray(samples)
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    meter = LoudnessMeter(sample_rate, samples.shape[1])
+    meter.add(samples)
+    return meter.integrated()
+
+
+def _interpolator() -> np.ndarray:
+    """Hann-windowed sinc taps for the OVERSAMPLING - 1 in-between phases, shaped (phases, taps)."""
+    taps = np.arange(-INTERPOLATOR_HALF_TAPS + 1, INTERPOLATOR_HALF_TAPS + 1)
+    fractions = np.arange(1, OVERSAMPLING)[:, None] / OVERSAMPLING
+    offsets = taps[None, :] - fractions
+    window = 0.5 + 0.5 * np.cos(np.pi * offsets / INTERPOLATOR_HALF_TAPS)
+    return (np.sinc(offsets) * window).astype(np.float32)
+
+
+_INTERPOLATOR = _interpolator()
+
+
+def frame_true_peaks(samples: np.ndarray) -> np.ndarray:
+    """
+    Per-frame true peak (linear): the largest absolute value over all channels of
+    the frame itself and the oversampled points between it and the next frame.
+
+    The first and last INTERPOLATOR_HALF_TAPS frames use sample peaks only.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    peaks = np.abs(samples).max(axis=1)
+    frames = samples.shape[0]
+    half = INTERPOLATOR_HALF_TAPS
+    if frames <= 2 * half:
+        return peaks
+
+    # Interpolated point between frame i and i+1 for i in [half - 1, frames - half)
+    count = frames - 2 * half + 1
+    for phase in _INTERPOLATOR:
+        between = np.zeros((count, samples.shape[1]), dtype=np.float32)
+        for t, tap in enumerate(phase):
+            between += tap * samples[t:t + count]
+        np.maximum(peaks[half - 1:half - 1 + count], np.abs(between).max(axis=1),
+                   out=peaks[half - 1:half - 1 + count])
+    return peaks
+
+
+def true_peak_dbfs(samples: np.ndarray) -> float:
+    """True peak over all samples in dBTP (4x oversampled)."""
+    samples = np.asarray(samples)
+    if samples.size == 0:
+        return float("-inf")
+    peak = float(frame_true_peaks(samples).max())
+    return 20 * math.log10(peak) if peak > 0 else float("-inf")
+
+
+def _running_min(values: np.ndarray, width: int) -> np.ndarray:
+    """min(values[i:i + width]) for every full window, in O(n) (van Herk / Gil-Werman)."""
+    n = values.shape[0]
+    padded_length = -(-n // width) * width
+    padded = np.full(padded_length, np.inf, dtype=values.dtype)
+    padded[:n] = values
+    rows = padded.reshape(-1, width)
+    prefix = np.minimum.accumulate(rows, axis=1).ravel()
+    suffix = np.minimum.accumulate(rows[:, ::-1], axis=1)[:, ::-1].ravel()
+    starts = np.arange(n - width + 1)
+    return np.minimum(suffix[starts], prefix[starts + width - 1])
+
+
+class TruePeakLimiter:
+    """
+    Look-ahead true-peak limiter over NumPy blocks.
+
+    The gain needed to keep each frame's true peak under the ceiling is held
+    for hold_ms, taken as a running minimum that looks lookahead_ms ahead, and
+    smoothed with a lookahead_ms moving average - so gain reduction is fully in
+    place before a peak arrives and never overshoots. Output lags input by the
+    look-ahead; process() returns what is ready and flush() the rest, so the
+    total output length always equals the total input length.
+    """
+
+    def __init__(self, sample_rate: int, channels: int, ceiling_db: float = -1.0,
+                 lookahead_ms: float = 5.0, hold_ms: float = 50.0):
+        self.ceiling = 10 ** (ceiling_db / 20)
+        self.channels = channels
+        self.lookahead = max(1, int(round(lookahead_ms * sample_rate / 1000)))
+        self.hold = max(0, int(round(hold_ms * sample_rate / 1000)))
+        # Frames kept before the next output frame: its smoothing, hold and interpolator context
+        self._history = self.lookahead + self.hold + INTERPOLATOR_HALF_TAPS
+        # Frames needed after the last output frame: its look-ahead and interpolator context
+        self._latency = self.lookahead + INTERPOLATOR_HALF_TAPS
+        self.min_gain = 1.0
+        self.reset()
+
+    def reset(self):
+        """Start a new stream (the signal before it counts as silence)."""
+        self._buffer = np.zeros((self._history, self.channels), dtype=np.float32)
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Feed the next block; returns the limited frames that are ready (possibly none)."""
+        buffer = np.concatenate([self._buffer, np.asarray(samples, dtype=np.float32).reshape(-1, self.channels)])
+        ready = buffer.shape[0] - self._history - self._latency
+        if ready <= 0:
+            self._buffer = buffer
+            return np.zeros((0, self.channels), dtype=np.float32)
+
+        peaks = frame_true_peaks(buffer)
+        with np.errstate(divide="ignore"):
+            needed = np.minimum(1.0, self.ceiling / peaks).astype(np.float32)
+
+        # Gain at frame j: min of needed[j - hold : j + lookahead + 1]
+        held = _running_min(needed, self.hold + self.lookahead + 1)
+        first = self._history - self.lookahead
+        held = held[first - self.hold:first - self.hold + ready + self.lookahead].astype(np.float64)
+
+        # Output frame n uses the mean of the held gain over [n - lookahead, n]
+        cumulative = np.concatenate([[0.0], np.cumsum(held)])
+        gain = ((cumulative[self.lookahead + 1:] - cumulative[:-self.lookahead - 1])
+                / (self.lookahead + 1)).astype(np.float32)
+        self.min_gain = min(self.min_gain, float(gain.min()))
+
+        limited = buffer[self._history:self._history + ready] * gain[:, None]
+        self._buffer = buffer[ready:]
+        return limited
+
+    def flush(self) -> np.ndarray:
+        """Return the frames still held back for look-ahead and start a new stream."""
+        limited = self.process(np.zeros((self._latency, self.channels), dtype=np.float32))
+        self.reset()
+        return limited
+
+
+def rms_dbfs(samples: np.ndarray) -> float:
+    """RMS level over all samples in dBFS (the same measure as pydub's AudioSegment.dBFS)."""
+    samples = np.asarray(samples, dtype=np.float64)
+    if samples.size == 0:
+        return float("-inf")
+    rms = math.sqrt(float(np.mean(samples ** 2)))
+    return 20 * math.log10(rms) if rms > 0 else float("-inf")
@@ -0,0 +1,172 @@
+"""
+MinHash LSH index
+Near-duplicate lookup for short texts such as topic titles. Each item's token
+set is summarised by a MinHash signature that is cut into bands; items that
+share a band bucket with the query become candidates, so a lookup touches a
+few buckets instead of every stored item. The band/row split is chosen for a
+Jaccard threshold, weighting missed near-duplicates against extra candidates
+(recall vs precision). Only the band keys are persisted, so the index file
+stays small and items are added or removed incrementally.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+# Smallest prime above 2**32: (a * x + b) % P is a universal hash of 32-bit tokens, and a * x + b fits in uint64
+_PRIME = np.uint64(4294967311)
+
+
+def collision_probability(jaccard: float, bands: int, rows: int) -> float:
+    """Probability that two sets with this Jaccard similarity share at least one band."""
+    return 1.0 - (1.0 - jaccard ** rows) ** bands
+
+
+@lru_cache(maxsize=None)
+def optimal_bands(threshold: float, num_perm: int, false_negative_weight: float = 0.5) -> Tuple[int, int]:
+    """
+    Bands and rows per band (bands * rows <= num_perm) minimising the weighted
+    false positive area below the threshold plus the false negative area above it.
+
+    Args:
+        threshold: Jaccard similarity that should become a candidate
+        num_perm: Signature length
+        false_negative_weight: 0-1; higher favours recall (fewer missed near-duplicates)
+
+    Returns:
+        (bands, rows)
+    """
+    step = 0.005
+    grid = np.arange(step / 2, 1.0, step)  # Midpoint rule over [0, 1]
+    below = grid < threshold
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        probability = 1.0 - (1.0 - grid ** rows) ** bands
+        false_positive = probability[below].sum() * step
+        false_negative = (1.0 - probability[~below]).sum() * step
+        error = (1 - false_negative_weight) * false_positive + false_negative_weight * false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def token_hashes(tokens: Iterable[str]) -> np.ndarray:
+    """Stable 32-bit hashes of the distinct tokens (Python's hash() is salted per process)."""
+    return np.array(sorted({int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+                            for token in tokens}), dtype=np.uint64)
+
+
+class MinHashLSH:
+    """
+    Banded MinHash index over token sets, keyed by item id.
+
+    Items with Jaccard similarity above `threshold` share a bucket with high
+    probability (see collision_probability); callers verify candidates with
+    their exact similarity measure.
+    """
+
+    def __init__(self, num_perm: int = 128, threshold: float = 0.5, false_negative_weight: float = 0.5,
+                 seed: int = 1):
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.false_negative_weight = false_negative_weight
+        self.seed = seed
+        self.bands, self.rows = optimal_bands(threshold, num_perm, false_negative_weight)
+        rng = random.Random(seed)
+        self._a = np.array([rng.randrange(1, int(_PRIME)) for _ in range(num_perm)], dtype=np.uint64)[:, None]
+        self._b = np.array([rng.randrange(0, int(_PRIME)) for _ in range(num_perm)], dtype=np.uint64)[:, None]
+        self.items: Dict[str, List[str]] = {}  # Item id -> band keys
+        self._buckets: List[Dict[str, Set[str]]] = [{} for _ in range(self.bands)]
+
+    def params(self) -> Dict[str, float]:
+        return {"num_perm": self.num_perm, "threshold": self.threshold,
+                "false_negative_weight": self.false_negative_weight, "seed": self.seed}
+
+    def signature(self, tokens: Iterable[str]) -> Optional[np.ndarray]:
+        """MinHash signature of the token set (None for an empty set)."""
+        hashes = token_hashes(tokens)
+        if hashes.size == 0:
+            return None
+        return ((self._a * hashes[None, :] + self._b) % _PRIME).min(axis=1)
+
+    def band_keys(self, tokens: Iterable[str]) -> List[str]:
+        """One bucket key per band (empty for an empty token set)."""
+        signature = self.signature(tokens)
+        if signature is None:
+            return []
+        rows = signature[:self.bands * self.rows].reshape(self.bands, self.rows)
+        return [hashlib.blake2b(band.tobytes(), digest_size=8).hexdigest() for band in rows]
+
+    def insert(self, item_id: str, tokens: Iterable[str]):
+        """Add an item, replacing any previous entry under the same id."""
+        self.remove(item_id)
+        self._add(item_id, self.band_keys(tokens))
+
+    def _add(self, item_id: str, keys: List[str]):
+        self.items[item_id] = keys
+        for buckets, key in zip(self._buckets, keys):
+            buckets.setdefault(key, set()).add(item_id)
+
+    def remove(self, item_id: str):
+        for buckets, key in zip(self._buckets, self.items.pop(item_id, ())):
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del buckets[key]
+
+    def query(self, tokens: Iterable[str]) -> Set[str]:
+        """Ids of items sharing at least one band with the token set (candidates, not verified)."""
+        candidates: Set[str] = set()
+        for buckets, key in zip(self._buckets, self.band_keys(tokens)):
+            candidates |= buckets.get(key, set())
+        return candidates
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.items
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": INDEX_VERSION, **self.params(), "bands": self.bands, "rows": self.rows,
+                "items": self.items}
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path, **params) -> Optional["MinHashLSH"]:
+        """
+        Load a saved index, or None if it is missing, unreadable or was built with other parameters.
+
+        Args:
+            path: Index file written by save()
+            **params: Expected constructor parameters (num_perm, threshold, false_negative_weight, seed)
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        index = cls(**params)
+        if data.get("version") != INDEX_VERSION or any(data.get(k) != v for k, v in index.params().items()):
+            logger.info("🔁 LSH index parameters changed - rebuilding")
+            return None
+        for item_id, keys in data.get("items", {}).items():
+            index._add(item_id, keys)
+        return index
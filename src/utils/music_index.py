@@ -0,0 +1,258 @@
+"""
+Music library index
+Persistent index of the background music library: duration, source format,
+integrated loudness and RMS level per track, plus a pre-decoded float32 cache
+(.npy, memory-mapped on load) at the mixer's sample rate. The index is
+refreshed incrementally: only added or modified files are decoded again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.utils.loudness import integrated_loudness, rms_dbfs
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+AUDIO_EXTENSIONS = (".wav", ".mp3")
+
+
+def decode_audio(path: Path, sample_rate: int, channels: int) -> Dict[str, Any]:
+    """
+    Decode an audio file to float32 samples shaped (frames, channels).
+
+    Returns:
+        Dictionary with samples plus the source sample rate and channel count
+    """
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(str(path))
+    source_rate, source_channels = audio.frame_rate, audio.channels
+    audio = audio.set_frame_rate(sample_rate).set_channels(channels)
+
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32).reshape(-1, channels)
+    samples /= float(1 << (8 * audio.sample_width - 1))
+    return {"samples": samples, "source_sample_rate": source_rate, "source_channels": source_channels}
+
+
+class MusicIndex:
+    """
+    Index of music tracks under music_dir/<Category>/*.{wav,mp3}.
+
+    Track keys are paths relative to music_dir (POSIX style). The index file
+    and sample cache live under music_dir, so the library can be moved as a whole.
+    """
+
+    def __init__(self, music_dir: Path, index_path: Optional[Path] = None, cache_dir: Optional[Path] = None,
+                 sample_rate: int = 44100, channels: int = 2):
+        self.music_dir = Path(music_dir)
+        self.index_path = Path(index_path) if index_path else self.music_dir / "music_index.json"
+        self.cache_dir = Path(cache_dir) if cache_dir else self.music_dir / ".cache"
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.tracks: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._refreshed = False
+        self._load()
+
+    def _load(self):
+        """Load the index file, discarding it if it was built for another format."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (data.get("version") != INDEX_VERSION or data.get("sample_rate") != self.sample_rate
+                or data.get("channels") != self.channels):
+            logger.info("🎵 Music index format changed - rebuilding")
+            return
+        self.tracks = data.get("tracks", {})
+
+    def _save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": INDEX_VERSION, "sample_rate": self.sample_rate, "channels": self.channels,
+                "tracks": self.tracks}
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def _key(self, path: Path) -> str:
+        return Path(path).resolve().relative_to(self.music_dir.resolve()).as_posix()
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.npy"
+
+    def _scan(self) -> Dict[str, os.stat_result]:
+        """Audio files one level below music_dir (one folder per category)."""
+        found = {}
+        if not self.music_dir.exists():
+            return found
+        for category_dir in sorted(p for p in self.music_dir.iterdir() if p.is_dir() and not p.name.startswith('.')):
+            for entry in os.scandir(category_dir):
+                if entry.is_file() and entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                    found[f"{category_dir.name}/{entry.name}"] = entry.stat()
+        return found
+
+    def _index_track(self, key: str, stat: os.stat_result) -> Dict[str, Any]:
+        """Decode one track, cache its samples and measure it."""
+        decoded = decode_audio(self.music_dir / key, self.sample_rate, self.channels)
+        samples = decoded["samples"]
+
+        cache_path = self._cache_path(key)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, samples)
+        os.replace(tmp_path, cache_path)
+
+        return {
+            "path": key,
+            "category": key.split('/', 1)[0],
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "frames": int(samples.shape[0]),
+            "duration": samples.shape[0] / self.sample_rate,
+            "source_sample_rate": decoded["source_sample_rate"],
+            "source_channels": decoded["source_channels"],
+            "integrated_loudness": integrated_loudness(samples, self.sample_rate),
+            "dbfs": rms_dbfs(samples),
+            "cache_file": cache_path.name,
+            "indexed_at": time.time()
+        }
+
+    def _is_current(self, key: str, entry: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+        """True when the entry matches the file on disk (and its sample cache, unless decoding failed)."""
+        return bool(entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns
+                    and (entry.get("error") or self._cache_path(key).exists()))
+
+    def _index_or_record_error(self, key: str, stat: os.stat_result) -> Dict[str, Any]:
+        """
+        Index one track. A track that cannot be decoded is kept (so it can still be
+        selected and decoded by the mixer) with its error, and retried once the file changes.
+        """
+        try:
+            entry = self._index_track(key, stat)
+            logger.info(f"🎵 Indexed {key}: {entry['duration']:.1f}s, {entry['integrated_loudness']:.1f} LUFS")
+            return entry
+        except Exception as e:
+            logger.error(f"❌ Could not index {key}: {e}")
+            return {"path": key, "category": key.split('/', 1)[0], "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns, "cache_file": None, "error": str(e), "indexed_at": time.time()}
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """
+        Bring the index up to date with the files on disk.
+
+        Only new files and files whose size or modification time changed are
+        decoded; entries (and cached samples) of deleted files are dropped.
+
+        Args:
+            force: Re-decode every track
+
+        Returns:
+            Counts of added, updated, removed and unchanged tracks
+        """
+        with self._lock:
+            start = time.time()
+            on_disk = self._scan()
+            counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+            for key in set(self.tracks) - set(on_disk):
+                self._cache_path(key).unlink(missing_ok=True)
+                del self.tracks[key]
+                counts["removed"] += 1
+
+            for key, stat in on_disk.items():
+                entry = self.tracks.get(key)
+                if not force and self._is_current(key, entry, stat):
+                    counts["unchanged"] += 1
+                    continue
+                self.tracks[key] = self._index_or_record_error(key, stat)
+                counts["updated" if entry else "added"] += 1
+
+            if counts["added"] or counts["updated"] or counts["removed"] or not self.index_path.exists():
+                self._save()
+            self._refreshed = True
+            logger.info(f"🎵 Music index refreshed in {time.time() - start:.2f}s: {counts}")
+            return counts
+
+    def ensure_fresh(self):
+        """Refresh once per process, on first use."""
+        if not self._refreshed:
+            self.refresh()
+
+    def entries(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Indexed tracks, optionally limited to one category."""
+        self.ensure_fresh()
+        with self._lock:
+            return [dict(entry) for key, entry in sorted(self.tracks.items())
+                    if category is None or entry["category"] == category]
+
+    def get(self, path) -> Optional[Dict[str, Any]]:
+        """Index entry for a track path (absolute, or relative to music_dir), refreshing it if the file changed."""
+        try:
+            key = self._key(self.music_dir / path)
+        except ValueError:
+            return None
+        with self._lock:
+            entry = self.tracks.get(key)
+            file_path = self.music_dir / key
+            if not file_path.exists():
+                return None
+            stat = file_path.stat()
+            if not self._is_current(key, entry, stat):
+                self.tracks[key] = entry = self._index_or_record_error(key, stat)
+                self._save()
+            return dict(entry)
+
+    def load_samples(self, path) -> np.ndarray:
+        """
+        Pre-decoded float32 samples (frames, channels) for a track, memory-mapped read-only.
+
+        Raises:
+            FileNotFoundError: If the track is not part of the library or could not be decoded
+        """
+        entry = self.get(path)
+        if entry is None:
+            raise FileNotFoundError(f"Track is not in the music library: {path}")
+        if not entry.get("cache_file"):
+            raise FileNotFoundError(f"Track could not be decoded: {path} ({entry.get('error')})")
+        return np.load(self.cache_dir / entry["cache_file"], mmap_mode='r')
+
+
+_default_index: Optional[MusicIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_music_index(music_dir: Optional[Path] = None) -> MusicIndex:
+    """Process-wide music index (for the default library, or music_dir if given)."""
+    global _default_index
+    from config import Config
+    music_dir = Path(music_dir) if music_dir else Config.MUSIC.LIBRARY_DIR
+    with _default_index_lock:
+        if _default_index is None or _default_index.music_dir.resolve() != music_dir.resolve():
+            _default_index = MusicIndex(music_dir, sample_rate=Config.MUSIC.SAMPLE_RATE)
+        return _default_index
+
+
+if __name__ == "__main__":
+    # Build or refresh the index ahead of time: python -m src.utils.music_index [--force]
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    index = get_music_index()
+    counts = index.refresh(force="--force" in sys.argv)
+    for entry in index.entries():
+        if entry.get("error"):
+            print(f"{entry['path']}: not decoded ({entry['error']})")
+        else:
+            print(f"{entry['path']}: {entry['duration']:.1f}s, {entry['integrated_loudness']:.1f} LUFS, {entry['dbfs']:.1f} dBFS")
+    print(f"{len(index.tracks)} tracks indexed: {counts}")
@@ -0,0 +1,89 @@
+"""
+Lazy music looping
+Reads a PCM array (a memory-mapped .npy cache or a view over an AudioSegment's
+raw bytes) as an endless loop, one block at a time. Repeats are never
+materialised, so memory use does not grow with the number of loops.
+"""
+
+from typing import Iterator, Tuple
+
+import numpy as np
+
+# Integer PCM dtypes by sample width in bytes (24-bit audio has no numpy dtype)
+PCM_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+
+def pcm_view(audio) -> np.ndarray:
+    """
+    Zero-copy (frames, channels) view over an AudioSegment's raw samples.
+
+    24-bit audio is converted to 16-bit first, since it has no matching numpy dtype.
+    """
+    if audio.sample_width not in PCM_DTYPES:
+        audio = audio.set_sample_width(2)
+    return np.frombuffer(audio.raw_data, dtype=PCM_DTYPES[audio.sample_width]).reshape(-1, audio.channels)
+
+
+def pcm_scale(pcm: np.ndarray) -> float:
+    """Factor that maps PCM values to floats in [-1, 1]."""
+    if np.issubdtype(pcm.dtype, np.integer):
+        return 1.0 / float(1 << (8 * pcm.dtype.itemsize - 1))
+    return 1.0
+
+
+class LoopedMusic:
+    """
+    A music track repeated forever, with an equal-power crossfade at each loop seam.
+
+    Consecutive passes overlap by `crossfade` frames: the tail of one pass fades
+    out while the head of the next fades in. The first pass starts without a fade,
+    so a target shorter than the track is just the track's first frames.
+    """
+
+    def __init__(self, pcm: np.ndarray, crossfade_frames: int = 0):
+        """
+        Args:
+            pcm: Samples shaped (frames, channels); integer PCM or float in [-1, 1]
+            crossfade_frames: Seam crossfade length (capped at a quarter of the track)
+        """
+        if pcm.ndim == 1:
+            pcm = pcm[:, None]
+        if pcm.shape[0] == 0:
+            raise ValueError("Cannot loop an empty track")
+        self.pcm = pcm
+        self.frames = pcm.shape[0]
+        self.channels = pcm.shape[1]
+        self.scale = np.float32(pcm_scale(pcm))
+        self.crossfade = max(0, min(int(crossfade_frames), self.frames // 4))
+        self.period = self.frames - self.crossfade
+
+        position = (np.arange(self.crossfade, dtype=np.float32) + 0.5) / max(1, self.crossfade)
+        self._fade_in = np.sin(position * (np.pi / 2))[:, None]
+        self._fade_out = np.cos(position * (np.pi / 2))[:, None]
+
+    def _take(self, offsets: np.ndarray) -> np.ndarray:
+        """Gather source frames as float32 (only the rows touched are read from a memory map)."""
+        if offsets.size and offsets[-1] - offsets[0] == offsets.size - 1:
+            rows = self.pcm[offsets[0]:offsets[-1] + 1]
+        else:
+            rows = self.pcm[offsets]
+        return rows.astype(np.float32) * self.scale
+
+    def read(self, start: int, count: int) -> np.ndarray:
+        """Looped samples [start, start + count) as float32 (count, channels)."""
+        passes, offsets = np.divmod(np.arange(start, start + count), self.period)
+        block = self._take(offsets)
+
+        if self.crossfade:
+            seam = (passes > 0) & (offsets < self.crossfade)
+            if seam.any():
+                head = offsets[seam]
+                block[seam] = (block[seam] * self._fade_in[head]
+                               + self._take(head + self.period) * self._fade_out[head])
+        return block
+
+    def blocks(self, total_frames: int, block_frames: int = 65536) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (start_frame, samples) blocks covering exactly total_frames frames."""
+        block_frames = max(1, int(block_frames))
+        for start in range(0, total_frames, block_frames):
+            yield start, self.read(start, min(block_frames, total_frames - start))
@@ -5,8 +5,9 @@ import os
 import random
 import json
 import re
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 class MusicSelector:
     """Handles music file selection based on story classification."""
@@ -20,6 +21,33 @@ class MusicSelector:
             self.music_dir = Path(__file__).parent.parent.parent / "data" / "music"
         
         self.categories = ["Intense", "Somber", "Uplifting", "Mystery"]
+        self._index = None
+    
+    def _get_index(self):
+        """Music index for this library, or None when disabled or unavailable."""
+        if self._index is None:
+            try:
+                project_root = Path(__file__).parent.parent.parent
+                if str(project_root) not in sys.path:
+                    sys.path.insert(0, str(project_root))
+                from config import Config
+                if not Config.MUSIC.USE_INDEX:
+                    return None
+                from src.utils.music_index import get_music_index
+                self._index = get_music_index(self.music_dir)
+            except Exception as e:
+                print(f"[WARNING] Music index unavailable, scanning folders instead: {e}")
+                return None
+        return self._index
+    
+    def _category_files(self, category: str) -> List[Path]:
+        """Music files in a category, from the index (refreshed once per process) or a folder scan."""
+        index = self._get_index()
+        if index is not None:
+            return [self.music_dir / entry["path"] for entry in index.entries(category)]
+        
+        category_dir = self.music_dir / category
+        return list(category_dir.glob("*.wav")) + list(category_dir.glob("*.mp3"))
     
     def get_music_file(self, category: str) -> Optional[str]:
         """
@@ -41,7 +69,7 @@ class MusicSelector:
             return None
         
         # Get all music files (.wav and .mp3) in the category directory
-        music_files = list(category_dir.glob("*.wav")) + list(category_dir.glob("*.mp3"))
+        music_files = self._category_files(category)
         
         if not music_files:
             print(f"[ERROR] No music files found in category: {category}")
@@ -145,8 +173,7 @@ class MusicSelector:
         for category in self.categories:
             category_dir = self.music_dir / category
             if category_dir.exists():
-                music_files = [f.name for f in category_dir.glob("*.wav")] + [f.name for f in category_dir.glob("*.mp3")]
-                available_music[category] = music_files
+                available_music[category] = [f.name for f in self._category_files(category)]
             else:
                 available_music[category] = []
         
@@ -0,0 +1,304 @@
+"""
+Stage profiler
+Opt-in spans around pipeline stages (story, TTS, Whisper sync, images, mix,
+Ken Burns render, subtitle render, encode). Each span records wall and CPU
+time, peak RSS, the top tracemalloc allocators and, optionally, a cProfile
+dump; a background sampler collects stacks in the collapsed format read by
+flamegraph tools (flamegraph.pl, speedscope, inferno).
+
+    with profile_span("tts"):          # free when profiling is off
+        audio = generate_audio(...)
+
+Spans also mark the current stage for log records (current_stage()), with
+or without profiling.
+"""
+
+import contextvars
+import cProfile
+import logging
+import os
+import re
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_STAGE = contextvars.ContextVar("pipeline_stage", default=None)
+# Allocation tracebacks are attributed to the innermost frame outside these (numpy, stdlib, ...)
+_LIBRARY_PATHS = tuple({sysconfig.get_paths()[key] for key in ("stdlib", "platstdlib", "purelib", "platlib")})
+TRACEBACK_FRAMES = 16
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes (peak RSS where the current value is unavailable)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_stage() -> Optional[str]:
+    """Path of the innermost open span in this task or thread ("video;mix"), None outside any span."""
+    return _STAGE.get()
+
+
+class _StageMarker:
+    """Marks the current stage for the duration of a span; all a span does when profiling is off."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        parent = _STAGE.get()
+        self._token = _STAGE.set(f"{parent};{self.name}" if parent else self.name)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _STAGE.reset(self._token)
+        return False
+
+
+class _Span(_StageMarker):
+    """One active span; becomes a plain dict in StageProfiler.spans when it ends."""
+
+    def __init__(self, profiler: "StageProfiler", name: str):
+        super().__init__(name)
+        self.profiler = profiler
+
+    def __enter__(self):
+        super().__enter__()
+        self.profiler._enter(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.profiler._exit(self, exc)
+        finally:
+            super().__exit__(exc_type, exc, tb)
+        return False
+
+
+class StageProfiler:
+    """
+    Collects nested stage spans for one pipeline run.
+
+    Spans are process-wide (the pipeline runs its stages one after another),
+    so they can be opened from any module through profile_span() without
+    passing the profiler around. Worker threads started inside a span are
+    covered by its wall/CPU/RSS figures and by the stack sampler.
+    """
+
+    def __init__(self, enabled: bool = True, sample_interval_ms: float = 5.0, trace_allocations: bool = True,
+                 top_allocators: int = 10, cprofile_dir: Optional[Path] = None):
+        self.enabled = enabled
+        self.sample_interval = sample_interval_ms / 1000
+        self.trace_allocations = trace_allocations
+        self.top_allocators = top_allocators
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self.spans: List[Dict[str, Any]] = []
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._active: List[_Span] = []
+        self._path = ()
+        self._lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started_tracemalloc = False
+
+    def span(self, name: str):
+        """Context manager timing one stage; only marks the current stage when profiling is off."""
+        return _Span(self, name) if self.enabled else _StageMarker(name)
+
+    # -- lifecycle -------------------------------------------------------------------
+
+    def start(self):
+        """Start tracemalloc and the stack sampler (spans also start them on first use)."""
+        if not self.enabled or self._sampler is not None:
+            return
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEBACK_FRAMES)
+            self._started_tracemalloc = True
+        if self.sample_interval > 0:
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="stage-profiler", daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        """Stop sampling and allocation tracing."""
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # -- spans -----------------------------------------------------------------------
+
+    def _enter(self, span: _Span):
+        self.start()
+        parent = self._active[-1] if self._active else None
+        span.path = self._path + (span.name,)
+        span.rss_start = span.rss_peak = current_rss()
+
+        if tracemalloc.is_tracing():
+            # The peak counter is shared: fold it into the parent before resetting it for the child
+            if parent is not None:
+                parent.traced_peak = max(parent.traced_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            span.traced_peak = 0
+            span.snapshot = tracemalloc.take_snapshot()
+
+        span.cprofile = None
+        if self.cprofile_dir is not None:
+            # Only one cProfile can be active: pause the parent's so each dump holds the stage's own time
+            if parent is not None and parent.cprofile is not None:
+                parent.cprofile.disable()
+            span.cprofile = cProfile.Profile()
+            span.cprofile.enable()
+
+        with self._lock:
+            self._active.append(span)
+            self._path = span.path
+        span.cpu_start = time.process_time()
+        span.wall_start = time.perf_counter()
+
+    def _exit(self, span: _Span, exc: Optional[BaseException]):
+        wall = time.perf_counter() - span.wall_start
+        cpu = time.process_time() - span.cpu_start
+        with self._lock:
+            self._active.remove(span)
+            self._path = self._active[-1].path if self._active else ()
+        parent = self._active[-1] if self._active else None
+
+        record = {
+            "name": span.name,
+            "path": ";".join(span.path),
+            "depth": len(span.path) - 1,
+            "wall_s": round(wall, 4),
+            "cpu_s": round(cpu, 4),
+            # process_time counts every thread, so >1 means the stage ran in parallel
+            "cpu_utilization": round(cpu / wall, 2) if wall > 0 else 0.0,
+            "rss_start_mb": round(span.rss_start / 2**20, 1),
+            "peak_rss_mb": round(max(span.rss_peak, current_rss()) / 2**20, 1),
+        }
+        if exc is not None:
+            record["error"] = f"{type(exc).__name__}: {exc}"
+
+        if span.cprofile is not None:
+            span.cprofile.disable()
+            record["cprofile"] = str(self._dump_cprofile(span))
+            if parent is not None and parent.cprofile is not None:
+                parent.cprofile.enable()
+
+        if tracemalloc.is_tracing() and hasattr(span, "snapshot"):
+            peak = max(span.traced_peak, tracemalloc.get_traced_memory()[1])
+            record["traced_peak_mb"] = round(peak / 2**20, 2)
+            record["top_allocators"] = self._top_allocators(span.snapshot)
+            del span.snapshot
+            if parent is not None:
+                parent.traced_peak = max(parent.traced_peak, peak)
+            tracemalloc.reset_peak()
+
+        if parent is not None:
+            parent.rss_peak = max(parent.rss_peak, span.rss_peak)
+        self.spans.append(record)
+        logger.info(f"⏱️ {record['path']}: {wall:.2f}s wall, {cpu:.2f}s CPU, peak RSS {record['peak_rss_mb']:.0f} MB")
+
+    def _top_allocators(self, before: "tracemalloc.Snapshot") -> List[Dict[str, Any]]:
+        """Project source lines whose calls allocated the most still-live memory during the span."""
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+        totals: Dict[str, List[int]] = {}
+        for stat in after.compare_to(before.filter_traces(filters), "traceback"):
+            # Frames run oldest to most recent; "np.zeros(...)" is charged to the line that called it
+            frame = next((f for f in reversed(stat.traceback) if not f.filename.startswith(_LIBRARY_PATHS)),
+                         stat.traceback[-1])
+            total = totals.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+            total[0] += stat.size_diff
+            total[1] += stat.count_diff
+        ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:self.top_allocators]
+        return [{"location": location, "size_kb": round(size / 1024, 1), "count": count}
+                for location, (size, count) in ranked if size > 0]
+
+    def _dump_cprofile(self, span: _Span) -> Path:
+        self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+        name = re.sub(r"[^\w.-]+", "_", "__".join(span.path))
+        path = self.cprofile_dir / f"{len(self.spans):02d}_{name}.prof"
+        span.cprofile.dump_stats(str(path))
+        return path
+
+    # -- stack sampling --------------------------------------------------------------
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.sample_interval):
+            with self._lock:
+                path = self._path
+                active = list(self._active)
+            if not path:
+                continue
+            rss = current_rss()
+            for span in active:
+                span.rss_peak = max(span.rss_peak, rss)
+
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                thread = names.get(ident, str(ident))
+                prefix = path if thread == "MainThread" else path + (f"thread:{thread}",)
+                self.stacks[";".join(prefix + tuple(reversed(stack)))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, path: Path) -> Path:
+        """Write sampled stacks as 'frame;frame;... count' lines (flamegraph.pl / speedscope input)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def report(self) -> Dict[str, Any]:
+        """Spans (in completion order) and sampling totals for the pipeline report."""
+        return {
+            "spans": self.spans,
+            "sample_interval_ms": self.sample_interval * 1000,
+            "samples": self.samples,
+        }
+
+
+_profiler = StageProfiler(enabled=False)
+
+
+def get_profiler() -> StageProfiler:
+    """The process-wide profiler (disabled unless set_profiler() installed an enabled one)."""
+    return _profiler
+
+
+def set_profiler(profiler: Optional[StageProfiler]) -> StageProfiler:
+    """Install a profiler for the current run; None restores the disabled default."""
+    global _profiler
+    _profiler = profiler or StageProfiler(enabled=False)
+    return _profiler
+
+
+def profile_span(name: str):
+    """Span on the process-wide profiler; only marks the current stage when profiling is off."""
+    return _profiler.span(name)
@@ -0,0 +1,45 @@
+"""
+Script tests
+Runner for the test_*.py scripts when they are run directly. The test
+functions assert, so pytest reports their failures; `python test_x.py`
+runs the same functions through run_tests and prints a summary.
+
+    def main():
+        return run_tests("TESTING MUSIC LOOP", [test_seamless_loop, test_crossfade])
+
+    if __name__ == "__main__":
+        sys.exit(0 if main() else 1)
+"""
+
+from typing import Callable, Sequence
+
+
+def run_tests(title: str, tests: Sequence[Callable[[], None]], width: int = 50) -> bool:
+    """
+    Run test functions in order, printing one line per test and a summary.
+
+    Args:
+        title: Heading printed above the results
+        tests: Test functions; a test fails by raising (AssertionError or otherwise)
+        width: Width of the heading rule
+
+    Returns:
+        True if every test passed
+    """
+    print(f"🔍 {title}")
+    print("=" * width)
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed" + (f": {e}" if str(e) else ""))
+        except Exception as e:
+            print(f"❌ {test.__name__} crashed: {e}")
+        else:
+            print(f"✅ {test.__name__} passed")
+            passed += 1
+
+    print(f"\n📊 {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
@@ -10,26 +10,26 @@ from typing import List, Optional, Literal
 import logging
 import math
 import tempfile
-from moviepy.editor import ImageClip, AudioFileClip, concatenate_videoclips
-from moviepy.video.fx import resize, crop
+import time
 
 # Add project root to path to import config
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.lazy_import import lazy_import
+from src.utils.logger import get_logger
+from src.utils.profiler import profile_span
+from src.video_composition.utils.timing_calculator import TimingCalculator
+from src.video_composition.utils.ffmpeg_utils import concat_video_chunks
+from src.video_composition.utils.quality_optimizer import QualityOptimizer
+
+# Imported on first use (moviepy.editor pulls in scipy, IPython and imageio)
+mpy = lazy_import("moviepy.editor")
 
 def setup_logger(name: str = "moviepy_video_composer") -> logging.Logger:
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    if logger.handlers:
-        return logger
-    ch = logging.StreamHandler()
-    ch.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
-    return logger
+    # Records propagate to the central queue handler; a handler here would print every line twice
+    return get_logger(name)
 
 class MoviePyVideoComposer:
     """
@@ -37,7 +37,8 @@ class MoviePyVideoComposer:
     Stitches images and applies Ken Burns effects in one operation
     """
     
-    def __init__(self, output_dir: str = None, logger: Optional[logging.Logger] = None):
+    def __init__(self, output_dir: str = None, logger: Optional[logging.Logger] = None,
+                 encoder_profile: Optional[str] = None):
         # Use absolute path to ensure consistent output location
         if output_dir is None:
             self.output_dir = Config.OUTPUT_DIR
@@ -46,16 +47,18 @@ class MoviePyVideoComposer:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.logger = logger or setup_logger()
         # FLUX Schnell 9:16 dimensions (actual generated size from test)
-        # Maintain 768x1344 throughout pipeline - NO downscaling
-        self.width = 768
-        self.height = 1344
+        # Maintain 768x1344 throughout pipeline - only the draft profile downscales
+        self.encoder_profile = QualityOptimizer.get_encoder_profile(encoder_profile or Config.RENDER.ENCODER_PROFILE)['name']
+        self.source_width, self.source_height = 768, 1344
+        self.width, self.height = QualityOptimizer.get_profile_dimensions(self.encoder_profile, self.source_width, self.source_height)
         self.fps = 30
+        self.encode_stats = []
         self.logger.info("✅ MoviePy Video Composer initialized")
-        self.logger.info(f"📐 Video dimensions: {self.width}x{self.height} (maintained throughout pipeline)")
+        self.logger.info(f"📐 Video dimensions: {self.width}x{self.height} (encoder profile: {self.encoder_profile})")
     
     def get_audio_duration(self, audio_file: str) -> float:
         """Get audio duration using MoviePy"""
-        audio = AudioFileClip(audio_file)
+        audio = mpy.AudioFileClip(audio_file)
         duration = audio.duration
         audio.close()
         return duration
@@ -125,8 +128,8 @@ class MoviePyVideoComposer:
             try:
                 with Image.open(img_path) as img:
                     width, height = img.size
-                    if width != self.width or height != self.height:
-                        self.logger.warning(f"⚠️  Image {Path(img_path).name} is {width}x{height}, expected {self.width}x{self.height}")
+                    if width != self.source_width or height != self.source_height:
+                        self.logger.warning(f"⚠️  Image {Path(img_path).name} is {width}x{height}, expected {self.source_width}x{self.source_height}")
                         self.logger.info("Images will be resized to maintain 768x1344 throughout pipeline")
             except Exception as e:
                 self.logger.warning(f"⚠️  Could not validate image {Path(img_path).name}: {e}")
@@ -141,7 +144,9 @@ class MoviePyVideoComposer:
         CRITICAL: Ensures exact duration to prevent video/audio sync issues
         """
         # Create base clip with exact duration first
-        clip = ImageClip(image_path, duration=duration)
+        clip = mpy.ImageClip(image_path, duration=duration)
+        if tuple(clip.size) != (self.width, self.height):
+            clip = clip.resize((self.width, self.height))
         base_zoom = 1.1
         zoom_range = 0.1  # 10% zoom in/out for effect
         pan_zoom = 1.2    # 20% zoom for pan effects
@@ -184,23 +189,15 @@ class MoviePyVideoComposer:
             moving = clip.resize(base_zoom)
             moving = moving.crop(x_center=self.width/2, y_center=self.height/2, width=crop_w, height=crop_h)
         
-        # CRITICAL: Force exact duration to prevent sync issues
-        moving = moving.set_duration(duration)
-        
-        # Double-check duration is correct
-        if abs(moving.duration - duration) > 0.001:  # 1ms tolerance
-            self.logger.warning(f"⚠️ Duration mismatch in Ken Burns clip: {moving.duration:.3f}s vs {duration:.3f}s")
-            # Force exact duration
-            moving = moving.set_duration(duration)
-        
-        return moving
+        # Duration is a whole number of frames taken from the timeline schedule
+        return moving.set_duration(duration)
     
     def create_basic_clip(self, image_path: str, duration: float):
         """
         Create a basic MoviePy clip from an image (no effects)
         Maintains 768x1344 dimensions throughout pipeline
         """
-        clip = ImageClip(image_path, duration=duration)
+        clip = mpy.ImageClip(image_path, duration=duration)
         # Ensure exact dimensions - no downscaling, maintain aspect ratio
         clip = clip.resize((self.width, self.height))
         self.logger.debug(f"📐 Basic clip created: {self.width}x{self.height}")
@@ -213,27 +210,35 @@ class MoviePyVideoComposer:
                      output_filename: Optional[str] = None,
                      enable_ken_burns: bool = True,
                      effects: Optional[List[str]] = None,
-                     num_images: int = 12) -> str:
+                     num_images: int = 12,
+                     parallel_render: bool = False,
+                     max_workers: Optional[int] = None) -> str:
         """
         Compose video with images and Ken Burns effects in one operation
+        
+        Args:
+            parallel_render: Render each image segment as its own chunk in a
+                process pool and join the chunks without re-encoding
+            max_workers: Process pool size for parallel rendering (defaults to CPU count)
         """
         try:
             self.logger.info(f"🎬 Starting unified video composition for: {topic_name}")
             if not Path(audio_file).exists():
                 raise FileNotFoundError(f"Audio file not found: {audio_file}")
-            # Get the actual target duration from the audio file
+            # The audio defines the timeline: every schedule below is whole frames,
+            # computed once and validated, so no corrective trim/extend passes are needed.
             audio_duration = self.get_audio_duration(audio_file)
+            timeline = TimingCalculator(fps=self.fps).timeline_for(audio_duration)
             image_paths = self.load_images(image_dir, num_images)
-            
-            # CRITICAL: Use the exact audio duration for image timing
-            image_duration = audio_duration / len(image_paths)
+            schedule = timeline.image_schedule(len(image_paths))
+            total_frames = timeline.total_frames
+            video_duration = float(timeline.video_duration)
             
             # Log the exact timing for verification
             self.logger.info(f"🎵 Audio duration: {audio_duration:.3f}s")
             self.logger.info(f"📸 Number of images: {len(image_paths)}")
-            self.logger.info(f"⏱️ Calculated image duration: {image_duration:.3f}s")
-            self.logger.info(f"📐 Expected total video duration: {audio_duration:.3f}s")
-            self.logger.info(f"⏱️  Image duration: {image_duration:.2f} seconds per image")
+            self.logger.info(f"📐 Timeline: {timeline}")
+            self.logger.info(f"⏱️ Image segments: {min(s['frames'] for s in schedule)}-{max(s['frames'] for s in schedule)} frames each")
             # Ensure output directory exists
             self.output_dir.mkdir(parents=True, exist_ok=True)
             if not output_filename:
@@ -247,140 +252,48 @@ class MoviePyVideoComposer:
                 # Use random effects with no back-to-back repeats
                 effects = self.generate_random_effects(num_images)
                 self.logger.info(f"🎲 Generated random effects sequence: {effects[:5]}..." if len(effects) > 5 else f"🎲 Generated random effects sequence: {effects}")
+            if parallel_render:
+                return self._compose_video_parallel(
+                    image_paths, audio_file, schedule, output_path,
+                    effects if enable_ken_burns else None, max_workers
+                )
             clips = []
-            for i, image_path in enumerate(image_paths):
-                self.logger.info(f"📸 Processing image {i+1}/{len(image_paths)}: {Path(image_path).name}")
+            for image_path, segment in zip(image_paths, schedule):
+                self.logger.info(f"📸 Processing image {segment['index']+1}/{len(image_paths)}: {Path(image_path).name} ({segment['frames']} frames)")
                 if enable_ken_burns and effects:
-                    effect = effects[i % len(effects)]
+                    effect = effects[segment['index'] % len(effects)]
                     self.logger.info(f"✨ Applying {effect} effect")
-                    clip = self.create_ken_burns_clip(image_path, effect, image_duration)
+                    clip = self.create_ken_burns_clip(image_path, effect, segment['duration'])
                 else:
-                    clip = self.create_basic_clip(image_path, image_duration)
+                    clip = self.create_basic_clip(image_path, segment['duration'])
                 clips.append(clip)
             self.logger.info(f"🔗 Concatenating {len(clips)} clips...")
-            final_video = concatenate_videoclips(clips, method="compose")
-            
-            # CRITICAL: Force video duration to match expected duration exactly
-            expected_duration = len(image_paths) * image_duration
-            actual_duration = final_video.duration
-            
-            self.logger.info(f"📐 Expected video duration: {expected_duration:.3f}s")
-            self.logger.info(f"📹 Actual video duration: {actual_duration:.3f}s")
-            
-            # AGGRESSIVE: Force exact duration to prevent sync issues (NO TOLERANCE)
-            if abs(actual_duration - expected_duration) > 0.001:  # 1ms tolerance
-                self.logger.warning(f"⚠️ Video duration mismatch: {abs(actual_duration - expected_duration):.3f}s")
-                if actual_duration > expected_duration:
-                    final_video = final_video.subclip(0, expected_duration)
-                    self.logger.info(f"✂️ AGGRESSIVE TRIM: Video {actual_duration:.3f}s → {expected_duration:.3f}s")
-                else:
-                    # Extend last frame if video is too short
-                    last_clip = clips[-1]
-                    extension_needed = expected_duration - actual_duration
-                    extension_clip = last_clip.set_duration(extension_needed)
-                    final_video = concatenate_videoclips([final_video, extension_clip], method="compose")
-                    self.logger.info(f"🔧 Extended video from {actual_duration:.3f}s to {expected_duration:.3f}s")
-                actual_duration = expected_duration
-            else:
-                self.logger.info(f"✅ Video duration matches expected: {actual_duration:.3f}s")
-            
-            # CRITICAL: Ensure exact audio/video synchronization
-            self.logger.info(f"🎵 Adding audio to video with exact duration matching...")
-            audio = AudioFileClip(audio_file)
+            final_video = mpy.concatenate_videoclips(clips, method="compose").set_duration(video_duration)
             
-            # Get exact durations
-            video_duration = final_video.duration
-            audio_duration = audio.duration
-            
-            self.logger.info(f"📹 Video duration: {video_duration:.3f}s")
-            self.logger.info(f"🎵 Audio duration: {audio_duration:.3f}s")
-            
-            # CRITICAL: ALWAYS trim video to match audio duration exactly (ZERO TOLERANCE)
-            # This prevents the issue where images continue showing after audio ends
-            if abs(audio_duration - video_duration) > 0.0001:  # 0.1ms tolerance (essentially zero)
-                if audio_duration > video_duration:
-                    audio = audio.subclip(0, video_duration)
-                    self.logger.info(f"✂️ Trimmed audio from {audio_duration:.3f}s to {video_duration:.3f}s")
-                else:
-                    # CRITICAL FIX: Always trim video to match audio (prevent end audio issues)
-                    final_video = final_video.subclip(0, audio_duration)
-                    self.logger.info(f"🔧 CRITICAL FIX: Trimmed video from {video_duration:.3f}s to {audio_duration:.3f}s")
-                    self.logger.info(f"🔧 This prevents images from showing after audio ends")
-                    video_duration = audio_duration
-            else:
-                self.logger.info(f"✅ Perfect duration match: {audio_duration:.3f}s")
-            
-            # CRITICAL: ALWAYS ensure video never exceeds audio duration (ZERO TOLERANCE)
-            # This is the main fix for the "images showing after audio ends" issue
-            if audio_duration > video_duration:
+            # Audio is never shorter than the video (the timeline floors to whole frames),
+            # so a single cut to the video duration aligns them
+            audio = mpy.AudioFileClip(audio_file)
+            if audio.duration > video_duration:
                 audio = audio.subclip(0, video_duration)
-                self.logger.info(f"🔧 Aggressive trim: Audio {audio_duration:.3f}s → {video_duration:.3f}s")
-            elif audio_duration < video_duration:
-                # CRITICAL FIX: Always trim video to match audio (prevents end audio issues)
-                final_video = final_video.subclip(0, audio_duration)
-                self.logger.info(f"🔧 CRITICAL FIX: Video {video_duration:.3f}s → {audio_duration:.3f}s")
-                self.logger.info(f"🔧 This ensures video ends exactly when audio ends")
-                video_duration = audio_duration
-            else:
-                self.logger.info(f"✅ Perfect audio/video duration match: {audio_duration:.3f}s")
-            
-            # Set audio with exact duration match
             final_video = final_video.set_audio(audio)
-            
-            # CRITICAL VERIFICATION: Final check to ensure video ends exactly when audio ends
-            final_audio_duration = final_video.audio.duration
-            final_video_duration = final_video.duration
-            
-            self.logger.info(f"🔍 Final verification - Audio: {final_audio_duration:.3f}s, Video: {final_video_duration:.3f}s")
-            
-            if abs(final_audio_duration - final_video_duration) > 0.0001:  # 0.1ms tolerance (essentially zero)
-                self.logger.warning(f"⚠️ Final sync mismatch: Audio {final_audio_duration:.3f}s vs Video {final_video_duration:.3f}s")
-                
-                # CRITICAL FIX: Force video to match audio duration exactly
-                if final_video_duration > final_audio_duration:
-                    self.logger.warning(f"⚠️ Video still longer than audio - this will cause images to show after audio ends!")
-                    # Force trim the video to match audio
-                    try:
-                        final_video = final_video.subclip(0, final_audio_duration)
-                        self.logger.info(f"🔧 CRITICAL FIX: Forced video trim to match audio: {final_audio_duration:.3f}s")
-                        self.logger.info(f"🔧 This prevents the 'images showing after audio ends' issue")
-                    except Exception as e:
-                        self.logger.error(f"❌ Failed to force trim video: {e}")
-                elif final_audio_duration > final_video_duration:
-                    self.logger.warning(f"⚠️ Audio longer than video - this may cause end audio issues")
-                    # Try to force trim the audio
-                    try:
-                        trimmed_audio = final_video.audio.subclip(0, final_video_duration)
-                        final_video = final_video.set_audio(trimmed_audio)
-                        self.logger.info(f"🔧 Forced audio trim to match video: {final_video_duration:.3f}s")
-                    except Exception as e:
-                        self.logger.error(f"❌ Failed to force trim audio: {e}")
-            else:
-                self.logger.info(f"✅ Perfect audio/video sync: {final_audio_duration:.3f}s")
-                self.logger.info(f"✅ Video will end exactly when audio ends")
+            self.logger.info(f"✅ Video {video_duration:.3f}s ({total_frames} frames), audio {audio_duration:.3f}s")
             self.logger.info(f"💾 Writing final video: {output_path}")
             import tempfile
             temp_audio = tempfile.NamedTemporaryFile(suffix='.m4a', delete=False)
             temp_audio.close()
-            final_video.write_videofile(
-                str(output_path),
-                fps=self.fps,
-                codec='libx264',
-                audio_codec='aac',
-                audio_bitrate='320k',
-                audio_fps=44100,  # Ensure high audio sample rate
-                temp_audiofile=temp_audio.name,
-                remove_temp=True,
-                preset='slow',  # High-quality encoding preset
-                bitrate='8000k',  # High bitrate for HD quality
-                threads=4,  # Multi-threading for faster encoding
-                ffmpeg_params=[
-                    '-crf', '18',  # High quality (lower CRF = better quality, 18 is visually lossless)
-                    '-profile:v', 'high',  # High profile for better quality
-                    '-level', '4.1',  # Support for HD content
-                    '-pix_fmt', 'yuv420p'  # Better compatibility
-                ]
-            )
+            encode_start = time.time()
+            with profile_span("encode"):
+                final_video.write_videofile(
+                    str(output_path),
+                    fps=self.fps,
+                    temp_audiofile=temp_audio.name,
+                    remove_temp=True,
+                    **QualityOptimizer.get_write_videofile_kwargs(
+                        self.encoder_profile, extra_ffmpeg_params=['-frames:v', str(total_frames)]
+                    )
+                )
+            self.encode_stats.append(QualityOptimizer.build_encode_stats(
+                'kenburns', self.encoder_profile, str(output_path), time.time() - encode_start))
             try:
                 os.unlink(temp_audio.name)
             except:
@@ -400,6 +313,60 @@ class MoviePyVideoComposer:
             self.logger.error(f"❌ Error in video composition: {str(e)}")
             raise
     
+    def _compose_video_parallel(self,
+                                image_paths: List[str],
+                                audio_file: str,
+                                schedule: List[dict],
+                                output_path: Path,
+                                effects: Optional[List[str]],
+                                max_workers: Optional[int] = None) -> str:
+        """
+        Render each image segment in a separate process and join the chunks
+        with the ffmpeg concat demuxer (stream copy, no second encode).
+        
+        Segment lengths come from the timeline image schedule (whole frames
+        tiling the video), so the joined video has exactly the timeline's frames.
+        """
+        import shutil
+        from concurrent.futures import ProcessPoolExecutor
+        
+        total_frames = sum(segment['frames'] for segment in schedule)
+        self.logger.info(f"⚡ Parallel render: {len(image_paths)} segments, {total_frames} frames "
+                         f"({total_frames / self.fps:.3f}s)")
+        
+        chunk_dir = Path(tempfile.mkdtemp(prefix=".chunks_", dir=str(self.output_dir)))
+        jobs = []
+        for i, (image_path, segment) in enumerate(zip(image_paths, schedule)):
+            jobs.append({
+                'image_path': image_path,
+                'effect': effects[i % len(effects)] if effects else None,
+                'frames': segment['frames'],
+                'fps': self.fps,
+                'encoder_profile': self.encoder_profile,
+                'chunk_path': str(chunk_dir / f"segment_{i:03d}.mp4")
+            })
+        
+        encode_start = time.time()
+        try:
+            workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+            # Segment processes render and encode; the span sees their time as wall time only
+            with profile_span("encode"):
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    chunk_paths = list(pool.map(_render_segment_chunk, jobs))
+                self.logger.info(f"✅ Rendered {len(chunk_paths)} segment chunks with {workers} workers")
+                
+                concat_video_chunks(chunk_paths, str(output_path), audio_path=audio_file,
+                                    audio_bitrate=QualityOptimizer.get_encoder_profile(self.encoder_profile)['audio_bitrate'],
+                                    duration=total_frames / self.fps, logger=self.logger)
+        finally:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+        self.encode_stats.append(QualityOptimizer.build_encode_stats(
+            'kenburns', self.encoder_profile, str(output_path), time.time() - encode_start))
+        
+        self.verify_video_quality(str(output_path))
+        self.logger.info(f"✅ Video composition completed: {output_path}")
+        return str(output_path)
+    
     def verify_video_quality(self, video_path: str):
         """Verify the final video meets HD quality standards"""
         try:
@@ -449,4 +416,35 @@ class MoviePyVideoComposer:
             clip.close()
             
         except Exception as e:
-            self.logger.warning(f"⚠️  Could not verify video quality: {e}") 
\ No newline at end of file
+            self.logger.warning(f"⚠️  Could not verify video quality: {e}")
+
+
+def _render_segment_chunk(job: dict) -> str:
+    """
+    Process-pool worker: render one image segment to a video-only chunk.
+    
+    The chunk is capped at exactly job['frames'] frames so the concatenated
+    timeline matches the frame counts computed from the audio.
+    """
+    composer = MoviePyVideoComposer(output_dir=Path(job['chunk_path']).parent,
+                                    logger=logging.getLogger("moviepy_video_composer.worker"),
+                                    encoder_profile=job['encoder_profile'])
+    composer.fps = job['fps']
+    duration = job['frames'] / job['fps']
+    
+    if job['effect']:
+        clip = composer.create_ken_burns_clip(job['image_path'], job['effect'], duration)
+    else:
+        clip = composer.create_basic_clip(job['image_path'], duration)
+    
+    clip.write_videofile(
+        job['chunk_path'],
+        fps=job['fps'],
+        logger=None,
+        **QualityOptimizer.get_write_videofile_kwargs(
+            job['encoder_profile'], audio=False, threads=1,
+            extra_ffmpeg_params=['-frames:v', str(job['frames'])]
+        )
+    )
+    clip.close()
+    return job['chunk_path']
@@ -3,11 +3,21 @@ Video Composition Utils - Utility modules for video processing
 """
 
 from .timing_calculator import TimingCalculator
+from .timeline import Timeline, TimelineError
 from .effect_presets import EffectPresets
-from .quality_optimizer import QualityOptimizer
+from .quality_optimizer import QualityOptimizer, ENCODER_PROFILES, DEFAULT_ENCODER_PROFILE
+from .ffmpeg_utils import concat_video_chunks, get_ffmpeg_binary, run_ffmpeg, stream_copy_trim
 
 __all__ = [
     'TimingCalculator',
+    'Timeline',
+    'TimelineError',
     'EffectPresets',
-    'QualityOptimizer'
+    'QualityOptimizer',
+    'ENCODER_PROFILES',
+    'DEFAULT_ENCODER_PROFILE',
+    'concat_video_chunks',
+    'get_ffmpeg_binary',
+    'run_ffmpeg',
+    'stream_copy_trim'
 ] 
\ No newline at end of file
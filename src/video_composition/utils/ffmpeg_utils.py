@@ -0,0 +1,115 @@
+"""
+FFmpeg Utilities - Direct ffmpeg operations that avoid MoviePy re-encoding
+"""
+
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+import logging
+
+
+def get_ffmpeg_binary() -> str:
+    """Get the ffmpeg binary MoviePy is configured to use."""
+    try:
+        from moviepy.config import get_setting
+        return get_setting("FFMPEG_BINARY")
+    except Exception:
+        return "ffmpeg"
+
+
+def run_ffmpeg(args: List[str], logger: Optional[logging.Logger] = None):
+    """
+    Run ffmpeg with the given arguments.
+
+    Args:
+        args: Arguments after the ffmpeg binary
+        logger: Optional logger for the command line
+
+    Raises:
+        RuntimeError: If ffmpeg exits with a non-zero status
+    """
+    cmd = [get_ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-y"] + args
+    if logger:
+        logger.debug(f"🔧 ffmpeg {' '.join(args)}")
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed ({result.returncode}): {result.stderr.strip()[-500:]}")
+
+
+def concat_video_chunks(chunk_paths: List[str],
+                        output_path: str,
+                        audio_path: Optional[str] = None,
+                        audio_bitrate: str = "320k",
+                        audio_fps: int = 44100,
+                        duration: Optional[float] = None,
+                        logger: Optional[logging.Logger] = None) -> str:
+    """
+    Join encoded video chunks with the concat demuxer (no video re-encode).
+
+    All chunks must share codec, resolution, frame rate and pixel format.
+
+    Args:
+        chunk_paths: Chunk files in playback order
+        output_path: Destination video file
+        audio_path: Optional audio track to mux in (encoded to AAC)
+        audio_bitrate: AAC bitrate for the muxed audio
+        audio_fps: Audio sample rate for the muxed audio
+        duration: Length of the joined video (frames / fps); the muxed audio is cut
+            to it. Without it the output stops at the shorter stream.
+        logger: Optional logger
+
+    Returns:
+        Path to the joined video
+    """
+    output_path = Path(output_path)
+    list_path = output_path.with_suffix(".concat.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        for chunk in chunk_paths:
+            escaped = str(Path(chunk).resolve()).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    args = ["-f", "concat", "-safe", "0", "-i", str(list_path)]
+    if audio_path:
+        args += ["-i", str(audio_path), "-map", "0:v:0", "-map", "1:a:0",
+                 "-c:a", "aac", "-b:a", audio_bitrate, "-ar", str(audio_fps)]
+        # The narration runs past the last whole frame; don't let it set the container duration
+        args += ["-t", f"{duration:.6f}"] if duration else ["-shortest"]
+    args += ["-c:v", "copy", "-movflags", "+faststart", str(output_path)]
+
+    try:
+        run_ffmpeg(args, logger)
+    finally:
+        try:
+            list_path.unlink()
+        except OSError:
+            pass
+
+    return str(output_path)
+
+
+def stream_copy_trim(input_path: str,
+                     output_path: str,
+                     duration: float,
+                     fps: Optional[int] = None,
+                     logger: Optional[logging.Logger] = None) -> str:
+    """
+    Cut a video to a duration without re-encoding (stream copy).
+
+    The cut starts at 0, which is always a keyframe, so no GOP is split at the
+    head; the tail is dropped at the last whole frame inside the duration.
+
+    Args:
+        input_path: Source video
+        output_path: Destination video (must differ from input_path)
+        duration: Target duration in seconds
+        fps: Frame rate used to snap the duration down to a frame boundary
+        logger: Optional logger
+
+    Returns:
+        Path to the trimmed video
+    """
+    if fps:
+        duration = int(duration * fps + 1e-6) / fps
+    run_ffmpeg(["-i", str(input_path), "-t", f"{duration:.6f}", "-map", "0",
+                "-c", "copy", "-movflags", "+faststart", str(output_path)], logger)
+    return str(output_path)
@@ -0,0 +1,199 @@
+"""
+Forced Aligner - Word timings for narration whose text is already known
+The narration is the story we wrote, so there is nothing to transcribe: the
+known tokens are fed to the Whisper decoder in one teacher-forced pass and
+the cross-attention heads are aligned to the encoder frames with DTW (the
+same alignment faster-whisper uses for word_timestamps, without the beam
+search in front of it). Words come back spelled exactly as in the story.
+
+Audio longer than one 30s Whisper window is aligned window by window. Each
+window gets the words expected to fit at the narration's speaking rate plus
+a margin; DTW squeezes surplus words into the end of the window, so words
+ending close to the window edge are handed on to the next window, which
+starts where the last kept word ended.
+"""
+
+import json
+import logging
+import math
+import re
+from itertools import takewhile
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Narration markup that is not spoken: [dramatic], [pause:1s], <break time="1s"/>
+_MARKUP = re.compile(r'\[[^\]]*\]|<[^>]+>')
+
+
+class AlignmentError(RuntimeError):
+    """Raised when the known text cannot be aligned to the audio."""
+
+
+def narration_text(story_path: Union[str, Path]) -> str:
+    """
+    The spoken narration for a story folder file (story.txt or story.json).
+
+    Prefers the 'story' field of story.json next to the file; otherwise reads
+    the "Story:" section of story.txt. Audio tags and SSML are removed.
+    """
+    story_path = Path(story_path)
+    story_json = story_path.with_name("story.json")
+    text = ""
+    if story_json.exists():
+        try:
+            text = json.loads(story_json.read_text(encoding="utf-8")).get("story", "")
+        except (OSError, ValueError):
+            text = ""
+    if not text:
+        content = story_path.read_text(encoding="utf-8")
+        match = re.search(r'^Story:\s*\n(.*?)(?:\n\s*\nDescription:|\Z)', content, re.S | re.M)
+        text = match.group(1) if match else content
+    return " ".join(_MARKUP.sub(" ", text).split())
+
+
+def _alignment_is_batched() -> bool:
+    """
+    faster-whisper 1.x's find_alignment takes a batch of token lists and returns
+    one word list per entry; 0.x takes a single token list and returns its words.
+    The signature is the same in both, so the installed version decides.
+    """
+    try:
+        from faster_whisper import __version__
+    except ImportError:
+        return True
+    return int(__version__.split(".")[0]) >= 1
+
+
+def _pad_or_trim(features: np.ndarray, frames: int) -> np.ndarray:
+    """Zero-pad or cut mel features to exactly one encoder window."""
+    if features.shape[-1] < frames:
+        features = np.pad(features, [(0, 0), (0, frames - features.shape[-1])])
+    return features[:, :frames]
+
+
+def _word_spans(pieces: List[str]) -> List[Tuple[int, int]]:
+    """Character span of each alignment piece in the concatenated text."""
+    spans, position = [], 0
+    for piece in pieces:
+        spans.append((position, position + len(piece)))
+        position += len(piece)
+    return spans
+
+
+class ForcedAligner:
+    """
+    Aligns known text to audio with a faster-whisper model's cross-attention.
+
+    Args:
+        model: faster-whisper WhisperModel (see src.utils.model_cache)
+        language: Narration language code
+        edge_guard: Seconds before a window's end; words ending later move to the next window
+        rate_margin: Extra share of words offered to a window beyond the speaking-rate estimate
+    """
+
+    def __init__(self, model, language: str = "en", edge_guard: float = 1.5, rate_margin: float = 0.3):
+        self.model = model
+        self.language = language
+        self.edge_guard = edge_guard
+        self.rate_margin = rate_margin
+        self.batched_alignment = _alignment_is_batched()
+        self._tokenizer = None
+
+    @property
+    def tokenizer(self):
+        if self._tokenizer is None:
+            from faster_whisper.tokenizer import Tokenizer
+            self._tokenizer = Tokenizer(self.model.hf_tokenizer, self.model.model.is_multilingual,
+                                        task="transcribe", language=self.language)
+        return self._tokenizer
+
+    def _features(self, audio: Union[str, Path, np.ndarray]) -> Tuple[np.ndarray, int]:
+        """Mel features and the number of frames that hold audio (0.x pads 30s of silence, 1.x one hop)."""
+        extractor = self.model.feature_extractor
+        if not isinstance(audio, np.ndarray):
+            from faster_whisper.audio import decode_audio
+            audio = decode_audio(str(audio), sampling_rate=extractor.sampling_rate)
+        return extractor(audio), len(audio) // extractor.hop_length
+
+    def _find_alignment(self, tokens: List[int], encoder_output, num_frames: int) -> List[Dict]:
+        """Word pieces for one token list, in whichever call shape the installed faster-whisper uses."""
+        if self.batched_alignment:
+            return self.model.find_alignment(self.tokenizer, [tokens], encoder_output, num_frames)[0]
+        return self.model.find_alignment(self.tokenizer, tokens, encoder_output, num_frames)
+
+    def _align_window(self, features: np.ndarray, seek: int, size: int, words: List[str]) -> List[Dict]:
+        """Word timings (seconds from the window start) for words spoken in features[:, seek:seek + size]."""
+        text = " " + " ".join(words)
+        window = _pad_or_trim(features[:, seek:seek + size], self.model.feature_extractor.nb_max_frames)
+        pieces = self._find_alignment(self.tokenizer.encode(text), self.model.encode(window), size)
+        if "".join(piece["word"] for piece in pieces) != text:
+            raise AlignmentError("Aligned tokens do not reproduce the narration text")
+
+        # Map token-level pieces back onto the story's words; punctuation pieces do not set the timing
+        # (a trailing "." would otherwise stretch the word over the pause after it)
+        spans = _word_spans([piece["word"] for piece in pieces])
+        timings, position = [], 1
+        for word in words:
+            start, end = position, position + len(word)
+            position = end + 1
+            inside = [piece for piece, (a, b) in zip(pieces, spans) if a < end and b > start]
+            spoken = [piece for piece in inside if any(char.isalnum() for char in piece["word"])] or inside
+            timings.append({
+                'word': " " + word,
+                'start': float(spoken[0]["start"]),
+                'end': float(spoken[-1]["end"]),
+                'confidence': float(np.mean([piece["probability"] for piece in spoken])),
+                'source': 'forced_alignment'
+            })
+        return timings
+
+    def align(self, audio: Union[str, Path, np.ndarray], text: str) -> List[Dict]:
+        """
+        Word-level timings for text spoken in audio.
+
+        Args:
+            audio: Audio file path, or 16 kHz mono samples
+            text: Exact narration text
+
+        Returns:
+            One {'word', 'start', 'end', 'confidence', 'source'} dict per word of text, in order
+
+        Raises:
+            AlignmentError: If the text is empty or longer than the audio can hold
+        """
+        words = text.split()
+        if not words:
+            raise AlignmentError("No narration text to align")
+        features, content_frames = self._features(audio)
+        extractor = self.model.feature_extractor
+        frames_per_second = 1.0 / extractor.time_per_frame
+        words_per_frame = len(words) / max(content_frames, 1)
+
+        aligned: List[Dict] = []
+        seek = 0
+        while len(aligned) < len(words):
+            if seek >= content_frames:
+                raise AlignmentError(f"Audio ended with {len(words) - len(aligned)} words left to align")
+            size = min(extractor.nb_max_frames, content_frames - seek)
+            last_window = seek + size >= content_frames
+            remaining = words[len(aligned):]
+            if not last_window:
+                remaining = remaining[:math.ceil(words_per_frame * size * (1 + self.rate_margin)) + 1]
+            timings = self._align_window(features, seek, size, remaining)
+
+            if not last_window:
+                # Surplus words pile up at the end of the window; keep what ends before the guard
+                limit = size / frames_per_second - self.edge_guard
+                timings = list(takewhile(lambda timing: timing['end'] <= limit, timings)) or timings[:1]
+            offset = seek / frames_per_second
+            for timing in timings:
+                timing['start'] += offset
+                timing['end'] += offset
+            aligned.extend(timings)
+            logger.debug(f"Aligned {len(timings)} words in window at {offset:.2f}s")
+            seek = max(seek + 1, round(aligned[-1]['end'] * frames_per_second))
+        return aligned
@@ -3,17 +3,60 @@ Quality Optimizer - Video quality optimization and validation utilities
 """
 
 import ffmpeg
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 import logging
 
+# Named encoder profiles applied by every video writer in the pipeline.
+# 'scale' is relative to the native 768x1344 frame size.
+ENCODER_PROFILES = {
+    'draft': {
+        'preset': 'ultrafast',
+        'crf': 28,
+        'bitrate': None,
+        'scale': 0.5,
+        'audio_bitrate': '128k',
+        'h264_profile': None,
+        'description': 'Half resolution, fastest encode for review loops'
+    },
+    'preview': {
+        'preset': 'veryfast',
+        'crf': 23,
+        'bitrate': None,
+        'scale': 1.0,
+        'audio_bitrate': '192k',
+        'h264_profile': None,
+        'description': 'Full resolution, quick encode for checking timing and subtitles'
+    },
+    'production': {
+        'preset': 'slow',
+        'crf': 18,
+        'bitrate': '8000k',
+        'scale': 1.0,
+        'audio_bitrate': '320k',
+        'h264_profile': ('high', '4.1'),
+        'description': 'Upload quality for YouTube Shorts'
+    },
+    'archival': {
+        'preset': 'veryslow',
+        'crf': 14,
+        'bitrate': None,
+        'scale': 1.0,
+        'audio_bitrate': '320k',
+        'h264_profile': ('high', '4.1'),
+        'description': 'Near-lossless master copy'
+    }
+}
+
+DEFAULT_ENCODER_PROFILE = 'production'
+
 class QualityOptimizer:
     """Video quality optimization and validation utilities"""
     
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(__name__)
     
-    def validate_video_file(self, video_path: str) -> Dict[str, any]:
+    def validate_video_file(self, video_path: str) -> Dict[str, Any]:
         """
         Validate video file quality and specifications
         
@@ -197,7 +240,7 @@ class QualityOptimizer:
     
     def get_optimal_encoding_settings(self, 
                                     target_quality: str = "youtube_shorts",
-                                    processing_speed: str = "balanced") -> Dict[str, any]:
+                                    processing_speed: str = "balanced") -> Dict[str, Any]:
         """
         Get optimal encoding settings based on target quality and processing speed
         
@@ -251,4 +294,86 @@ class QualityOptimizer:
             }
         }
         
-        return settings.get(target_quality, {}).get(processing_speed, settings['youtube_shorts']['balanced']) 
\ No newline at end of file
+        return settings.get(target_quality, {}).get(processing_speed, settings['youtube_shorts']['balanced'])
+    
+    @staticmethod
+    def get_encoder_profile(profile_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get a named encoder profile
+        
+        Args:
+            profile_name: 'draft', 'preview', 'production' or 'archival' (None = production)
+            
+        Returns:
+            Dict with the profile settings plus its 'name'
+        """
+        name = (profile_name or DEFAULT_ENCODER_PROFILE).lower()
+        if name not in ENCODER_PROFILES:
+            raise ValueError(f"Unknown encoder profile '{profile_name}'. Available: {', '.join(ENCODER_PROFILES)}")
+        return dict(ENCODER_PROFILES[name], name=name)
+    
+    @staticmethod
+    def get_profile_dimensions(profile_name: Optional[str], width: int, height: int) -> Tuple[int, int]:
+        """Scale native dimensions for a profile, keeping them even for yuv420p."""
+        scale = QualityOptimizer.get_encoder_profile(profile_name)['scale']
+        return int(width * scale) // 2 * 2, int(height * scale) // 2 * 2
+    
+    @staticmethod
+    def get_write_videofile_kwargs(profile_name: Optional[str] = None,
+                                   audio: bool = True,
+                                   threads: int = 4,
+                                   extra_ffmpeg_params: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Build MoviePy write_videofile() keyword arguments for a profile
+        
+        Args:
+            profile_name: Encoder profile name
+            audio: Whether the output carries an audio track
+            threads: Encoder threads
+            extra_ffmpeg_params: Additional ffmpeg output parameters
+            
+        Returns:
+            Dict of write_videofile keyword arguments (everything except filename and fps)
+        """
+        profile = QualityOptimizer.get_encoder_profile(profile_name)
+        ffmpeg_params = ['-crf', str(profile['crf'])]
+        if profile['h264_profile']:
+            ffmpeg_params += ['-profile:v', profile['h264_profile'][0], '-level', profile['h264_profile'][1]]
+        ffmpeg_params += ['-pix_fmt', 'yuv420p']
+        if extra_ffmpeg_params:
+            ffmpeg_params += list(extra_ffmpeg_params)
+        
+        kwargs = {
+            'codec': 'libx264',
+            'preset': profile['preset'],
+            'threads': threads,
+            'ffmpeg_params': ffmpeg_params
+        }
+        if profile['bitrate']:
+            kwargs['bitrate'] = profile['bitrate']
+        if audio:
+            kwargs.update({'audio_codec': 'aac', 'audio_bitrate': profile['audio_bitrate'], 'audio_fps': 44100})
+        else:
+            kwargs['audio'] = False
+        return kwargs
+    
+    @staticmethod
+    def build_encode_stats(stage: str, profile_name: Optional[str], output_path: str,
+                           encode_time: float) -> Dict[str, Any]:
+        """
+        Build the per-encode record that goes into pipeline reports
+        
+        Args:
+            stage: Pipeline stage that wrote the file (e.g. 'kenburns', 'subtitles')
+            profile_name: Encoder profile used
+            output_path: Written file
+            encode_time: Wall time spent writing, in seconds
+        """
+        path = Path(output_path)
+        return {
+            'stage': stage,
+            'profile': QualityOptimizer.get_encoder_profile(profile_name)['name'],
+            'output': str(path),
+            'encode_time': round(encode_time, 3),
+            'file_size': path.stat().st_size if path.exists() else 0
+        }
@@ -0,0 +1,172 @@
+"""
+Timeline - Rational-time core shared by the composer, subtitles, audio mixer and sync
+Video positions are integer frames, audio positions are integer samples. Seconds only
+appear at the edges (logging, MoviePy arguments) and are derived from the integers.
+"""
+
+from fractions import Fraction
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_FPS = 30
+DEFAULT_SAMPLE_RATE = 44100
+
+
+class TimelineError(ValueError):
+    """Raised when a schedule does not fit the timeline."""
+
+
+class Timeline:
+    """
+    Frame/sample timeline for one video
+
+    The audio defines the timeline: total_samples at sample_rate. The video holds
+    the whole frames that fit inside the audio, so video never outlasts audio and
+    is at most one frame shorter.
+    """
+
+    def __init__(self, total_samples: int, sample_rate: int = DEFAULT_SAMPLE_RATE, fps: int = DEFAULT_FPS):
+        if total_samples < 0:
+            raise TimelineError(f"Negative sample count: {total_samples}")
+        self.total_samples = int(total_samples)
+        self.sample_rate = int(sample_rate)
+        self.fps = int(fps)
+        # Integer arithmetic: floor(total_samples * fps / sample_rate)
+        self.total_frames = self.total_samples * self.fps // self.sample_rate
+
+    @classmethod
+    def from_seconds(cls, duration: float, sample_rate: int = DEFAULT_SAMPLE_RATE, fps: int = DEFAULT_FPS) -> "Timeline":
+        """Build a timeline from a duration in seconds (rounded to the nearest sample)."""
+        return cls(round(Fraction(duration) * sample_rate), sample_rate, fps)
+
+    @classmethod
+    def from_frames(cls, total_frames: int, sample_rate: int = DEFAULT_SAMPLE_RATE, fps: int = DEFAULT_FPS) -> "Timeline":
+        """Build a timeline that is exactly total_frames long."""
+        return cls(-(-total_frames * sample_rate // fps), sample_rate, fps)
+
+    @classmethod
+    def from_audio_segment(cls, audio, fps: int = DEFAULT_FPS) -> "Timeline":
+        """Build a timeline from a pydub AudioSegment (exact sample count)."""
+        return cls(int(audio.frame_count()), audio.frame_rate, fps)
+
+    # ---- conversions -------------------------------------------------------
+
+    @property
+    def video_duration(self) -> Fraction:
+        """Exact video duration in seconds."""
+        return Fraction(self.total_frames, self.fps)
+
+    @property
+    def audio_duration(self) -> Fraction:
+        """Exact audio duration in seconds."""
+        return Fraction(self.total_samples, self.sample_rate)
+
+    def frame_to_seconds(self, frame: int) -> float:
+        """Start time of a frame in seconds."""
+        return frame / self.fps
+
+    def frame_to_sample(self, frame: int) -> int:
+        """First audio sample of a frame."""
+        return frame * self.sample_rate // self.fps
+
+    def sample_to_frame(self, sample: int) -> int:
+        """Frame containing an audio sample."""
+        return sample * self.fps // self.sample_rate
+
+    def seconds_to_frame(self, seconds: float) -> int:
+        """Nearest frame boundary to a time in seconds, clamped to the timeline."""
+        frame = round(Fraction(seconds) * self.fps)
+        return min(max(frame, 0), self.total_frames)
+
+    def seconds_to_sample(self, seconds: float) -> int:
+        """Nearest sample to a time in seconds, clamped to the timeline."""
+        sample = round(Fraction(seconds) * self.sample_rate)
+        return min(max(sample, 0), self.total_samples)
+
+    # ---- schedules ---------------------------------------------------------
+
+    def _segment(self, index: int, start_frame: int, end_frame: int) -> Dict:
+        return {
+            'index': index,
+            'start_frame': start_frame,
+            'end_frame': end_frame,
+            'frames': end_frame - start_frame,
+            'start': self.frame_to_seconds(start_frame),
+            'end': self.frame_to_seconds(end_frame),
+            'duration': (end_frame - start_frame) / self.fps
+        }
+
+    def image_schedule(self, num_images: int) -> List[Dict]:
+        """
+        Split the video into contiguous whole-frame segments, one per image
+
+        Boundaries are the exact boundaries rounded to the nearest frame, so
+        rounding never accumulates and the segments always cover every frame.
+
+        Args:
+            num_images: Number of segments
+
+        Returns:
+            List of segment dicts (index, start_frame, end_frame, frames, start, end, duration)
+        """
+        if num_images <= 0:
+            raise TimelineError("num_images must be positive")
+        bounds = [(i * self.total_frames * 2 + num_images) // (2 * num_images) for i in range(num_images + 1)]
+        schedule = [self._segment(i, bounds[i], bounds[i + 1]) for i in range(num_images)]
+        self.validate_contiguous(schedule)
+        return schedule
+
+    def interval_schedule(self, intervals: Sequence[Tuple[float, float]], min_frames: int = 1) -> List[Optional[Dict]]:
+        """
+        Snap (start, end) times in seconds to frame boundaries
+
+        Intervals are clamped to the timeline and to the start of the next
+        interval, so the result never overlaps and never runs past the end.
+        Intervals that end up shorter than min_frames become None.
+
+        Args:
+            intervals: (start_seconds, end_seconds) pairs in playback order
+            min_frames: Minimum length for an interval to be kept
+
+        Returns:
+            List of segment dicts (or None for dropped intervals), same order as input
+        """
+        starts = [self.seconds_to_frame(start) for start, _ in intervals]
+        schedule: List[Optional[Dict]] = []
+        for i, (_, end) in enumerate(intervals):
+            start_frame = starts[i]
+            end_frame = self.seconds_to_frame(end)
+            if i + 1 < len(starts):
+                end_frame = min(end_frame, max(starts[i + 1], start_frame))
+            if end_frame - start_frame < min_frames:
+                schedule.append(None)
+            else:
+                schedule.append(self._segment(i, start_frame, end_frame))
+        self.validate_ordered([s for s in schedule if s is not None])
+        return schedule
+
+    # ---- validation (single O(n) pass each) --------------------------------
+
+    def validate_contiguous(self, schedule: Sequence[Dict]):
+        """Check segments tile [0, total_frames) exactly, with no gaps or overlaps."""
+        position = 0
+        for segment in schedule:
+            if segment['start_frame'] != position or segment['end_frame'] < segment['start_frame']:
+                raise TimelineError(f"Segment {segment['index']} starts at frame {segment['start_frame']}, expected {position}")
+            position = segment['end_frame']
+        if position != self.total_frames:
+            raise TimelineError(f"Schedule covers {position} frames, timeline has {self.total_frames}")
+
+    def validate_ordered(self, schedule: Sequence[Dict]):
+        """Check segments are in order, non-overlapping and inside the timeline."""
+        position = 0
+        for segment in schedule:
+            if segment['start_frame'] < position or segment['end_frame'] <= segment['start_frame']:
+                raise TimelineError(f"Segment {segment['index']} overlaps or is empty "
+                                    f"({segment['start_frame']}-{segment['end_frame']}, previous end {position})")
+            position = segment['end_frame']
+        if position > self.total_frames:
+            raise TimelineError(f"Schedule ends at frame {position}, timeline has {self.total_frames}")
+
+    def __repr__(self) -> str:
+        return (f"Timeline({self.total_frames} frames @ {self.fps}fps, "
+                f"{self.total_samples} samples @ {self.sample_rate}Hz)")
@@ -5,6 +5,8 @@ Timing Calculator - Utilities for video timing and synchronization
 from typing import List, Dict, Tuple
 import json
 
+from .timeline import Timeline
+
 class TimingCalculator:
     """Calculate timing for video elements and synchronization"""
     
@@ -21,26 +23,13 @@ class TimingCalculator:
             num_images: Number of images (defaults to self.num_images)
             
         Returns:
-            List of dicts with 'start', 'end', 'duration' for each image
+            List of dicts with 'start', 'end', 'duration' for each image, plus the
+            whole-frame 'start_frame', 'end_frame' and 'frames' they are derived from
         """
         if num_images is None:
             num_images = self.num_images
             
-        image_duration = audio_duration / num_images
-        timings = []
-        
-        for i in range(num_images):
-            start_time = i * image_duration
-            end_time = start_time + image_duration
-            
-            timings.append({
-                'index': i,
-                'start': start_time,
-                'end': end_time,
-                'duration': image_duration
-            })
-        
-        return timings
+        return self.timeline_for(audio_duration).image_schedule(num_images)
     
     def calculate_total_duration(self, audio_duration: float, num_images: int = None) -> float:
         """Calculate total video duration (should match audio duration)"""
@@ -56,6 +45,41 @@ class TimingCalculator:
         """Convert seconds to frame count"""
         return int(seconds * self.fps)
     
+    def timeline_for(self, audio_duration: float) -> Timeline:
+        """Build the shared frame/sample timeline for an audio duration"""
+        return Timeline.from_seconds(audio_duration, fps=self.fps)
+    
+    def calculate_total_frames(self, audio_duration: float) -> int:
+        """
+        Number of whole frames that fit in the audio (the video never outlasts the audio)
+
+        Args:
+            audio_duration: Duration of audio in seconds
+
+        Returns:
+            Frame count, at most one frame shorter than the audio
+        """
+        return self.timeline_for(audio_duration).total_frames
+
+    def calculate_segment_frame_counts(self, audio_duration: float, num_images: int = None) -> List[int]:
+        """
+        Split the audio duration into whole-frame segments, one per image
+
+        Segment boundaries are the exact boundaries rounded to the nearest frame,
+        so rounding never accumulates and the counts always sum to the total.
+
+        Args:
+            audio_duration: Duration of audio in seconds
+            num_images: Number of images (defaults to self.num_images)
+
+        Returns:
+            List of frame counts, one per image
+        """
+        if num_images is None:
+            num_images = self.num_images
+
+        return [segment['frames'] for segment in self.calculate_image_timings(audio_duration, num_images)]
+
     def calculate_audio_sync_points(self, audio_duration: float, num_images: int = None) -> List[float]:
         """
         Calculate optimal sync points for audio-visual synchronization
@@ -70,11 +94,8 @@ class TimingCalculator:
         if num_images is None:
             num_images = self.num_images
             
-        # Calculate image duration based on audio length
-        image_duration = audio_duration / num_images
-        
-        # Return sync points at the start of each image
-        return [i * image_duration for i in range(num_images)]
+        # Return sync points at the (frame-aligned) start of each image
+        return [segment['start'] for segment in self.calculate_image_timings(audio_duration, num_images)]
     
     def create_ssml_timing_map(self, story_text: str, audio_duration: float, num_images: int = None) -> Dict:
         """
@@ -7,10 +7,8 @@ import os
 import json
 import logging
 import sys
-import openai
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
-from faster_whisper import WhisperModel
 import numpy as np
 
 # Add project root to path to import config
@@ -18,6 +16,18 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import Config
+from src.utils.keyword_scanner import KeywordScanner
+from src.utils.logger import get_logger
+from src.utils.model_cache import get_whisper_model
+from src.video_composition.utils.timeline import Timeline
+
+# Keywords for the fallback parser, checked in this order (the first content type with a hit wins)
+FALLBACK_CONTENT_TYPES = KeywordScanner({
+    'character_action': ['walked', 'ran', 'fought', 'moved', 'entered'],
+    'environment_description': ['palace', 'room', 'city', 'building'],
+    'emotional_moment': ['felt', 'thought', 'realized', 'feared'],
+    'dialogue_confrontation': ['said', 'spoke', 'told', 'asked'],
+}, whole_words=False)
 
 class WhisperAudioSynchronizer:
     """
@@ -59,6 +69,8 @@ class WhisperAudioSynchronizer:
                 'belonged', 'existed', 'occurred', 'happened', 'took place'
             ]
         }
+        # Compiled once; matches inside longer words like the `keyword in text` checks it replaced
+        self.content_scanner = KeywordScanner(self.content_keywords, whole_words=False)
         
         # Shot type mapping based on content type - more flexible
         self.shot_type_mapping = {
@@ -70,21 +82,13 @@ class WhisperAudioSynchronizer:
         }
     
     def _setup_logger(self) -> logging.Logger:
-        logger = logging.getLogger("whisper_audio_synchronizer")
-        logger.setLevel(logging.INFO)
-        if not logger.handlers:
-            ch = logging.StreamHandler()
-            ch.setLevel(logging.INFO)
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            ch.setFormatter(formatter)
-            logger.addHandler(ch)
-        return logger
+        return get_logger("whisper_audio_synchronizer")
     
     def load_model(self):
         """Load faster-whisper model (lazy loading to save memory)"""
         if self.model is None:
             self.logger.info(f"📥 Loading faster-whisper model: {self.model_name}")
-            self.model = WhisperModel(self.model_name, compute_type="int8")
+            self.model = get_whisper_model(self.model_name, compute_type="int8")
             self.logger.info("✅ faster-whisper model loaded successfully")
         return self.model
     
@@ -115,7 +119,8 @@ class WhisperAudioSynchronizer:
         # Convert faster-whisper format to standard format
         result = {
             'segments': [],
-            'text': ''
+            'text': '',
+            'duration': getattr(info, 'duration', None)
         }
         
         for segment in segments:
@@ -172,15 +177,20 @@ class WhisperAudioSynchronizer:
         self, 
         word_timestamps: List[Dict[str, Any]], 
         num_images: int = 12,
-        original_story: str = None
+        original_story: str = None,
+        audio_duration: Optional[float] = None
     ) -> List[Dict[str, Any]]:
         """
         Create image timing schedule based on word timestamps
         
+        Windows come from the same frame timeline the video composer uses, so each
+        image's words are exactly the words spoken while that image is on screen.
+        
         Args:
             word_timestamps: List of words with timestamps
             num_images: Number of images to generate
             original_story: Original story text for reference
+            audio_duration: Exact audio duration (defaults to the last word's end)
             
         Returns:
             List of image timing data
@@ -189,17 +199,18 @@ class WhisperAudioSynchronizer:
             raise ValueError("No word timestamps provided")
         
         # Get total audio duration
-        total_duration = word_timestamps[-1]['end']
-        image_duration = total_duration / num_images
+        total_duration = audio_duration or word_timestamps[-1]['end']
+        timeline = Timeline.from_seconds(total_duration)
         
-        self.logger.info(f"⏱️  Total duration: {total_duration:.2f}s, Image duration: {image_duration:.2f}s")
+        self.logger.info(f"⏱️  Total duration: {total_duration:.2f}s, Timeline: {timeline}")
         
         # Create image timing schedule
         image_schedule = []
         
-        for i in range(num_images):
-            start_time = i * image_duration
-            end_time = (i + 1) * image_duration
+        for segment in timeline.image_schedule(num_images):
+            i = segment['index']
+            start_time = segment['start']
+            end_time = segment['end']
             
             # Find words that fall within this time window
             words_in_window = [
@@ -225,6 +236,8 @@ class WhisperAudioSynchronizer:
                 'image_number': i + 1,
                 'timestamp_start': start_time,
                 'timestamp_end': end_time,
+                'start_frame': segment['start_frame'],
+                'end_frame': segment['end_frame'],
                 'audio_content': audio_content,
                 'words_in_segment': len(words_in_window),
                 'confidence_avg': np.mean([word['confidence'] for word in words_in_window]) if words_in_window else 0.0
@@ -287,11 +300,7 @@ class WhisperAudioSynchronizer:
         except Exception as e:
             self.logger.warning(f"GPT analysis failed, falling back to keyword matching: {e}")
             # Fallback to keyword matching
-            audio_lower = audio_content.lower()
-            scores = {}
-            for content_type, keywords in self.content_keywords.items():
-                score = sum(1 for keyword in keywords if keyword in audio_lower)
-                scores[content_type] = score
+            scores = self.content_scanner.term_counts(audio_content)
             
             if max(scores.values()) == 0:
                 return 'exposition_setup'
@@ -480,20 +489,8 @@ class WhisperAudioSynchronizer:
     
     def _fallback_parse_response(self, response_text: str, audio_content: str) -> Dict[str, str]:
         """Fallback parsing when JSON parsing fails"""
-        # Simple keyword-based fallback
-        audio_lower = audio_content.lower()
-        
-        # Determine content type
-        if any(word in audio_lower for word in ['walked', 'ran', 'fought', 'moved', 'entered']):
-            content_type = 'character_action'
-        elif any(word in audio_lower for word in ['palace', 'room', 'city', 'building']):
-            content_type = 'environment_description'
-        elif any(word in audio_lower for word in ['felt', 'thought', 'realized', 'feared']):
-            content_type = 'emotional_moment'
-        elif any(word in audio_lower for word in ['said', 'spoke', 'told', 'asked']):
-            content_type = 'dialogue_confrontation'
-        else:
-            content_type = 'exposition_setup'
+        # Simple keyword-based fallback: the first content type (in rule order) with a keyword hit
+        content_type = FALLBACK_CONTENT_TYPES.first_label(audio_content, default='exposition_setup')
         
         # Determine shot type
         shot_type = 'medium_shot'  # Default
@@ -526,11 +523,7 @@ class WhisperAudioSynchronizer:
     
     def _keyword_content_analysis(self, audio_content: str) -> str:
         """Keyword-based content analysis fallback"""
-        audio_lower = audio_content.lower()
-        scores = {}
-        for content_type, keywords in self.content_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in audio_lower)
-            scores[content_type] = score
+        scores = self.content_scanner.term_counts(audio_content)
         
         if max(scores.values()) == 0:
             return 'exposition_setup'
@@ -850,7 +843,8 @@ class WhisperAudioSynchronizer:
         word_timestamps = self.extract_word_timestamps(transcription_result)
         
         # Step 3: Create image timing schedule
-        image_schedule = self.create_image_timing_schedule(word_timestamps, num_images, original_story)
+        image_schedule = self.create_image_timing_schedule(word_timestamps, num_images, original_story,
+                                                           audio_duration=transcription_result.get('duration'))
         
         # Step 4: Generate synchronized image prompts (now async)
         synchronized_prompts = await self.generate_synchronized_image_prompts(
@@ -5,22 +5,41 @@ Scientifically optimized viral configuration with dynamic word highlighting
 
 import json
 import time
-import requests
 import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
-from moviepy.editor import VideoFileClip, CompositeVideoClip, ColorClip, ImageClip
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import logging
-from faster_whisper import WhisperModel
 import re
+import sys
+import math
+
+# Add project root to path to import config
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from config import Config
+from src.utils.model_cache import get_whisper_model
+from src.video_composition.utils.forced_aligner import ForcedAligner, narration_text
+from src.video_composition.utils.quality_optimizer import QualityOptimizer
+from src.video_composition.utils.timeline import Timeline
+from src.utils.lazy_import import lazy_import
+from src.utils.profiler import profile_span
+
+# Imported on first use
+mpy = lazy_import("moviepy.editor")
+requests = lazy_import("requests")
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+ImageFont = lazy_import("PIL.ImageFont")
 
 class OptimizedWhisperViralSubtitleProcessor:
     """Scientifically optimized viral subtitle processor with dynamic word highlighting."""
     
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, encoder_profile: Optional[str] = None):
         self.logger = logger or logging.getLogger(__name__)
+        self.encoder_profile = QualityOptimizer.get_encoder_profile(encoder_profile or Config.RENDER.ENCODER_PROFILE)['name']
+        self.encode_stats = []
         
         # 🎯 SCIENTIFICALLY PROVEN VIRAL SETTINGS
         self.font_size = 49  # Increased by ~3% from 48 to 49
@@ -32,6 +51,7 @@ class OptimizedWhisperViralSubtitleProcessor:
         self.width = 768
         self.height = 1344
         self.vertical_position = 0.55  # 55% down from top
+        self.fps = 30  # Output frame rate - subtitle states are snapped to these frames
         self.text_height = 200  # Reduced for smaller text
         self._font_cache = {}
         
@@ -56,16 +76,27 @@ class OptimizedWhisperViralSubtitleProcessor:
         self.letter_spacing = 1  # Space between letters for better readability
         self.line_height = 60  # Space between lines
         
-        # 📝 STORY FALLBACK SETTINGS
+        # 🎯 ALIGNED-TEXT MODE: force-align the known story text instead of transcribing it
+        self.aligned_text_mode = Config.RENDER.SUBTITLE_TIMING == 'aligned'
+        self.min_alignment_confidence = 0.2  # Mean token probability below this means text and audio differ
+        
+        # 📝 STORY FALLBACK SETTINGS (transcription mode only; aligned words need no patching)
         self.story_fallback_enabled = False  # Disable aggressive story-based word completion
         self.min_whisper_confidence = 0.7  # Confidence threshold for using Whisper words
         self.gpt4_fallback_enabled = False  # Enable GPT-4 for advanced word placement (costs extra)
         self.gpt4_api_key = None  # Set your OpenAI API key if using GPT-4 fallback
         
-        # Initialize Whisper model and font
-        self._init_whisper()
+        # Font now; the Whisper model on first transcription (rendering from known timings never needs it)
+        self._whisper_model = None
         self._init_font()
     
+    @property
+    def whisper_model(self):
+        """faster-whisper model, loaded on first use."""
+        if self._whisper_model is None:
+            self._init_whisper()
+        return self._whisper_model
+    
     def _init_whisper(self):
         """Initialize faster-whisper model."""
         try:
@@ -82,7 +113,7 @@ class OptimizedWhisperViralSubtitleProcessor:
                 if os.path.exists(model_path) and model_path != "base":
                     try:
                         self.logger.info(f"Loading cached Whisper model from: {model_path}")
-                        self.whisper_model = WhisperModel(model_path, compute_type="int8")
+                        self._whisper_model = get_whisper_model(model_path, compute_type="int8")
                         self.logger.info("Cached Whisper model loaded successfully")
                         model_loaded = True
                         break
@@ -92,7 +123,7 @@ class OptimizedWhisperViralSubtitleProcessor:
             
             if not model_loaded:
                 self.logger.info("Loading Whisper model (small) - will download if not cached...")
-                self.whisper_model = WhisperModel("small", compute_type="int8")
+                self._whisper_model = get_whisper_model("small", compute_type="int8")
                 self.logger.info("Whisper model loaded successfully")
                 
         except Exception as e:
@@ -283,6 +314,7 @@ class OptimizedWhisperViralSubtitleProcessor:
         story_timeline.sort(key=lambda x: x[0])
         
         # For each missing word, calculate its timing based on story position
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         for missing_idx, missing_word in missing_words:
             # Find the story words before and after this missing word
             before_timeline = [t for t in story_timeline if t[0] < missing_idx]
@@ -332,15 +364,32 @@ class OptimizedWhisperViralSubtitleProcessor:
             
             # Insert at appropriate position
             enhanced_words.append(missing_word_data)
-            self.logger.debug(f"Inserted missing word '{missing_word}' (story pos {missing_idx}) at {insertion_time:.2f}s")
+            if debug:
+                self.logger.debug(f"Inserted missing word '{missing_word}' (story pos {missing_idx}) at {insertion_time:.2f}s")
         
         # Sort by start time again
         enhanced_words.sort(key=lambda x: x['start'])
         
         return enhanced_words
     
+    def _align_story_words(self, audio_path: str, story_path: str) -> List[Dict]:
+        """Word timings from forced alignment of the story narration (exact spelling, no decoding)."""
+        text = narration_text(story_path)
+        words = ForcedAligner(self.whisper_model).align(audio_path, text)
+        confidence = float(np.mean([word['confidence'] for word in words]))
+        if confidence < self.min_alignment_confidence:
+            raise ValueError(f"alignment confidence {confidence:.2f} is too low - audio does not match the story")
+        self.logger.info(f"Aligned {len(words)} story words to the audio (mean confidence {confidence:.2f})")
+        return words
+    
     def extract_word_timing(self, audio_path: str, story_path: Optional[str] = None) -> List[Dict]:
-        """Extract word-level timing using faster-whisper with minimal story fallback."""
+        """Extract word-level timing: forced alignment of the known story, else faster-whisper transcription."""
+        if story_path and self.aligned_text_mode:
+            try:
+                return self._align_story_words(audio_path, story_path)
+            except Exception as e:
+                self.logger.warning(f"Forced alignment failed ({e}) - falling back to transcription")
+        
         self.logger.info("Transcribing audio with word-level timing...")
         
         try:
@@ -455,8 +504,17 @@ class OptimizedWhisperViralSubtitleProcessor:
             self.logger.error(f"Failed to create dynamic word image: {e}")
             return None
     
-    def create_viral_subtitle_clips(self, words_with_timing: List[Dict], video_duration: float = None) -> List[ImageClip]:
-        """Create individual subtitle clips for each word highlighting state with transparency."""
+    def create_viral_subtitle_clips(self, words_with_timing: List[Dict], video_duration: float = None, scale: float = 1.0,
+                                    timeline: Optional[Timeline] = None) -> List['mpy.ImageClip']:
+        """
+        Create individual subtitle clips for each word highlighting state with transparency.
+        
+        Args:
+            words_with_timing: Word dicts with 'word', 'start' and 'end'
+            video_duration: Clips are kept inside this duration when given
+            scale: Output frame size relative to 768x1344 (0.5 for draft renders)
+            timeline: Frame timeline of the target video (built from video_duration when omitted)
+        """
         clips = []
         subtitle_start = time.time()
         
@@ -465,18 +523,13 @@ class OptimizedWhisperViralSubtitleProcessor:
         # Group words into chunks of 3-4 words
         word_groups = self._group_words_into_chunks(words_with_timing)
         
-        # Create individual clips for each word highlighting state
+        # Pass 1: plan every word-state interval (group index, word index, start, end)
+        planned: List[Tuple[int, int, float, float]] = []
         for group_index, word_group in enumerate(word_groups):
             group_words = word_group['words']
             group_start = word_group['start_time']
             group_end = word_group['end_time']
             
-            self.logger.info(f"Creating clips for group {group_index + 1}: {len(group_words)} words")
-            
-            # Create ONE continuous clip per word group that stays visible until the next group starts
-            group_start = word_group['start_time']
-            group_end = word_group['end_time']
-            
             # Calculate the end time for this group (either when next group starts or when this group ends)
             if group_index < len(word_groups) - 1:
                 next_group_start = word_groups[group_index + 1]['start_time']
@@ -490,47 +543,65 @@ class OptimizedWhisperViralSubtitleProcessor:
             if video_duration:
                 group_clip_end = min(group_clip_end, video_duration - 0.1)  # End 100ms before video ends
             
-            group_clip_duration = group_clip_end - group_start
-            
             # Create continuous clips that maintain word state during pauses
             for word_index, word_data in enumerate(group_words):
-                word_start = word_data['start']
-                word_end = word_data['end']
-                
-                # Find the start of the next word (or group end)
+                # This word stays highlighted until the next word starts (last word: group clip end)
                 if word_index < len(group_words) - 1:
-                    next_word_start = group_words[word_index + 1]['start']
-                    # This word should stay highlighted until the next word starts
-                    clip_end = next_word_start
+                    clip_end = group_words[word_index + 1]['start']
                 else:
-                    # For the last word, extend it to the group clip end
                     clip_end = group_clip_end
                 
                 # Tighten timing - start exactly when word starts, minimal overlap
                 overlap = 0.02  # Reduced from 50ms to 20ms for tighter timing
-                clip_start = max(group_start, word_start - overlap)
+                clip_start = max(group_start, word_data['start'] - overlap)
                 clip_end = min(group_clip_end, clip_end + overlap)
-                clip_duration = clip_end - clip_start
+                planned.append((group_index, word_index, clip_start, clip_end))
+        
+        if not planned:
+            self.logger.info("Created 0 individual subtitle clips")
+            return clips
+        
+        # Pass 2: snap the whole plan to whole frames once - no overlaps, nothing past the end
+        if timeline is None:
+            if video_duration:
+                timeline = Timeline.from_frames(int(round(video_duration * self.fps)), fps=self.fps)
+            else:
+                timeline = Timeline.from_frames(int(math.ceil(max(end for *_, end in planned) * self.fps)), fps=self.fps)
+        schedule = timeline.interval_schedule([(start, end) for *_, start, end in planned])
+        dropped = sum(1 for segment in schedule if segment is None)
+        if dropped:
+            self.logger.info(f"Dropped {dropped} subtitle states shorter than one frame")
+        
+        # Pass 3: render one image per kept interval
+        y_position = int(self.height * scale * self.vertical_position)
+        debug = self.logger.isEnabledFor(logging.DEBUG)  # Per-clip lines are only built when they will be emitted
+        for (group_index, word_index, _, _), segment in zip(planned, schedule):
+            if segment is None:
+                continue
+            group_words = word_groups[group_index]['words']
+            
+            # Create image for this specific word highlighting state
+            word_image = self._create_simplified_word_group_image(group_words, word_index)
+            if word_image is not None:
+                # Convert numpy array to PIL Image for ImageClip with RGBA support
+                pil_image = Image.fromarray(word_image, 'RGBA')
                 
-                # Create image for this specific word highlighting state
-                word_image = self._create_simplified_word_group_image(group_words, word_index)
-                if word_image is not None:
-                    # Convert numpy array to PIL Image for ImageClip with RGBA support
-                    pil_image = Image.fromarray(word_image, 'RGBA')
-                    
-                    # Create ImageClip that maintains this word state until next word
-                    img_clip = ImageClip(np.array(pil_image), duration=clip_duration)
-                    y_position = int(self.height * self.vertical_position)
-                    img_clip = img_clip.set_position(('center', y_position)).set_start(clip_start)
-                    
-                    clips.append(img_clip)
-                    
-                    self.logger.info(f"Created continuous clip for word {word_index + 1} in group {group_index + 1}: {clip_start:.2f}s - {clip_end:.2f}s")
+                # Create ImageClip that maintains this word state until next word
+                img_clip = mpy.ImageClip(np.array(pil_image), duration=segment['duration'])
+                if scale != 1.0:
+                    img_clip = img_clip.resize(scale)
+                img_clip = img_clip.set_position(('center', y_position)).set_start(segment['start'])
+                
+                clips.append(img_clip)
+                
+                if debug:
+                    self.logger.debug(f"Created continuous clip for word {word_index + 1} in group {group_index + 1}: "
+                                      f"frames {segment['start_frame']}-{segment['end_frame']}")
             
             # Progress logging
-            if group_index % 10 == 0:
+            if debug and word_index == 0 and group_index % 10 == 0:
                 elapsed = time.time() - subtitle_start
-                self.logger.info(f"Created clips for {group_index + 1}/{len(word_groups)} word groups - ETA: {elapsed:.0f}s")
+                self.logger.debug(f"Created clips for {group_index + 1}/{len(word_groups)} word groups - ETA: {elapsed:.0f}s")
         
         self.logger.info(f"Created {len(clips)} individual subtitle clips")
         return clips
@@ -542,6 +613,7 @@ class OptimizedWhisperViralSubtitleProcessor:
         word_groups = []
         i = 0
         padding = 0.02  # Reduced to 20ms padding between groups to reduce lag
+        debug = self.logger.isEnabledFor(logging.DEBUG)  # Per-group lines are only built when they will be emitted
         
         while i < len(words_with_timing):
             # Prefer 3-4 words, avoid 5 words for mobile UI
@@ -590,7 +662,9 @@ class OptimizedWhisperViralSubtitleProcessor:
                 'end_time': group_end
             })
             
-            self.logger.info(f"Group {len(word_groups)}: {group_size} words ({total_chars} chars), {group_start:.2f}s - {group_end:.2f}s")
+            if debug:
+                self.logger.debug(f"Group {len(word_groups)}: {group_size} words ({total_chars} chars), "
+                                  f"{group_start:.2f}s - {group_end:.2f}s")
             
             i += group_size
         
@@ -786,7 +860,7 @@ class OptimizedWhisperViralSubtitleProcessor:
             
             # Load video with audio validation
             video_start = time.time()
-            video = VideoFileClip(video_path)
+            video = mpy.VideoFileClip(video_path)
             self.logger.info(f"Video loading took {time.time() - video_start:.2f}s")
             
             # Pre-composite validation
@@ -796,17 +870,18 @@ class OptimizedWhisperViralSubtitleProcessor:
             
             # Create viral subtitle clips
             subtitle_start = time.time()
-            subtitle_clips = self.create_viral_subtitle_clips(words_with_timing, video.duration)
+            timeline = Timeline.from_frames(int(round(video.duration * video.fps)), fps=self.fps)
+            subtitle_clips = self.create_viral_subtitle_clips(words_with_timing, video.duration, scale=video.h / self.height,
+                                                              timeline=timeline)
             self.logger.info(f"Viral subtitle creation took {time.time() - subtitle_start:.2f}s")
             self.logger.info(f"Subtitle clips count: {len(subtitle_clips)}")
             
-            # Composite video
+            # Composite video - subtitle clips are already frame-snapped inside the video timeline
             composite_start = time.time()
-            final_video = CompositeVideoClip([video] + subtitle_clips)
+            final_video = mpy.CompositeVideoClip([video] + subtitle_clips).set_duration(float(timeline.video_duration))
             self.logger.info(f"Video composition took {time.time() - composite_start:.2f}s")
             
-            # CRITICAL: Ensure exact audio duration preservation using MIXED AUDIO duration
-            # Load the mixed audio to get the correct target duration
+            # Mixed audio defines the target duration; the video holds the whole frames inside it
             try:
                 from moviepy.editor import AudioFileClip
                 mixed_audio = AudioFileClip(audio_path)
@@ -815,30 +890,12 @@ class OptimizedWhisperViralSubtitleProcessor:
                 self.logger.info(f"📊 Mixed audio duration (target): {target_audio_duration:.3f}s")
             except Exception as e:
                 self.logger.warning(f"Could not load mixed audio, using video audio: {e}")
-                target_audio_duration = video.audio.duration if video.audio else 0
-            
-            original_audio_duration = video.audio.duration if video.audio else 0
-            final_audio_duration = final_video.audio.duration if final_video.audio else 0
+                target_audio_duration = video.audio.duration if video.audio else float(timeline.video_duration)
             
-            self.logger.info(f"Original video audio duration: {original_audio_duration:.3f}s")
-            self.logger.info(f"Target mixed audio duration: {target_audio_duration:.3f}s")
-            self.logger.info(f"Final video duration: {final_video.duration:.3f}s")
-            self.logger.info(f"Final audio duration: {final_audio_duration:.3f}s")
-            
-            # CRITICAL FIX: Force exact audio duration to match MIXED AUDIO duration
-            if final_video.audio and abs(final_audio_duration - target_audio_duration) > 0.01:
-                self.logger.warning(f"⚠️ Audio duration mismatch: {final_audio_duration:.3f}s vs target {target_audio_duration:.3f}s")
-                
-                # Trim audio to exact mixed audio duration
-                if final_audio_duration > target_audio_duration:
-                    trimmed_audio = final_video.audio.subclip(0, target_audio_duration)
-                    final_video = final_video.set_audio(trimmed_audio)
-                    self.logger.info(f"🔧 Trimmed audio to mixed audio duration: {target_audio_duration:.3f}s")
-                
-                # Also trim video to match mixed audio duration
-                if final_video.duration > target_audio_duration:
-                    final_video = final_video.subclip(0, target_audio_duration)
-                    self.logger.info(f"🔧 Trimmed video to mixed audio duration: {target_audio_duration:.3f}s")
+            # Single timeline step: the audio track is cut to the video's last frame
+            if final_video.audio and final_video.audio.duration > final_video.duration:
+                final_video = final_video.set_audio(final_video.audio.subclip(0, final_video.duration))
+            self.logger.info(f"Final timeline: {timeline} ({float(timeline.video_duration):.3f}s)")
             
             # Post-composite validation
             self.logger.info(f"Final video - Duration: {final_video.duration:.2f}s, Audio: {final_video.audio is not None}")
@@ -858,44 +915,37 @@ class OptimizedWhisperViralSubtitleProcessor:
             
             # Write video with HD encoding settings
             write_start = time.time()
-            self.logger.info(f"Writing HD viral subtitle video: {output_path}")
-            final_video.write_videofile(
-                output_path,
-                fps=30,  # Fixed FPS for better compatibility
-                codec='libx264',
-                audio_codec='aac',
-                audio_bitrate='320k',
-                temp_audiofile='temp-audio.m4a',
-                remove_temp=True,
-                preset='slow',  # High-quality encoding preset
-                bitrate='8000k',  # High bitrate for HD quality
-                threads=4,  # Multi-threading for faster encoding
-                ffmpeg_params=[
-                    '-pix_fmt', 'yuv420p',  # Better compatibility
-                    '-crf', '18',  # High quality (lower CRF = better quality, 18 is visually lossless)
-                    '-profile:v', 'high',  # High profile for better quality
-                    '-level', '4.1'  # Support for HD content
-                ]
-            )
+            self.logger.info(f"Writing viral subtitle video ({self.encoder_profile} profile): {output_path}")
+            with profile_span("encode"):
+                final_video.write_videofile(
+                    output_path,
+                    fps=self.fps,  # Fixed FPS for better compatibility
+                    temp_audiofile=str(Path(output_path).with_suffix('.temp-audio.m4a')),
+                    remove_temp=True,
+                    **QualityOptimizer.get_write_videofile_kwargs(self.encoder_profile)
+                )
+            self.encode_stats.append(QualityOptimizer.build_encode_stats(
+                'subtitles', self.encoder_profile, output_path, time.time() - write_start))
             self.logger.info(f"Video writing took {time.time() - write_start:.2f}s")
             
             # CRITICAL: Final output file validation with duration verification
             self.logger.info("Validating output file with duration verification...")
             try:
-                test_video = VideoFileClip(output_path)
+                test_video = mpy.VideoFileClip(output_path)
                 test_audio_duration = test_video.audio.duration if test_video.audio else 0
                 test_video_duration = test_video.duration
                 
                 self.logger.info(f"Output file - Video Duration: {test_video_duration:.3f}s, Audio Duration: {test_audio_duration:.3f}s")
                 
-                # CRITICAL: Verify exact duration match against MIXED AUDIO duration
-                if abs(test_audio_duration - target_audio_duration) > 0.05:
+                # Verify against the MIXED AUDIO duration - within one frame is exact for this timeline
+                frame_duration = 1.0 / self.fps
+                if abs(test_audio_duration - target_audio_duration) > frame_duration:
                     self.logger.error(f"❌ CRITICAL: Final audio duration mismatch! Expected: {target_audio_duration:.3f}s, Got: {test_audio_duration:.3f}s")
                     self.logger.error("This will cause end audio repetition issues!")
                 else:
                     self.logger.info(f"✅ Perfect audio duration match: {test_audio_duration:.3f}s")
                 
-                if abs(test_video_duration - target_audio_duration) > 0.05:
+                if abs(test_video_duration - target_audio_duration) > frame_duration:
                     self.logger.error(f"❌ CRITICAL: Final video duration mismatch! Expected: {target_audio_duration:.3f}s, Got: {test_video_duration:.3f}s")
                 else:
                     self.logger.info(f"✅ Perfect video duration match: {test_video_duration:.3f}s")
@@ -927,14 +977,15 @@ class OptimizedWhisperViralSubtitleProcessor:
             # Filter words within preview duration
             preview_words = [w for w in words_with_timing if w['start'] < duration]
             
-            # Create background
-            background = ColorClip(size=(self.width, self.height), color=(0, 0, 0)).set_duration(duration)
+            # Create background (previews always use the fast 'preview' profile)
+            width, height = QualityOptimizer.get_profile_dimensions('preview', self.width, self.height)
+            background = mpy.ColorClip(size=(width, height), color=(0, 0, 0)).set_duration(duration)
             
             # Create viral subtitle clips
-            subtitle_clips = self.create_viral_subtitle_clips(preview_words)
+            subtitle_clips = self.create_viral_subtitle_clips(preview_words, scale=height / self.height)
             
             # Composite preview
-            preview_video = CompositeVideoClip([background] + subtitle_clips)
+            preview_video = mpy.CompositeVideoClip([background] + subtitle_clips)
             
             if not output_path:
                 output_path = "output/viral_subtitle_preview.mp4"
@@ -943,9 +994,7 @@ class OptimizedWhisperViralSubtitleProcessor:
             preview_video.write_videofile(
                 output_path,
                 fps=30,
-                codec='libx264',
-                audio=False,
-                preset='fast'
+                **QualityOptimizer.get_write_videofile_kwargs('preview', audio=False)
             )
             
             # Cleanup
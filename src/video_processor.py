@@ -12,10 +12,10 @@ from video_composition.moviepy_video_composer import MoviePyVideoComposer
 from video_composition.whisper_subtitle_processor import OptimizedWhisperViralSubtitleProcessor
 
 from src.utils.folder_utils import sanitize_folder_name
+from src.utils.logger import get_logger
 
 def setup_logger():
-    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-    return logging.getLogger(__name__)
+    return get_logger(__name__)
 
 def process_video_for_topic(topic_name: str, logger: Optional[logging.Logger] = None) -> bool:
     if not logger:
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the batch pipeline with stub content and render stages: content
+generation never runs more than the render slots ahead of rendering, and
+auto-suggested topics stay unique when concurrent stories suggest the same
+topic.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+import asyncio
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import batch_pipeline
+from batch_pipeline import BatchPipeline
+from src.utils.script_tests import run_tests
+
+
+class StubStages:
+    """Content and render stages that record how many stories are in flight."""
+
+    def __init__(self, suggestions, content_seconds=0.05, render_seconds=0.2):
+        self.suggestions = list(suggestions)
+        self.content_seconds = content_seconds
+        self.render_seconds = render_seconds
+        self.lock = threading.Lock()
+        self.in_flight = 0  # Content started, render not finished
+        self.rendering = 0
+        self.max_in_flight = 0
+        self.max_rendering = 0
+        self.exclusions = []
+
+    def _suggest(self, exclude_topics):
+        with self.lock:
+            self.exclusions.append(list(exclude_topics))
+            return self.suggestions.pop(0)
+
+    async def content(self, topic=None, exclude_topics=None, summary=None, claim_topic=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        exclusions = list(exclude_topics or [])
+        await asyncio.sleep(self.content_seconds)  # Concurrent stories suggest before either claims
+        while True:
+            topic = self._suggest(exclusions)
+            if claim_topic(topic):
+                break
+            exclusions.append(topic)
+        summary.update({"topic": topic, "story_title": topic.upper()})
+        return True
+
+    def render(self, story_title, logger=None, encoder_profile=None, encode_stats=None):
+        with self.lock:
+            self.rendering += 1
+            self.max_rendering = max(self.max_rendering, self.rendering)
+        time.sleep(self.render_seconds)
+        with self.lock:
+            self.rendering -= 1
+            self.in_flight -= 1
+        return True
+
+
+def run_batch(stages, count, **kwargs):
+    """Run a batch with the stub stages, writing logs and the report to a temp directory."""
+    originals = (batch_pipeline.test_complete_replicate_pipeline_whisper,
+                 batch_pipeline.process_video_for_topic, batch_pipeline.Config.OUTPUT_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        batch_pipeline.test_complete_replicate_pipeline_whisper = stages.content
+        batch_pipeline.process_video_for_topic = stages.render
+        batch_pipeline.Config.OUTPUT_DIR = Path(tmp)
+        try:
+            pipeline = BatchPipeline(**kwargs)
+            report = asyncio.run(pipeline.run_batch(count=count))
+        finally:
+            (batch_pipeline.test_complete_replicate_pipeline_whisper,
+             batch_pipeline.process_video_for_topic, batch_pipeline.Config.OUTPUT_DIR) = originals
+    return pipeline, report
+
+
+def test_content_bounded_by_render_slots():
+    """With slow renders, stories in flight never exceed render workers plus pending renders."""
+    print("🧪 Testing content run-ahead bound...")
+    stages = StubStages([f"Unrelated topic number {i}" for i in range(8)])
+    _, report = run_batch(stages, count=8, content_workers=4, render_workers=1, pending_renders=1)
+    print(f"   max in flight: {stages.max_in_flight}, max rendering: {stages.max_rendering}, "
+          f"status: {report['batch_status']}")
+    assert stages.max_in_flight <= 2, f"{stages.max_in_flight} stories in flight with one render slot pending"
+    assert stages.max_rendering == 1, f"{stages.max_rendering} renders at once with one render worker"
+    assert report["batch_status"] == "SUCCESS", report["batch_status"]
+
+
+def test_concurrent_topics_are_unique():
+    """Concurrent stories that suggest the same topic claim it once; the other suggests again."""
+    print("🧪 Testing topic claims across concurrent stories...")
+    suggestions = ["The Lost Fleet Of Kublai Khan", "The Lost Fleet Of Kublai Khan!",
+                   "The Lost Fleet Of Kublai Khan", "The Comet That Fooled Kyoto",
+                   "The Silent Bells Of Lisbon", "The Forgotten Tsar Of Alaska"]
+    stages = StubStages(suggestions, render_seconds=0.01)
+    pipeline, report = run_batch(stages, count=3, content_workers=3, render_workers=1, pending_renders=2)
+    topics = [story["topic"] for story in report["stories"]]
+    print(f"   topics: {topics}")
+    assert len(set(topics)) == 3 and "The Lost Fleet Of Kublai Khan" in topics, topics
+    assert sorted(pipeline.claimed_topics) == sorted(topics), pipeline.claimed_topics
+    assert report["batch_status"] == "SUCCESS", report["batch_status"]
+
+
+def main():
+    """Run all batch pipeline tests."""
+    tests = [test_content_bounded_by_render_slots, test_concurrent_topics_are_unique]
+    return run_tests("TESTING BATCH PIPELINE", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
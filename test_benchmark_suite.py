@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test the offline benchmark suite: fixtures match what the pipeline expects,
+canned word timings line up with the synthetic narration, and baseline
+comparison flags real slowdowns only.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.fixtures import RATE, build_fixtures, narration_word_timings, render_narration
+from benchmarks.run_benchmarks import compare, main as run_benchmarks
+from src.utils.script_tests import run_tests
+
+
+def test_fixtures():
+    """12 768x1344 JPEGs, a WAV narration and a categorised music library."""
+    print("🧪 Testing fixture generation...")
+    from PIL import Image
+    from pydub import AudioSegment
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fx = build_fixtures(Path(tmp), seconds=3.0)
+        sizes = {Image.open(path).size for path in fx["images"]}
+        narration = AudioSegment.from_wav(str(fx["narration_path"]))
+        categories = sorted(path.parent.name for path in fx["music_tracks"])
+        print(f"   {len(fx['images'])} images {sizes}, narration {len(narration)}ms, "
+              f"{len(fx['music_tracks'])} tracks in {sorted(set(categories))}")
+        assert len(fx["images"]) == 12 and sizes == {(768, 1344)}, sizes
+        assert len(narration) == 3000, f"narration is {len(narration)}ms"
+        assert len(set(categories)) == 4, categories
+
+
+def test_word_timings_follow_narration():
+    """Words cover voiced audio and avoid the phrase pauses."""
+    print("🧪 Testing canned word timings...")
+    seconds = 20.0
+    voice = render_narration(seconds)
+    words = narration_word_timings(seconds)
+
+    def rms(start, end):
+        segment = voice[int(start * RATE):int(end * RATE)]
+        return float(np.sqrt(np.mean(segment ** 2))) if segment.size else 0.0
+
+    inside = np.mean([rms(w["start"], w["end"]) for w in words])
+    gaps = [(a["end"], b["start"]) for a, b in zip(words, words[1:]) if b["start"] - a["end"] > 0.15]
+    pauses = np.mean([rms(start + 0.01, end - 0.01) for start, end in gaps])
+    print(f"   {len(words)} words, RMS inside words {inside:.3f}, in {len(gaps)} long pauses {pauses:.4f}")
+    assert all(a["end"] <= b["start"] and a["start"] < a["end"] for a, b in zip(words, words[1:])), "words overlap"
+    assert len(words) > 30 and len(gaps) >= 3, f"{len(words)} words, {len(gaps)} pauses"
+    assert pauses < inside * 0.05, "words fall in the pauses"
+
+
+def test_baseline_comparison():
+    """Only slowdowns beyond the threshold (and the noise floor) are regressions."""
+    print("🧪 Testing baseline comparison...")
+    baseline = {"results": {"mix": {"median_s": 1.0}, "tiny": {"median_s": 0.001}, "gone": {"median_s": 1.0}}}
+    current = {"results": {"mix": {"median_s": 1.3}, "tiny": {"median_s": 0.002}, "new": {"median_s": 1.0},
+                           "av_stage": {"skipped": "no ffmpeg"}}}
+    loose = compare(current, baseline, threshold=0.5)
+    strict = compare(current, baseline, threshold=0.2)
+    print(f"   threshold 20%: {[(n, e['change'], e['regression']) for n, e in strict.items()]}")
+    assert set(strict) == {"mix", "tiny"}, set(strict)
+    assert strict["mix"]["regression"] and not loose["mix"]["regression"], "threshold not applied"
+    assert not strict["tiny"]["regression"], "noise-floor change flagged"
+
+
+def test_runner_end_to_end():
+    """A quick benchmark run writes results and fails against a much faster baseline."""
+    print("🧪 Testing the runner...")
+    import json
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results_path = Path(tmp) / "results.json"
+        status = run_benchmarks(["--only", "mix_audio", "--repeat", "1", "--seconds", "3",
+                                 "--output", str(results_path)])
+        results = json.loads(results_path.read_text())
+        median = results["results"]["mix_audio"]["median_s"]
+
+        faster = dict(results, results={"mix_audio": {"median_s": median / 10}})
+        baseline_path = Path(tmp) / "baseline.json"
+        baseline_path.write_text(json.dumps(faster))
+        regression_status = run_benchmarks(["--only", "mix_audio", "--repeat", "1", "--seconds", "3",
+                                            "--output", str(results_path), "--baseline", str(baseline_path)])
+        assert status == 0 and median > 0, f"status {status}, median {median}"
+        assert regression_status == 1, "a 10x faster baseline did not fail the run"
+
+
+def main():
+    """Run all benchmark suite tests."""
+    tests = [test_fixtures, test_word_timings_follow_narration, test_baseline_comparison, test_runner_end_to_end]
+    return run_tests("TESTING BENCHMARK SUITE", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
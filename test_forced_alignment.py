@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Test aligned-text subtitle timing: the narration is read from the story
+files without markup, long audio is aligned window by window with every
+story word kept in order and spelled as written, and the subtitle processor
+falls back to transcription when the text does not match the audio.
+
+Alignment runs against a scripted model whose cross-attention "knows" the
+true word timings, so the windowing can be checked without model weights.
+"""
+
+import inspect
+import json
+import random
+import re
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.script_tests import run_tests
+from src.video_composition.utils.forced_aligner import ForcedAligner, narration_text
+
+SAMPLE_RATE = 16000
+
+
+class PieceTokenizer:
+    """hf_tokenizer stand-in: tokens are word and punctuation pieces; joined they give back the text."""
+
+    @staticmethod
+    def encode(text, add_special_tokens=False):
+        return SimpleNamespace(ids=re.findall(r" ?[\w'’]+| ?[^\w\s]", text))
+
+
+class ScriptedFeatures:
+    sampling_rate = SAMPLE_RATE
+    hop_length = 160
+    time_per_frame = 0.01
+    nb_max_frames = 3000
+
+    def __call__(self, audio):
+        frames = len(audio) // 160 + 1
+        features = np.zeros((80, frames), dtype=np.float32)
+        features[0] = np.arange(frames)  # Lets the scripted encoder see where a window starts
+        return features
+
+
+class ScriptedModel:
+    """
+    Stand-in for WhisperModel: find_alignment returns each word's true timing
+    inside the window; words spoken after the window are squeezed into its last
+    0.2s, like DTW does with surplus tokens. Unknown words get low probabilities.
+    Takes a batch of token lists (faster-whisper 1.x) or a single list (0.x).
+    """
+
+    def __init__(self, timings):
+        self.timings = timings  # word -> (start, end) in seconds
+        self.feature_extractor = ScriptedFeatures()
+        self.hf_tokenizer = PieceTokenizer()
+        self.model = SimpleNamespace(is_multilingual=False)
+        self.encoded_windows = 0
+
+    def encode(self, segment):
+        self.encoded_windows += 1
+        return {"start": float(segment[0, 0]) / 100}
+
+    def find_alignment(self, tokenizer, text_tokens, encoder_output, num_frames):
+        window_start, window_length = encoder_output["start"], num_frames / 100
+        pieces, word, previous_end = [], None, 0.0
+        batched = isinstance(text_tokens[0], list)
+        for token in (text_tokens[0] if batched else text_tokens):
+            if any(char.isalnum() for char in token):
+                word = token.strip()
+                start, end = self.timings.get(word, (None, None))
+                if start is None:
+                    start, end, probability = previous_end, previous_end + 0.3, 0.05
+                else:
+                    start, end, probability = start - window_start, end - window_start, 0.9
+                if end > window_length:
+                    start, end = window_length - 0.2, window_length - 0.1
+            else:  # Punctuation runs into the pause after the word
+                start, end, probability = previous_end, previous_end + 0.4, 0.5
+            pieces.append({"word": token, "start": start, "end": end, "probability": probability})
+            previous_end = end
+        return [pieces] if batched else pieces
+
+    def transcribe(self, audio, word_timestamps=True):
+        words = [SimpleNamespace(word=" transcribed", start=0.0, end=0.5, probability=0.9)]
+        return [SimpleNamespace(words=words)], None
+
+
+def narration(word_count, seed=0):
+    """Unique words with punctuation and pauses; returns (text, true timings, duration)."""
+    rng = random.Random(seed)
+    words, timings, t = [], {}, 0.3
+    for i in range(word_count):
+        word = f"word{i}"
+        duration = rng.uniform(0.2, 0.45)
+        timings[word] = (t, t + duration)
+        t += duration + rng.uniform(0.02, 0.1)
+        if rng.random() < 0.12:
+            word += rng.choice([",", ".", "!", "?"])
+            t += rng.uniform(0.3, 0.8)
+        words.append(word)
+    return " ".join(words), timings, t + 0.5
+
+
+def test_narration_text():
+    """Narration comes from story.json when present, else the Story section of story.txt, without markup."""
+    print("🧪 Testing narration text extraction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        story_txt = Path(tmp) / "story.txt"
+        story_txt.write_text("Title: The Lost Fleet\nHook: [dramatic] What if?\nMusic Category: Intense\n"
+                             "Word Count: 6\n\nStory:\n[dramatic] What if the fleet [pause:1s] never\n"
+                             "sailed? <break time=\"1s\"/> Nobody knew.\n\nDescription:\nA story.\n\nTags: a, b\n",
+                             encoding="utf-8")
+        from_txt = narration_text(story_txt)
+        (Path(tmp) / "story.json").write_text(json.dumps({"story": "[curious] It   sailed anyway."}), encoding="utf-8")
+        from_json = narration_text(story_txt)
+    print(f"   story.txt: {from_txt!r}")
+    print(f"   story.json: {from_json!r}")
+    assert from_txt == "What if the fleet never sailed? Nobody knew.", from_txt
+    assert from_json == "It sailed anyway.", from_json
+
+
+def test_long_narration_alignment():
+    """About 90s of narration: every word once, in order, spelled as written, with the true timings."""
+    print("🧪 Testing window-by-window alignment...")
+    text, timings, duration = narration(190)
+    audio = np.zeros(int(duration * SAMPLE_RATE), dtype=np.float32)
+    model = ScriptedModel(timings)
+    aligned = ForcedAligner(model).align(audio, text)
+    single_list = ForcedAligner(ScriptedModel(timings))
+    single_list.batched_alignment = not single_list.batched_alignment
+    same_in_other_shape = single_list.align(audio, text) == aligned
+
+    errors = [max(abs(word["start"] - timings[word["word"].strip().rstrip(",.!?")][0]),
+                  abs(word["end"] - timings[word["word"].strip().rstrip(",.!?")][1])) for word in aligned]
+    print(f"   {duration:.1f}s, {len(aligned)} words in {model.encoded_windows} windows, "
+          f"max timing error {max(errors) * 1000:.1f} ms")
+    print(f"   same timings with the other find_alignment call shape: {same_in_other_shape}")
+    assert [word["word"].strip() for word in aligned] == text.split(), "words missing, repeated or respelled"
+    assert all(a["end"] <= b["start"] + 1e-9 for a, b in zip(aligned, aligned[1:])), "words overlap"
+    assert max(errors) < 1e-6, f"timing error {max(errors) * 1000:.1f} ms"
+    assert model.encoded_windows <= 4, f"{model.encoded_windows} windows encoded"
+    assert same_in_other_shape, "the two find_alignment call shapes gave different timings"
+
+
+def test_real_find_alignment_call_shape():
+    """The installed WhisperModel.find_alignment aligns our one token list (not a nested batch) and returns its words."""
+    print("🧪 Testing the installed faster-whisper find_alignment...")
+    import faster_whisper
+    from faster_whisper import WhisperModel
+
+    tokens, eot = [11, 12], 50257
+    calls = []
+
+    def align(encoder_output, sot_sequence, text_tokens, num_frames, median_filter_width=7):
+        calls.append(text_tokens)
+        return [SimpleNamespace(text_token_probs=[0.9, 0.8, 0.7], alignments=[(0, 0), (1, 10), (2, 20)])]
+
+    whisper = SimpleNamespace(model=SimpleNamespace(align=align), tokens_per_second=50)
+    whisper.find_alignment = WhisperModel.find_alignment.__get__(whisper)
+    aligner = ForcedAligner(whisper)
+    aligner._tokenizer = SimpleNamespace(
+        sot_sequence=[50258], eot=eot,
+        split_to_word_tokens=lambda ids: (["A", " b", ""], [[11], [12], [eot]]))
+    pieces = aligner._find_alignment(tokens, encoder_output=None, num_frames=100)
+
+    parameters = list(inspect.signature(WhisperModel.find_alignment).parameters)[1:5]
+    print(f"   faster-whisper {faster_whisper.__version__}, batched: {aligner.batched_alignment}, "
+          f"align got {calls}, words {[(piece['word'], piece['end']) for piece in pieces]}")
+    assert parameters == ["tokenizer", "text_tokens", "encoder_output", "num_frames"], parameters
+    assert calls == [[tokens]], f"align got {calls}"  # One align call on a batch of one token list, in 0.x and 1.x
+    words = [(piece["word"], float(piece["start"]), float(piece["end"])) for piece in pieces]
+    assert words == [("A", 0.0, 0.2), (" b", 0.2, 0.4)], words
+
+
+def test_subtitle_processor_modes():
+    """Aligned mode uses the story text; text that does not match the audio falls back to transcription."""
+    print("🧪 Testing subtitle processor timing modes...")
+    from src.video_composition.whisper_subtitle_processor import OptimizedWhisperViralSubtitleProcessor
+
+    text, timings, duration = narration(40, seed=1)
+    audio = np.zeros(int(duration * SAMPLE_RATE), dtype=np.float32)
+    processor = OptimizedWhisperViralSubtitleProcessor()
+    processor._whisper_model = ScriptedModel(timings)
+    with tempfile.TemporaryDirectory() as tmp:
+        story = Path(tmp) / "story.txt"
+        story.write_text(f"Title: T\n\nStory:\n{text}\n", encoding="utf-8")
+        aligned = processor.extract_word_timing(audio, str(story))
+        story.write_text("Story:\nSomething else entirely was narrated here.\n", encoding="utf-8")
+        mismatched = processor.extract_word_timing(audio, str(story))
+        processor.aligned_text_mode = False
+        transcribed = processor.extract_word_timing(audio, str(story))
+    sources = [{word["source"] for word in words} for words in (aligned, mismatched, transcribed)]
+    print(f"   sources: {sources}")
+    assert len(aligned) == 40, f"{len(aligned)} aligned words"
+    assert sources == [{"forced_alignment"}, {"whisper"}, {"whisper"}], sources
+
+
+def main():
+    """Run all forced alignment tests."""
+    tests = [test_narration_text, test_long_narration_alignment, test_real_find_alignment_call_shape,
+             test_subtitle_processor_modes]
+    return run_tests("TESTING FORCED ALIGNMENT", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test the precompiled keyword scanner: positions and overlapping matches,
+whole-word vs substring rules, exception suffixes, and that the content
+safety check and keyword classifiers decide exactly as the per-keyword
+checks they replaced.
+"""
+
+import contextlib
+import io
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.keyword_scanner import KeywordMatch, KeywordRule, KeywordScanner
+from src.utils.script_tests import run_tests
+
+UNSAFE_PATTERNS = [
+    r'\b(murder(ed|ing)?|assassination|execution|torture|massacre|genocide|slaughter)\b',
+    r'\b(kill(ed|ing|s)?|death|dead|die|died)\b(?!\s+(bacteria|infection|disease|mold|germ))',
+    r'\b(bloody|gore|gory|gruesome|horrific)\b',
+    r'\b(gun|guns|sword|swords|knife|knives|weapon|weapons)\b',
+    r'\b(battle|war|fighting|fought|attack|attacked|bomb|bombed|explosion|exploded)\b',
+    r'\b(terror|terrorist|terrorism)\b',
+    r'\b(nude|naked|sex|sexual|porn|pornographic|explicit|adult|mature)\b',
+    r'\b(hate|hateful|racist|racism|discrimination|discriminatory|abuse|abusive)\b',
+]
+HISTORICAL_CONTEXTS = ['infection', 'disease', 'bacteria', 'mold', 'germ', 'medicine', 'medical', 'discovery',
+                       'invention', 'science', 'scientific', 'research', 'experiment', 'ancient', 'historical',
+                       'archaeology', 'civilization', 'culture', 'treasure', 'artifact', 'monument', 'building',
+                       'architecture', 'king', 'queen', 'emperor', 'empire', 'kingdom', 'dynasty', 'trade',
+                       'commerce', 'economy', 'wealth', 'fortune']
+PROBLEMATIC_WORDS = ['violent', 'violence', 'brutal', 'brutally', 'horror', 'disturbing', 'shocking', 'terrifying',
+                     'fear', 'fearful', 'scary', 'scared', 'afraid', 'terrified']
+
+
+def reference_is_safe(content: str) -> bool:
+    """The previous _is_content_safe: one re.search per pattern, then `in` checks over the word lists."""
+    content_lower = content.lower()
+    if any(re.search(pattern, content_lower) for pattern in UNSAFE_PATTERNS):
+        return False
+    if not any(context in content_lower for context in HISTORICAL_CONTEXTS):
+        return not any(word in content_lower for word in PROBLEMATIC_WORDS)
+    return True
+
+
+def random_texts(vocabulary, count=3000, seed=0):
+    rng = random.Random(seed)
+    filler = ["the", "Grand", "orange", "warfare", "fearless", "stone", "accidental", "KINGDOM", "spoken", "x"]
+    for _ in range(count):
+        yield " ".join(rng.choice(vocabulary if rng.random() < 0.5 else filler) for _ in range(rng.randint(1, 12)))
+
+
+def test_positions_and_overlaps():
+    """Every match is reported with its position, including keywords inside or overlapping others."""
+    print("🧪 Testing positions and overlapping matches...")
+    scanner = KeywordScanner({
+        "weapons": ["sword", "knife"],
+        "violence": KeywordRule(["kill", "killed"], not_followed_by=r"\s+bacteria"),
+        "context": KeywordRule(["king", "kingdom", "dom"], whole_words=False),
+    })
+    text = "The Knife that killed the king of the Kingdom; killed bacteria"
+    matches = scanner.scan(text)
+    for match in matches:
+        print(f"   {match}")
+    expected = [
+        KeywordMatch("weapons", "knife", 4, 9),
+        KeywordMatch("violence", "killed", 15, 21),
+        KeywordMatch("context", "king", 26, 30),
+        KeywordMatch("context", "kingdom", 38, 45),
+        KeywordMatch("context", "king", 38, 42),
+        KeywordMatch("context", "dom", 42, 45),
+    ]
+    assert matches == expected and text[4:9] == "Knife", matches
+    assert scanner.search("no match here") is None
+    assert scanner.term_counts(text) == {"weapons": 1, "violence": 1, "context": 3}, scanner.term_counts(text)
+
+
+def test_whole_words():
+    """Whole-word rules skip keywords inside longer words; the shortest whole word still matches."""
+    print("🧪 Testing word boundaries...")
+    scanner = KeywordScanner({"war": ["war", "warfare"], "fear": KeywordRule(["fear"], whole_words=False)})
+    cases = {
+        "warfare": {"war": 1, "fear": 0},
+        "war-time": {"war": 1, "fear": 0},
+        "swarm": {"war": 0, "fear": 0},
+        "fearless warrior": {"war": 0, "fear": 1},
+        "İstanbul WAR": {"war": 1, "fear": 0},  # Lowercasing "İ" changes the length; positions stay aligned
+    }
+    results = {text: scanner.term_counts(text) for text in cases}
+    print(f"   {results}")
+    istanbul = scanner.scan("İstanbul WAR")[0]
+    assert results == cases, results
+    assert (istanbul.start, istanbul.end) == (9, 12), istanbul
+
+
+def test_content_safety_matches_reference():
+    """The single-pass safety check decides exactly like the per-pattern version, and faster."""
+    print("🧪 Testing content safety against the previous implementation...")
+    from src.llm.story_generator import StoryGenerator
+
+    generator = StoryGenerator.__new__(StoryGenerator)  # _is_content_safe needs no API client
+    vocabulary = ("murdered killing kills dead died bacteria germ gun war fought terrorist adult hate "
+                  "Disease KING trade violence brutally horror fear scared afraid").split()
+    mismatches = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for text in random_texts(vocabulary):
+            if generator._is_content_safe(text) != reference_is_safe(text):
+                mismatches.append(text)
+
+    story = " ".join(random.Random(1).choice(["the", "ancient", "river", "merchants", "sailed", "across",
+                                              "stormy", "seas", "carrying", "silk", "spices"]) for _ in range(250))
+    start = time.perf_counter()
+    for _ in range(200):
+        reference_is_safe(story)
+    reference_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(200):
+        generator._is_content_safe(story)
+    scanner_s = time.perf_counter() - start
+    print(f"   {len(mismatches)} mismatches; 250-word story: {reference_s * 5000:.0f} µs -> {scanner_s * 5000:.0f} µs")
+    assert not mismatches, f"decisions differ for {mismatches[:3]}"
+    assert scanner_s < reference_s, "single-pass check is slower than the per-pattern one"
+
+
+def test_keyword_classifiers():
+    """Content-type scores and the fallback parser match the `keyword in text` checks they replaced."""
+    print("🧪 Testing keyword classifiers...")
+    from src.video_composition.whisper_audio_synchronizer import FALLBACK_CONTENT_TYPES, WhisperAudioSynchronizer
+
+    synchronizer = WhisperAudioSynchronizer()
+    vocabulary = [word for words in synchronizer.content_keywords.values() for word in words]
+    mismatches = 0
+    for text in random_texts(vocabulary, count=1000, seed=2):
+        lower = text.lower()
+        expected = {content_type: sum(1 for keyword in keywords if keyword in lower)
+                    for content_type, keywords in synchronizer.content_keywords.items()}
+        mismatches += synchronizer.content_scanner.term_counts(text) != expected
+    parsed = synchronizer._fallback_parse_response("", "The general spoke as the army entered the city")
+    print(f"   {mismatches} score mismatches; fallback parse -> {parsed['content_type']}")
+    assert mismatches == 0, f"{mismatches} score mismatches"
+    assert parsed["content_type"] == "character_action", parsed["content_type"]
+    assert FALLBACK_CONTENT_TYPES.first_label("Nothing here", default="exposition_setup") == "exposition_setup"
+
+
+def main():
+    """Run all keyword scanner tests."""
+    tests = [test_positions_and_overlaps, test_whole_words, test_content_safety_matches_reference,
+             test_keyword_classifiers]
+    return run_tests("TESTING KEYWORD SCANNER", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
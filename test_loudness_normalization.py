@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test streaming loudness normalization: block-fed LUFS meter, true-peak
+limiter, and a single-pass mix that lands on the -14 LUFS target.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.loudness import LoudnessMeter, TruePeakLimiter, integrated_loudness, true_peak_dbfs
+from src.utils.music_loop import pcm_view
+from src.utils.script_tests import run_tests
+
+
+def speech_like(seconds: float, rate: int = 44100, seed: int = 1) -> np.ndarray:
+    """Stereo noise bursts with pauses - bursty like speech, so RMS and LUFS disagree."""
+    rng = np.random.default_rng(seed)
+    frames = int(seconds * rate)
+    envelope = (np.sin(2 * np.pi * 2.5 * np.arange(frames) / rate) > 0.2).astype(np.float32)
+    mono = rng.standard_normal(frames).astype(np.float32) * 0.15 * envelope
+    return np.stack([mono, mono], axis=1)
+
+
+def segment(samples: np.ndarray, rate: int = 44100) -> AudioSegment:
+    """16-bit AudioSegment from float samples."""
+    pcm = np.clip(np.rint(samples * 32767), -32768, 32767).astype('<i2')
+    return AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=rate, channels=samples.shape[1])
+
+
+def test_streaming_meter():
+    """Feeding blocks of any size gives the same loudness as one whole-signal measurement."""
+    print("🧪 Testing streaming loudness meter...")
+    samples = speech_like(12.0)
+    whole = integrated_loudness(samples, 44100)
+    meter = LoudnessMeter(44100, 2)
+    for start in range(0, samples.shape[0], 3001):
+        meter.add(samples[start:start + 3001])
+    print(f"   Whole: {whole:.3f} LUFS, streamed: {meter.integrated():.3f} LUFS")
+    assert abs(whole - meter.integrated()) < 1e-6, "block size changed the measurement"
+
+
+def test_true_peak_limiter():
+    """Limited output keeps its length, stays under the ceiling and leaves quiet audio untouched."""
+    print("🧪 Testing true-peak limiter...")
+    samples = speech_like(5.0) * 6.0
+    limiter = TruePeakLimiter(44100, 2, ceiling_db=-1.0)
+    limited = np.concatenate([limiter.process(samples[start:start + 10000])
+                              for start in range(0, samples.shape[0], 10000)] + [limiter.flush()])
+    print(f"   Input {true_peak_dbfs(samples):+.2f} dBTP -> output {true_peak_dbfs(limited):+.2f} dBTP, "
+          f"{limited.shape[0]}/{samples.shape[0]} frames")
+
+    quiet = speech_like(2.0) * 0.2
+    passthrough = np.concatenate([limiter.process(quiet), limiter.flush()])
+    assert limited.shape == samples.shape, f"{limited.shape[0]}/{samples.shape[0]} frames"
+    assert true_peak_dbfs(limited) <= -0.95, f"output peaks at {true_peak_dbfs(limited):+.2f} dBTP"
+    assert np.allclose(passthrough, quiet), "quiet audio was changed"
+
+
+def test_mix_hits_target():
+    """Quiet voice and loud music mix to -14 LUFS, peaks under -1 dBTP, sample-exact length."""
+    print("🧪 Testing single-pass mix loudness...")
+    from src.audio_mixer import AudioMixer
+
+    mixer = AudioMixer()
+    voice = segment(speech_like(9.0) * 0.3)
+    music = segment(speech_like(4.0, seed=7) * 2.5)
+    mixed = mixer.mix_audio(voice, pcm_view(music))
+
+    samples = np.frombuffer(mixed.raw_data, dtype='<i2').reshape(-1, 2) / 32768.0
+    lufs = integrated_loudness(samples, 44100)
+    peak = true_peak_dbfs(samples)
+    print(f"   Mix: {lufs:.2f} LUFS, {peak:+.2f} dBTP, {mixed.frame_count():.0f}/{voice.frame_count():.0f} frames")
+    assert abs(lufs - (-14.0)) < 0.5, f"{lufs:.2f} LUFS, expected -14"
+    assert peak <= -0.9, f"mix peaks at {peak:+.2f} dBTP"
+    assert mixed.frame_count() == voice.frame_count(), "mix length differs from the voice"
+
+
+def main():
+    """Run all loudness normalization tests."""
+    tests = [test_streaming_meter, test_true_peak_limiter, test_mix_hits_target]
+    return run_tests("TESTING LOUDNESS NORMALIZATION", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
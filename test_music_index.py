@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test the music library index: incremental refresh, memory-mapped sample
+cache and precomputed loudness, on a synthetic library of WAV tones.
+"""
+
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.loudness import has_scipy, integrated_loudness, rms_dbfs
+from src.utils.music_index import MusicIndex
+from src.utils.script_tests import run_tests
+
+
+def write_tone(path: Path, seconds: float, amplitude: float, sample_rate: int = 22050, freq: float = 997.0):
+    """Write a mono 16-bit sine tone (the index resamples it to 44.1 kHz stereo)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frames = int(seconds * sample_rate)
+    with wave.open(str(path), 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(b''.join(
+            struct.pack('<h', int(amplitude * 32767 * math.sin(2 * math.pi * freq * i / sample_rate)))
+            for i in range(frames)))
+
+
+def test_loudness_reference():
+    """A 997 Hz stereo sine at -6 dBFS peak measures -6 LUFS (unweighted: -6.7)."""
+    print("🧪 Testing loudness reference tone...")
+    rate = 48000
+    t = np.arange(rate * 3) / rate
+    tone = 0.5 * np.sin(2 * np.pi * 997 * t)
+    samples = np.stack([tone, tone], axis=1)
+
+    lufs = integrated_loudness(samples, rate)
+    expected = -6.02 if has_scipy else -6.71
+    print(f"   Integrated loudness: {lufs:.2f} LUFS (expected {expected}, K-weighting: {has_scipy})")
+    print(f"   RMS level: {rms_dbfs(samples):.2f} dBFS")
+    assert abs(lufs - expected) < 0.2, f"{lufs:.2f} LUFS, expected {expected}"
+    assert abs(rms_dbfs(samples) - (-9.03)) < 0.05, f"{rms_dbfs(samples):.2f} dBFS, expected -9.03"
+
+
+def test_incremental_refresh():
+    """Only new or modified tracks are decoded; deleted tracks drop out of the index."""
+    print("🧪 Testing incremental refresh...")
+    with tempfile.TemporaryDirectory() as tmp:
+        library = Path(tmp) / "music"
+        write_tone(library / "Intense" / "a.wav", 1.0, 0.8)
+        write_tone(library / "Intense" / "b.wav", 1.5, 0.4)
+        write_tone(library / "Somber" / "c.wav", 2.0, 0.2)
+        (library / "Licenses").mkdir()
+        (library / "Licenses" / "a.pdf").write_bytes(b"%PDF")
+
+        index = MusicIndex(library)
+        first = index.refresh()
+        print(f"   First build: {first}")
+        assert first == {"added": 3, "updated": 0, "removed": 0, "unchanged": 0}
+
+        # A fresh instance re-uses the saved index without decoding anything
+        reloaded = MusicIndex(library)
+        second = reloaded.refresh()
+        print(f"   Reload: {second}")
+        assert second == {"added": 0, "updated": 0, "removed": 0, "unchanged": 3}, "reload decoded tracks again"
+
+        time.sleep(0.01)
+        write_tone(library / "Intense" / "b.wav", 0.5, 0.4)
+        os.remove(library / "Somber" / "c.wav")
+        third = reloaded.refresh()
+        print(f"   After modify + delete: {third}")
+        assert third == {"added": 0, "updated": 1, "removed": 1, "unchanged": 1}
+
+        entries = reloaded.entries("Intense")
+        durations = {e["path"]: round(e["duration"], 2) for e in entries}
+        print(f"   Intense tracks: {durations}")
+        assert durations == {"Intense/a.wav": 1.0, "Intense/b.wav": 0.5}
+        assert reloaded.entries("Somber") == [], "deleted track still indexed"
+
+
+def test_cached_samples():
+    """Cached samples are memory-mapped 44.1 kHz stereo float32 with the indexed level (resampling may drop a frame)."""
+    print("🧪 Testing memory-mapped sample cache...")
+    with tempfile.TemporaryDirectory() as tmp:
+        library = Path(tmp) / "music"
+        track = library / "Uplifting" / "tone.wav"
+        write_tone(track, 1.0, 0.5)
+
+        index = MusicIndex(library)
+        index.refresh()
+        samples = index.load_samples(track)
+        entry = index.get("Uplifting/tone.wav")
+
+        print(f"   Samples: {type(samples).__name__} {samples.shape} {samples.dtype}")
+        print(f"   Indexed: {entry['dbfs']:.2f} dBFS, {entry['integrated_loudness']:.2f} LUFS, "
+              f"source {entry['source_sample_rate']} Hz / {entry['source_channels']} ch")
+        assert isinstance(samples, np.memmap), "samples are not memory-mapped"
+        assert abs(samples.shape[0] - 44100) <= 2 and samples.shape[1] == 2, samples.shape
+        assert samples.dtype == np.float32, samples.dtype
+        assert abs(entry["dbfs"] - rms_dbfs(samples)) < 1e-6 and abs(entry["dbfs"] - (-9.03)) < 0.1, entry["dbfs"]
+        assert entry["source_sample_rate"] == 22050 and entry["source_channels"] == 1
+
+
+def main():
+    """Run all music index tests."""
+    tests = [test_loudness_reference, test_incremental_refresh, test_cached_samples]
+    return run_tests("TESTING MUSIC INDEX", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
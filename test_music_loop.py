@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test lazy music looping: exact frame counts, continuous loop seams, memory
+use independent of the number of loops, and sample-exact mixer output.
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.music_loop import LoopedMusic, pcm_view
+from src.utils.script_tests import run_tests
+
+
+def tone(seconds: float, amplitude: float, freq: float = 220.0, rate: int = 44100) -> np.ndarray:
+    """Stereo float32 sine tone shaped (frames, 2)."""
+    t = np.arange(int(seconds * rate)) / rate
+    mono = (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+    return np.stack([mono, mono], axis=1)
+
+
+def segment(samples: np.ndarray, rate: int = 44100) -> AudioSegment:
+    """16-bit AudioSegment from float samples."""
+    pcm = np.clip(np.rint(samples * 32767), -32768, 32767).astype('<i2')
+    return AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=rate, channels=samples.shape[1])
+
+
+def test_exact_frame_count():
+    """Blocks cover exactly the requested frames, shorter or longer than the track."""
+    print("🧪 Testing exact frame counts...")
+    looped = LoopedMusic(tone(1.0, 0.5), crossfade_frames=4410)
+    for total in (1000, 44100, 44101, 250_000):
+        frames = sum(block.shape[0] for _, block in looped.blocks(total, 8192))
+        print(f"   {total} frames requested -> {frames}")
+        assert frames == total, f"{frames} frames for {total} requested"
+    # Shorter than the track: just the head of the track, untouched
+    head = looped.read(0, 1000)
+    assert np.allclose(head, looped.pcm[:1000]), "head of the track changed"
+
+
+def test_seam_continuity():
+    """Looping a track with a silent head clicks without a crossfade; the crossfade spreads it out."""
+    print("🧪 Testing loop seam continuity...")
+    track = np.full((10000, 2), 0.5, dtype=np.float32)
+    track[:100] = 0.0  # The silent head is faded in over 1000 frames
+    looped = LoopedMusic(track, crossfade_frames=1000)
+    seam = looped.read(looped.period - 10, 1200)
+    plain = LoopedMusic(track).read(9990, 20)
+
+    jump_crossfaded = float(np.abs(np.diff(seam[:, 0])).max())
+    jump_plain = float(np.abs(np.diff(plain[:, 0])).max())
+    print(f"   Largest step across seam: {jump_crossfaded:.4f} (without crossfade: {jump_plain:.4f})")
+    # Block boundaries must not change the result
+    stitched = np.concatenate([block for _, block in looped.blocks(30000, 777)])
+    whole = looped.read(0, 30000)
+    assert jump_crossfaded < 0.1, f"crossfaded seam steps by {jump_crossfaded:.4f}"
+    assert jump_plain >= 0.5, f"plain seam steps by only {jump_plain:.4f}"
+    assert np.array_equal(stitched, whole), "block boundaries changed the samples"
+
+
+def test_memory_independent_of_loops():
+    """Peak memory while streaming 10x and 100x the track is about the same (one block, not the loop)."""
+    print("🧪 Testing memory use vs. loop count...")
+    looped = LoopedMusic(tone(2.0, 0.5), crossfade_frames=44100)
+    peaks = {}
+    for loops in (10, 100):
+        total = looped.period * loops
+        tracemalloc.start()
+        energy = 0.0
+        for _, block in looped.blocks(total, 16384):
+            energy += float(np.square(block[:, 0]).sum())
+        peaks[loops] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"   {loops} loops ({total} frames): peak {peaks[loops] / 1e6:.2f} MB")
+    materialized = looped.period * 100 * 2 * 4
+    assert peaks[100] < peaks[10] * 1.5, "peak memory grows with the loop count"
+    assert peaks[100] < materialized / 20, "peak memory close to the materialized loop"
+
+
+def test_mixer_output_length():
+    """The mix is exactly the voice's sample count, whatever the music length."""
+    print("🧪 Testing mixer output length...")
+    from src.audio_mixer import AudioMixer
+
+    mixer = AudioMixer()
+    voice = segment(tone(7.3, 0.6, freq=440.0))
+    for music_seconds in (1.0, 20.0):
+        music = segment(tone(music_seconds, 0.3))
+        mixed = mixer.mix_audio(voice, pcm_view(music))
+        print(f"   {music_seconds:.0f}s music under {voice.frame_count():.0f}-frame voice -> {mixed.frame_count():.0f} frames")
+        assert mixed.frame_count() == voice.frame_count(), "mix length differs from the voice"
+        assert mixed.max_dBFS <= 0, f"mix clips at {mixed.max_dBFS:.2f} dBFS"
+    # AudioSegment input is accepted too
+    assert mixer.mix_audio(voice, segment(tone(1.0, 0.3))).frame_count() == voice.frame_count()
+
+
+def main():
+    """Run all music loop tests."""
+    tests = [test_exact_frame_count, test_seam_continuity, test_memory_independent_of_loops,
+             test_mixer_output_length]
+    return run_tests("TESTING MUSIC LOOPING", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test sidechain ducking: the music gain curve follows the voice (from its
+envelope or from Whisper word timings), runs fast on a 60-second mix and
+only allocates per block.
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.ducking import build_ducker
+from src.utils.script_tests import run_tests
+
+RATE = 44100
+
+
+def voice_with_pause(seconds: float, pause: tuple = (4.0, 6.0)) -> np.ndarray:
+    """16-bit stereo 'voice' (noise) with a silent pause."""
+    rng = np.random.default_rng(3)
+    voice = (rng.standard_normal((int(seconds * RATE), 2)) * 3000).astype(np.int16)
+    voice[int(pause[0] * RATE):int(pause[1] * RATE)] = 0
+    return voice
+
+
+def test_gain_follows_voice():
+    """Music is ducked while the voice speaks, ramps up in the pause and ducks again ahead of the voice."""
+    print("🧪 Testing envelope-keyed ducking...")
+    ducker = build_ducker(voice_with_pause(10.0), RATE, 1 / 32768, depth_db=8.0, attack_ms=80.0, release_ms=400.0)
+    gain_db = 20 * np.log10(ducker.gain(0, 10 * RATE)[:, 0])
+
+    speaking, pause = gain_db[int(2.0 * RATE)], gain_db[int(5.0 * RATE)]
+    before_voice = gain_db[int(5.97 * RATE)]  # 30 ms before the voice returns: already ducking
+    print(f"   Speaking: {speaking:.1f}dB, pause: {pause:.1f}dB, 30ms before voice: {before_voice:.1f}dB")
+    steps = np.abs(np.diff(gain_db)).max()
+    print(f"   Largest per-sample gain step: {steps:.4f}dB")
+    assert abs(speaking + 8.0) < 0.01, f"{speaking:.2f}dB while speaking, expected -8"
+    assert abs(pause) < 0.01, f"{pause:.2f}dB in the pause, expected 0"
+    assert -8.0 < before_voice < -1.0, "not ducking ahead of the voice"
+    assert steps < 0.01, f"gain steps by {steps:.4f}dB"
+
+
+def test_word_timings():
+    """Word timings key the ducking without looking at the audio."""
+    print("🧪 Testing word-timing-keyed ducking...")
+    silence = np.zeros((4 * RATE, 2), dtype=np.int16)
+    words = [{'word': 'Rome', 'start': 1.0, 'end': 1.3}, {'word': 'fell', 'start': 1.4, 'end': 2.0}]
+    ducker = build_ducker(silence, RATE, 1 / 32768, word_timings=words, depth_db=6.0)
+    gain_db = 20 * np.log10(ducker.gain(0, 4 * RATE)[:, 0])
+    values = {t: round(float(gain_db[int(t * RATE)]), 2) for t in (0.5, 1.2, 1.35, 1.9, 3.5)}
+    print(f"   Gain by time: {values}")
+    assert values == {0.5: 0, 1.2: -6, 1.35: -6, 1.9: -6, 3.5: 0}, values
+
+
+def test_speed_and_memory():
+    """A 60-second stereo mix is ducked in under 50 ms, with per-block allocations only."""
+    print("🧪 Testing 60-second ducking speed and memory...")
+    voice = voice_with_pause(60.0, pause=(20.0, 22.0))
+    block = 65536
+    timings = []
+    for _ in range(3):
+        start_time = time.perf_counter()
+        ducker = build_ducker(voice, RATE, 1 / 32768, block_frames=block)
+        for start in range(0, voice.shape[0], block):
+            ducker.gain(start, min(block, voice.shape[0] - start))
+        timings.append(time.perf_counter() - start_time)
+    best_ms = min(timings) * 1000
+
+    tracemalloc.start()
+    ducker = build_ducker(voice, RATE, 1 / 32768, block_frames=block)
+    for start in range(0, voice.shape[0], block):
+        ducker.gain(start, min(block, voice.shape[0] - start))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    full_float_mix = voice.shape[0] * 2 * 4
+    print(f"   Best of 3: {best_ms:.1f}ms, peak allocation {peak / 1e6:.2f} MB "
+          f"(full float mix would be {full_float_mix / 1e6:.1f} MB)")
+    assert best_ms < 50, f"{best_ms:.1f}ms for 60 seconds"
+    assert peak < full_float_mix / 10, f"peak allocation {peak / 1e6:.2f} MB"
+
+
+def main():
+    """Run all sidechain ducking tests."""
+    tests = [test_gain_follows_voice, test_word_timings, test_speed_and_memory]
+    return run_tests("TESTING SIDECHAIN DUCKING", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
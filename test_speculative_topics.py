@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test speculative topic suggestion: the banned-topic index decides exactly like
+the per-topic comparison it replaced, concurrent candidates remove the serial
+retry latency, and requests still in flight are cancelled once a topic is
+accepted.
+"""
+
+import asyncio
+import contextlib
+import io
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.llm.story_generator import TOPIC_COMMON_WORDS, BannedTopicIndex, StoryGenerator
+from src.utils.script_tests import run_tests
+
+
+def reference_contains_banned(suggested_topic: str, banned_topics: set) -> bool:
+    """The previous _contains_banned_topic: clean and compare every banned topic per check."""
+    suggested_clean = re.sub(r'[^\w\s]', '', suggested_topic.lower())
+    suggested_words = set(suggested_clean.split()) - TOPIC_COMMON_WORDS
+    for banned_topic in banned_topics:
+        banned_clean = re.sub(r'[^\w\s]', '', banned_topic.lower())
+        banned_words = set(banned_clean.split()) - TOPIC_COMMON_WORDS
+        if banned_words and suggested_words:
+            overlap = len(banned_words & suggested_words)
+            if overlap / len(banned_words | suggested_words) > 0.8:
+                return True
+        if suggested_clean.strip() == banned_clean.strip():
+            return True
+    return False
+
+
+class ScriptedCompletions:
+    """chat.completions stand-in answering calls in order with (delay, topic or exception)."""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.calls = 0
+        self.cancelled = 0
+
+    async def create(self, **kwargs):
+        delay, answer = self.answers[self.calls]
+        self.calls += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(answer, Exception):
+            raise answer
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=answer))])
+
+
+def scripted_generator(answers, banned):
+    generator = StoryGenerator(api_key="offline-test")
+    completions = ScriptedCompletions(answers)
+    generator.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    generator._load_banned_topics = lambda: list(banned)
+    return generator, completions
+
+
+def suggest(generator, candidates):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        topic = asyncio.run(generator.suggest_topic(candidates=candidates))
+        return topic, time.perf_counter() - start
+
+
+def test_index_matches_reference():
+    """The indexed check rejects exactly what the per-topic loop rejected, in a fraction of the time."""
+    print("🧪 Testing banned-topic index against the previous check...")
+    rng = random.Random(3)
+    words = ["Emperor", "Library", "Lighthouse", "Siege", "Treasure", "Spy", "Queen", "Rome", "Venice", "Petra",
+             "the", "of", "Secret", "Lost", "1347", "Comet", "Duel", "Heist", "Kyoto", "Babylon", "!", "Story"]
+
+    def topic():
+        return " ".join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+
+    banned = {topic() for _ in range(1500)} | {"The Story", "The Secret History of ..."}
+    candidates = [topic() for _ in range(400)] + ["the story", "THE SECRET HISTORY OF", "Rome Rome Venice"]
+    index = BannedTopicIndex(banned)
+    generator = StoryGenerator.__new__(StoryGenerator)  # _contains_banned_topic needs no API client
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        expected = [reference_contains_banned(candidate, banned) for candidate in candidates]
+        reference_s = time.perf_counter() - start
+        start = time.perf_counter()
+        indexed = [index.contains(candidate) for candidate in candidates]
+        indexed_s = time.perf_counter() - start
+        via_method = [generator._contains_banned_topic(candidate, banned) for candidate in candidates]
+    mismatches = sum(a != b for a, b in zip(expected, indexed))
+    print(f"   {sum(expected)}/{len(candidates)} rejected, {mismatches} mismatches; "
+          f"{reference_s * 1e6 / len(candidates):.0f} µs -> {indexed_s * 1e6 / len(candidates):.0f} µs per check")
+    assert mismatches == 0 and via_method == expected, f"{mismatches} mismatches"
+    assert sum(expected) > 10, "too few rejections to compare"
+    assert indexed_s < reference_s, "indexed check is slower than the per-topic loop"
+    assert not generator._contains_banned_topic("Anything", set())
+
+
+def test_concurrent_candidates_cut_retry_latency():
+    """Two rejected answers cost two extra round-trips serially, nothing extra when requested together."""
+    print("🧪 Testing speculative vs serial latency...")
+    banned = ["The Lost Library Of Alexandria", "The Spy Who Saved Venice"]
+    answers = [(0.1, "The Lost Library of Alexandria!"), (0.1, "The Spy Who Saved Venice"),
+               (0.1, "The Lighthouse Keeper Who Outlived Three Empires")]
+    serial_topic, serial_s = suggest(scripted_generator(answers, banned)[0], candidates=1)
+    speculative, completions = scripted_generator(answers, banned)
+    speculative_topic, speculative_s = suggest(speculative, candidates=3)
+    print(f"   serial: {serial_s:.2f}s -> {serial_topic!r}")
+    print(f"   speculative: {speculative_s:.2f}s -> {speculative_topic!r} ({completions.calls} requests)")
+    assert serial_topic == speculative_topic == answers[2][1], (serial_topic, speculative_topic)
+    assert serial_s > 0.28, f"serial suggestion took only {serial_s:.2f}s"
+    assert speculative_s < 0.2, f"speculative suggestion took {speculative_s:.2f}s"
+    assert completions.calls == 3, f"{completions.calls} requests"
+
+
+def test_first_acceptable_wins_and_cancels():
+    """The fastest acceptable answer is returned, slower requests are cancelled, failures are tolerated."""
+    print("🧪 Testing first-acceptable selection...")
+    answers = [(0.5, "The Comet That Fooled Kyoto"), (0.01, RuntimeError("rate limited")),
+               (0.05, "The Duel That Never Ended In Petra")]
+    generator, completions = scripted_generator(answers, [])
+    topic, elapsed = suggest(generator, candidates=3)
+    print(f"   {topic!r} after {elapsed:.2f}s, {completions.cancelled} request(s) cancelled")
+
+    failing, _ = scripted_generator([(0.01, RuntimeError("offline"))] * 3, [])
+    try:
+        suggest(failing, candidates=3)
+        raised = False
+    except RuntimeError:
+        raised = True
+    assert topic == answers[2][1] and elapsed < 0.3, f"{topic!r} after {elapsed:.2f}s"
+    assert completions.cancelled == 1, f"{completions.cancelled} requests cancelled"
+    assert raised, "all candidates failing did not raise"
+
+
+def main():
+    """Run all speculative topic suggestion tests."""
+    tests = [test_index_matches_reference, test_concurrent_candidates_cut_retry_latency,
+             test_first_acceptable_wins_and_cancels]
+    return run_tests("TESTING SPECULATIVE TOPIC SUGGESTION", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
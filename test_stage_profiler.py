@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test the stage profiler: nested span records, top allocators, per-stage
+cProfile dumps, the collapsed-stack export and the disabled fast path.
+"""
+
+import pstats
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.profiler import StageProfiler, get_profiler, profile_span, set_profiler
+from src.utils.script_tests import run_tests
+
+
+def busy(seconds: float) -> float:
+    """Burn CPU in Python code so the sampler and cProfile have something to see."""
+    end = time.perf_counter() + seconds
+    total = 0.0
+    while time.perf_counter() < end:
+        total += sum(i * i for i in range(200))
+    return total
+
+
+def run_stages(keep: list):
+    with profile_span("video"):
+        with profile_span("mix"):
+            keep.append(np.ones(4_000_000, dtype=np.float32))  # 16 MB still alive after the span
+            busy(0.15)
+        with profile_span("encode"):
+            busy(0.15)
+
+
+def test_nested_spans():
+    """Spans nest, report wall/CPU/RSS, and attribute allocations to the right source line."""
+    print("🧪 Testing nested spans...")
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = set_profiler(StageProfiler(sample_interval_ms=2, cprofile_dir=Path(tmp) / "prof"))
+        keep = []
+        try:
+            run_stages(keep)
+        finally:
+            profiler.stop()
+            set_profiler(None)
+
+        spans = {span["path"]: span for span in profiler.spans}
+        for path, span in spans.items():
+            print(f"   {path}: {span['wall_s']:.2f}s wall, {span['cpu_s']:.2f}s CPU, "
+                  f"traced peak {span['traced_peak_mb']:.1f} MB, RSS {span['peak_rss_mb']:.0f} MB")
+        mix = spans["video;mix"]
+        top = mix["top_allocators"][0]
+        print(f"   Top allocator in mix: {top['location']} ({top['size_kb']:.0f} KB)")
+
+        assert list(spans) == ["video;mix", "video;encode", "video"], list(spans)
+        assert spans["video"]["wall_s"] >= mix["wall_s"] + spans["video;encode"]["wall_s"], "parent shorter than children"
+        assert mix["cpu_s"] > 0.1, f"mix used {mix['cpu_s']:.2f}s CPU"
+        assert Path(top["location"].rsplit(":", 1)[0]).name == "test_stage_profiler.py", top["location"]
+        assert top["size_kb"] > 15_000, f"top allocation {top['size_kb']:.0f} KB"
+        assert spans["video"]["traced_peak_mb"] >= mix["traced_peak_mb"] > 15
+        assert all(pstats.Stats(span["cprofile"]).total_calls > 0 for span in spans.values()), "empty cProfile dump"
+        # The encode dump must not contain the mix stage's work (parent/child dumps are exclusive)
+        encode_stats = pstats.Stats(spans["video;encode"]["cprofile"])
+        assert not any(func[2] == "ones" for func in encode_stats.stats), "encode dump contains the mix stage"
+
+
+def test_collapsed_stacks():
+    """Sampled stacks are prefixed with the span path and written in 'stack count' lines."""
+    print("🧪 Testing collapsed-stack export...")
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = set_profiler(StageProfiler(sample_interval_ms=2, trace_allocations=False))
+        try:
+            run_stages([])
+        finally:
+            profiler.stop()
+            set_profiler(None)
+        path = profiler.write_collapsed(Path(tmp) / "profile.folded")
+        lines = path.read_text().splitlines()
+        counts = {"video;mix": 0, "video;encode": 0}
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            for stage in counts:
+                if stack.startswith(stage + ";"):
+                    counts[stage] += int(count)
+        print(f"   {profiler.samples} samples, {len(lines)} distinct stacks, per stage: {counts}")
+        assert profiler.samples > 20, f"only {profiler.samples} samples"
+        assert min(counts.values()) > 5, counts
+        assert any(line.startswith("video;encode;") and "busy (" in line for line in lines), "busy() not under encode"
+        assert all(line.startswith("video;") for line in lines), "stack outside the spans"
+
+
+def test_disabled_and_errors():
+    """The default profiler is off and nearly free; a failing stage is still recorded."""
+    print("🧪 Testing disabled profiler and failing spans...")
+    start = time.perf_counter()
+    for _ in range(100_000):
+        with profile_span("noop"):
+            pass
+    per_span_us = (time.perf_counter() - start) * 10
+    print(f"   Disabled span: {per_span_us:.2f} µs")
+
+    profiler = set_profiler(StageProfiler(sample_interval_ms=0, trace_allocations=False))
+    try:
+        with profile_span("tts"):
+            raise RuntimeError("quota exceeded")
+    except RuntimeError:
+        pass
+    finally:
+        profiler.stop()
+        set_profiler(None)
+    print(f"   Failed span: {profiler.spans[0].get('error')}")
+    assert not get_profiler().enabled and get_profiler().spans == [], "default profiler is recording"
+    assert per_span_us < 5, f"disabled span costs {per_span_us:.2f} µs"
+    assert profiler.spans[0]["error"] == "RuntimeError: quota exceeded", profiler.spans[0]
+
+
+def main():
+    """Run all stage profiler tests."""
+    tests = [test_nested_spans, test_collapsed_stacks, test_disabled_and_errors]
+    return run_tests("TESTING STAGE PROFILER", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
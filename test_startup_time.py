@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Startup-time regression check for the pipeline entry points.
+
+Each entry point is imported in a fresh interpreter under `python -X importtime`.
+Its cumulative import time must stay within budget, and none of the heavy
+dependencies (moviepy, openai, Whisper, ...) may be imported before first use.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.script_tests import run_tests
+
+# Cumulative import time budget per entry point (best of 3 runs), in milliseconds
+STARTUP_BUDGETS_MS = {
+    "full_pipeline": 800,
+    "interactive_pipeline": 800,
+    "run_project": 200,
+}
+
+# Deferred until first use through src.utils.lazy_import or local imports
+HEAVY_MODULES = ["moviepy", "openai", "replicate", "faster_whisper", "ctranslate2", "librosa",
+                 "PIL", "scipy", "elevenlabs", "cv2", "IPython", "requests"]
+
+
+def import_profile(module: str) -> dict:
+    """Import a module in a fresh interpreter; returns {module name: cumulative microseconds}."""
+    env = dict(os.environ)
+    # tts_generator refuses to import without credentials; any value will do
+    env.setdefault("ELEVENLABS_API_KEY", "startup-check")
+    env.setdefault("ELEVENLABS_VOICE_ID", "startup-check")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=project_root, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1]}")
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def check_entry_point(module: str):
+    """Entry point imports within budget and without heavy dependencies."""
+    print(f"🧪 Checking {module}.py startup...")
+    profiles = [import_profile(module) for _ in range(3)]
+    best_ms = min(profile[module] for profile in profiles) / 1000
+    loaded = sorted({name.split('.')[0] for name in profiles[0]} & set(HEAVY_MODULES))
+    slowest = sorted(((cumulative, name) for name, cumulative in profiles[0].items()
+                      if name not in (module, 'site') and '.' not in name), reverse=True)[:3]
+
+    print(f"   Import time: {best_ms:.0f}ms (budget {STARTUP_BUDGETS_MS[module]}ms)")
+    print(f"   Slowest top-level imports: " + ", ".join(f"{name} {us / 1000:.0f}ms" for us, name in slowest))
+    assert not loaded, f"heavy modules imported at startup: {', '.join(loaded)}"
+    assert best_ms <= STARTUP_BUDGETS_MS[module], f"{best_ms:.0f}ms over the {STARTUP_BUDGETS_MS[module]}ms budget"
+
+
+def test_full_pipeline():
+    check_entry_point("full_pipeline")
+
+
+def test_interactive_pipeline():
+    check_entry_point("interactive_pipeline")
+
+
+def test_run_project():
+    check_entry_point("run_project")
+
+
+def test_lazy_module():
+    """A lazy module is not imported until an attribute is used."""
+    print("🧪 Testing lazy module proxy...")
+    code = ("import sys; from src.utils.lazy_import import lazy_import, is_loaded; "
+            "m = lazy_import('colorsys'); a = 'colorsys' in sys.modules; "
+            "v = m.rgb_to_hsv(1, 0, 0); print(a, is_loaded(m), 'colorsys' in sys.modules, v)")
+    result = subprocess.run([sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True)
+    print(f"   {result.stdout.strip() or result.stderr.strip()}")
+    assert result.stdout.strip() == "False True True (0.0, 1.0, 1)", result.stdout + result.stderr
+
+
+def main():
+    """Run all startup-time checks."""
+    tests = [test_lazy_module, test_full_pipeline, test_interactive_pipeline, test_run_project]
+    return run_tests("TESTING STARTUP TIME", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
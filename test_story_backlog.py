@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test the story backlog: oldest-first takes that skip excluded and expired
+stories, refills that stop at the configured size, stories whose topic was
+used in the meantime being dropped, and the render worker refilling the
+backlog while its queue is idle.
+"""
+
+import asyncio
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from render_worker import JobQueue, RenderWorker
+from src.llm.story_backlog import StoryBacklog, StoryPrefetcher, take_prefetched_story
+from src.llm.story_generator import StoryGenerator
+from src.utils.script_tests import run_tests
+
+# Stand-in for a project's src/llm/story_backlog.py: each refill appends a line, the first two add a story
+PREFETCH_MODULE = '''
+from pathlib import Path
+
+class StoryPrefetcher:
+    async def refill(self, limit=None):
+        calls = Path("prefetch_calls.txt")
+        count = len(calls.read_text().splitlines()) + 1 if calls.exists() else 1
+        calls.write_text("x\\n" * count)
+        return 1 if count <= 2 else 0
+'''
+
+
+class ScriptedGenerator:
+    """Async-context StoryGenerator stand-in that records the topics it was asked to avoid."""
+
+    def __init__(self, topics, fail_at=None):
+        self.topics = list(topics)
+        self.fail_at = fail_at
+        self.excluded = []
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def suggest_topic(self, exclude_topics=None):
+        self.excluded.append(list(exclude_topics or []))
+        if len(self.excluded) == self.fail_at:
+            raise RuntimeError("rate limited")
+        return self.topics[len(self.excluded) - 1]
+
+    async def generate_story(self, topic):
+        return {"title": topic.upper(), "story": f"A story about {topic}.", "music_category": "mysterious"}
+
+
+def test_take_order_exclusions_and_ttl():
+    """Takes are oldest first, skip excluded topics, and never return expired stories."""
+    print("🧪 Testing backlog takes...")
+    with tempfile.TemporaryDirectory() as tmp:
+        backlog = StoryBacklog(Path(tmp) / "stories.db", max_size=3, ttl_seconds=3600)
+        for topic in ("Old Lighthouse", "Silk Road Heist", "Comet Of 1811"):
+            backlog.add(topic, {"title": topic, "story": "..."})
+        full = backlog.missing() == 0
+        first = backlog.take(exclude_topics=["Old Lighthouse"])["topic"]
+        second = backlog.take()["topic"]
+
+        short_lived = StoryBacklog(Path(tmp) / "stories.db", ttl_seconds=0.05)
+        time.sleep(0.1)
+        expired = short_lived.take()
+        print(f"   takes: {first!r}, {second!r}; after TTL: {expired}, left: {len(backlog)}")
+        assert full, "backlog not full after three adds"
+        assert (first, second) == ("Silk Road Heist", "Old Lighthouse"), (first, second)
+        assert expired is None, "expired story returned"
+        assert len(backlog) == 0 and backlog.missing() == 3
+
+
+def test_refill_fills_to_size_and_stops_on_failure():
+    """Refills add stories until the backlog is full, avoid topics already waiting, and stop at a failure."""
+    print("🧪 Testing refills...")
+    with tempfile.TemporaryDirectory() as tmp:
+        backlog = StoryBacklog(Path(tmp) / "stories.db", max_size=3, ttl_seconds=3600)
+        generator = ScriptedGenerator(["Topic A", "Topic B", "Topic C", "Topic D"])
+        prefetcher = StoryPrefetcher(backlog, generator_factory=generator)
+        added = asyncio.run(prefetcher.refill())
+        again = asyncio.run(prefetcher.refill())
+
+        failing = StoryPrefetcher(StoryBacklog(Path(tmp) / "other.db", max_size=3),
+                                  generator_factory=ScriptedGenerator(["X", "Y", "Z"], fail_at=2))
+        partial = asyncio.run(failing.refill())
+        stored = backlog.take()["story_data"]
+        print(f"   added {added} then {again}; excluded per suggestion: {generator.excluded}; "
+              f"with a failure: {partial}")
+        assert added == 3 and again == 0, (added, again)
+        assert generator.excluded == [[], ["Topic A"], ["Topic A", "Topic B"]], generator.excluded
+        assert partial == 1, f"{partial} stories added before the failure"
+        assert stored["music_category"] == "mysterious", stored
+
+
+def test_used_topics_are_dropped():
+    """A prefetched story whose topic was used since is dropped and the next one is returned."""
+    print("🧪 Testing used-topic check on take...")
+    with tempfile.TemporaryDirectory() as tmp:
+        backlog = StoryBacklog(Path(tmp) / "stories.db", max_size=2, ttl_seconds=3600)
+        backlog.add("The Lighthouse Keeper Who Outlived Three Empires", {"title": "A", "story": "..."})
+        backlog.add("The Comet That Fooled Kyoto", {"title": "B", "story": "..."})
+        generator = StoryGenerator.__new__(StoryGenerator)  # Only the banned-topic check is used
+        generator._load_banned_topics = lambda: ["The Lighthouse Keeper Who Outlived Three Empires!"]
+        taken = take_prefetched_story(generator, backlog=backlog)
+        print(f"   taken: {taken['topic']!r}, left: {len(backlog)}")
+        assert taken["story_data"]["title"] == "B", taken
+        assert len(backlog) == 0, "used story left in the backlog"
+
+
+def test_worker_refills_while_idle():
+    """An idle worker asks project processes for one story at a time and backs off once nothing is added."""
+    print("🧪 Testing idle refills in the render worker...")
+    from test_render_worker import make_project
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = make_project(Path(tmp))
+        (project / "src" / "llm").mkdir(parents=True)
+        (project / "src" / "llm" / "story_backlog.py").write_text(textwrap.dedent(PREFETCH_MODULE))
+        other = Path(tmp) / "NoBacklog"
+        other.mkdir()
+        for name in ("config.py", "content_generation_pipeline.py", "audio_video_processor_pipeline.py"):
+            (other / name).write_text((project / name).read_text())
+
+        queue = JobQueue(Path(tmp) / "jobs.db")
+        worker = RenderWorker(queue, preload_models=False, poll_seconds=0.05, prefetch_after=1.0,
+                              prefetch_projects=(str(project), str(other)))
+        worker.serve(idle_exit=4.0)
+        calls = len((project / "prefetch_calls.txt").read_text().splitlines())
+        print(f"   refill calls: {calls}, projects still prefetched: {[Path(p).name for p in worker.prefetch_projects]}")
+        # Two stories added back to back, one empty refill, then retries a second apart until the exit at 4s
+        assert 3 <= calls <= 6, f"{calls} refill calls"
+        assert worker.prefetch_projects == [str(project)], worker.prefetch_projects
+
+
+def main():
+    """Run all story backlog tests."""
+    tests = [test_take_order_exclusions_and_ttl, test_refill_fills_to_size_and_stops_on_failure,
+             test_used_topics_are_dropped, test_worker_refills_while_idle]
+    return run_tests("TESTING STORY BACKLOG", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test the queue-based logging setup: one root QueueHandler, JSON-lines files
+tagged with the pipeline stage, per-stage log volume, per-key log files and
+no per-group records from the subtitle hot loops at INFO.
+"""
+
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.logger import StageQueueHandler, configure_logging, log_volume, reset_log_volume, shutdown_logging
+from src.utils.profiler import profile_span
+from src.utils.script_tests import run_tests
+
+
+def read_json_lines(path: Path) -> list:
+    shutdown_logging()  # Drain the queue; the next configure_logging() restarts the listener
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_single_queue_handler():
+    """Importing modules that used to call basicConfig leaves exactly one root handler: the queue."""
+    print("🧪 Testing root handler setup...")
+    logging.basicConfig(level=logging.INFO)  # Something configured logging first
+    configure_logging(console=False)
+    import src.audio_mixer  # noqa: F401 (used to call basicConfig at import time)
+    configure_logging()
+    # Under pytest the root logger also carries pytest's own capture handlers
+    handlers = [h for h in logging.getLogger().handlers if not type(h).__module__.startswith("_pytest")]
+    print(f"   Root handlers: {[type(h).__name__ for h in handlers]}")
+    assert len(handlers) == 1 and isinstance(handlers[0], StageQueueHandler), handlers
+
+
+def test_json_records_and_stages():
+    """File records are JSON lines with the innermost span path and extra= fields."""
+    print("🧪 Testing structured records...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "run.log"
+        configure_logging(log_file=path, file_key="test", file_format="json", console=False)
+        logger = logging.getLogger("autotube.test")
+        logger.info("before any stage")
+        with profile_span("video"):
+            with profile_span("mix"):
+                logger.warning("clipping %d samples", 12, extra={"track": "intense_1.wav"})
+        records = read_json_lines(path)
+        configure_logging(log_file=Path(tmp) / "other.log", file_key="test")  # Release run.log
+        for record in records:
+            print(f"   {record}")
+        mix = records[-1]
+        assert len(records) == 2 and records[0]["stage"] == "-", records
+        assert mix["stage"] == "video;mix" and mix["message"] == "clipping 12 samples", mix
+        assert mix["level"] == "WARNING" and mix["logger"] == "autotube.test", mix
+        assert mix["track"] == "intense_1.wav", "extra= field missing"
+
+
+def test_log_volume_and_file_keys():
+    """Records are counted per stage and level; a new file under the same key replaces the old one."""
+    print("🧪 Testing log volume and per-key files...")
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = Path(tmp) / "topic_a.log", Path(tmp) / "topic_b.log"
+        logger = logging.getLogger("autotube.content_gen")
+        reset_log_volume()
+        configure_logging(level="INFO", log_file=first, file_key="content_gen", console=False)
+        with profile_span("tts"):
+            for i in range(5):
+                logger.info("chunk %d", i)
+        configure_logging(log_file=second, file_key="content_gen")
+        with profile_span("image_batch"):
+            logger.error("rate limited")
+        volume = log_volume()
+        a, b = read_json_lines(first), read_json_lines(second)
+        configure_logging(log_file=Path(tmp) / "other.log", file_key="content_gen")
+        print(f"   Volume: {volume}")
+        print(f"   topic_a: {len(a)} records, topic_b: {len(b)} records")
+        assert volume["tts"]["INFO"] == 5 and volume["image_batch"]["ERROR"] == 1, volume
+        assert volume["tts"]["bytes"] == 5 * len("chunk 0"), volume["tts"]
+        assert len(a) == 5 and len(b) == 1, "records went to the wrong file"
+
+
+def test_subtitle_hot_loops_quiet_at_info():
+    """Grouping words and building clips logs a handful of lines at INFO, not one per group or clip."""
+    print("🧪 Testing subtitle hot-loop logging...")
+    from benchmarks.fixtures import narration_word_timings
+    from src.video_composition.whisper_subtitle_processor import OptimizedWhisperViralSubtitleProcessor
+
+    configure_logging(level="INFO", console=False)
+    processor = OptimizedWhisperViralSubtitleProcessor()
+    words = narration_word_timings(20.0)
+    reset_log_volume()
+    with profile_span("subtitle_render"):
+        groups = processor._group_words_into_chunks([dict(word) for word in words])
+    records = sum(count for key, count in log_volume()["subtitle_render"].items() if key != "bytes")
+    print(f"   {len(words)} words -> {len(groups)} groups, {records} log records")
+    assert len(groups) > 10, f"{len(groups)} groups"
+    assert records == 1, f"{records} log records at INFO"
+
+
+def main():
+    """Run all structured logging tests."""
+    tests = [test_single_queue_handler, test_json_records_and_stages, test_log_volume_and_file_keys,
+             test_subtitle_hot_loops_quiet_at_info]
+    return run_tests("TESTING STRUCTURED LOGGING", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test WSOLA time stretching: exact output length, pitch and level preserved,
+and no librosa import when the audio modules load.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.script_tests import run_tests
+from src.utils.time_stretch import wsola
+
+RATE = 44100
+
+
+def test_length_and_pitch():
+    """Tempo changes by the factor, pitch (dominant frequency) and level do not."""
+    print("🧪 Testing length, pitch and level...")
+    t = np.arange(4 * RATE) / RATE
+    tone = (0.5 * np.sin(2 * np.pi * 180 * t)).astype(np.float32)
+    stereo = np.stack([tone, tone], axis=1)
+
+    for speed in (0.9, 1.1, 1.25, 1.5):
+        stretched = wsola(stereo, RATE, speed)
+        spectrum = np.abs(np.fft.rfft(stretched[RATE // 2:RATE // 2 + RATE, 0]))
+        frequency = float(np.argmax(spectrum))  # 1 s window: bins are 1 Hz apart
+        rms_ratio = np.sqrt(np.mean(stretched[RATE // 2:-RATE // 2] ** 2)) / np.sqrt(np.mean(stereo ** 2))
+        print(f"   {speed}x: {stretched.shape[0]} frames (expected {round(stereo.shape[0] / speed)}), "
+              f"{frequency:.0f} Hz, level ratio {rms_ratio:.3f}")
+        assert stretched.shape == (round(stereo.shape[0] / speed), 2), f"{speed}x: shape {stretched.shape}"
+        assert frequency == 180, f"{speed}x: pitch moved to {frequency:.0f} Hz"
+        assert abs(rms_ratio - 1) < 0.02, f"{speed}x: level ratio {rms_ratio:.3f}"
+
+
+def test_mono_passthrough():
+    """Mono input stays mono; speed 1.0 returns the input unchanged."""
+    print("🧪 Testing mono and identity...")
+    signal = np.random.default_rng(0).standard_normal(RATE).astype(np.float32) * 0.1
+    assert wsola(signal, RATE, 1.2).ndim == 1, "mono input came back multichannel"
+    assert np.array_equal(wsola(signal, RATE, 1.0), signal), "speed 1.0 changed the input"
+
+
+def test_no_librosa_at_import():
+    """Loading the mixer and audio processor does not pull in librosa."""
+    print("🧪 Testing import chain...")
+    code = ("import sys; import src.audio_mixer, src.utils.high_quality_audio_processor; "
+            "print('librosa' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True)
+    print(f"   librosa imported: {result.stdout.strip()}")
+    assert result.stdout.strip() == "False", result.stdout + result.stderr
+
+
+def main():
+    """Run all time stretch tests."""
+    tests = [test_length_and_pitch, test_mono_passthrough, test_no_librosa_at_import]
+    return run_tests("TESTING TIME STRETCH", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test the MinHash LSH topic index: near-duplicate recall against the exact
+scan, candidate counts well below the history size, persistence next to
+topic_history.json and incremental maintenance.
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.llm.topic_tracker import TopicTracker
+from src.utils.minhash_lsh import MinHashLSH, collision_probability
+from src.utils.script_tests import run_tests
+
+
+def random_topic(rng: random.Random, vocabulary: list) -> str:
+    return " ".join(rng.sample(vocabulary, rng.randint(4, 9))).title()
+
+
+def near_duplicate(rng: random.Random, topic: str, vocabulary: list) -> str:
+    """Swap one word, or drop one from a longer title (word overlap 0.75-0.9)."""
+    words = topic.split()
+    if len(words) >= 5 and rng.random() < 0.5:
+        words.pop(rng.randrange(len(words)))
+    else:
+        words[rng.randrange(len(words))] = rng.choice(vocabulary).title()
+    return " ".join(words)
+
+
+def write_history(path: Path, topics: list, days_ago: int = 1):
+    used = (datetime.now() - timedelta(days=days_ago)).isoformat()
+    history = {
+        TopicTracker._generate_topic_id(None, topic): {
+            'topic': topic, 'first_used': used, 'last_used': used, 'use_count': 1, 'video_id': None, 'context': {}
+        }
+        for topic in topics
+    }
+    path.write_text(json.dumps({'version': '1.0', 'topics': history}), encoding='utf-8')
+
+
+def test_recall_and_candidates():
+    """Indexed lookups find the near-duplicates the full scan finds while comparing a fraction of the history."""
+    print("🧪 Testing recall against the exact scan...")
+    rng = random.Random(7)
+    vocabulary = [f"w{i}" for i in range(3000)]
+    topics = [random_topic(rng, vocabulary) for _ in range(5000)]
+    queries = [near_duplicate(rng, rng.choice(topics), vocabulary) for _ in range(300)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = Path(tmp) / "topic_history.json"
+        write_history(history, topics)
+        tracker = TopicTracker(history)
+
+        start = time.perf_counter()
+        exact = [{t['topic'] for t in tracker.get_similar_topics(q, exact=True)} for q in queries]
+        exact_s = time.perf_counter() - start
+        start = time.perf_counter()
+        indexed = [{t['topic'] for t in tracker.get_similar_topics(q)} for q in queries]
+        indexed_s = time.perf_counter() - start
+        candidates = sum(len(tracker.index.query(tracker._topic_words(q))) for q in queries) / len(queries)
+
+    expected = sum(len(found) for found in exact)
+    recalled = sum(len(found & other) for found, other in zip(exact, indexed))
+    false_hits = sum(len(other - found) for found, other in zip(exact, indexed))
+    bands, rows = tracker.index.bands, tracker.index.rows
+    print(f"   {bands} bands x {rows} rows: P(candidate) at Jaccard 0.67 = {collision_probability(0.67, bands, rows):.3f}")
+    print(f"   Recall {recalled}/{expected}, {candidates:.1f} candidates per query out of {len(topics)}")
+    print(f"   Exact scan {exact_s * 1000 / len(queries):.2f} ms/query, indexed {indexed_s * 1000 / len(queries):.2f} ms/query")
+    assert expected >= len(queries) * 0.7, f"only {expected} near-duplicates to find"
+    assert recalled / expected >= 0.98, f"recall {recalled}/{expected}"
+    assert false_hits == 0, f"{false_hits} topics the exact scan does not report"
+    assert candidates < len(topics) * 0.02, f"{candidates:.1f} candidates per query"
+    assert indexed_s < exact_s, "indexed lookups are slower than the full scan"
+
+
+def test_persistence_and_incremental_updates():
+    """The index is saved next to the history, reloaded as-is, extended by mark_topic_used and pruned on expiry."""
+    print("🧪 Testing persistence and incremental maintenance...")
+    with tempfile.TemporaryDirectory() as tmp:
+        history = Path(tmp) / "topic_history.json"
+        write_history(history, ["The Lost Gold Of The Templars", "Why Rome Burned In 64 AD"])
+        tracker = TopicTracker(history)
+        index_file = history.with_name("topic_history.lsh.json")
+        built = index_file.stat().st_mtime_ns
+
+        reloaded = TopicTracker(history)
+        unchanged = index_file.stat().st_mtime_ns == built and reloaded.index.items == tracker.index.items
+
+        reloaded.mark_topic_used("The Night The Titanic Almost Made It")
+        saved = json.loads(index_file.read_text(encoding='utf-8'))
+        added = len(saved["items"]) == 3 and len(TopicTracker(history).index) == 3
+
+        # Entries older than 90 days are dropped from the history on load, and from the index with them
+        write_history(history, ["The Lost Gold Of The Templars"], days_ago=120)
+        expired = TopicTracker(history)
+        pruned = len(expired.index) == 0 and json.loads(index_file.read_text(encoding='utf-8'))["items"] == {}
+
+        near = reloaded.is_topic_used("The Lost Gold Of The Knights Templars", similarity_threshold=0.8)
+        not_near = reloaded.is_topic_used("The Lost Temple Of Atlantis", similarity_threshold=0.8)
+        exact_only = reloaded.is_topic_used("The Lost Gold Of The Knights Templars")
+        print(f"   reload unchanged: {unchanged}, mark added: {added}, expiry pruned: {pruned}, "
+              f"near-duplicate: {near}/{not_near}/{exact_only}")
+        assert unchanged, "reloading rebuilt or changed the index"
+        assert added, "mark_topic_used did not extend the saved index"
+        assert pruned, "expired topics stayed in the index"
+        assert near and not not_near and not exact_only, (near, not_near, exact_only)
+
+
+def test_parameters():
+    """Higher false-negative weight buys recall with more bands; changed parameters force a rebuild."""
+    print("🧪 Testing recall/precision tuning...")
+    precise = MinHashLSH(threshold=0.6, false_negative_weight=0.2)
+    recall = MinHashLSH(threshold=0.6, false_negative_weight=0.9)
+    p_precise = collision_probability(0.6, precise.bands, precise.rows)
+    p_recall = collision_probability(0.6, recall.bands, recall.rows)
+    print(f"   P(candidate) at the threshold: {p_precise:.2f} (precision-weighted) vs {p_recall:.2f} (recall-weighted)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "index.json"
+        recall.insert("a", {"roman", "empire", "collapse"})
+        recall.save(path)
+        same = MinHashLSH.load(path, threshold=0.6, false_negative_weight=0.9)
+        other = MinHashLSH.load(path, threshold=0.5, false_negative_weight=0.9)
+    assert p_recall > p_precise, (p_recall, p_precise)
+    assert same is not None and same.query({"roman", "empire", "collapse"}) == {"a"}, "saved index not reloaded"
+    assert other is None, "index with other parameters reused"
+
+
+def main():
+    """Run all topic index tests."""
+    tests = [test_recall_and_candidates, test_persistence_and_incremental_updates, test_parameters]
+    return run_tests("TESTING TOPIC LSH INDEX", tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)